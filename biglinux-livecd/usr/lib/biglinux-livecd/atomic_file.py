@@ -0,0 +1,43 @@
+"""Replace the small boot-scoped files the live session caches under /run.
+
+Readers of these files must see either the old content or the new, never a
+partial write, so each one is written to a temporary file in the same
+directory and renamed over the old one.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def user_file(directory: Path, name: str) -> Path:
+    """The calling user's own file in a directory every user may write.
+
+    Those directories are shared and sticky, like the boot timeline's, so
+    each user keeps a file named after its uid instead of sharing one.
+    """
+    return directory / f"{name}.{os.geteuid()}.json"
+
+
+def write_atomically(path: Path, data: bytes, mode: int = 0o644) -> None:
+    """Write ``data`` to ``path`` in one rename.
+
+    The files live on tmpfs and only last the boot: the rename is what
+    matters, not fsync.
+    """
+    descriptor, temporary_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", dir=path.parent
+    )
+    temporary_path = Path(temporary_name)
+    try:
+        os.write(descriptor, data)
+        os.fchmod(descriptor, mode)
+        os.close(descriptor)
+        descriptor = -1
+        os.replace(temporary_path, path)
+    finally:
+        if descriptor >= 0:
+            os.close(descriptor)
+        temporary_path.unlink(missing_ok=True)
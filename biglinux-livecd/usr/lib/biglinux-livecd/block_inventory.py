@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Enumerate the block devices once and cache the answer until one changes.
+
+``storage-probe`` ran ``lsblk --inverse`` once per EFI partition, and the
+language probe ran ``findmnt`` and ``lsblk --json`` again, each to learn
+which devices hold the live medium, which partitions are EFI system
+partitions and which hold a Linux filesystem. The same answers come from
+``/sys/class/block``, the udev database and ``/proc/self/mountinfo``, read
+here with no fork and cached under ``/run/biglinux-live``.
+
+A udev rule writes the sequence number of every block uevent to
+``block-generation``. The cache records the generation it was enumerated
+under, read before enumerating, so a device that comes or goes, or is
+reformatted, while or after the cache is built makes it stale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import stat
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from atomic_file import write_atomically
+
+INVENTORY_VERSION = 1
+SYSFS_BLOCK = Path("/sys/class/block")
+UDEV_DATA = Path("/run/udev/data")
+MOUNTINFO = Path("/proc/self/mountinfo")
+LIVE_MOUNT = "/run/miso/bootmnt"
+JSON_PATH = Path("/run/biglinux-live/block-inventory.json")
+ENV_PATH = Path("/run/biglinux-live/block-inventory.env")
+GENERATION_PATH = Path("/run/biglinux-live/block-generation")
+# Before the first block uevent there is no generation file.
+NO_GENERATION = "none"
+MAX_INVENTORY_BYTES = 256 * 1024
+EFI_PARTITION_TYPES = {"0xef", "c12a7328-f81f-11d2-ba4b-00a0c93ec93b"}
+LINUX_FILESYSTEMS = {"ext4", "btrfs"}
+# The active flag of an MBR partition, which is where BIOS Windows boots from.
+MBR_BOOTABLE = "0x80"
+_DEVICE_PATH = re.compile(r"/dev/[A-Za-z0-9_.+/-]+")
+
+
+@dataclass(frozen=True)
+class BlockDevice:
+    name: str
+    path: str
+    number: str
+    type: str
+    parents: tuple[str, ...] = ()
+    filesystem: str = ""
+    partition_type: str = ""
+    partition_flags: str = ""
+
+
+@dataclass(frozen=True)
+class BlockInventory:
+    generation: str
+    live_mount: str
+    live_device: str | None
+    devices: tuple[BlockDevice, ...]
+
+    def device(self, name: str) -> BlockDevice | None:
+        return next((device for device in self.devices if device.name == name), None)
+
+    def ancestry(self, name: str) -> set[str]:
+        """The device and everything it sits on: partitions, disks, PVs."""
+        by_name = {device.name: device for device in self.devices}
+        found: set[str] = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in found:
+                continue
+            found.add(current)
+            device = by_name.get(current)
+            if device is not None:
+                pending.extend(device.parents)
+        return found
+
+    def live_ancestry(self) -> set[str]:
+        return self.ancestry(self.live_device) if self.live_device else set()
+
+    def is_live(self, name: str) -> bool:
+        """Whether the device shares a disk with the live medium."""
+        return not self.ancestry(name).isdisjoint(self.live_ancestry())
+
+    def efi_partitions(self) -> list[str]:
+        return [
+            device.path
+            for device in self.devices
+            if device.type == "part"
+            and device.partition_type in EFI_PARTITION_TYPES
+            and not self.is_live(device.name)
+        ]
+
+    def linux_filesystems(self) -> list[tuple[str, str]]:
+        return [
+            (device.path, device.filesystem)
+            for device in self.devices
+            if device.type in {"part", "lvm"}
+            and device.filesystem in LINUX_FILESYSTEMS
+            and not self.is_live(device.name)
+        ]
+
+    def windows_boot_volumes(self) -> list[str]:
+        """EFI system partitions, then active NTFS partitions of BIOS installs."""
+        bios = [
+            device.path
+            for device in self.devices
+            if device.type == "part"
+            and device.filesystem == "ntfs"
+            and device.partition_flags == MBR_BOOTABLE
+            and not self.is_live(device.name)
+        ]
+        return self.efi_partitions() + bios
+
+
+def read_generation(path: Path = GENERATION_PATH) -> str:
+    try:
+        generation = path.read_text(encoding="ascii").strip()
+    except (OSError, UnicodeDecodeError):
+        return NO_GENERATION
+    return generation if generation.isdigit() else NO_GENERATION
+
+
+def read_udev_properties(number: str, udev_data: Path = UDEV_DATA) -> dict[str, str]:
+    """The ``E:`` properties udev recorded for block device ``major:minor``."""
+    try:
+        content = (udev_data / f"b{number}").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return {}
+    properties = {}
+    for line in content.splitlines():
+        if line.startswith("E:") and "=" in line:
+            key, value = line[2:].split("=", 1)
+            properties[key] = value
+    return properties
+
+
+def _read_attribute(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _device_type(entry: Path, name: str, is_partition: bool) -> str:
+    if is_partition:
+        return "part"
+    if name.startswith("loop"):
+        return "loop"
+    if name.startswith("dm-"):
+        uuid = _read_attribute(entry / "dm/uuid")
+        if uuid.startswith("LVM-"):
+            return "lvm"
+        if uuid.startswith("CRYPT-"):
+            return "crypt"
+        return "dm"
+    if name.startswith("md"):
+        return "raid"
+    if name.startswith("sr"):
+        return "rom"
+    return "disk"
+
+
+def read_device(entry: Path, udev_data: Path = UDEV_DATA) -> BlockDevice | None:
+    """One ``/sys/class/block`` entry, or ``None`` when it vanished meanwhile."""
+    name = entry.name
+    number = _read_attribute(entry / "dev")
+    if not number:
+        return None
+    is_partition = (entry / "partition").exists()
+    if is_partition:
+        # A partition's sysfs directory sits inside its disk's.
+        parents: tuple[str, ...] = (entry.resolve().parent.name,)
+    else:
+        try:
+            parents = tuple(sorted(os.listdir(entry / "slaves")))
+        except OSError:
+            parents = ()
+    properties = read_udev_properties(number, udev_data)
+    return BlockDevice(
+        name=name,
+        # sysfs spells the slash of names like cciss/c0d0 as "!".
+        path="/dev/" + name.replace("!", "/"),
+        number=number,
+        type=_device_type(entry, name, is_partition),
+        parents=parents,
+        filesystem=properties.get("ID_FS_TYPE", "").lower(),
+        partition_type=properties.get("ID_PART_ENTRY_TYPE", "").lower(),
+        partition_flags=properties.get("ID_PART_ENTRY_FLAGS", "").lower(),
+    )
+
+
+def find_live_device(
+    devices: tuple[BlockDevice, ...],
+    live_mount: str = LIVE_MOUNT,
+    mountinfo: Path = MOUNTINFO,
+) -> str | None:
+    """The device mounted at ``live_mount``, from its ``major:minor``."""
+    try:
+        lines = mountinfo.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    number = None
+    for line in lines:
+        fields = line.split()
+        # Octal escapes in mount points are left alone: the live mount has none.
+        if len(fields) > 4 and fields[4] == live_mount:
+            number = fields[2]
+    if number is None:
+        return None
+    return next((device.name for device in devices if device.number == number), None)
+
+
+def enumerate_inventory(
+    sysfs_block: Path = SYSFS_BLOCK,
+    udev_data: Path = UDEV_DATA,
+    mountinfo: Path = MOUNTINFO,
+    live_mount: str = LIVE_MOUNT,
+    generation_path: Path = GENERATION_PATH,
+) -> BlockInventory:
+    generation = read_generation(generation_path)
+    devices = []
+    try:
+        entries = sorted(os.listdir(sysfs_block))
+    except OSError:
+        entries = []
+    for name in entries:
+        device = read_device(sysfs_block / name, udev_data)
+        if device is not None:
+            devices.append(device)
+    return BlockInventory(
+        generation=generation,
+        live_mount=live_mount,
+        live_device=find_live_device(tuple(devices), live_mount, mountinfo),
+        devices=tuple(devices),
+    )
+
+
+def format_env(inventory: BlockInventory) -> str:
+    """The answers the shell needs, as ``key=value`` lines it reads with no fork."""
+    lists = {
+        "efi_partitions": inventory.efi_partitions(),
+        "windows_boot_volumes": inventory.windows_boot_volumes(),
+        "linux_filesystems": [path for path, _ in inventory.linux_filesystems()],
+    }
+    lines = [
+        f"version={INVENTORY_VERSION}",
+        f"generation={inventory.generation}",
+        f"live_mount={inventory.live_mount}",
+        f"live_device={inventory.live_device or ''}",
+    ]
+    for key, paths in lists.items():
+        # The lists are colon-separated; a path that cannot be written so
+        # would make the shell count wrong, so the cache is not written.
+        if not all(_DEVICE_PATH.fullmatch(path) for path in paths):
+            raise ValueError(f"{key} cannot be cached for the shell")
+        lines.append(f"{key}={':'.join(paths)}")
+    return "".join(f"{line}\n" for line in lines)
+
+
+def write_inventory(
+    inventory: BlockInventory, json_path: Path = JSON_PATH, env_path: Path = ENV_PATH
+) -> None:
+    payload = {"version": INVENTORY_VERSION, **asdict(inventory)}
+    write_atomically(json_path, json.dumps(payload, separators=(",", ":")).encode())
+    write_atomically(env_path, format_env(inventory).encode())
+
+
+def _inventory_from_payload(payload: Any) -> BlockInventory | None:
+    if not isinstance(payload, dict) or payload.get("version") != INVENTORY_VERSION:
+        return None
+    try:
+        devices = tuple(
+            BlockDevice(**{**device, "parents": tuple(device["parents"])})
+            for device in payload["devices"]
+        )
+        inventory = BlockInventory(
+            generation=payload["generation"],
+            live_mount=payload["live_mount"],
+            live_device=payload["live_device"],
+            devices=devices,
+        )
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(inventory.generation, str) or not all(
+        isinstance(device.name, str) and isinstance(device.path, str)
+        for device in devices
+    ):
+        return None
+    return inventory
+
+
+def read_inventory(
+    json_path: Path = JSON_PATH, generation_path: Path = GENERATION_PATH
+) -> BlockInventory | None:
+    """The cached inventory, or ``None`` when a block uevent came since."""
+    descriptor = -1
+    try:
+        descriptor = os.open(json_path, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+        file_status = os.fstat(descriptor)
+        if (
+            not stat.S_ISREG(file_status.st_mode)
+            or file_status.st_mode & 0o022
+            or file_status.st_size > MAX_INVENTORY_BYTES
+        ):
+            return None
+        content = os.read(descriptor, MAX_INVENTORY_BYTES + 1)
+        if len(content) > MAX_INVENTORY_BYTES:
+            return None
+        payload = json.loads(content.decode("utf-8", "strict"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    finally:
+        if descriptor >= 0:
+            os.close(descriptor)
+    inventory = _inventory_from_payload(payload)
+    if inventory is None or inventory.generation != read_generation(generation_path):
+        return None
+    return inventory
+
+
+def load_inventory(
+    json_path: Path = JSON_PATH,
+    env_path: Path = ENV_PATH,
+    generation_path: Path = GENERATION_PATH,
+    **sources: Any,
+) -> BlockInventory:
+    """The cached inventory, enumerated again when stale.
+
+    A fresh enumeration is cached when this process may write there; the
+    sandboxed language probe may not, and uses it uncached. ``sources``
+    overrides where ``enumerate_inventory`` looks.
+    """
+    inventory = read_inventory(json_path, generation_path)
+    if inventory is not None and inventory.live_mount == sources.get(
+        "live_mount", LIVE_MOUNT
+    ):
+        return inventory
+    inventory = enumerate_inventory(generation_path=generation_path, **sources)
+    try:
+        write_inventory(inventory, json_path, env_path)
+    except (OSError, ValueError):
+        pass
+    return inventory
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Cache the block devices for the live session's probes."
+    )
+    parser.add_argument("--json", type=Path, default=JSON_PATH)
+    parser.add_argument("--env", type=Path, default=ENV_PATH)
+    arguments = parser.parse_args(argv)
+    try:
+        write_inventory(enumerate_inventory(), arguments.json, arguments.env)
+    except (OSError, ValueError) as error:
+        print(f"biglinux-livecd: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
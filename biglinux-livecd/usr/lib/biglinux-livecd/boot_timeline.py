@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Record and report where the live boot spends its time before the wizard.
+
+Shell scripts (through the ``boot-timeline`` library) and the Python wizards
+append named events to one file per user below ``/run/biglinux-live``.
+Timestamps are CLOCK_BOOTTIME seconds, the clock behind ``/proc/uptime``, so
+events from every process sort on one axis that starts at power-on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import stat
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+TIMELINE_DIRECTORY = Path("/run/biglinux-live/timeline")
+EVENTS = ("begin", "end", "mark")
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+_MAX_EVENT_FILE_BYTES = 1024 * 1024
+_default_source = Path(sys.argv[0]).name if sys.argv and sys.argv[0] else "python"
+
+
+@dataclass(frozen=True)
+class Event:
+    timestamp: float
+    source: str
+    pid: int
+    event: str
+    name: str
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    source: str
+    start: float
+    end: float | None
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+
+def set_source(source: str) -> None:
+    """Name the component recorded with this process's events."""
+    global _default_source
+    if not _NAME_PATTERN.fullmatch(source):
+        raise ValueError(f"invalid timeline source: {source!r}")
+    _default_source = source
+
+
+def record(
+    event: str,
+    name: str,
+    *,
+    source: str | None = None,
+    directory: Path | None = None,
+) -> None:
+    """Append one event; the timeline is diagnostics, so I/O errors are ignored."""
+    source = source or _default_source
+    if event not in EVENTS:
+        raise ValueError(f"unsupported timeline event: {event}")
+    if not _NAME_PATTERN.fullmatch(name) or not _NAME_PATTERN.fullmatch(source):
+        raise ValueError(f"invalid timeline name: {source!r}/{name!r}")
+    timestamp = time.clock_gettime(time.CLOCK_BOOTTIME)
+    line = f"{timestamp:.6f}\t{source}\t{os.getpid()}\t{event}\t{name}\n"
+    path = (directory or TIMELINE_DIRECTORY) / f"events.{os.geteuid()}"
+    try:
+        descriptor = os.open(
+            path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC | os.O_NOFOLLOW,
+            0o644,
+        )
+    except OSError:
+        return
+    try:
+        file_stat = os.fstat(descriptor)
+        if stat.S_ISREG(file_stat.st_mode) and file_stat.st_uid == os.geteuid():
+            os.write(descriptor, line.encode("ascii"))
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def mark(
+    name: str, *, source: str | None = None, directory: Path | None = None
+) -> None:
+    record("mark", name, source=source, directory=directory)
+
+
+@contextmanager
+def span(
+    name: str, *, source: str | None = None, directory: Path | None = None
+) -> Iterator[None]:
+    record("begin", name, source=source, directory=directory)
+    try:
+        yield
+    finally:
+        record("end", name, source=source, directory=directory)
+
+
+def parse_events(text: str) -> list[Event]:
+    events: list[Event] = []
+    for line in text.splitlines():
+        fields = line.split("\t")
+        if len(fields) != 5 or fields[3] not in EVENTS:
+            continue
+        try:
+            timestamp = float(fields[0])
+            pid = int(fields[2])
+        except ValueError:
+            continue
+        if _NAME_PATTERN.fullmatch(fields[1]) and _NAME_PATTERN.fullmatch(fields[4]):
+            events.append(Event(timestamp, fields[1], pid, fields[3], fields[4]))
+    return events
+
+
+def read_events(directory: Path = TIMELINE_DIRECTORY) -> list[Event]:
+    events: list[Event] = []
+    try:
+        paths = sorted(directory.glob("events.*"))
+    except OSError:
+        return events
+    for path in paths:
+        try:
+            descriptor = os.open(path, os.O_RDONLY | os.O_CLOEXEC | os.O_NOFOLLOW)
+        except OSError:
+            continue
+        with os.fdopen(descriptor, "rb") as event_file:
+            if not stat.S_ISREG(os.fstat(event_file.fileno()).st_mode):
+                continue
+            content = event_file.read(_MAX_EVENT_FILE_BYTES)
+        events.extend(parse_events(content.decode("ascii", "replace")))
+    return sorted(events, key=lambda event: event.timestamp)
+
+
+def build_spans(events: list[Event]) -> list[Span]:
+    """Pair begin/end events of one process; marks become zero-length spans."""
+    spans: list[Span] = []
+    open_spans: dict[tuple[str, int, str], list[Event]] = {}
+    for event in sorted(events, key=lambda event: event.timestamp):
+        key = (event.source, event.pid, event.name)
+        if event.event == "begin":
+            open_spans.setdefault(key, []).append(event)
+        elif event.event == "end" and open_spans.get(key):
+            begin = open_spans[key].pop()
+            spans.append(
+                Span(event.name, event.source, begin.timestamp, event.timestamp)
+            )
+        elif event.event == "mark":
+            spans.append(
+                Span(event.name, event.source, event.timestamp, event.timestamp)
+            )
+    for pending in open_spans.values():
+        spans.extend(
+            Span(begin.name, begin.source, begin.timestamp, None) for begin in pending
+        )
+    return sorted(spans, key=lambda span: (span.start, span.end is None))
+
+
+def format_report(spans: list[Span]) -> str:
+    if not spans:
+        return "No boot timeline events were recorded.\n"
+    source_width = max(len("source"), *(len(span.source) for span in spans))
+    lines = [
+        f"{'since boot':>10}  {'duration':>9}  {'source':<{source_width}}  event",
+    ]
+    for item in spans:
+        if item.end is None:
+            duration = "open"
+        elif item.end == item.start:
+            duration = "mark"
+        else:
+            duration = f"{item.duration:.3f}s"
+        lines.append(
+            f"{item.start:>9.3f}s  {duration:>9}  "
+            f"{item.source:<{source_width}}  {item.name}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Show where this boot spent its time before the wizard."
+    )
+    parser.add_argument("--directory", type=Path, default=TIMELINE_DIRECTORY)
+    parser.add_argument("--json", action="store_true", help="print spans as JSON")
+    arguments = parser.parse_args(argv)
+    spans = build_spans(read_events(arguments.directory))
+    if arguments.json:
+        payload = [dict(asdict(item), duration=item.duration) for item in spans]
+        print(json.dumps(payload, indent=2))
+    else:
+        sys.stdout.write(format_report(spans))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
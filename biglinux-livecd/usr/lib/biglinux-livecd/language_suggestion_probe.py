@@ -9,24 +9,20 @@ import queue
 import re
 import stat
 import subprocess
-import tempfile
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
+from atomic_file import write_atomically
 from babel.core import get_global  # pyright: ignore[reportMissingImports]
+from block_inventory import load_inventory
 
 SUPPORTED_LOCALES_PATH = Path("/usr/share/biglinux/livecd/assets/localization.json")
 WORK_DIRECTORY = Path("/run/biglinux-language-probe")
 RESULT_PATH = WORK_DIRECTORY / "suggestion.json"
-LIVE_MOUNT = "/run/miso/bootmnt"
 GEOIP_URL = "https://geoip.kde.org/v1/ubiquity"
-EFI_PARTITION_TYPES = {
-    "0xef",
-    "c12a7328-f81f-11d2-ba4b-00a0c93ec93b",
-}
 LOCALE_PATTERN = re.compile(r"^[a-z]{2}_[A-Z]{2}$")
 WINDOWS_LOCALE_PATTERN = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
 COUNTRY_PATTERN = re.compile(r"^[A-Z]{2}$")
@@ -164,86 +160,21 @@ def load_supported_locales(path: Path = SUPPORTED_LOCALES_PATH) -> tuple[str, ..
     return tuple(dict.fromkeys(locales))
 
 
-def flatten_devices(devices: list[object]) -> list[dict[str, object]]:
-    flattened: list[dict[str, object]] = []
-    for raw_device in devices:
-        if not isinstance(raw_device, dict):
-            continue
-        device = raw_device
-        flattened.append(device)
-        children = device.get("children", [])
-        if isinstance(children, list):
-            flattened.extend(flatten_devices(children))
-    return flattened
-
+def storage_inventory(_deadline: float) -> StorageInventory | None:
+    """Other disks' Linux filesystems and EFI partitions, from the inventory.
 
-def parse_storage_inventory(output: str, live_path: str) -> StorageInventory | None:
-    try:
-        roots = json.loads(output).get("blockdevices", [])
-    except (AttributeError, json.JSONDecodeError):
+    This used to run findmnt and lsblk for the same answers; the block
+    inventory is cached at boot, or read from sysfs when a device changed.
+    """
+    inventory = load_inventory()
+    if inventory.live_device is None:
         return None
-    if not isinstance(roots, list):
-        return None
-
-    linux_filesystems: list[tuple[str, str]] = []
-    efi_partitions: list[str] = []
-    for raw_root in roots:
-        tree = flatten_devices([raw_root])
-        tree_paths = {
-            os.path.realpath(path)
-            for device in tree
-            if isinstance((path := device.get("path")), str)
-            and path.startswith("/dev/")
-        }
-        if live_path in tree_paths:
-            continue
-        for device in tree:
-            path = device.get("path")
-            if not isinstance(path, str) or not path.startswith("/dev/"):
-                continue
-            device_type = device.get("type")
-            filesystem = str(device.get("fstype") or "").lower()
-            if device_type in {"part", "lvm"} and filesystem in {"ext4", "btrfs"}:
-                linux_filesystems.append((path, filesystem))
-            partition_type = str(device.get("parttype") or "").lower()
-            if device_type == "part" and partition_type in EFI_PARTITION_TYPES:
-                efi_partitions.append(path)
     return StorageInventory(
-        linux_filesystems=tuple(sorted(set(linux_filesystems))),
-        efi_partitions=tuple(sorted(set(efi_partitions))),
+        linux_filesystems=tuple(sorted(set(inventory.linux_filesystems()))),
+        efi_partitions=tuple(sorted(set(inventory.efi_partitions()))),
     )
 
 
-def storage_inventory(deadline: float) -> StorageInventory | None:
-    live_source = run_text_command(
-        [
-            "/usr/bin/findmnt",
-            "--noheadings",
-            "--raw",
-            "--output",
-            "SOURCE",
-            "--target",
-            LIVE_MOUNT,
-        ],
-        deadline,
-    )
-    if not live_source or not live_source.strip().startswith("/dev/"):
-        return None
-    output = run_text_command(
-        [
-            "/usr/bin/lsblk",
-            "--json",
-            "--paths",
-            "--output",
-            "PATH,TYPE,FSTYPE,PARTTYPE,MOUNTPOINTS",
-        ],
-        deadline,
-    )
-    if not output:
-        return None
-    return parse_storage_inventory(output, os.path.realpath(live_source.strip()))
-
-
 def is_block_device(path: str) -> bool:
     try:
         return stat.S_ISBLK(os.stat(path, follow_symlinks=True).st_mode)
@@ -437,24 +368,11 @@ def choose_suggestion(
 
 def publish_suggestion(suggestion: LanguageSuggestion) -> None:
     WORK_DIRECTORY.mkdir(mode=0o755, parents=True, exist_ok=True)
-    descriptor, temporary_name = tempfile.mkstemp(
-        prefix=".suggestion-", dir=WORK_DIRECTORY
-    )
-    temporary_path = Path(temporary_name)
-    try:
-        payload = json.dumps(
-            {"locale": suggestion.locale, "source": suggestion.source},
-            separators=(",", ":"),
-        ).encode("utf-8")
-        os.write(descriptor, payload)
-        os.fchmod(descriptor, 0o644)
-        os.close(descriptor)
-        descriptor = -1
-        os.replace(temporary_path, RESULT_PATH)
-    finally:
-        if descriptor >= 0:
-            os.close(descriptor)
-        temporary_path.unlink(missing_ok=True)
+    payload = json.dumps(
+        {"locale": suggestion.locale, "source": suggestion.source},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    write_atomically(RESULT_PATH, payload)
 
 
 def main() -> int:
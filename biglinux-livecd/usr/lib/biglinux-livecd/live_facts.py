@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Collect the live machine facts both wizards need, once per boot.
+
+The live wizard and the installer wizard each used to find these out on
+their own the first time they were asked: existence checks for the desktop
+entry points, ``systemd-detect-virt``, ``/proc/meminfo``, ``resolve-profile``,
+two ``uname`` runs and another walk of the ISO mount. ``livecd-tweaks`` now
+runs this collector before the display manager starts and publishes the
+answers as a versioned JSON snapshot. Readers take the snapshot in one read
+and fall back to the same detection functions when it is missing or from an
+older layout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import stat
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from atomic_file import write_atomically
+from block_inventory import load_inventory
+from integrity import detect_iso_mount
+from profile_manifest import live_profile, load_manifest
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_PATH = Path("/run/biglinux-live/facts.json")
+MAX_SNAPSHOT_BYTES = 64 * 1024
+CONTRAST_PROFILE = Path("/usr/share/color/icc/colord/ECI-RGBv1.icc")
+DEFAULT_PROFILE: dict[str, object] = {
+    "id": "biglinux",
+    "display_name": "BigLinux",
+    "directory": "/usr/share/biglinux/calamares-profiles/biglinux",
+}
+# The first entry point found wins, in this order.
+DESKTOP_ENTRY_POINTS = (
+    ("GNOME", Path("/usr/bin/startgnome-community")),
+    ("Cinnamon", Path("/usr/bin/startcinnamon-community")),
+    ("XFCE", Path("/usr/bin/startxfce-community")),
+)
+
+
+@dataclass(frozen=True)
+class LiveFacts:
+    desktop_environment: str
+    virtual_machine: bool
+    total_memory_kib: int
+    contrast_profile: bool
+    kernel_release: str
+    machine: str
+    iso_image_directory: str | None
+    profile: dict[str, object] = field(default_factory=dict)
+
+
+def detect_desktop_environment() -> str:
+    for name, entry_point in DESKTOP_ENTRY_POINTS:
+        if entry_point.exists():
+            return name
+    return "other"
+
+
+def detect_virtual_machine() -> bool:
+    try:
+        # systemd-detect-virt returns 0 if in a VM, 1 otherwise.
+        result = subprocess.run(
+            ["systemd-detect-virt"], capture_output=True, check=False
+        )
+    except FileNotFoundError:
+        # Assume not a VM for safety.
+        return False
+    return result.returncode == 0
+
+
+def read_total_memory_kib(path: Path = Path("/proc/meminfo")) -> int:
+    """Return MemTotal in KiB, or 0 when it cannot be read."""
+    try:
+        meminfo = path.read_text(encoding="utf-8")
+    except OSError:
+        return 0
+    match = re.search(r"MemTotal:\s+(\d+)\s+kB", meminfo)
+    return int(match.group(1)) if match else 0
+
+
+def detect_contrast_profile() -> bool:
+    return CONTRAST_PROFILE.exists()
+
+
+def resolve_live_profile() -> dict[str, object]:
+    """Read the selected profile's metadata, or the BigLinux defaults."""
+    # This used to fork resolve-profile; the manifest resolves in process.
+    # A hand-edited or truncated profile.json raises JSONDecodeError, a
+    # ValueError, and must fall back to the defaults, not abort the wizard.
+    try:
+        return live_profile(load_manifest())
+    except (OSError, ValueError):
+        return dict(DEFAULT_PROFILE)
+
+
+def detect_iso_image_directory() -> str | None:
+    try:
+        image_directory = detect_iso_mount()
+    except (OSError, RuntimeError):
+        return None
+    return str(image_directory) if image_directory else None
+
+
+def collect_facts() -> LiveFacts:
+    system = os.uname()
+    return LiveFacts(
+        desktop_environment=detect_desktop_environment(),
+        virtual_machine=detect_virtual_machine(),
+        total_memory_kib=read_total_memory_kib(),
+        contrast_profile=detect_contrast_profile(),
+        kernel_release=system.release,
+        machine=system.machine,
+        iso_image_directory=detect_iso_image_directory(),
+        profile=resolve_live_profile(),
+    )
+
+
+def write_snapshot(facts: LiveFacts, path: Path = SNAPSHOT_PATH) -> None:
+    payload = json.dumps(
+        {"version": SNAPSHOT_VERSION, **asdict(facts)}, separators=(",", ":")
+    ).encode("utf-8")
+    write_atomically(path, payload)
+
+
+def _facts_from_payload(payload: Any) -> LiveFacts | None:
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        return None
+    expected = {
+        "desktop_environment": str,
+        "virtual_machine": bool,
+        "total_memory_kib": int,
+        "contrast_profile": bool,
+        "kernel_release": str,
+        "machine": str,
+        "profile": dict,
+    }
+    for name, kind in expected.items():
+        value = payload.get(name)
+        # bool is an int, and a memory size of True is not one.
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            return None
+    image_directory = payload.get("iso_image_directory")
+    if image_directory is not None and not isinstance(image_directory, str):
+        return None
+    return LiveFacts(
+        desktop_environment=payload["desktop_environment"],
+        virtual_machine=payload["virtual_machine"],
+        total_memory_kib=payload["total_memory_kib"],
+        contrast_profile=payload["contrast_profile"],
+        kernel_release=payload["kernel_release"],
+        machine=payload["machine"],
+        iso_image_directory=image_directory,
+        profile=payload["profile"],
+    )
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> LiveFacts | None:
+    """Return this boot's facts, or ``None`` when they must be detected."""
+    descriptor = -1
+    try:
+        descriptor = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+        file_status = os.fstat(descriptor)
+        if (
+            not stat.S_ISREG(file_status.st_mode)
+            or file_status.st_mode & 0o022
+            or file_status.st_size > MAX_SNAPSHOT_BYTES
+        ):
+            return None
+        content = os.read(descriptor, MAX_SNAPSHOT_BYTES + 1)
+        if len(content) > MAX_SNAPSHOT_BYTES:
+            return None
+        payload = json.loads(content.decode("utf-8", "strict"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    finally:
+        if descriptor >= 0:
+            os.close(descriptor)
+    return _facts_from_payload(payload)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Publish the live machine facts the wizards read."
+    )
+    parser.add_argument("--output", type=Path, default=SNAPSHOT_PATH)
+    arguments = parser.parse_args(argv)
+    write_snapshot(collect_facts(), arguments.output)
+    # The storage probes read this instead of running lsblk; it is cached
+    # alongside the snapshot and kept until a block device changes.
+    try:
+        load_inventory()
+    except OSError:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""One versioned document for the choices the live wizard makes.
+
+Every choice used to be written as soon as it was made, each to its own
+``/tmp/big_*`` file with its own temporary file and rename, and ``startbiglive``
+then read the files back one by one. A wizard that stopped halfway left some
+of them behind, and a reader could see the new language next to the old
+desktop. The wizard now stages its choices and commits them together when
+the user confirms: the document is replaced in one rename, and only the
+legacy files whose value changed are exported again for the readers that
+still expect them, such as ``biglinux-install-setup.sh``.
+
+Shell scripts go through the command line: ``live_state.py set NAME=VALUE``
+commits, ``get NAME`` prints one value and ``shell`` prints assignments to
+the ``live_state`` associative array for ``load_live_state`` to evaluate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import stat
+import sys
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from atomic_file import write_atomically
+
+STATE_VERSION = 1
+STATE_DIRECTORY = Path("/tmp")
+DOCUMENT_NAME = "big_live_state.json"
+SHORT_VALUE_BYTES = 4096
+SETTINGS_VALUE_BYTES = 1024 * 1024
+MAX_DOCUMENT_BYTES = 2 * SETTINGS_VALUE_BYTES
+
+
+@dataclass(frozen=True)
+class StateKey:
+    legacy_name: str
+    max_bytes: int = SHORT_VALUE_BYTES
+
+
+# Keep in step with live_state_path in the live-state shell library.
+SCHEMA: dict[str, StateKey] = {
+    "language": StateKey("big_language"),
+    "keyboard": StateKey("big_keyboard"),
+    "desktop": StateKey("big_desktop_changed"),
+    "gnome-layout": StateKey("big_gnome_layout"),
+    "gnome-settings": StateKey("big_gnome_settings", SETTINGS_VALUE_BYTES),
+    "desktop-theme": StateKey("big_desktop_theme"),
+    "enable-jamesdsp": StateKey("big_enable_jamesdsp"),
+    "improve-display": StateKey("big_improve_display"),
+}
+
+StateChanges = Mapping[str, "str | None"]
+
+
+@dataclass(frozen=True)
+class CommitReport:
+    changed: int
+    exported: int
+    removed: int
+    duration: float
+
+
+def key_for_legacy_name(legacy_name: str) -> str | None:
+    for name, key in SCHEMA.items():
+        if key.legacy_name == legacy_name:
+            return name
+    return None
+
+
+def validate_value(name: str, value: object) -> str:
+    """Return ``value`` if ``name`` may hold it; raise ``ValueError`` if not."""
+    key = SCHEMA.get(name)
+    if key is None:
+        raise ValueError(f"unsupported live state name: {name}")
+    if not isinstance(value, str):
+        raise ValueError(f"live state {name} is not text")
+    if "\0" in value or len(value.encode("utf-8")) > key.max_bytes:
+        raise ValueError(f"live state {name} is not a valid value")
+    return value
+
+
+def _read_regular_file(path: Path, limit: int) -> str | None:
+    descriptor = -1
+    try:
+        descriptor = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+        file_status = os.fstat(descriptor)
+        if (
+            not stat.S_ISREG(file_status.st_mode)
+            or file_status.st_mode & 0o022
+            or file_status.st_size > limit
+        ):
+            return None
+        content = b""
+        while len(content) <= limit:
+            chunk = os.read(descriptor, limit + 1 - len(content))
+            if not chunk:
+                break
+            content += chunk
+        if len(content) > limit:
+            return None
+        return content.decode("utf-8", "strict")
+    except (OSError, UnicodeDecodeError):
+        return None
+    finally:
+        if descriptor >= 0:
+            os.close(descriptor)
+
+
+def _state_from_payload(payload: Any) -> dict[str, str] | None:
+    if not isinstance(payload, dict) or payload.get("version") != STATE_VERSION:
+        return None
+    values = payload.get("state")
+    if not isinstance(values, dict):
+        return None
+    try:
+        return {name: validate_value(name, value) for name, value in values.items()}
+    except ValueError:
+        return None
+
+
+def read_document(directory: Path = STATE_DIRECTORY) -> dict[str, str] | None:
+    """Return the committed state, or ``None`` when there is no valid one."""
+    text = _read_regular_file(directory / DOCUMENT_NAME, MAX_DOCUMENT_BYTES)
+    if text is None:
+        return None
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return _state_from_payload(payload)
+
+
+def read_legacy_files(directory: Path = STATE_DIRECTORY) -> dict[str, str]:
+    state: dict[str, str] = {}
+    for name, key in SCHEMA.items():
+        value = _read_regular_file(directory / key.legacy_name, key.max_bytes)
+        if value is not None and "\0" not in value:
+            state[name] = value
+    return state
+
+
+def read_state(directory: Path = STATE_DIRECTORY) -> dict[str, str]:
+    """The committed state; the legacy files until a document exists."""
+    state = read_document(directory)
+    return read_legacy_files(directory) if state is None else state
+
+
+def _replace_file(directory: Path, name: str, data: bytes) -> None:
+    write_atomically(directory / name, data, 0o600)
+
+
+def commit_state(
+    changes: StateChanges, directory: Path = STATE_DIRECTORY
+) -> CommitReport:
+    """Apply ``changes`` (``None`` removes a name) in one document rename."""
+    started = time.monotonic()
+    validated = {
+        name: None if value is None else validate_value(name, value)
+        for name, value in changes.items()
+    }
+    directory_status = os.lstat(directory)
+    if not stat.S_ISDIR(directory_status.st_mode):
+        raise OSError(f"live state directory is missing or unsafe: {directory}")
+    previous = read_state(directory)
+    state = dict(previous)
+    for name, value in validated.items():
+        if value is None:
+            state.pop(name, None)
+        else:
+            state[name] = value
+    payload = {"version": STATE_VERSION, "state": dict(sorted(state.items()))}
+    _replace_file(
+        directory,
+        DOCUMENT_NAME,
+        json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
+    exported = removed = 0
+    for name, value in validated.items():
+        legacy_name = SCHEMA[name].legacy_name
+        if value is None:
+            try:
+                os.unlink(directory / legacy_name)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        elif previous.get(name) != value:
+            _replace_file(directory, legacy_name, value.encode("utf-8"))
+            exported += 1
+    verified = os.lstat(directory)
+    if (verified.st_dev, verified.st_ino) != (
+        directory_status.st_dev,
+        directory_status.st_ino,
+    ):
+        raise OSError("live state directory changed while writing")
+    return CommitReport(len(validated), exported, removed, time.monotonic() - started)
+
+
+def shell_assignments(state: Mapping[str, str]) -> str:
+    """Lines that set ``live_state[NAME]`` for each value, safely quoted."""
+    return "".join(
+        f"live_state[{name}]={shlex.quote(value)}\n"
+        for name, value in sorted(state.items())
+        if name in SCHEMA
+    )
+
+
+def _parse_assignment(assignment: str) -> tuple[str, str]:
+    name, separator, value = assignment.partition("=")
+    if not separator:
+        raise ValueError(f"expected NAME=VALUE, got: {assignment}")
+    return name, value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Read or commit the live state.")
+    parser.add_argument("--directory", type=Path, default=STATE_DIRECTORY)
+    commands = parser.add_subparsers(dest="command", required=True)
+    set_command = commands.add_parser("set", help="commit values in one document")
+    set_command.add_argument("assignments", nargs="*", metavar="NAME=VALUE")
+    set_command.add_argument("--unset", action="append", default=[], metavar="NAME")
+    get_command = commands.add_parser("get", help="print one committed value")
+    get_command.add_argument("name")
+    commands.add_parser("shell", help="print assignments for load_live_state")
+    arguments = parser.parse_args(argv)
+
+    if arguments.command == "get":
+        value = read_state(arguments.directory).get(arguments.name)
+        if value is None:
+            return 1
+        sys.stdout.write(value)
+        return 0
+    if arguments.command == "shell":
+        sys.stdout.write(shell_assignments(read_state(arguments.directory)))
+        return 0
+    try:
+        changes: dict[str, str | None] = dict(
+            _parse_assignment(assignment) for assignment in arguments.assignments
+        )
+        changes.update(dict.fromkeys(arguments.unset))
+        commit_state(changes, arguments.directory)
+    except (OSError, ValueError) as error:
+        print(f"biglinux-livecd: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Resolve the live profile once per boot and cache the answer.
+
+Every reader used to resolve the profile on its own: the live wizard forked
+``resolve-profile``, ``calamares-biglinux`` forked it too and then started a
+Python interpreter only to read ``warn_old_release``, and the installer
+wizard read ``profile.json`` once more. This resolver applies the rules of
+``resolve-profile`` and writes the effective profile under
+``/run/biglinux-live`` twice: as JSON for Python readers, and as flat
+``key=value`` lines that the shell reads with no fork.
+
+Both caches list the files they were built from. A cache is stale unless it
+is newer than all of them, and when one has appeared or disappeared since. The
+shell can only compare modification times; a profile copied in with its old
+times kept still changes the time of the directory it lands in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import stat
+import sys
+from pathlib import Path
+from typing import Any
+
+from atomic_file import write_atomically
+
+MANIFEST_VERSION = 1
+JSON_PATH = Path("/run/biglinux-live/profile.json")
+ENV_PATH = Path("/run/biglinux-live/profile.env")
+MARKER = Path("/etc/biglinux-livecd/profile")
+CUSTOM_ROOT = Path("/etc/biglinux-livecd/calamares-profiles")
+BUILTIN_ROOT = Path("/usr/share/biglinux/calamares-profiles")
+ROOTS = (CUSTOM_ROOT, BUILTIN_ROOT)
+DEFAULT_PROFILE_ID = "biglinux"
+MAX_MANIFEST_BYTES = 64 * 1024
+_PROFILE_ID = re.compile(r"[a-z0-9][a-z0-9_-]{0,31}")
+# What the shell cache may hold without quoting: ids, paths and booleans.
+_SHELL_VALUE = re.compile(r"[A-Za-z0-9_./-]*")
+
+
+def read_profile_id(marker: Path = MARKER) -> str:
+    """The id in the root-owned marker, or the BigLinux default without one."""
+    try:
+        marker_status = os.lstat(marker)
+    except FileNotFoundError:
+        return DEFAULT_PROFILE_ID
+    # resolve-profile accepts the modes 400 to 744 with no group or other
+    # write or execute bits, and nothing special.
+    if (
+        not stat.S_ISREG(marker_status.st_mode)
+        or marker_status.st_uid != 0
+        or not marker_status.st_mode & 0o400
+        or stat.S_IMODE(marker_status.st_mode) & 0o7033
+    ):
+        raise ValueError(f"unsafe profile marker: {marker}")
+    with open(marker, encoding="utf-8") as marker_file:
+        profile_id = marker_file.readline().rstrip("\n")
+    if not _PROFILE_ID.fullmatch(profile_id):
+        raise ValueError(f"invalid live profile id: {profile_id}")
+    return profile_id
+
+
+def find_profile_directory(profile_id: str, roots: tuple[Path, ...] = ROOTS) -> Path:
+    """The first installed profile with that id; custom profiles come first."""
+    for root in roots:
+        if not root.is_dir() or root.is_symlink():
+            continue
+        candidate = root / profile_id
+        if (
+            candidate.is_dir()
+            and not candidate.is_symlink()
+            and (candidate / "settings.conf").is_file()
+            and (candidate / "profile.json").is_file()
+            and (candidate / "modules").is_dir()
+            and (candidate / "branding").is_dir()
+        ):
+            return candidate
+    raise ValueError(f"live profile is not installed: {profile_id}")
+
+
+def manifest_inputs(
+    profile_id: str, marker: Path = MARKER, roots: tuple[Path, ...] = ROOTS
+) -> list[Path]:
+    """Every path whose change can change what the profile resolves to."""
+    inputs = [marker]
+    for root in roots:
+        inputs += [root, root / profile_id, root / profile_id / "profile.json"]
+    return inputs
+
+
+def build_manifest(
+    marker: Path = MARKER, roots: tuple[Path, ...] = ROOTS
+) -> dict[str, Any]:
+    profile_id = read_profile_id(marker)
+    directory = find_profile_directory(profile_id, roots)
+    with open(directory / "profile.json", encoding="utf-8") as profile_file:
+        metadata = json.load(profile_file)
+    if not isinstance(metadata, dict):
+        raise ValueError("profile metadata is not an object")
+    # The launcher refused to start on a non-boolean here, and still does.
+    if not isinstance(metadata.get("warn_old_release", True), bool):
+        raise ValueError("warn_old_release is not a boolean")
+    inputs = manifest_inputs(profile_id, marker, roots)
+    return {
+        "version": MANIFEST_VERSION,
+        "id": profile_id,
+        "directory": str(directory),
+        "metadata": metadata,
+        "inputs": [str(path) for path in inputs if os.path.lexists(path)],
+        "absent": [str(path) for path in inputs if not os.path.lexists(path)],
+    }
+
+
+def live_profile(manifest: dict[str, Any]) -> dict[str, object]:
+    """The profile as the wizards know it: its metadata plus its directory."""
+    return {**manifest["metadata"], "directory": manifest["directory"]}
+
+
+def format_env(manifest: dict[str, Any]) -> str:
+    metadata = manifest["metadata"]
+    fields = {
+        "version": [str(manifest["version"])],
+        "profile_id": [manifest["id"]],
+        "profile_directory": [manifest["directory"]],
+        "profile_warn_old_release": [
+            str(metadata.get("warn_old_release", True)).lower()
+        ],
+        "profile_inputs": manifest["inputs"],
+        "profile_absent": manifest["absent"],
+    }
+    for key, values in fields.items():
+        for value in values:
+            if not _SHELL_VALUE.fullmatch(value):
+                raise ValueError(f"{key} cannot be cached for the shell: {value!r}")
+    # The path lists are colon-separated, which the values above cannot hold.
+    return "".join(f"{key}={':'.join(values)}\n" for key, values in fields.items())
+
+
+def write_manifest(
+    manifest: dict[str, Any], json_path: Path = JSON_PATH, env_path: Path = ENV_PATH
+) -> None:
+    write_atomically(json_path, json.dumps(manifest, separators=(",", ":")).encode())
+    write_atomically(env_path, format_env(manifest).encode())
+
+
+def is_fresh(manifest: dict[str, Any], cache_time_ns: int) -> bool:
+    try:
+        for name in manifest["inputs"]:
+            input_status = os.lstat(name)
+            # File times tick coarsely: a change in the cache's own tick counts.
+            if max(input_status.st_mtime_ns, input_status.st_ctime_ns) >= cache_time_ns:
+                return False
+    except OSError:
+        return False
+    return not any(os.path.lexists(name) for name in manifest["absent"])
+
+
+def _valid_manifest(payload: Any) -> bool:
+    if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+        return False
+    return (
+        isinstance(payload.get("id"), str)
+        and isinstance(payload.get("directory"), str)
+        and isinstance(payload.get("metadata"), dict)
+        and all(
+            isinstance(payload.get(key), list)
+            and all(isinstance(name, str) for name in payload[key])
+            for key in ("inputs", "absent")
+        )
+    )
+
+
+def read_manifest(json_path: Path = JSON_PATH) -> dict[str, Any] | None:
+    """This boot's cached manifest, or ``None`` when it must be rebuilt."""
+    descriptor = -1
+    try:
+        descriptor = os.open(json_path, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+        file_status = os.fstat(descriptor)
+        if (
+            not stat.S_ISREG(file_status.st_mode)
+            or file_status.st_mode & 0o022
+            or file_status.st_size > MAX_MANIFEST_BYTES
+        ):
+            return None
+        content = os.read(descriptor, MAX_MANIFEST_BYTES + 1)
+        if len(content) > MAX_MANIFEST_BYTES:
+            return None
+        payload = json.loads(content.decode("utf-8", "strict"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    finally:
+        if descriptor >= 0:
+            os.close(descriptor)
+    if not _valid_manifest(payload) or not is_fresh(payload, file_status.st_mtime_ns):
+        return None
+    return payload
+
+
+def load_manifest(
+    json_path: Path = JSON_PATH,
+    env_path: Path = ENV_PATH,
+    marker: Path = MARKER,
+    roots: tuple[Path, ...] = ROOTS,
+) -> dict[str, Any]:
+    """The cached manifest, rebuilt in process when stale.
+
+    The rebuilt manifest is cached again when this process may write there;
+    the live user's wizards may not, and use it uncached. Raises ``OSError``
+    or ``ValueError`` when the profile cannot be resolved at all.
+    """
+    manifest = read_manifest(json_path)
+    if manifest is not None:
+        return manifest
+    manifest = build_manifest(marker, roots)
+    try:
+        write_manifest(manifest, json_path, env_path)
+    except (OSError, ValueError):
+        pass
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Cache the live profile for the launchers and wizards."
+    )
+    parser.add_argument("--json", type=Path, default=JSON_PATH)
+    parser.add_argument("--env", type=Path, default=ENV_PATH)
+    parser.add_argument("--marker", type=Path, default=MARKER)
+    parser.add_argument(
+        "--root",
+        dest="roots",
+        type=Path,
+        action="append",
+        help="profile directory to search, first match wins (repeatable)",
+    )
+    arguments = parser.parse_args(argv)
+    roots = tuple(arguments.roots) if arguments.roots else ROOTS
+    try:
+        manifest = build_manifest(arguments.marker, roots)
+        write_manifest(manifest, arguments.json, arguments.env)
+    except (OSError, ValueError) as error:
+        print(f"biglinux-livecd: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -23,6 +23,7 @@ from .file_operations import (
     write_text_file,
 )
 from .i18n import _
+from .pacman_db import LocalDatabase, LocalPackage
 from .subprocesses import get_command_output, pacman_query_installed
 
 __all__ = [
@@ -47,4 +48,6 @@ __all__ = [
     "validate_package_name",
     "get_command_output",
     "pacman_query_installed",
+    "LocalDatabase",
+    "LocalPackage",
 ]
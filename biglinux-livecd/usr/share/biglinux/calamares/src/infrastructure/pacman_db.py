@@ -0,0 +1,160 @@
+"""Read the pacman local database without running pacman.
+
+The installer used to fork ``pacman -Qq`` at startup only for the names, and
+the minimal installation page would have needed more forks for sizes and
+dependencies. Every installed package already has a ``desc`` file below
+``/var/lib/pacman/local`` with all of that, so the database is read once,
+on a background thread, into indexes by name, provided name and group.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PACMAN_LOCAL_DB = Path("/var/lib/pacman/local")
+# %REASON% is 1 for packages pulled in as a dependency, 0 (or absent) otherwise.
+REASON_DEPENDENCY = 1
+_SECTIONS = {"NAME", "VERSION", "SIZE", "REASON", "GROUPS", "DEPENDS", "PROVIDES"}
+_CONSTRAINT = re.compile(r"[<>=:].*$")
+
+
+@dataclass(frozen=True, slots=True)
+class LocalPackage:
+    name: str
+    version: str
+    installed_size: int
+    reason: int
+    depends: tuple[str, ...]
+    groups: tuple[str, ...]
+    provides: tuple[str, ...]
+
+
+def dependency_name(specification: str) -> str:
+    """``libfoo>=2`` and ``libfoo.so=1-64`` name ``libfoo`` and ``libfoo.so``."""
+    return _CONSTRAINT.sub("", specification.strip())
+
+
+def parse_desc(text: str) -> LocalPackage | None:
+    sections: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for line in text.splitlines():
+        if line.startswith("%") and line.endswith("%") and len(line) > 2:
+            section = line[1:-1]
+            current = sections.setdefault(section, []) if section in _SECTIONS else None
+        elif line and current is not None:
+            current.append(line)
+    name = sections.get("NAME")
+    version = sections.get("VERSION")
+    if not name or not version:
+        return None
+    try:
+        installed_size = int(sections.get("SIZE", ["0"])[0])
+        reason = int(sections.get("REASON", ["0"])[0])
+    except ValueError:
+        return None
+    return LocalPackage(
+        name=name[0],
+        version=version[0],
+        installed_size=installed_size,
+        reason=reason,
+        depends=tuple(sections.get("DEPENDS", ())),
+        groups=tuple(sections.get("GROUPS", ())),
+        provides=tuple(sections.get("PROVIDES", ())),
+    )
+
+
+class LocalDatabase:
+    """Installed packages, indexed by name, provided name, group and dependent."""
+
+    def __init__(self, packages: Iterable[LocalPackage] = ()) -> None:
+        self.packages: dict[str, LocalPackage] = {}
+        self._providers: dict[str, list[str]] = {}
+        self._groups: dict[str, list[str]] = {}
+        for package in packages:
+            self.packages[package.name] = package
+            for provided in package.provides:
+                self._providers.setdefault(dependency_name(provided), []).append(
+                    package.name
+                )
+            for group in package.groups:
+                self._groups.setdefault(group, []).append(package.name)
+        self._required_by: dict[str, set[str]] = {}
+        for package in self.packages.values():
+            for specification in package.depends:
+                for provider in self.resolve(specification):
+                    self._required_by.setdefault(provider, set()).add(package.name)
+
+    @classmethod
+    def load(cls, directory: Path = PACMAN_LOCAL_DB) -> LocalDatabase:
+        """Every readable ``desc`` below ``directory``; unreadable ones are skipped."""
+        packages = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    with open(
+                        os.path.join(entry.path, "desc"), encoding="utf-8"
+                    ) as source:
+                        package = parse_desc(source.read())
+                except (OSError, UnicodeDecodeError) as error:
+                    logger.debug("Skipping %s: %s", entry.name, error)
+                    continue
+                if package is not None:
+                    packages.append(package)
+        return cls(packages)
+
+    def __len__(self) -> int:
+        return len(self.packages)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.packages
+
+    def names(self) -> set[str]:
+        return set(self.packages)
+
+    def get(self, name: str) -> LocalPackage | None:
+        return self.packages.get(name)
+
+    def group(self, group: str) -> list[str]:
+        return list(self._groups.get(group, ()))
+
+    def resolve(self, specification: str) -> list[str]:
+        """Installed packages satisfying a dependency, by name or provides."""
+        name = dependency_name(specification)
+        if name in self.packages:
+            return [name]
+        return list(self._providers.get(name, ()))
+
+    def required_by(self, name: str) -> set[str]:
+        return set(self._required_by.get(name, ()))
+
+    def removal_set(self, names: Iterable[str]) -> set[str]:
+        """What ``pacman -Rs`` takes away: the packages and their unneeded deps."""
+        removed = {name for name in names if name in self.packages}
+        pending = list(removed)
+        while pending:
+            package = self.packages[pending.pop()]
+            for specification in package.depends:
+                for candidate in self.resolve(specification):
+                    if (
+                        candidate not in removed
+                        and self.packages[candidate].reason == REASON_DEPENDENCY
+                        and self._required_by.get(candidate, set()) <= removed
+                    ):
+                        removed.add(candidate)
+                        pending.append(candidate)
+        return removed
+
+    def removal_size(self, names: Iterable[str]) -> int:
+        """Installed bytes freed by removing ``names`` with ``pacman -Rs``."""
+        return sum(
+            self.packages[name].installed_size for name in self.removal_set(names)
+        )
@@ -136,29 +136,14 @@ class MainPage(Gtk.Box):
         system_info_box.set_margin_start(12)
         system_info_box.set_margin_end(12)
 
-        plain_info = self.system_service.get_system_summary()
-        # Emphasize the detected values inside the already translated sentence.
-        markup = GLib.markup_escape_text(plain_info)
-        for value in (
-            self.system_service.get_boot_mode(),
-            self.system_service.get_kernel_version(),
-            self.system_service.get_session_type(),
-        ):
-            if value:
-                markup = markup.replace(
-                    GLib.markup_escape_text(value),
-                    f"<b>{GLib.markup_escape_text(value)}</b>",
-                )
-
-        info_label = Gtk.Label(
+        # Filled in by show_system_info once the system detection finishes.
+        self.info_label = Gtk.Label(
             use_markup=True,
-            label=markup,
             wrap=True,
             justify=Gtk.Justification.CENTER,
             halign=Gtk.Align.CENTER,
         )
-        set_label(info_label, plain_info)
-        system_info_box.append(info_label)
+        system_info_box.append(self.info_label)
 
         # Keep the URL out of translations and escape translated markup.
         forum_text = _(
@@ -240,6 +225,24 @@ class MainPage(Gtk.Box):
         system_info_widget = self._create_system_info_bar()
         system_info_container.append(system_info_widget)
 
+    def show_system_info(self):
+        """Show the detected boot mode, kernel and session."""
+        plain_info = self.system_service.get_system_summary()
+        # Emphasize the detected values inside the already translated sentence.
+        markup = GLib.markup_escape_text(plain_info)
+        for value in (
+            self.system_service.get_boot_mode(),
+            self.system_service.get_kernel_version(),
+            self.system_service.get_session_type(),
+        ):
+            if value:
+                markup = markup.replace(
+                    GLib.markup_escape_text(value),
+                    f"<b>{GLib.markup_escape_text(value)}</b>",
+                )
+        self.info_label.set_markup(markup)
+        set_label(self.info_label, plain_info)
+
     def on_maintenance_clicked(self, button):
         self.logger.info("Maintenance option selected")
         self.emit("navigate", "maintenance", None)
@@ -38,6 +38,7 @@ class MinimalPage(Gtk.Box):
         self.loading_box: Gtk.Box
         self.loading_spinner: Gtk.Spinner
         self.loading_status_label: Gtk.Label
+        self.savings_label: Gtk.Label
         self.packages_listbox: Gtk.ListBox
         self.add_css_class("minimal-page")
         self.create_content()
@@ -78,6 +79,12 @@ class MinimalPage(Gtk.Box):
         self.loading_box.append(status_label)
         content_box.append(self.loading_box)
 
+        self.savings_label = Gtk.Label(
+            visible=False, halign=Gtk.Align.CENTER, wrap=True, margin_top=12
+        )
+        self.savings_label.add_css_class("dim-label")
+        content_box.append(self.savings_label)
+
         self.packages_listbox = Gtk.ListBox(
             selection_mode=Gtk.SelectionMode.NONE, visible=False
         )
@@ -124,6 +131,7 @@ class MinimalPage(Gtk.Box):
             row = self._create_package_row(package)
             self.packages_listbox.append(row)
             self.package_rows[package.name] = row
+        self._update_savings()
 
         # Announce loaded count to screen readers
         count_msg = _("{count} packages loaded").format(count=len(packages))
@@ -131,7 +139,11 @@ class MinimalPage(Gtk.Box):
 
     def _create_package_row(self, package: Package) -> Adw.ActionRow:
         """Factory function to create a package row."""
-        row = Adw.ActionRow(title=package.name, title_lines=1, subtitle="")
+        # What removing this one frees, with the dependencies only it needs.
+        subtitle = ""
+        if package.installed_size:
+            subtitle = GLib.format_size(package.installed_size)
+        row = Adw.ActionRow(title=package.name, title_lines=1, subtitle=subtitle)
         row.add_css_class("package-row")
 
         icon_image = Gtk.Image()
@@ -167,6 +179,21 @@ class MinimalPage(Gtk.Box):
         row = self.package_rows.get(package.name)
         if row:
             self._update_row_style(row, to_keep)
+        self._update_savings()
+
+    def _update_savings(self):
+        """Show the disk space the packages switched off will free."""
+        removed = [package.name for package in self.packages if not package.selected]
+        # Dependencies shared by several removed programs count once.
+        size = self.package_service.removal_size(removed)
+        if size:
+            text = _("Removing the selected programs frees {size}").format(
+                size=GLib.format_size(size)
+            )
+        else:
+            text = _("No programs will be removed")
+        self.savings_label.set_label(text)
+        self.savings_label.set_visible(bool(self.packages))
 
     def _update_row_style(self, row: Adw.ActionRow, to_keep: bool):
         """Update visual state. Dim items that will be REMOVED (switch is OFF)."""
@@ -201,6 +228,7 @@ class MinimalPage(Gtk.Box):
             if isinstance(switch, Gtk.Switch) and switch.get_active() != selected:
                 switch.set_active(selected)
             self._update_row_style(row, selected)
+        self._update_savings()
 
     def do_continue_action(self, button):
         """This method is called by the main window's continue button."""
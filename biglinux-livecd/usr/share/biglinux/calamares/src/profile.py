@@ -4,19 +4,39 @@ from __future__ import annotations
 
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Any
 
+_installed_library = Path("/usr/lib/biglinux-livecd")
+_development_library = Path(__file__).resolve().parents[4] / "lib/biglinux-livecd"
+sys.path.insert(
+    0, str(_installed_library if _installed_library.is_dir() else _development_library)
+)
+from profile_manifest import read_manifest  # noqa: E402
+
+
+def _cached_metadata(profile_id: str | None) -> dict[str, Any] | None:
+    """The metadata the launcher resolved, when it is for this profile."""
+    if not profile_id:
+        return None
+    manifest = read_manifest()
+    if manifest is None or manifest["id"] != profile_id:
+        return None
+    return manifest["metadata"]
+
 
 def load_profile() -> dict[str, Any]:
     profile_directory = Path(
         os.environ.get("CALAMARES_PROFILE_DIRECTORY", "/etc/calamares")
     )
-    profile_file = profile_directory / "profile.json"
-    try:
-        data = json.loads(profile_file.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        data = {}
+    data = _cached_metadata(os.environ.get("CALAMARES_PROFILE_ID"))
+    if data is None:
+        profile_file = profile_directory / "profile.json"
+        try:
+            data = json.loads(profile_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
     if not isinstance(data, dict):
         data = {}
 
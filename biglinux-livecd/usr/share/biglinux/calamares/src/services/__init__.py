@@ -2,6 +2,7 @@
 
 from .install_service import InstallService
 from .package_service import PackageService
+from .startup import ServiceStartup
 from .system_service import SystemService
 
-__all__ = ["SystemService", "PackageService", "InstallService"]
+__all__ = ["SystemService", "PackageService", "InstallService", "ServiceStartup"]
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import re
 import subprocess
+import threading
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -48,6 +49,7 @@ class InstallService:
         self.system_service = system_service
         self._current_config = InstallationConfig()
         self._is_initialized = False
+        self._ready = threading.Event()
 
     def initialize(self) -> None:
         if self._is_initialized:
@@ -55,6 +57,13 @@ class InstallService:
         ensure_directory(CALAMARES_CONFIG_DIR)
         ensure_directory(CALAMARES_MODULES_DIR)
         self._is_initialized = True
+        self._ready.set()
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """Wait for this service and the system detection it reads."""
+        return self._ready.wait(timeout) and self.system_service.wait_until_ready(
+            timeout
+        )
 
     def cleanup(self) -> None:
         try:
@@ -64,6 +73,7 @@ class InstallService:
                 "Could not remove %s: %s", TEMP_FILES["wait_install"], error
             )
         self._is_initialized = False
+        self._ready.clear()
 
     def configure_installation(self, config: InstallationConfig) -> bool:
         self.logger.info("Configuring installation with: %s", config.to_dict())
@@ -201,6 +211,7 @@ pacman:
         return True
 
     def check_installation_requirements(self) -> dict[str, bool]:
+        self.wait_until_ready()
         return {
             "config_dir": CALAMARES_CONFIG_DIR.is_dir(),
             "modules_dir": CALAMARES_MODULES_DIR.is_dir(),
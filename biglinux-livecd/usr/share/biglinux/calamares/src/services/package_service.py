@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
 
 from ..infrastructure import (
     ICON_MAPPING_FILE,
     MINIMAL_PACKAGES_FILE,
     TEMP_FILES,
+    LocalDatabase,
     load_json_file,
     pacman_query_installed,
     validate_package_name,
@@ -21,6 +23,7 @@ class Package:
     name: str
     icon: str
     selected: bool = True
+    installed_size: int = 0
 
 
 class PackageService:
@@ -31,6 +34,8 @@ class PackageService:
         self._icon_mapping: dict[str, str] = {}
         self._minimal_packages: list[str] = []
         self._installed_packages: set[str] = set()
+        self._database = LocalDatabase()
+        self._database_ready = threading.Event()
 
     def initialize(self) -> None:
         icon_mapping = load_json_file(ICON_MAPPING_FILE)
@@ -47,27 +52,56 @@ class PackageService:
                 package for package in package_data if isinstance(package, str)
             ]
 
-        self._installed_packages = set(pacman_query_installed())
-        # This runs from the window constructor. Writing straight to the file
-        # raised FileNotFoundError whenever the tmpfiles.d unit that creates
-        # /run/biglinux-live had not run yet, and the installer window then
-        # never appeared at all. write_text_file creates the directory and
-        # reports failure instead.
-        write_text_file(
-            "\n".join(sorted(self._installed_packages)),
-            TEMP_FILES["installed_packages"],
-        )
+        # The window constructor used to wait here for a pacman -Qq fork; the
+        # local database is now read next to it and waited for only by the
+        # minimal installation page.
+        self._database_ready.clear()
+        threading.Thread(
+            target=self._load_database, name="pacman-local-db", daemon=True
+        ).start()
+
+    def _load_database(self) -> None:
+        database = LocalDatabase()
+        try:
+            database = LocalDatabase.load()
+        except OSError as error:
+            self.logger.warning("Could not read the pacman local database: %s", error)
+        finally:
+            installed = database.names() or set(pacman_query_installed())
+            self._database = database
+            self._installed_packages = installed
+            # Writing straight to the file raised FileNotFoundError whenever
+            # the tmpfiles.d unit that creates /run/biglinux-live had not run
+            # yet, and the installer window then never appeared at all.
+            # write_text_file creates the directory and reports failure instead.
+            write_text_file(
+                "\n".join(sorted(installed)), TEMP_FILES["installed_packages"]
+            )
+            # The minimal page waits for this; it must never wait forever.
+            self._database_ready.set()
+
+    def wait_until_loaded(self, timeout: float | None = None) -> bool:
+        return self._database_ready.wait(timeout)
+
+    def removal_size(self, names: list[str]) -> int:
+        """Disk space freed by removing ``names`` and the dependencies they orphan."""
+        if not self._database_ready.is_set():
+            return 0
+        return self._database.removal_size(names)
 
     def cleanup(self) -> None:
         self._icon_mapping.clear()
         self._minimal_packages.clear()
         self._installed_packages.clear()
+        self._database = LocalDatabase()
 
     def get_minimal_packages(self) -> list[Package]:
+        self.wait_until_loaded()
         packages = [
             Package(
                 name=name,
                 icon=self._icon_mapping.get(name, name),
+                installed_size=self.removal_size([name]),
             )
             for name in self._minimal_packages
             if validate_package_name(name) and name in self._installed_packages
@@ -79,6 +113,7 @@ class PackageService:
         return packages
 
     def get_packages_for_removal(self, selected_packages: list[str]) -> list[str]:
+        self.wait_until_loaded()
         packages = [
             name
             for name in selected_packages
@@ -0,0 +1,76 @@
+"""Initialize the installer services in the background and time them.
+
+The window used to initialize every service and build every page before it
+appeared, so the user waited for the ``uname`` and ``hostname`` forks, the
+ISO mount detection and the package list. Services now start on futures
+while the first page is shown; the services wait for their own setup where
+it matters, and the window builds the other pages when they are first
+opened.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from contextlib import contextmanager
+
+Dispatcher = Callable[[Callable[[], None]], None]
+
+
+class ServiceStartup:
+    """Run service initializers on worker threads, recording how long each took."""
+
+    def __init__(self, dispatch: Dispatcher, *, workers: int = 3) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.timings: dict[str, float] = {}
+        self._dispatch = dispatch
+        self._futures: dict[str, Future[None]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="installer-startup"
+        )
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[name] = elapsed
+            self.logger.info("%s took %.1f ms", name, elapsed * 1000)
+
+    def start(self, name: str, initialize: Callable[[], None]) -> Future[None]:
+        def run() -> None:
+            with self.timed(f"service {name}"):
+                initialize()
+
+        future = self._executor.submit(run)
+        future.add_done_callback(lambda done: self._log_failure(name, done))
+        self._futures[name] = future
+        return future
+
+    def _log_failure(self, name: str, future: Future[None]) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(
+                "The %s service failed to initialize: %s", name, future.exception()
+            )
+
+    def wait(self, *names: str, timeout: float | None = None) -> bool:
+        """Block until the named services are set up; failures count as done."""
+        futures = [self._futures[name] for name in names if name in self._futures]
+        _done, not_done = wait_futures(futures, timeout=timeout)
+        return not not_done
+
+    def when_ready(self, name: str, callback: Callable[[], None]) -> None:
+        """Call ``callback`` on the main loop once the service is set up."""
+        future = self._futures.get(name)
+        if future is None:
+            self._dispatch(callback)
+            return
+        future.add_done_callback(lambda _done: self._dispatch(callback))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
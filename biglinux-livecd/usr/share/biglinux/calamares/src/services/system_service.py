@@ -9,6 +9,7 @@ import logging
 import os
 import shutil
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -20,6 +21,7 @@ sys.path.insert(
     0, str(_installed_library if _installed_library.is_dir() else _development_library)
 )
 from integrity import detect_iso_mount  # noqa: E402
+from live_facts import load_snapshot  # noqa: E402
 
 
 class SystemService:
@@ -29,6 +31,7 @@ class SystemService:
         self.logger = logging.getLogger(__name__)
         self._system_info = {}
         self._is_initialized = False
+        self._ready = threading.Event()
 
     def initialize(self):
         """Initialize the system service"""
@@ -36,15 +39,24 @@ class SystemService:
             return
 
         self.logger.info("Initializing SystemService")
-        self._detect_system_info()
-        self._is_initialized = True
+        try:
+            self._detect_system_info()
+        finally:
+            # Detection runs off the main thread; callers wait for it here.
+            self._is_initialized = True
+            self._ready.set()
         self.logger.info("SystemService initialized successfully")
 
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for initialize(), which the window runs in the background."""
+        return self._ready.wait(timeout)
+
     def cleanup(self):
         """Cleanup system service resources"""
         self.logger.info("Cleaning up SystemService")
         self._system_info.clear()
         self._is_initialized = False
+        self._ready.clear()
 
     def _is_efi_available(self) -> bool:
         """Directly check if the system has an EFI directory."""
@@ -63,21 +75,35 @@ class SystemService:
 
         self._system_info = {
             "boot_mode": "UEFI" if is_efi else "BIOS (Legacy)",
-            "kernel_version": self._detect_kernel_version(),
             "session_type": self._detect_session_type(),
-            "architecture": self._detect_architecture(),
             "hostname": self._detect_hostname(),
             "live_mode": self._detect_live_mode(),
             "efi_available": is_efi,
-            "sfs_folder": self._detect_sfs_folder(),
         }
+        # livecd-tweaks publishes the boot-time facts; detect them otherwise.
+        facts = load_snapshot()
+        if facts is not None:
+            image_directory = facts.iso_image_directory
+            self._system_info.update(
+                kernel_version=facts.kernel_release.split("-")[0] or "Unknown",
+                architecture=facts.machine or "Unknown",
+                sfs_folder=(
+                    Path(image_directory).parent.name if image_directory else None
+                ),
+            )
+        else:
+            self._system_info.update(
+                kernel_version=self._detect_kernel_version(),
+                architecture=self._detect_architecture(),
+                sfs_folder=self._detect_sfs_folder(),
+            )
 
         self.logger.info(f"System detected: {self._system_info}")
 
     def _detect_kernel_version(self) -> str:
         """Detect kernel version"""
         try:
-            full_version = get_command_output(["uname", "-r"])
+            full_version = os.uname().release
             return full_version.split("-")[0] if full_version else "Unknown"
         except Exception as e:
             self.logger.warning(f"Failed to detect kernel version: {e}")
@@ -99,7 +125,7 @@ class SystemService:
     def _detect_architecture(self) -> str:
         """Detect system architecture"""
         try:
-            return get_command_output(["uname", "-m"]) or "Unknown"
+            return os.uname().machine or "Unknown"
         except Exception as e:
             self.logger.warning(f"Failed to detect architecture: {e}")
             return "Unknown"
@@ -6,13 +6,14 @@ Manages navigation between different pages using Gtk.Stack
 """
 
 import logging
+import time
 
 import gi
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Adw, Gdk, Gtk
+from gi.repository import Adw, Gdk, GLib, Gtk
 
 from .infrastructure.accessibility import (
     announce,
@@ -24,7 +25,19 @@ from .infrastructure.constants import DEFAULTS
 from .infrastructure.i18n import _
 from .pages import MainPage, MaintenancePage, MinimalPage, TipsPage
 from .profile import load_profile
-from .services import InstallService, PackageService, SystemService
+from .services import InstallService, PackageService, ServiceStartup, SystemService
+
+# Services a page reads while it is built or configures the installation from.
+# The main page waits through check_installation_requirements instead.
+PAGE_SERVICES = {"maintenance": ("system",), "minimal": ("system", "install")}
+
+
+def _on_main_loop(callback):
+    def run():
+        callback()
+        return GLib.SOURCE_REMOVE
+
+    GLib.idle_add(run)
 
 
 class CalamaresWindow(Adw.ApplicationWindow):
@@ -32,14 +45,17 @@ class CalamaresWindow(Adw.ApplicationWindow):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        started = time.perf_counter()
 
         self.logger = logging.getLogger(__name__)
         self.system_service = SystemService()
         self.package_service = PackageService()
         self.install_service = InstallService(self.system_service)
-        self.system_service.initialize()
-        self.package_service.initialize()
-        self.install_service.initialize()
+        # Set up in the background; pages and services wait where they must.
+        self.startup = ServiceStartup(_on_main_loop)
+        self.startup.start("system", self.system_service.initialize)
+        self.startup.start("package", self.package_service.initialize)
+        self.startup.start("install", self.install_service.initialize)
         self.continue_signal_handler = None
         self.check_all_handler = None
         self.uncheck_all_handler = None
@@ -52,13 +68,18 @@ class CalamaresWindow(Adw.ApplicationWindow):
         self.create_layout()
         self.create_pages()
         self.setup_navigation()
+        self.startup.when_ready("system", self._on_system_ready)
 
         # KeyboardEventController for Super+Alt+S to start ORCA
         key_controller = Gtk.EventControllerKey.new()
         key_controller.connect("key-pressed", self._on_key_press_event)
         self.add_controller(key_controller)
 
-        self.logger.info("Main window initialized")
+        self.startup.timings["window"] = time.perf_counter() - started
+        self.logger.info(
+            "Main window initialized in %.1f ms",
+            self.startup.timings["window"] * 1000,
+        )
 
     def _on_key_press_event(self, controller, keyval, keycode, state):
         """Handle global key events — Super+Alt+S starts ORCA screen reader."""
@@ -159,17 +180,36 @@ class CalamaresWindow(Adw.ApplicationWindow):
         set_description(self.continue_button, _("Proceed to the next step"))
 
     def create_pages(self):
-        """Create and add all pages to the stack."""
-        self.pages = {
-            "main": MainPage(self.system_service, self.install_service),
-            "maintenance": MaintenancePage(self.system_service, self.install_service),
-            "minimal": MinimalPage(self.package_service, self.install_service),
-            "tips": TipsPage(),
+        """Register the pages; each is built the first time it is shown."""
+        self.pages = {}
+        self.page_factories = {
+            "main": lambda: MainPage(self.system_service, self.install_service),
+            "maintenance": lambda: MaintenancePage(
+                self.system_service, self.install_service
+            ),
+            "minimal": lambda: MinimalPage(self.package_service, self.install_service),
+            "tips": TipsPage,
         }
 
-        for name, page in self.pages.items():
-            page.connect("navigate", self.on_navigate_requested)
-            self.stack.add_named(page, name)
+    def ensure_page(self, page_name):
+        page = self.pages.get(page_name)
+        if page is not None:
+            return page
+        factory = self.page_factories.get(page_name)
+        if factory is None:
+            return None
+        self.startup.wait(*PAGE_SERVICES.get(page_name, ()))
+        with self.startup.timed(f"page {page_name}"):
+            page = factory()
+        page.connect("navigate", self.on_navigate_requested)
+        self.stack.add_named(page, page_name)
+        self.pages[page_name] = page
+        return page
+
+    def _on_system_ready(self):
+        main_page = self.pages.get("main")
+        if main_page is not None:
+            main_page.show_system_info()
 
     def setup_navigation(self):
         self.navigate_to("main")
@@ -182,7 +222,7 @@ class CalamaresWindow(Adw.ApplicationWindow):
             self.navigate_to(page_name, data)
 
     def navigate_to(self, page_name, data=None):
-        if page_name not in self.pages:
+        if self.ensure_page(page_name) is None:
             self.logger.error(f"Page '{page_name}' not found")
             return
         self.stack.set_visible_child_name(page_name)
@@ -316,6 +356,7 @@ class CalamaresWindow(Adw.ApplicationWindow):
         for page in self.pages.values():
             if hasattr(page, "cleanup"):
                 page.cleanup()
+        self.startup.shutdown()
         self.install_service.cleanup()
         self.package_service.cleanup()
         self.system_service.cleanup()
@@ -1,6 +1,8 @@
 """Accessibility utilities — speech via Kokoro TTS (koko CLI)."""
 
+import atexit
 import os
+import shutil
 import subprocess
 import tempfile
 import threading
@@ -8,8 +10,10 @@ import threading
 import gi
 
 gi.require_version("Gtk", "4.0")
+from audio_sink import get_audio_sink
 from gi.repository import Gtk
 from logging_config import get_logger
+from phrase_cache import PhraseCache, PhraseKey, default_spill_directory
 
 logger = get_logger()
 
@@ -19,17 +23,20 @@ _HAS_ANNOUNCE = hasattr(Gtk.Accessible, "announce")
 _KOKO_BIN = "/usr/bin/koko"
 _KOKO_MODEL = "/usr/share/biglinux-kokoro-tts/model/model.onnx"
 _KOKO_VOICES = "/usr/share/biglinux-kokoro-tts/voices/voices.bin"
+_SPEAK_SPEED = "1.5"
 
 # ── Global accessibility state ──────────────────────────────
 _accessibility_enabled = False
 _speak_gen = 0
 _speak_lock = threading.Lock()
-_play_process = None
 
 # Voice configuration set by the language screen selection
 _current_voice = "af_heart"
 _current_lang_code = "en-us"
 
+_phrase_cache: PhraseCache | None = None
+_phrase_cache_lock = threading.Lock()
+
 
 def is_accessibility_enabled() -> bool:
     return _accessibility_enabled
@@ -48,6 +55,18 @@ def set_speak_voice(voice: str, lang_code: str) -> None:
     _current_lang_code = lang_code
 
 
+def get_phrase_cache() -> PhraseCache:
+    """Return the speech cache, spilling to the session tmpfs when available."""
+    global _phrase_cache
+    with _phrase_cache_lock:
+        if _phrase_cache is None:
+            spill_directory = default_spill_directory()
+            if spill_directory:
+                atexit.register(shutil.rmtree, spill_directory, True)
+            _phrase_cache = PhraseCache(spill_directory=spill_directory)
+        return _phrase_cache
+
+
 def speak(text: str) -> None:
     """Speak text using koko directly. Non-blocking, cancels previous speech."""
     if not _accessibility_enabled or not text:
@@ -58,10 +77,25 @@ def speak(text: str) -> None:
         _speak_gen += 1
         gen = _speak_gen
 
-    threading.Thread(target=_synthesize_and_play, args=(text, gen), daemon=True).start()
+    # The language code selects Kokoro's phonemizer, so it is part of the voice.
+    key: PhraseKey = (text, f"{_current_voice}:{_current_lang_code}", _SPEAK_SPEED)
+    cached = get_phrase_cache().get(key)
+    if cached is not None:
+        try:
+            get_audio_sink().play(cached)
+        except ValueError as error:
+            logger.warning("Cached speech is unusable: %s", error)
+        return
+    threading.Thread(
+        target=_synthesize_and_play,
+        args=(text, gen, key, _current_voice, _current_lang_code),
+        daemon=True,
+    ).start()
 
 
-def _synthesize_and_play(text: str, generation: int) -> None:
+def _synthesize_and_play(
+    text: str, generation: int, key: PhraseKey, voice: str, lang_code: str
+) -> None:
     temporary_wav = ""
     try:
         descriptor, temporary_wav = tempfile.mkstemp(prefix="a11y-", suffix=".wav")
@@ -73,24 +107,31 @@ def _synthesize_and_play(text: str, generation: int) -> None:
             "-d",
             _KOKO_VOICES,
             "-l",
-            _current_lang_code,
+            lang_code,
             "-s",
-            _current_voice,
+            voice,
             "--force-style",
             "true",
             "--speed",
-            "1.5",
+            _SPEAK_SPEED,
             "text",
             text,
             "-o",
             temporary_wav,
         ]
         result = subprocess.run(command, capture_output=True, timeout=15)
+        if result.returncode != 0:
+            return
+        with open(temporary_wav, "rb") as wav_file:
+            audio = wav_file.read()
+        if not audio:
+            return
+        get_phrase_cache().put(key, audio)
         with _speak_lock:
             is_current = generation == _speak_gen
-        if result.returncode == 0 and is_current and os.path.getsize(temporary_wav) > 0:
-            _play_wav(temporary_wav)
-    except (OSError, subprocess.SubprocessError) as error:
+        if is_current:
+            get_audio_sink().play(audio)
+    except (OSError, ValueError, subprocess.SubprocessError) as error:
         logger.warning("Speech output failed: %s", error)
     finally:
         if temporary_wav:
@@ -100,24 +141,12 @@ def _synthesize_and_play(text: str, generation: int) -> None:
                 pass
 
 
-def _play_wav(path: str) -> None:
-    global _play_process
-    play = subprocess.Popen(
-        ["paplay", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-    )
-    with _speak_lock:
-        _play_process = play
-    play.wait(timeout=15)
-
-
 def stop_speaking() -> None:
     """Cancel any ongoing speech playback."""
-    global _speak_gen, _play_process
+    global _speak_gen
     with _speak_lock:
         _speak_gen += 1
-        if _play_process and _play_process.poll() is None:
-            _play_process.terminate()
-        _play_process = None
+    get_audio_sink().interrupt()
 
 
 def announce(widget: Gtk.Accessible, message: str, assertive: bool = False) -> None:
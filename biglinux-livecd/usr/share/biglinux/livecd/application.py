@@ -4,10 +4,13 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 import os
 import stat
+import time
 
 from gi.repository import Adw, Gdk, Gtk
 from logging_config import get_logger
+from timeline import mark, span
 from ui.app_window import AppWindow
+from zygote import LAUNCH_MODE_VARIABLE, LAUNCH_TIME_VARIABLE
 
 logger = get_logger()
 
@@ -49,6 +52,21 @@ class Application(Adw.Application):
             return
         self._wizard_ready_notified = True
         logger.info("Wizard window mapped; background integrity check released")
+        mark("wizard-visible")
+        self._log_launch_latency()
+
+    @staticmethod
+    def _log_launch_latency():
+        """Report launch-to-map time so zygote and cold starts can be compared."""
+        try:
+            launched_at = float(os.environ[LAUNCH_TIME_VARIABLE])
+        except (KeyError, ValueError):
+            return
+        logger.info(
+            "Wizard visible %.0f ms after launch (%s start)",
+            (time.monotonic() - launched_at) * 1000,
+            os.environ.get(LAUNCH_MODE_VARIABLE, "cold"),
+        )
 
     def do_startup(self):
         """Called once when the application starts."""
@@ -79,6 +97,9 @@ class Application(Adw.Application):
     def do_activate(self):
         """Called when the application is activated (run)."""
         if not self.win:
-            self.win = AppWindow(application=self, system_service=self.system_service)
+            with span("app-window-init"):
+                self.win = AppWindow(
+                    application=self, system_service=self.system_service
+                )
             self.win.connect("map", self._mark_wizard_visible)
         self.win.present()
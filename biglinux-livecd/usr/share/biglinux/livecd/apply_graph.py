@@ -0,0 +1,165 @@
+"""Run the wizard's settings steps as a small dependency graph.
+
+``SystemService`` used to start its commands with ``Popen`` and never wait
+for them: exit statuses were lost, children stayed zombies until the wizard
+exited, and steps that must happen in order (edit a config, then restart the
+service that reads it) simply raced. Each step now names the steps it comes
+after and is submitted to a bounded executor once they have finished, so a
+batch takes as long as its longest chain. Every step hands back a future with
+its exit status and duration, and every command is waited for.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, Future
+from concurrent.futures import wait as wait_for_futures
+from dataclasses import dataclass
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+COMMAND_NOT_FOUND = 127
+COMMAND_TIMED_OUT = 124
+
+StepAction = Callable[[], "int | None"]
+
+
+@dataclass(frozen=True)
+class StepResult:
+    name: str
+    status: int | None
+    duration: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.status
+
+
+def run_process(command: Sequence[str], *, timeout: float | None = None) -> int:
+    """Run ``command`` to completion and return its exit status."""
+    try:
+        completed = subprocess.run(
+            list(command),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+            check=False,
+        )
+    except FileNotFoundError:
+        return COMMAND_NOT_FOUND
+    # subprocess.run kills and waits for the child before raising this.
+    except subprocess.TimeoutExpired:
+        return COMMAND_TIMED_OUT
+    return completed.returncode
+
+
+class ApplyGraph:
+    """Steps start as soon as every step they come after has finished.
+
+    A step only orders its dependencies; it still runs when one of them
+    failed, because the settings steps are independent best-effort changes.
+    """
+
+    def __init__(self, executor: Executor) -> None:
+        self._executor = executor
+        self._futures: dict[str, Future[StepResult]] = {}
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    @property
+    def futures(self) -> dict[str, Future[StepResult]]:
+        return dict(self._futures)
+
+    def add(
+        self, name: str, action: StepAction, *, after: Iterable[str] = ()
+    ) -> Future[StepResult]:
+        """Add a step; its dependencies must already be in the graph."""
+        dependencies = list(after)
+        with self._lock:
+            if name in self._futures:
+                raise ValueError(f"duplicate apply step: {name}")
+            missing = [dep for dep in dependencies if dep not in self._futures]
+            if missing:
+                raise ValueError(f"{name} comes after unknown steps: {missing}")
+            future: Future[StepResult] = Future()
+            self._futures[name] = future
+            waiting = [self._futures[dep] for dep in dependencies]
+        remaining = [len(waiting)]
+        remaining_lock = threading.Lock()
+
+        def dependency_done(_dependency: Future[StepResult]) -> None:
+            with remaining_lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._submit(name, action, future)
+
+        if not waiting:
+            self._submit(name, action, future)
+        for dependency in waiting:
+            dependency.add_done_callback(dependency_done)
+        return future
+
+    def add_command(
+        self,
+        name: str,
+        command: Sequence[str],
+        *,
+        after: Iterable[str] = (),
+        timeout: float | None = None,
+    ) -> Future[StepResult]:
+        return self.add(
+            name, lambda: run_process(command, timeout=timeout), after=after
+        )
+
+    def _submit(
+        self, name: str, action: StepAction, future: Future[StepResult]
+    ) -> None:
+        try:
+            self._executor.submit(self._execute, name, action, future)
+        except RuntimeError as error:
+            # The executor was shut down while the wizard was closing.
+            future.set_result(StepResult(name, None, 0.0, str(error)))
+
+    @staticmethod
+    def _execute(name: str, action: StepAction, future: Future[StepResult]) -> None:
+        started = time.monotonic()
+        try:
+            status = action()
+            error = None
+        except Exception as failure:
+            logger.exception("Apply step %s failed", name)
+            status, error = None, str(failure)
+        future.set_result(StepResult(name, status, time.monotonic() - started, error))
+
+    def wait(self, timeout: float | None = None) -> list[StepResult]:
+        """Wait for every step added so far; unfinished ones are left out."""
+        futures = list(self._futures.values())
+        done, _pending = wait_for_futures(futures, timeout=timeout)
+        return [future.result() for future in futures if future in done]
+
+    def report(self) -> None:
+        """Log each finished step and how the batch compares to running serially."""
+        results = self.wait(timeout=0)
+        for result in results:
+            log = logger.info if result.ok else logger.warning
+            log(
+                "Apply step %s: status %s, error %s, %.0f ms",
+                result.name,
+                result.status,
+                result.error,
+                result.duration * 1000,
+            )
+        logger.info(
+            "Applied %d steps in %.0f ms (%.0f ms one after another)",
+            len(results),
+            (time.monotonic() - self._started) * 1000,
+            sum(result.duration for result in results) * 1000,
+        )
@@ -0,0 +1,296 @@
+"""Persistent speech playback stream for the live wizard.
+
+Every spoken item used to fork ``paplay`` on a WAV file: one exec, one new
+PulseAudio/PipeWire connection and one new stream per utterance, and
+interrupting meant killing that process. The sink below keeps a single
+``pacat`` stream open and feeds it decoded PCM from memory, so interrupting
+only stops writing and queued clips never touch the filesystem.
+"""
+
+from __future__ import annotations
+
+import atexit
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+PACAT_BIN = "/usr/bin/pacat"
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_PCM_SAMPLE_FORMATS = {8: "u8", 16: "s16le", 24: "s24le", 32: "s32le"}
+# Writes are paced in short chunks and never run far ahead of the stream, so
+# an interrupt silences speech within roughly one chunk plus the lead instead
+# of after the whole pipe buffer has drained.
+_CHUNK_SECONDS = 0.02
+_LEAD_SECONDS = 0.08
+_LATENCY_MSEC = 40
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    sample_format: str
+    rate: int
+    channels: int
+    frame_bytes: int
+
+
+@dataclass(frozen=True)
+class AudioClip:
+    audio_format: AudioFormat
+    frames: bytes
+
+    @property
+    def duration(self) -> float:
+        frame_count = len(self.frames) // self.audio_format.frame_bytes
+        return frame_count / self.audio_format.rate
+
+
+def parse_wav(data: bytes) -> AudioClip:
+    """Decode an in-memory RIFF/WAVE file into raw frames and their format."""
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE file")
+    audio_format: AudioFormat | None = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", data, offset + 4)
+        body = data[offset + 8 : offset + 8 + chunk_size]
+        if chunk_id == b"fmt ":
+            audio_format = _parse_format_chunk(body)
+        elif chunk_id == b"data":
+            if audio_format is None:
+                raise ValueError("WAVE data precedes its format chunk")
+            usable = len(body) - len(body) % audio_format.frame_bytes
+            return AudioClip(audio_format, body[:usable])
+        offset += 8 + chunk_size + (chunk_size & 1)
+    raise ValueError("WAVE file has no data chunk")
+
+
+def _parse_format_chunk(body: bytes) -> AudioFormat:
+    if len(body) < 16:
+        raise ValueError("WAVE format chunk is truncated")
+    tag, channels, rate, _byte_rate, block_align, bits = struct.unpack_from(
+        "<HHIIHH", body
+    )
+    if tag == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+        (tag,) = struct.unpack_from("<H", body, 24)
+    if tag == _WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        sample_format = "float32le"
+    elif tag == _WAVE_FORMAT_PCM and bits in _PCM_SAMPLE_FORMATS:
+        sample_format = _PCM_SAMPLE_FORMATS[bits]
+    else:
+        raise ValueError(f"unsupported WAVE encoding {tag:#x}/{bits} bit")
+    if channels < 1 or rate < 1 or block_align != channels * bits // 8:
+        raise ValueError("inconsistent WAVE format chunk")
+    return AudioFormat(sample_format, rate, channels, block_align)
+
+
+def pacat_command(audio_format: AudioFormat) -> list[str]:
+    return [
+        PACAT_BIN,
+        "--playback",
+        "--raw",
+        f"--format={audio_format.sample_format}",
+        f"--rate={audio_format.rate}",
+        f"--channels={audio_format.channels}",
+        f"--latency-msec={_LATENCY_MSEC}",
+        "--client-name=biglinux-livecd",
+        "--stream-name=speech",
+    ]
+
+
+class AudioSink:
+    """Queue of in-memory clips played through one long-lived stream."""
+
+    def __init__(
+        self,
+        command_for: Callable[[AudioFormat], Sequence[str]] = pacat_command,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._command_for = command_for
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._queue: deque[tuple[int, AudioClip, float]] = deque()
+        self._generation = 0
+        self._closed = False
+        self._process: subprocess.Popen[bytes] | None = None
+        self._process_format: AudioFormat | None = None
+        self._thread: threading.Thread | None = None
+        self._busy = False
+        self.last_time_to_first_sample: float | None = None
+        self.streams_opened = 0
+
+    def play(self, wav: bytes) -> None:
+        """Interrupt current speech and play ``wav`` as soon as possible."""
+        self._submit(wav, interrupt=True)
+
+    def enqueue(self, wav: bytes) -> None:
+        """Play ``wav`` after every clip already queued."""
+        self._submit(wav, interrupt=False)
+
+    def play_file(self, path: str, *, interrupt: bool = True) -> None:
+        with open(path, "rb") as wav_file:
+            self._submit(wav_file.read(), interrupt=interrupt)
+
+    def _submit(self, wav: bytes, *, interrupt: bool) -> None:
+        submitted = self._clock()
+        clip = parse_wav(wav)
+        with self._condition:
+            if self._closed:
+                return
+            if interrupt:
+                self._generation += 1
+                self._queue.clear()
+            self._queue.append((self._generation, clip, submitted))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audio-sink", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def interrupt(self) -> None:
+        """Drop queued clips and stop the clip being written."""
+        with self._condition:
+            self._generation += 1
+            self._queue.clear()
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._generation += 1
+            self._queue.clear()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+        self._stop_process()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until the queue is drained; used by tests and shutdown."""
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._condition:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation, clip, submitted = self._queue.popleft()
+                self._busy = True
+            try:
+                self._write_clip(generation, clip, submitted)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _current(self, generation: int) -> bool:
+        with self._condition:
+            return generation == self._generation and not self._closed
+
+    def _write_clip(self, generation: int, clip: AudioClip, submitted: float) -> None:
+        stream = self._stream_for(clip.audio_format)
+        if stream is None:
+            return
+        chunk_bytes = max(
+            clip.audio_format.frame_bytes,
+            int(clip.audio_format.rate * _CHUNK_SECONDS)
+            * clip.audio_format.frame_bytes,
+        )
+        bytes_per_second = clip.audio_format.rate * clip.audio_format.frame_bytes
+        started = 0.0
+        for offset in range(0, len(clip.frames), chunk_bytes):
+            if not self._current(generation):
+                return
+            if offset:
+                ahead = offset / bytes_per_second - (self._clock() - started)
+                if ahead > _LEAD_SECONDS:
+                    time.sleep(ahead - _LEAD_SECONDS)
+            try:
+                stream.write(clip.frames[offset : offset + chunk_bytes])
+                stream.flush()
+            except (BrokenPipeError, ValueError, OSError) as error:
+                logger.warning("Speech stream closed unexpectedly: %s", error)
+                self._stop_process()
+                return
+            if not offset:
+                started = self._clock()
+                self.last_time_to_first_sample = started - submitted
+                logger.debug(
+                    "Speech time to first sample: %.1f ms",
+                    self.last_time_to_first_sample * 1000,
+                )
+
+    def _stream_for(self, audio_format: AudioFormat):
+        process = self._process
+        if (
+            process is not None
+            and process.poll() is None
+            and self._process_format == audio_format
+        ):
+            return process.stdin
+        self._stop_process()
+        try:
+            process = subprocess.Popen(
+                list(self._command_for(audio_format)),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as error:
+            logger.warning("Could not open the speech stream: %s", error)
+            return None
+        self._process = process
+        self._process_format = audio_format
+        self.streams_opened += 1
+        return process.stdin
+
+    def _stop_process(self) -> None:
+        process, self._process = self._process, None
+        self._process_format = None
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+_shared_sink: AudioSink | None = None
+_shared_sink_lock = threading.Lock()
+
+
+def get_audio_sink() -> AudioSink:
+    """Return the process-wide sink shared by every speech source."""
+    global _shared_sink
+    with _shared_sink_lock:
+        if _shared_sink is None:
+            _shared_sink = AudioSink()
+            atexit.register(_shared_sink.close)
+        return _shared_sink
@@ -0,0 +1,245 @@
+"""The themes and desktop layouts the wizard offers, scanned once per boot.
+
+``list-themes.sh`` ran while the theme page was being built and again when
+a theme was applied, only to check the chosen name. ``list-desktops.sh`` ran
+for the desktop page. Each run forked a shell that walked the squashfs.
+Both listings are now scanned once into a typed index, which is kept in
+memory and cached under ``/run/biglinux-live/catalog``. The cache is keyed
+on the modification times of the directories and scripts the listings come
+from, so a theme package installed during the session shows up on the next
+scan. The listing scripts belong to biglinux-themes-gui and are still what
+decides which names exist. The catalog only stops asking them twice.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from gnome_layout import LAYOUT_NAMES
+from logging_config import get_logger
+
+_installed_library = Path("/usr/lib/biglinux-livecd")
+_development_library = Path(__file__).resolve().parents[3] / "lib/biglinux-livecd"
+sys.path.insert(
+    0, str(_installed_library if _installed_library.is_dir() else _development_library)
+)
+from atomic_file import user_file, write_atomically  # noqa: E402
+
+logger = get_logger()
+
+CATALOG_VERSION = 1
+CATALOG_DIRECTORY = Path("/run/biglinux-live/catalog")
+MAX_CATALOG_BYTES = 256 * 1024
+THEME = "theme"
+DESKTOP = "desktop"
+
+# Runs a listing script read-only and returns (success, output).
+Lister = Callable[[list[str]], "tuple[bool, str]"]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    kind: str
+    name: str
+    preview: str
+    desktop_environment: str
+    files: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class CatalogSources:
+    """Where the listings come from; every path here is part of the key."""
+
+    desktop_environment: str
+    theme_list_script: str
+    desktop_list_script: str
+    theme_preview: str
+    desktop_preview: str
+    gnome_layouts: str
+    gnome_icons: str
+
+    def watched_paths(self) -> list[str]:
+        scripts = [self.theme_list_script, self.desktop_list_script]
+        directories = {
+            os.path.dirname(path)
+            for path in (*scripts, self.theme_preview, self.desktop_preview)
+        }
+        return sorted({*scripts, *directories, self.gnome_layouts, self.gnome_icons})
+
+
+class Catalog:
+    """Read-only index of catalog entries by kind and name.
+
+    ``complete`` is false when a listing script failed. Such a catalog is
+    shown, but never cached, so the next request runs the listing again.
+    """
+
+    def __init__(self, entries: list[CatalogEntry], complete: bool = True) -> None:
+        self.entries = tuple(entries)
+        self.complete = complete
+        self._by_name = {(entry.kind, entry.name): entry for entry in entries}
+
+    def names(self, kind: str) -> list[str]:
+        return [entry.name for entry in self.entries if entry.kind == kind]
+
+    def get(self, kind: str, name: str) -> CatalogEntry | None:
+        return self._by_name.get((kind, name))
+
+
+def source_key(sources: CatalogSources) -> list[Any]:
+    """Modification time of every watched path; ``None`` for a missing one."""
+    key: list[Any] = [sources.desktop_environment]
+    for path in sources.watched_paths():
+        try:
+            key.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            key.append([path, None])
+    return key
+
+
+def _listed_names(script: str, run_listing: Lister) -> list[str] | None:
+    """The names a listing prints; ``None`` when the script failed."""
+    if not os.path.isfile(script):
+        # Part of the source key: installing the script invalidates the cache.
+        logger.warning(f"Listing script not found at {script}")
+        return []
+    success, output = run_listing([script])
+    if not success:
+        logger.warning(f"Listing script failed: {script}")
+        return None
+    return [name for name in output.splitlines() if name]
+
+
+def _existing(*paths: str) -> tuple[str, ...]:
+    return tuple(path for path in paths if os.path.isfile(path))
+
+
+def _entry(kind: str, name: str, preview: str, environment: str) -> CatalogEntry:
+    return CatalogEntry(kind, name, preview, environment, _existing(preview))
+
+
+def scan_catalog(sources: CatalogSources, run_listing: Lister) -> Catalog:
+    environment = sources.desktop_environment
+    themes = _listed_names(sources.theme_list_script, run_listing)
+    complete = themes is not None
+    entries = [
+        _entry(THEME, name, sources.theme_preview.format(name), environment)
+        for name in themes or []
+    ]
+    if environment == "GNOME":
+        for layout in LAYOUT_NAMES:
+            layout_file = os.path.join(sources.gnome_layouts, f"{layout}.txt")
+            if not os.path.exists(layout_file):
+                continue
+            preview = os.path.join(sources.gnome_icons, f"{layout}.svg")
+            files = _existing(layout_file, preview)
+            entries.append(CatalogEntry(DESKTOP, layout, preview, environment, files))
+        if not any(entry.kind == DESKTOP for entry in entries):
+            logger.warning(f"No GNOME layouts found at {sources.gnome_layouts}")
+    else:
+        desktops = _listed_names(sources.desktop_list_script, run_listing)
+        complete = complete and desktops is not None
+        entries.extend(
+            _entry(DESKTOP, name, sources.desktop_preview.format(name), environment)
+            for name in desktops or []
+        )
+    return Catalog(entries, complete)
+
+
+def _catalog_from_payload(payload: Any, key: list[Any]) -> Catalog | None:
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != CATALOG_VERSION
+        or payload.get("key") != key
+        or not isinstance(payload.get("entries"), list)
+    ):
+        return None
+    entries = []
+    for item in payload["entries"]:
+        if not isinstance(item, dict):
+            return None
+        try:
+            entry = CatalogEntry(
+                kind=item["kind"],
+                name=item["name"],
+                preview=item["preview"],
+                desktop_environment=item["desktop_environment"],
+                files=tuple(item["files"]),
+            )
+        except (KeyError, TypeError):
+            return None
+        texts = (entry.kind, entry.name, entry.preview, entry.desktop_environment)
+        if not all(isinstance(text, str) for text in (*texts, *entry.files)):
+            return None
+        entries.append(entry)
+    return Catalog(entries)
+
+
+def read_cache(directory: Path, key: list[Any]) -> Catalog | None:
+    """Return the cached catalog if it was built from the same sources."""
+    descriptor = -1
+    try:
+        descriptor = os.open(
+            user_file(directory, "catalog"), os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC
+        )
+        file_status = os.fstat(descriptor)
+        if (
+            not stat.S_ISREG(file_status.st_mode)
+            or file_status.st_uid != os.geteuid()
+            or file_status.st_mode & 0o022
+            or file_status.st_size > MAX_CATALOG_BYTES
+        ):
+            return None
+        content = os.read(descriptor, MAX_CATALOG_BYTES + 1)
+        if len(content) > MAX_CATALOG_BYTES:
+            return None
+        payload = json.loads(content.decode("utf-8", "strict"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    finally:
+        if descriptor >= 0:
+            os.close(descriptor)
+    return _catalog_from_payload(payload, key)
+
+
+def write_cache(directory: Path, key: list[Any], catalog: Catalog) -> None:
+    payload = json.dumps(
+        {
+            "version": CATALOG_VERSION,
+            "key": key,
+            "entries": [asdict(entry) for entry in catalog.entries],
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    write_atomically(user_file(directory, "catalog"), payload)
+
+
+def load_catalog(
+    sources: CatalogSources,
+    run_listing: Lister,
+    directory: Path | None = CATALOG_DIRECTORY,
+) -> Catalog:
+    """The cached catalog when its sources are unchanged, else a fresh scan.
+
+    ``directory=None`` scans without reading or writing the cache. A scan
+    whose listing failed is returned but not cached.
+    """
+    key = source_key(sources)
+    if directory is not None:
+        cached = read_cache(directory, key)
+        if cached is not None:
+            return cached
+    catalog = scan_catalog(sources, run_listing)
+    if directory is not None and catalog.complete:
+        try:
+            write_cache(directory, key, catalog)
+        except OSError as error:
+            logger.debug(f"Could not cache the theme catalog: {error}")
+    return catalog
@@ -3,12 +3,14 @@ from __future__ import annotations
 import ast
 import logging
 import os
-import shutil
 import stat
-from collections.abc import Mapping
+from collections import Counter
+from collections.abc import Callable, Mapping
 from typing import Protocol
 
+from catalog import THEME, Catalog
 from gnome_layout import LAYOUT_NAMES
+from settings_bus import BusCall, CallResult, set_xfconf_property
 
 logger = logging.getLogger(__name__)
 GNOME_LIGHT_STYLE_UUID = "light-style@gnome-shell-extensions.gcampax.github.com"
@@ -24,7 +26,6 @@ SettingsChanges = Mapping[str, Mapping[str, str]]
 
 class ThemeHost(Protocol):
     test_mode: bool
-    theme_list_script: str
     theme_apply_script: str
     theme_state_file: str
     gnome_layout_state_file: str
@@ -44,27 +45,28 @@ class ThemeHost(Protocol):
 
     def _apply_gtk_settings_ini(self, dark: bool, icon_theme: str) -> None: ...
 
+    def _apply_xfconf_settings(self, calls: list[BusCall]) -> list[CallResult]: ...
+
     def get_desktop_environment(self) -> str: ...
 
+    def get_catalog(self) -> Catalog: ...
+
     def _ensure_gnome_settings_file(self) -> None: ...
 
-    def _sync_gnome_settings_tmp(self) -> None: ...
+    def _sync_gnome_settings_tmp(self, text: str | None = None) -> None: ...
 
-    def _stamp_gnome_input_sources(self, settings_file: str) -> None: ...
+    def _stamp_gnome_input_sources(
+        self, settings_file: str, documents: SettingsDocuments | None = None
+    ) -> None: ...
 
 
 def available_theme_names(host: ThemeHost) -> list[str]:
-    if not os.path.isfile(host.theme_list_script):
-        logger.warning("Theme list command is unavailable")
-        return []
-    success, output = host._run_command([host.theme_list_script], read_only=True)
-    if not success:
-        return []
-    return [name for name in output.splitlines() if name]
+    return host.get_catalog().names(THEME)
 
 
 def apply_packaged_theme(host: ThemeHost, theme: str) -> bool:
-    if theme not in set(available_theme_names(host)):
+    # The catalog the page was built from; checking used to list them again.
+    if host.get_catalog().get(THEME, theme) is None:
         logger.error("Refusing unknown packaged theme: %s", theme)
         return False
     if not host._write_live_state_file(host.theme_state_file, theme):
@@ -162,22 +164,95 @@ def update_settings_text(  # noqa: C901 - single-pass parser preserves file stru
     return "".join(output)
 
 
+def _section_values(text: str, section_name: str) -> dict[str, str]:
+    values: dict[str, str] = {}
+    current_section = ""
+    for raw_line in text.splitlines():
+        stripped = raw_line.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            current_section = stripped[1:-1]
+        elif current_section == section_name and "=" in stripped:
+            key, _, value = stripped.partition("=")
+            values[key.strip()] = value.strip()
+    return values
+
+
+class SettingsDocuments:
+    """The settings files of one apply, each read once and written once.
+
+    Applying a theme used to read the same dconf keyfile up to six times
+    (layout detection, extension lists, the edit itself, the input-source
+    stamp and the live state copy) and write it twice. Every step now edits
+    the text held here, and ``commit`` writes each changed file one time.
+    """
+
+    def __init__(self) -> None:
+        self._texts: dict[str, str] = {}
+        # Insertion-ordered, so files are written in the order first changed.
+        self._dirty: dict[str, None] = {}
+        self.reads: Counter[str] = Counter()
+        self.writes: Counter[str] = Counter()
+
+    def text(self, path: str) -> str:
+        """The current text of ``path``; raises ``OSError`` or ``UnicodeError``."""
+        text = self._texts.get(path)
+        if text is None:
+            self.reads[path] += 1
+            text = _read_regular_text(path)
+            self._texts[path] = text
+        return text
+
+    def section(self, path: str, section_name: str) -> dict[str, str]:
+        return _section_values(self.text(path), section_name)
+
+    def update(self, path: str, changes: SettingsChanges) -> None:
+        current = self.text(path)
+        self.replace(path, update_settings_text(current, changes), current)
+
+    def replace(self, path: str, text: str, current: str | None = None) -> None:
+        """Set the whole text of ``path``; it is not read first."""
+        if current is None:
+            current = self._texts.get(path)
+        self._texts[path] = text
+        if text != current:
+            self._dirty[path] = None
+
+    @property
+    def dirty(self) -> list[str]:
+        return list(self._dirty)
+
+    def commit(self, write: Callable[[str, str], bool]) -> bool:
+        """Write every changed document; stop at the first that fails."""
+        while self._dirty:
+            path = next(iter(self._dirty))
+            self.writes[path] += 1
+            if not write(path, self._texts[path]):
+                return False
+            del self._dirty[path]
+        return True
+
+
 def modify_settings_file(
-    host: ThemeHost, settings_file: str, changes: SettingsChanges
+    host: ThemeHost,
+    settings_file: str,
+    changes: SettingsChanges,
+    documents: SettingsDocuments | None = None,
 ) -> bool:
+    """Edit ``settings_file``, in ``documents`` when an apply is under way."""
     if host.test_mode:
         return True
     if not settings_file:
         logger.error("No settings file belongs to this desktop environment")
         return False
+    session = SettingsDocuments() if documents is None else documents
     try:
-        current = _read_regular_text(settings_file)
+        session.update(settings_file, changes)
     except (OSError, UnicodeError) as error:
         logger.error("Could not read desktop settings: %s", error)
         return False
-    return host._write_user_config_file(
-        settings_file, update_settings_text(current, changes)
-    )
+    if documents is not None:
+        return True
+    return session.commit(host._write_user_config_file)
 
 
 def _parse_settings_list(value: str) -> list[str]:
@@ -191,32 +266,23 @@ def _parse_settings_list(value: str) -> list[str]:
 
 
 def _settings_key_values(
-    settings_file: str, section_name: str
+    documents: SettingsDocuments, settings_file: str, section_name: str
 ) -> dict[str, str] | None:
     try:
-        text = _read_regular_text(settings_file)
+        return documents.section(settings_file, section_name)
     except (OSError, UnicodeError) as error:
         logger.error("Could not inspect GNOME settings: %s", error)
         return None
-    values: dict[str, str] = {}
-    current_section = ""
-    for raw_line in text.splitlines():
-        stripped = raw_line.strip()
-        if stripped.startswith("[") and stripped.endswith("]"):
-            current_section = stripped[1:-1]
-        elif current_section == section_name and "=" in stripped:
-            key, _, value = stripped.partition("=")
-            values[key.strip()] = value.strip()
-    return values
 
 
 def _gnome_extension_changes(
+    documents: SettingsDocuments,
     settings_file: str,
     *,
     user_theme: bool,
     light_style: bool,
 ) -> dict[str, dict[str, str]]:
-    values = _settings_key_values(settings_file, "org/gnome/shell")
+    values = _settings_key_values(documents, settings_file, "org/gnome/shell")
     if values is None:
         return {}
     enabled = _parse_settings_list(values.get("enabled-extensions", "[]"))
@@ -248,10 +314,13 @@ def _gnome_extension_changes(
     }
 
 
-def _gnome_layout_class(settings_file: str) -> str:
-    shell_values = _settings_key_values(settings_file, "org/gnome/shell") or {}
+def _gnome_layout_class(documents: SettingsDocuments, settings_file: str) -> str:
+    shell_values = (
+        _settings_key_values(documents, settings_file, "org/gnome/shell") or {}
+    )
     user_theme_values = (
         _settings_key_values(
+            documents,
             settings_file,
             "org/gnome/shell/extensions/user-theme",
         )
@@ -270,6 +339,12 @@ def _selected_gnome_layout(host: ThemeHost) -> str:
     state_file = getattr(host, "gnome_layout_state_file", "")
     if not state_file:
         return ""
+    # SystemService only commits the live state when the user confirms, so
+    # a layout picked earlier in this run is still staged there.
+    read_live_state = getattr(host, "_read_live_state_file", None)
+    if read_live_state is not None:
+        layout = (read_live_state(state_file) or "").strip()
+        return layout if layout in LAYOUT_NAMES else ""
     try:
         layout = _read_regular_text(state_file).strip()
     except (OSError, UnicodeError):
@@ -282,7 +357,10 @@ def _desktop_changes(
     settings_file: str,
     dark: bool,
     gnome_layout: str = "",
+    documents: SettingsDocuments | None = None,
 ) -> dict[str, dict[str, str]]:
+    if documents is None:
+        documents = SettingsDocuments()
     color_scheme = "'prefer-dark'" if dark else "'default'"
     gtk_theme = "'adw-gtk3-dark'" if dark else "'adw-gtk3'"
     icon_theme = f"'{_simple_icon_theme(desktop_environment, dark)}'"
@@ -305,7 +383,7 @@ def _desktop_changes(
         layout = (
             gnome_layout
             if gnome_layout in LAYOUT_NAMES
-            else _gnome_layout_class(settings_file)
+            else _gnome_layout_class(documents, settings_file)
         )
         orchis = layout in GNOME_ORCHIS_LAYOUTS
         shell_theme = (
@@ -318,6 +396,7 @@ def _desktop_changes(
         changes["org/gnome/shell/extensions/user-theme"] = {"name": shell_theme}
         changes.update(
             _gnome_extension_changes(
+                documents,
                 settings_file,
                 user_theme=orchis,
                 light_style=(
@@ -331,14 +410,14 @@ def _desktop_changes(
 def _apply_xfce(host: ThemeHost, dark: bool) -> None:
     gtk_theme = "adw-gtk3-dark" if dark else "adw-gtk3"
     icon_theme = _simple_icon_theme("XFCE", dark)
-    for channel, property_name, value in (
-        ("xsettings", "/Net/ThemeName", gtk_theme),
-        ("xsettings", "/Net/IconThemeName", icon_theme),
-        ("xfwm4", "/general/theme", gtk_theme),
-    ):
-        host._run_command(
-            ["xfconf-query", "-c", channel, "-p", property_name, "-s", value]
-        )
+    # One batch to xfconfd; each property used to fork its own xfconf-query.
+    host._apply_xfconf_settings(
+        [
+            set_xfconf_property("xsettings", "/Net/ThemeName", gtk_theme),
+            set_xfconf_property("xsettings", "/Net/IconThemeName", icon_theme),
+            set_xfconf_property("xfwm4", "/general/theme", gtk_theme),
+        ]
+    )
 
 
 def apply_simple_theme(host: ThemeHost, theme: str) -> bool:
@@ -354,6 +433,7 @@ def apply_simple_theme(host: ThemeHost, theme: str) -> bool:
         host._ensure_gnome_settings_file()
         gnome_layout = _selected_gnome_layout(host)
     settings_file = settings_file_path(desktop_environment)
+    documents = SettingsDocuments()
     if not modify_settings_file(
         host,
         settings_file,
@@ -362,9 +442,13 @@ def apply_simple_theme(host: ThemeHost, theme: str) -> bool:
             settings_file,
             dark,
             gnome_layout=gnome_layout,
+            documents=documents,
         ),
+        documents,
     ):
         return False
+    if desktop_environment == "GNOME":
+        host._stamp_gnome_input_sources(settings_file, documents)
     if desktop_environment == "XFCE":
         _apply_xfce(host, dark)
     host._apply_gtk_settings_ini(
@@ -374,27 +458,32 @@ def apply_simple_theme(host: ThemeHost, theme: str) -> bool:
 
     home = os.path.expanduser("~")
     kvantum_theme = "BigAdwaitaRoundGtkDark" if dark else "BigAdwaitaRoundGtk"
-    if not host._write_user_config_file(
+    documents.replace(
         os.path.join(home, ".config", "Kvantum", "kvantum.kvconfig"),
         f"[General]\ntheme={kvantum_theme}\n",
-    ):
-        return False
+    )
     source_name = "biglinux-dark" if dark else "biglinux"
     kdeglobals_source = f"/usr/share/sync-kde-and-gtk-places/{source_name}"
     if os.path.isfile(kdeglobals_source):
-        # _run_command spawns and returns, so it reported success the moment cp
-        # started and the check below could never fire. Copying in process both
-        # finishes before the caller is told it did and saves the fork.
+        # Installed with the other documents, so it is replaced atomically and
+        # the caller is only told the theme applied once it has been written.
         try:
-            shutil.copyfile(
-                kdeglobals_source, os.path.join(home, ".config", "kdeglobals")
+            documents.replace(
+                os.path.join(home, ".config", "kdeglobals"),
+                documents.text(kdeglobals_source),
             )
-        except OSError as error:
+        except (OSError, UnicodeError) as error:
             logger.error("Could not install the KDE theme settings: %s", error)
             return False
     else:
         logger.warning("KDE theme settings are unavailable")
-    if desktop_environment == "GNOME":
-        host._stamp_gnome_input_sources(settings_file)
-        host._sync_gnome_settings_tmp()
+    if not documents.commit(host._write_user_config_file):
+        return False
+    logger.debug(
+        "Theme applied with %d settings reads and %d writes",
+        documents.reads.total(),
+        documents.writes.total(),
+    )
+    if desktop_environment == "GNOME" and not host.test_mode:
+        host._sync_gnome_settings_tmp(documents.text(settings_file))
     return True
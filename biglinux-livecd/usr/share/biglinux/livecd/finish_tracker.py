@@ -0,0 +1,225 @@
+"""Follow the wizard's last settings changes without blocking the window.
+
+Choosing a theme used to wait on the system-update queue from inside the GTK
+signal handler, for up to 15 seconds, then apply the theme and finalize the
+setup there too. The window stopped drawing and screen-reader speech stopped
+with it, and nothing said which update it was waiting for. Each queued update
+and finish step is now recorded here with when it was submitted, started and
+finished. The window redraws its progress list when one of them changes, and
+lets the user leave once every critical step has settled. At that point the
+wait is broken down per step, so the slow one shows up in the log.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from apply_graph import StepResult
+from logging_config import get_logger
+
+logger = get_logger()
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STALLED = "stalled"
+
+Notifier = Callable[[Callable[[], None]], object]
+Result = TypeVar("Result")
+
+
+@dataclass(eq=False)
+class FinishStep:
+    name: str
+    critical: bool
+    submitted: float
+    started: float | None = None
+    finished: float | None = None
+    error: str | None = None
+    stalled: bool = False
+    future: Future[Any] | None = None
+
+    @property
+    def status(self) -> str:
+        if self.finished is not None:
+            return FAILED if self.error is not None else DONE
+        if self.stalled:
+            return STALLED
+        return QUEUED if self.started is None else RUNNING
+
+    @property
+    def settled(self) -> bool:
+        return self.finished is not None or self.stalled
+
+
+def notify_main_loop(callback: Callable[[], None]) -> object:
+    from gi.repository import GLib
+
+    def dispatch() -> bool:
+        callback()
+        return GLib.SOURCE_REMOVE
+
+    return GLib.idle_add(dispatch)
+
+
+class FinishTracker:
+    """Timing and status of queued work; safe to update from any thread.
+
+    Listeners are called through ``notify``, which hands them to the GTK main
+    loop in the wizard, so widgets are only touched from the main thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        notify: Notifier = notify_main_loop,
+    ) -> None:
+        self._clock = clock
+        self._notify = notify
+        self._steps: list[FinishStep] = []
+        self._listeners: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._clock()
+
+    def add(self, name: str, *, critical: bool = True) -> FinishStep:
+        """Record a step as submitted; call before handing it to a worker."""
+        step = FinishStep(name, critical, self._clock())
+        with self._lock:
+            self._steps.append(step)
+        self._changed()
+        return step
+
+    def watch(self, step: FinishStep, future: Future[Any]) -> None:
+        """Settle ``step`` when ``future`` does."""
+        step.future = future
+        future.add_done_callback(lambda done: self._settle(step, done))
+
+    def track(
+        self, name: str, future: Future[Any], *, critical: bool = True
+    ) -> FinishStep:
+        step = self.add(name, critical=critical)
+        self.watch(step, future)
+        return step
+
+    def timed(
+        self, step: FinishStep, action: Callable[[], Result]
+    ) -> Callable[[], Result]:
+        """Wrap ``action`` so the worker marks ``step`` started when it runs."""
+
+        def run() -> Result:
+            self.begin(step)
+            return action()
+
+        return run
+
+    def begin(self, step: FinishStep) -> None:
+        with self._lock:
+            step.started = self._clock()
+        self._changed()
+
+    def stall(self, steps: Iterable[FinishStep]) -> None:
+        """Stop waiting for ``steps``; they still settle if they ever finish."""
+        with self._lock:
+            for step in steps:
+                if step.finished is None:
+                    step.stalled = True
+        self._changed()
+
+    def _settle(self, step: FinishStep, future: Future[Any]) -> None:
+        finished = self._clock()
+        error: str | None = None
+        started = finished
+        if future.cancelled():
+            error = "cancelled"
+        elif (failure := future.exception()) is not None:
+            error = str(failure) or type(failure).__name__
+        else:
+            result = future.result()
+            # Graph steps are not wrapped; their result says how long they ran.
+            if isinstance(result, StepResult):
+                if not result.ok:
+                    error = result.error or f"exit status {result.status}"
+                started = finished - result.duration
+        with self._lock:
+            if step.started is None:
+                step.started = started
+            step.finished = finished
+            step.error = error
+        self._changed()
+
+    def steps(self) -> list[FinishStep]:
+        """The latest step of each name, in the order names first appeared."""
+        with self._lock:
+            latest: dict[str, FinishStep] = {}
+            for step in self._steps:
+                latest[step.name] = step
+        return list(latest.values())
+
+    def unsettled(self, *, critical_only: bool = True) -> list[FinishStep]:
+        with self._lock:
+            return [
+                step
+                for step in self._steps
+                if not step.settled and (step.critical or not critical_only)
+            ]
+
+    def settled(self) -> bool:
+        """Whether every critical step has finished or been given up on."""
+        return not self.unsettled()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def _changed(self) -> None:
+        if self._listeners:
+            self._notify(self._call_listeners)
+
+    def _call_listeners(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def wait_breakdown(
+        self, since: float, until: float | None = None
+    ) -> list[tuple[FinishStep, float]]:
+        """Seconds each step ran between ``since`` and ``until``, longest first."""
+        end = self._clock() if until is None else until
+        with self._lock:
+            shares = []
+            for step in self._steps:
+                if step.started is None:
+                    continue
+                stopped = end if step.finished is None else min(step.finished, end)
+                share = stopped - max(step.started, since)
+                if share > 0:
+                    shares.append((step, share))
+        return sorted(shares, key=lambda entry: entry[1], reverse=True)
+
+    def log_wait(self, since: float, until: float | None = None) -> None:
+        end = self._clock() if until is None else until
+        breakdown = self.wait_breakdown(since, end)
+        for step, share in breakdown:
+            queued = (step.started or step.submitted) - step.submitted
+            logger.info(
+                "Finish step %s: %s, %.0f ms of the wait, queued %.0f ms",
+                step.name,
+                step.status,
+                share * 1000,
+                queued * 1000,
+            )
+        if breakdown:
+            step, share = breakdown[0]
+            logger.info(
+                "Finishing took %.0f ms; %s dominated with %.0f ms",
+                (end - since) * 1000,
+                step.name,
+                share * 1000,
+            )
@@ -0,0 +1,240 @@
+"""Pre-rendered atlas of the wizard's flag and header step icons.
+
+The header steps used to go through librsvg every time they were drawn, and
+the language grid opened and parsed one circle-flags SVG per row as it
+scrolled into view, all from squashfs. The package build now renders every
+flag and step icon at the sizes and scale factors the wizard uses into one
+PNG with a JSON index next to it; at run time the PNG is decoded once and
+textures are sliced out of it. A missing or stale atlas only means the
+wizard falls back to the SVG files.
+
+Build it with ``python icon_atlas.py --flags-dir DIR --assets-dir DIR
+--output-dir DIR``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+ATLAS_VERSION = 1
+ATLAS_IMAGE = "icon-atlas.png"
+ATLAS_INDEX = "icon-atlas.json"
+ATLAS_DIRECTORY = Path(__file__).resolve().parent / "assets"
+ATLAS_WIDTH = 1024
+SCALES = (1, 2)
+# Group name -> logical pixel size, matching LanguageView and AppWindow.
+FLAG_GROUP = "flag"
+FLAG_SIZE = 36
+STEP_GROUP = "step"
+STEP_SIZE = 48
+STEP_PATTERN = "headerbar-*.svg"
+
+
+@dataclass(frozen=True)
+class Tile:
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def tile_key(group: str, name: str, size: int, scale: int) -> str:
+    return f"{group}/{name}/{size}@{scale}"
+
+
+def pack_tiles(
+    sizes: dict[str, tuple[int, int]], width: int = ATLAS_WIDTH
+) -> tuple[dict[str, Tile], int]:
+    """Shelf-pack tiles, tallest first; return their places and atlas height."""
+    tiles: dict[str, Tile] = {}
+    x = y = shelf_height = 0
+    for key, (tile_width, tile_height) in sorted(
+        sizes.items(), key=lambda item: (-item[1][1], item[0])
+    ):
+        if tile_width > width:
+            raise ValueError(f"{key} is wider than the atlas")
+        if x + tile_width > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        tiles[key] = Tile(x, y, tile_width, tile_height)
+        x += tile_width
+        shelf_height = max(shelf_height, tile_height)
+    return tiles, y + shelf_height
+
+
+def atlas_sources(flags_dir: Path, assets_dir: Path) -> list[tuple[str, str, Path]]:
+    """List (group, name, svg) for every icon the atlas should hold."""
+    sources = [
+        (FLAG_GROUP, path.stem, path) for path in sorted(flags_dir.glob("*.svg"))
+    ]
+    sources.extend(
+        (STEP_GROUP, path.stem, path) for path in sorted(assets_dir.glob(STEP_PATTERN))
+    )
+    return sources
+
+
+def build_atlas(flags_dir: Path, assets_dir: Path, output_dir: Path) -> int:
+    """Render the atlas PNG and index; return the number of tiles."""
+    import gi
+
+    gi.require_version("GdkPixbuf", "2.0")
+    from gi.repository import GdkPixbuf
+
+    group_sizes = {FLAG_GROUP: FLAG_SIZE, STEP_GROUP: STEP_SIZE}
+    rendered: dict[str, Any] = {}
+    for group, name, path in atlas_sources(flags_dir, assets_dir):
+        for scale in SCALES:
+            pixels = group_sizes[group] * scale
+            rendered[tile_key(group, name, group_sizes[group], scale)] = (
+                GdkPixbuf.Pixbuf.new_from_file_at_size(str(path), pixels, pixels)
+            )
+    tiles, height = pack_tiles(
+        {
+            key: (pixbuf.get_width(), pixbuf.get_height())
+            for key, pixbuf in rendered.items()
+        }
+    )
+    atlas = GdkPixbuf.Pixbuf.new(
+        GdkPixbuf.Colorspace.RGB, True, 8, ATLAS_WIDTH, max(height, 1)
+    )
+    atlas.fill(0)
+    for key, tile in tiles.items():
+        rendered[key].copy_area(0, 0, tile.width, tile.height, atlas, tile.x, tile.y)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    atlas.savev(str(output_dir / ATLAS_IMAGE), "png", ["compression"], ["9"])
+    index = {
+        "version": ATLAS_VERSION,
+        "tiles": {
+            key: [tile.x, tile.y, tile.width, tile.height]
+            for key, tile in sorted(tiles.items())
+        },
+    }
+    (output_dir / ATLAS_INDEX).write_text(
+        json.dumps(index, separators=(",", ":")), encoding="utf-8"
+    )
+    return len(tiles)
+
+
+def parse_index(text: str) -> dict[str, Tile]:
+    """Return the tiles of an atlas index, or nothing for another version."""
+    try:
+        index = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(index, dict) or index.get("version") != ATLAS_VERSION:
+        return {}
+    tiles: dict[str, Tile] = {}
+    raw_tiles = index.get("tiles")
+    if not isinstance(raw_tiles, dict):
+        return {}
+    for key, place in raw_tiles.items():
+        if (
+            isinstance(place, list)
+            and len(place) == 4
+            and all(isinstance(value, int) and value >= 0 for value in place)
+        ):
+            tiles[key] = Tile(*place)
+    return tiles
+
+
+class IconAtlas:
+    """Slices cached textures out of the atlas image; GTK main thread only."""
+
+    def __init__(self, directory: Path = ATLAS_DIRECTORY) -> None:
+        self.directory = directory
+        try:
+            text = (directory / ATLAS_INDEX).read_text(encoding="utf-8")
+        except OSError:
+            text = ""
+        self.tiles = parse_index(text) if text else {}
+        self._image: Any = None
+        self._textures: dict[str, Any] = {}
+
+    def tile(self, group: str, name: str, size: int, scale: int) -> str | None:
+        """Key of the tile to use, preferring the closest scale at or above."""
+        available = sorted(
+            candidate
+            for candidate in SCALES
+            if tile_key(group, name, size, candidate) in self.tiles
+        )
+        if not available:
+            return None
+        chosen = next((value for value in available if value >= scale), available[-1])
+        return tile_key(group, name, size, chosen)
+
+    def texture(self, group: str, name: str, size: int, scale: int = 1) -> Any:
+        """Return a Gdk.Texture for the icon, or ``None`` if it is not here."""
+        key = self.tile(group, name, size, scale)
+        if key is None:
+            return None
+        texture = self._textures.get(key)
+        if texture is not None:
+            return texture
+        image = self._load_image()
+        if image is None:
+            return None
+        from gi.repository import Gdk
+
+        tile = self.tiles[key]
+        if (
+            tile.x + tile.width > image.get_width()
+            or tile.y + tile.height > image.get_height()
+        ):
+            return None
+        texture = Gdk.Texture.new_for_pixbuf(
+            image.new_subpixbuf(tile.x, tile.y, tile.width, tile.height)
+        )
+        self._textures[key] = texture
+        return texture
+
+    def _load_image(self) -> Any:
+        if self._image is None and self.tiles:
+            from gi.repository import GdkPixbuf, GLib
+
+            try:
+                self._image = GdkPixbuf.Pixbuf.new_from_file(
+                    str(self.directory / ATLAS_IMAGE)
+                )
+            except GLib.Error as error:
+                logger.warning(f"Icon atlas is unusable, loading SVGs: {error}")
+                self.tiles = {}
+        return self._image
+
+
+_shared_atlas: IconAtlas | None = None
+
+
+def get_icon_atlas() -> IconAtlas:
+    global _shared_atlas
+    if _shared_atlas is None:
+        _shared_atlas = IconAtlas()
+    return _shared_atlas
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Render the live wizard's flag and step icon atlas."
+    )
+    parser.add_argument("--flags-dir", type=Path, required=True)
+    parser.add_argument("--assets-dir", type=Path, default=ATLAS_DIRECTORY)
+    parser.add_argument("--output-dir", type=Path, default=ATLAS_DIRECTORY)
+    arguments = parser.parse_args(argv)
+    if not arguments.flags_dir.is_dir():
+        print(f"{arguments.flags_dir} is not a directory", file=sys.stderr)
+        return 1
+    count = build_atlas(arguments.flags_dir, arguments.assets_dir, arguments.output_dir)
+    print(f"Packed {count} icons into {os.fspath(arguments.output_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,15 @@
 import argparse
 import logging
+import os
 import sys
+import time
 
-from application import Application
+import zygote
 from logging_config import setup_logging
-from services import SystemService
+from timeline import mark, set_source, span
 
 
-def main():
-    """Initializes and runs the GTK application."""
+def parse_arguments(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
     parser = argparse.ArgumentParser(description="BigLinux Setup Utility")
     parser.add_argument(
         "--test-mode",
@@ -20,7 +21,34 @@ def main():
         action="store_true",
         help="Enable debug logging.",
     )
-    args, remaining_argv = parser.parse_known_args()
+    parser.add_argument(
+        "--zygote",
+        action="store_true",
+        help="Preload the wizard and fork it when a later launch asks for it.",
+    )
+    parser.add_argument(
+        "--no-zygote",
+        action="store_true",
+        help="Start in this process even if a preloaded wizard is waiting.",
+    )
+    return parser.parse_known_args(argv)
+
+
+def run_wizard(argv: list[str]) -> int:
+    """Initializes and runs the GTK application."""
+    set_source("livecd-wizard")
+    with span("wizard-imports"):
+        from application import Application
+        from gi.repository import Gdk
+        from services import SystemService
+
+    args, remaining_argv = parse_arguments(argv[1:])
+
+    # A wizard forked by the zygote has GTK loaded but no display yet.
+    if Gdk.Display.get_default() is None:
+        display = Gdk.Display.open(None)
+        if display is not None:
+            Gdk.DisplayManager.get().set_default_display(display)
 
     # Setup logging
     log_level = logging.DEBUG if args.debug else logging.INFO
@@ -30,7 +58,27 @@ def main():
     system_service = SystemService(test_mode=args.test_mode)
 
     app = Application(system_service=system_service)
-    return app.run([sys.argv[0]] + remaining_argv)
+    return app.run([argv[0]] + remaining_argv)
+
+
+def main():
+    launched_at = time.monotonic()
+    args, _remaining_argv = parse_arguments(sys.argv[1:])
+    if args.zygote:
+        set_source("wizard-zygote")
+        with span("wizard-preload"):
+            zygote.preload()
+        return zygote.serve(run_wizard)
+
+    set_source("livecd-wizard")
+    mark("wizard-launch")
+    os.environ[zygote.LAUNCH_TIME_VARIABLE] = repr(launched_at)
+    if not args.no_zygote:
+        status = zygote.request_wizard(sys.argv)
+        if status is not None:
+            return status
+    os.environ[zygote.LAUNCH_MODE_VARIABLE] = "cold"
+    return run_wizard(sys.argv)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+"""Keep the wizard lean when the live system is short of memory.
+
+The live session runs the whole OS from RAM-backed overlays, and the wizard
+kept a lot next to it: decoded previews, Kokoro voice clips on tmpfs, the
+language list and every page it had built ahead of time. On 2-4 GB machines
+that pushed the system towards the OOM killer. The governor compares the
+process RSS against a budget derived from the total memory and switches the
+wizard to lean mode on small machines or once the budget is exceeded:
+precaching stops, the texture and speech caches shrink, and pages out of
+view are destroyed and rebuilt when the user goes back. Lean mode is not
+left again during the session; the wizard is short-lived and flapping
+between modes would rebuild pages for nothing.
+
+Each decision and the peak RSS go to the log, the boot timeline and
+``/run/biglinux-live/memory``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from logging_config import get_logger
+from timeline import mark
+
+_installed_library = Path("/usr/lib/biglinux-livecd")
+_development_library = Path(__file__).resolve().parents[3] / "lib/biglinux-livecd"
+sys.path.insert(
+    0, str(_installed_library if _installed_library.is_dir() else _development_library)
+)
+from atomic_file import user_file, write_atomically  # noqa: E402
+
+logger = get_logger()
+
+REPORT_VERSION = 1
+REPORT_DIRECTORY = Path("/run/biglinux-live/memory")
+STATUS_PATH = Path("/proc/self/status")
+MEMINFO_PATH = Path("/proc/meminfo")
+# Machines this small start lean; the overlays alone need most of the rest.
+LOW_MEMORY_GB = 4.0
+# RSS allowed before lean mode, as a share of total memory, within bounds.
+BUDGET_SHARE = 0.04
+MIN_BUDGET_KIB = 96 * 1024
+MAX_BUDGET_KIB = 320 * 1024
+# The system as a whole is short once less than this is available.
+MIN_AVAILABLE_KIB = 384 * 1024
+CHECK_INTERVAL_SECONDS = 5
+
+NORMAL = "normal"
+LEAN = "lean"
+
+
+@dataclass(frozen=True)
+class MemoryPolicy:
+    mode: str
+    reason: str
+    precache: bool
+    max_textures: int | None
+    max_voice_clips: int | None
+    release_hidden_pages: bool
+
+
+NORMAL_POLICY = MemoryPolicy(NORMAL, "", True, None, None, False)
+
+
+def lean_policy(reason: str) -> MemoryPolicy:
+    return MemoryPolicy(LEAN, reason, False, 8, 4, True)
+
+
+def _read_kib(path: Path, field: str) -> int | None:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    match = re.search(rf"^{field}:\s+(\d+)\s+kB", text, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def rss_budget_kib(total_memory_gb: float) -> int:
+    budget = int(total_memory_gb * 1024 * 1024 * BUDGET_SHARE)
+    return max(MIN_BUDGET_KIB, min(budget, MAX_BUDGET_KIB))
+
+
+class MemoryGovernor:
+    """Samples RSS and decides how much the wizard may keep in memory."""
+
+    def __init__(
+        self,
+        total_memory_gb: float,
+        *,
+        status_path: Path = STATUS_PATH,
+        meminfo_path: Path = MEMINFO_PATH,
+        report_directory: Path | None = REPORT_DIRECTORY,
+    ) -> None:
+        self.total_memory_gb = total_memory_gb
+        self.budget_kib = rss_budget_kib(total_memory_gb)
+        self.rss_kib = 0
+        self.peak_rss_kib = 0
+        self.available_kib: int | None = None
+        self.policy = NORMAL_POLICY
+        self._status_path = status_path
+        self._meminfo_path = meminfo_path
+        self._report_directory = report_directory
+        self._listeners: list[Callable[[MemoryPolicy], None]] = []
+
+    @property
+    def lean(self) -> bool:
+        return self.policy.mode == LEAN
+
+    def add_listener(self, listener: Callable[[MemoryPolicy], None]) -> None:
+        self._listeners.append(listener)
+
+    def sample(self) -> None:
+        self.rss_kib = _read_kib(self._status_path, "VmRSS") or 0
+        # VmHWM is the kernel's own peak, which catches spikes between checks.
+        high_water = _read_kib(self._status_path, "VmHWM") or 0
+        self.peak_rss_kib = max(self.peak_rss_kib, self.rss_kib, high_water)
+        self.available_kib = _read_kib(self._meminfo_path, "MemAvailable")
+
+    def _lean_reason(self) -> str:
+        if 0 < self.total_memory_gb <= LOW_MEMORY_GB:
+            return f"{self.total_memory_gb:.1f} GB of memory"
+        if self.rss_kib > self.budget_kib:
+            return f"RSS {self.rss_kib} KiB over the {self.budget_kib} KiB budget"
+        if self.available_kib is not None and self.available_kib < MIN_AVAILABLE_KIB:
+            return f"only {self.available_kib} KiB available"
+        return ""
+
+    def check(self) -> MemoryPolicy:
+        """Sample, and switch to lean mode if memory is short."""
+        self.sample()
+        if not self.lean:
+            reason = self._lean_reason()
+            if reason:
+                self.policy = lean_policy(reason)
+                logger.warning(f"Wizard switching to low-memory mode: {reason}")
+                mark("wizard-memory-lean")
+                self.publish()
+                for listener in list(self._listeners):
+                    listener(self.policy)
+        return self.policy
+
+    def report(self) -> dict[str, object]:
+        return {
+            "version": REPORT_VERSION,
+            "total_memory_gb": round(self.total_memory_gb, 2),
+            "budget_kib": self.budget_kib,
+            "rss_kib": self.rss_kib,
+            "peak_rss_kib": self.peak_rss_kib,
+            "available_kib": self.available_kib,
+            "policy": asdict(self.policy),
+        }
+
+    def publish(self) -> None:
+        """Log the peak RSS and write the report for the session to read."""
+        logger.info(
+            f"Wizard memory: {self.policy.mode}, RSS {self.rss_kib} KiB, "
+            f"peak {self.peak_rss_kib} KiB, budget {self.budget_kib} KiB"
+        )
+        if self._report_directory is None:
+            return
+        try:
+            write_report(self._report_directory, self.report())
+        except OSError as error:
+            logger.debug(f"Could not write the memory report: {error}")
+
+
+def write_report(directory: Path, report: dict[str, object]) -> None:
+    payload = json.dumps(report, separators=(",", ":")).encode("utf-8")
+    write_atomically(user_file(directory, "wizard"), payload)
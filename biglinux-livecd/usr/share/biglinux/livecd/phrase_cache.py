@@ -0,0 +1,162 @@
+"""Byte-budgeted cache of synthesized speech for the live wizard.
+
+Button labels and step titles are announced over and over while the user
+moves focus around, and each announcement used to run Kokoro again. Clips
+are kept in RAM up to a byte budget and evicted least recently used first;
+evicted clips may spill to a tmpfs directory with a budget of its own, so
+neither tier can grow with the length of the session.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+PhraseKey = tuple[str, str, str]
+
+DEFAULT_MEMORY_BUDGET = 8 * 1024 * 1024
+DEFAULT_SPILL_BUDGET = 32 * 1024 * 1024
+
+
+@dataclass
+class CacheStatistics:
+    hits: int = 0
+    spill_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class PhraseCache:
+    """LRU map of (text, voice, speed) to WAV bytes with a RAM byte budget."""
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        *,
+        spill_directory: str | None = None,
+        spill_budget: int = DEFAULT_SPILL_BUDGET,
+    ) -> None:
+        self.memory_budget = memory_budget
+        self.spill_budget = spill_budget if spill_directory else 0
+        self.statistics = CacheStatistics()
+        self._spill_directory = spill_directory
+        self._memory: OrderedDict[PhraseKey, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._spilled: OrderedDict[PhraseKey, tuple[str, int]] = OrderedDict()
+        self._spilled_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    @property
+    def spilled_bytes(self) -> int:
+        return self._spilled_bytes
+
+    def get(self, key: PhraseKey) -> bytes | None:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.statistics.hits += 1
+                return audio
+            spilled = self._spilled.pop(key, None)
+            if spilled is None:
+                self.statistics.misses += 1
+                return None
+            path, size = spilled
+            self._spilled_bytes -= size
+            try:
+                with open(path, "rb") as spill_file:
+                    audio = spill_file.read()
+            except OSError:
+                audio = None
+            _unlink(path)
+            if audio is None:
+                self.statistics.misses += 1
+                return None
+            self.statistics.spill_hits += 1
+            self._store(key, audio)
+            return audio
+
+    def put(self, key: PhraseKey, audio: bytes) -> None:
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            spilled = self._spilled.pop(key, None)
+            if spilled is not None:
+                self._spilled_bytes -= spilled[1]
+                _unlink(spilled[0])
+            self._store(key, audio)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path, _size in self._spilled.values():
+                _unlink(path)
+            self._spilled.clear()
+            self._spilled_bytes = 0
+
+    def _store(self, key: PhraseKey, audio: bytes) -> None:
+        if len(audio) > self.memory_budget:
+            self._spill(key, audio)
+            return
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_budget:
+            old_key, old_audio = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_audio)
+            self.statistics.evictions += 1
+            self._spill(old_key, old_audio)
+
+    def _spill(self, key: PhraseKey, audio: bytes) -> None:
+        if self._spill_directory is None or len(audio) > self.spill_budget:
+            return
+        while self._spilled_bytes + len(audio) > self.spill_budget:
+            _old_key, (old_path, old_size) = self._spilled.popitem(last=False)
+            self._spilled_bytes -= old_size
+            _unlink(old_path)
+        name = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+        path = os.path.join(self._spill_directory, f"{name}.wav")
+        try:
+            descriptor = os.open(
+                path,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC | os.O_NOFOLLOW,
+                0o600,
+            )
+            with os.fdopen(descriptor, "wb") as spill_file:
+                spill_file.write(audio)
+        except OSError as error:
+            logger.debug("Could not spill speech clip: %s", error)
+            _unlink(path)
+            return
+        self._spilled[key] = (path, len(audio))
+        self._spilled_bytes += len(audio)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def default_spill_directory() -> str | None:
+    """Return a private directory on the session tmpfs, when there is one."""
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_directory or not os.path.isdir(runtime_directory):
+        return None
+    try:
+        return tempfile.mkdtemp(prefix="biglinux-speech-", dir=runtime_directory)
+    except OSError:
+        return None
@@ -1,12 +1,18 @@
-import json
 import os
 import re
+import shutil
 import subprocess
-import tempfile
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Tuple
 
+from apply_graph import ApplyGraph, StepAction, StepResult, run_process
+from catalog import CATALOG_DIRECTORY, DESKTOP, Catalog, CatalogSources, load_catalog
 from config import SetupConfig
 from desktop_theme import (
+    SettingsDocuments,
     apply_packaged_theme,
     available_theme_names,
     modify_settings_file,
@@ -17,11 +23,49 @@ from desktop_theme import (
 )
 from gnome_layout import LAYOUT_DISPLAY_NAMES, LAYOUT_NAMES, normalize_layout_text
 from logging_config import get_logger
+from settings_bus import (
+    BusCall,
+    CallResult,
+    SettingsBus,
+    set_locale,
+    set_ntp,
+    set_timezone,
+    set_x11_keyboard,
+)
 from user_config import update_ini_file
 from user_config import write_text as write_user_config_text
 
+_installed_library = Path("/usr/lib/biglinux-livecd")
+_development_library = Path(__file__).resolve().parents[3] / "lib/biglinux-livecd"
+sys.path.insert(
+    0, str(_installed_library if _installed_library.is_dir() else _development_library)
+)
+from live_facts import (  # noqa: E402
+    LiveFacts,
+    detect_contrast_profile,
+    detect_desktop_environment,
+    detect_virtual_machine,
+    load_snapshot,
+    read_total_memory_kib,
+    resolve_live_profile,
+)
+from live_state import (  # noqa: E402
+    commit_state,
+    key_for_legacy_name,
+    read_state,
+    validate_value,
+)
+
 logger = get_logger()
 
+APPLY_WORKERS = 4
+
+
+def _log_background_status(command: List[str], future: Future[int]) -> None:
+    status = future.result()
+    if status:
+        logger.warning(f"Command '{' '.join(command)}' exited with status {status}")
+
 
 class SystemService:
     def __init__(self, test_mode: bool = False):
@@ -66,7 +110,23 @@ class SystemService:
         self.theme_state_file = "/tmp/big_desktop_theme"
         self.jamesdsp_state_file = "/tmp/big_enable_jamesdsp"
         self.display_profile_state_file = "/tmp/big_improve_display"
+        # Choices are staged here and committed together when the user
+        # confirms; None removes a name. Apply workers stage concurrently.
+        self._staged_live_state: dict[str, str | None] = {}
+        self._live_state_lock = threading.Lock()
         self._gnome_input_sources: str | None = None
+        # Published by livecd-tweaks at boot; None means detect on demand.
+        self.live_facts: LiveFacts | None = load_snapshot()
+        self.settings_bus = SettingsBus()
+        self._catalog: Catalog | None = None
+        self._catalog_lock = threading.Lock()
+        # xfconfd answers on the session bus.
+        self.session_settings_bus = SettingsBus(session=True)
+        # Background commands and apply steps share one bounded pool; its
+        # workers wait for every child, so none is left a zombie.
+        self._apply_executor = ThreadPoolExecutor(
+            max_workers=APPLY_WORKERS, thread_name_prefix="livecd-apply"
+        )
 
     def _run_command(
         self,
@@ -104,10 +164,13 @@ class SystemService:
                 )
                 return True, result.stdout.strip()
             else:
-                # Run in the background and detach
-                # Redirect stdout/stderr to /dev/null to prevent terminal clutter
-                subprocess.Popen(
-                    command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                # Run in the background; a worker waits for it and logs a
+                # failing exit status. Output goes to /dev/null.
+                if shutil.which(command[0]) is None:
+                    raise FileNotFoundError(command[0])
+                future = self._apply_executor.submit(run_process, command)
+                future.add_done_callback(
+                    lambda done: _log_background_status(command, done)
                 )
                 return True, ""  # Assume success on launch
         except FileNotFoundError:
@@ -125,72 +188,74 @@ class SystemService:
             logger.error(err_msg)
             return False, str(e)
 
-    def _write_live_state_file(self, filepath: str, content: str) -> bool:
-        """Atomically commit one boot-scoped live state file."""
-        if self.test_mode:
-            logger.debug(
-                f"[TEST MODE] Suppressed write to {filepath}: '{content[:50]}{'...' if len(content) > 50 else ''}'"
-            )
-            return True
+    def _live_state_name(self, filepath: str) -> str | None:
         if os.path.dirname(filepath) != self.live_state_dir:
             logger.error("Refusing live state path outside the contract directory")
+            return None
+        name = key_for_legacy_name(os.path.basename(filepath))
+        if name is None:
+            logger.error(f"Refusing unknown live state file: {filepath}")
+        return name
+
+    def _write_live_state_file(self, filepath: str, content: str) -> bool:
+        """Stage one live state value until ``commit_live_state``."""
+        name = self._live_state_name(filepath)
+        if name is None:
             return False
-        temporary_path = ""
         try:
-            directory_stat = os.lstat(self.live_state_dir)
-            if not os.path.isdir(self.live_state_dir) or os.path.islink(
-                self.live_state_dir
-            ):
-                raise OSError("live state directory is missing or unsafe")
-            with tempfile.NamedTemporaryFile(
-                mode="w",
-                encoding="utf-8",
-                dir=self.live_state_dir,
-                prefix=f".{os.path.basename(filepath)}.",
-                delete=False,
-            ) as temporary_file:
-                temporary_path = temporary_file.name
-                temporary_file.write(content)
-            os.chmod(temporary_path, 0o600)
-            os.replace(temporary_path, filepath)
-            temporary_path = ""
-            directory_fd = os.open(
-                self.live_state_dir, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW
-            )
-            try:
-                verified_directory = os.fstat(directory_fd)
-                if (verified_directory.st_dev, verified_directory.st_ino) != (
-                    directory_stat.st_dev,
-                    directory_stat.st_ino,
-                ):
-                    raise OSError("live state directory changed while writing")
-            finally:
-                os.close(directory_fd)
-            return True
-        except OSError as e:
-            logger.error(f"Error writing to {filepath}: {e}")
+            validate_value(name, content)
+        except ValueError as error:
+            logger.error(f"Error staging {filepath}: {error}")
             return False
-        finally:
-            if temporary_path:
-                try:
-                    os.unlink(temporary_path)
-                except FileNotFoundError:
-                    pass
+        with self._live_state_lock:
+            self._staged_live_state[name] = content
+        return True
 
     def _remove_live_state_file(self, filepath: str) -> bool:
-        if self.test_mode:
-            logger.debug(f"[TEST MODE] Suppressed removal of {filepath}")
-            return True
-        if os.path.dirname(filepath) != self.live_state_dir:
-            logger.error("Refusing live state path outside the contract directory")
-            return False
-        try:
-            os.unlink(filepath)
-        except FileNotFoundError:
-            return True
-        except OSError as error:
-            logger.error(f"Error removing {filepath}: {error}")
+        name = self._live_state_name(filepath)
+        if name is None:
             return False
+        with self._live_state_lock:
+            self._staged_live_state[name] = None
+        return True
+
+    def _read_live_state_file(self, filepath: str) -> str | None:
+        """The staged value for ``filepath``, else the committed one."""
+        name = self._live_state_name(filepath)
+        if name is None:
+            return None
+        with self._live_state_lock:
+            if name in self._staged_live_state:
+                return self._staged_live_state[name]
+        return read_state(Path(self.live_state_dir)).get(name)
+
+    def commit_live_state(self) -> bool:
+        """Publish every staged choice as one state document."""
+        with self._live_state_lock:
+            changes = dict(self._staged_live_state)
+        if self.test_mode:
+            logger.debug(f"[TEST MODE] Suppressed live state commit: {sorted(changes)}")
+        else:
+            try:
+                report = commit_state(changes, Path(self.live_state_dir))
+            except (OSError, ValueError) as error:
+                logger.error(f"Error committing the live state: {error}")
+                return False
+            logger.info(
+                "Committed %d live state values in %.1f ms "
+                "(%d legacy files exported, %d removed)",
+                report.changed,
+                report.duration * 1000,
+                report.exported,
+                report.removed,
+            )
+        with self._live_state_lock:
+            # A value staged again while committing waits for the next commit.
+            for name, value in changes.items():
+                if name in self._staged_live_state and (
+                    self._staged_live_state[name] is value
+                ):
+                    del self._staged_live_state[name]
         return True
 
     def _write_user_config_file(self, filepath: str, content: str) -> bool:
@@ -235,29 +300,70 @@ class SystemService:
         logger.info(f"Setting language to {lang_code} and timezone to {timezone}")
         self._write_live_state_file(self.language_state_file, lang_code)
 
-        self._run_command(["timedatectl", "set-timezone", timezone], as_root=True)
-        self._run_command(["timedatectl", "set-ntp", "1"], as_root=True)
-        self._run_command(
-            ["localectl", "set-locale", f"LANG={lang_code}.UTF-8"], as_root=True
+        self._apply_system_settings(
+            [
+                set_timezone(timezone),
+                set_ntp(True),
+                set_locale(f"{lang_code}.UTF-8"),
+            ]
         )
 
+    def _apply_system_settings(self, calls: list[BusCall]) -> None:
+        """Make the calls over D-Bus; run the old command for any that fail."""
+        self._apply_bus_calls(self.settings_bus, calls, as_root=True)
+
+    def _apply_xfconf_settings(self, calls: list[BusCall]) -> list[CallResult]:
+        """Set xfconf properties in one batch; ``xfconf-query`` if xfconfd fails.
+
+        Returns the calls xfconfd did not accept, whose fallback was run.
+        """
+        return self._apply_bus_calls(self.session_settings_bus, calls, as_root=False)
+
+    def _apply_bus_calls(
+        self, bus: SettingsBus, calls: list[BusCall], *, as_root: bool
+    ) -> list[CallResult]:
+        if self.test_mode:
+            for call in calls:
+                logger.debug(f"[TEST MODE] Suppressed D-Bus call: {call.method}")
+            return []
+        failed = []
+        for result in bus.run(calls):
+            if result.error is None:
+                logger.info(
+                    "%s answered in %.1f ms", result.call.method, result.latency * 1000
+                )
+                continue
+            # The whole command names the property that failed, not just the tool.
+            logger.warning(
+                "%s failed over D-Bus after %.1f ms (%s); running %s",
+                result.call.method,
+                result.latency * 1000,
+                result.error,
+                " ".join(result.call.fallback),
+            )
+            failed.append(result)
+            self._run_command(list(result.call.fallback), as_root=as_root)
+        return failed
+
     def apply_keyboard_layout(self, layout: str):
         """Applies the selected keyboard layout."""
         logger.info(f"Setting keyboard layout to: {layout}")
         layout_cleaned = layout.replace("\\", "")
         self._write_live_state_file(self.keyboard_state_file, layout_cleaned)
-        self._run_command(["setxkbmap", layout_cleaned])
         xkb_layout, xkb_variant = self._split_xkb_layout(layout_cleaned)
-        self._run_command(
+        # The same form startbiglive replays; any variant from the layout
+        # browser goes through as chosen.
+        if xkb_variant:
+            self._run_command(["setxkbmap", xkb_layout, "-variant", xkb_variant])
+        else:
+            self._run_command(["setxkbmap", xkb_layout])
+        xkb_id = f"{xkb_layout}+{xkb_variant}" if xkb_variant else xkb_layout
+        self._apply_system_settings(
             [
-                "localectl",
-                "set-x11-keymap",
-                xkb_layout,
-                "pc105",
-                xkb_variant,
-                "terminate:ctrl_alt_bksp",
-            ],
-            as_root=True,
+                set_x11_keyboard(
+                    xkb_layout, "pc105", xkb_variant, "terminate:ctrl_alt_bksp"
+                )
+            ]
         )
 
         home = os.path.expanduser("~")
@@ -267,7 +373,8 @@ class SystemService:
             # Configure keyboard layout via dconf settings file for Cinnamon
             settings_file = settings_file_path(desktop_env)
             if settings_file:
-                sources_value = f"[('xkb', '{layout_cleaned}')]"
+                # Input sources name variants "layout+variant", like GNOME's.
+                sources_value = f"[('xkb', '{xkb_id}')]"
                 modify_settings_file(
                     self,
                     settings_file,
@@ -282,7 +389,6 @@ class SystemService:
                     f"Configured keyboard layout '{layout_cleaned}' in settings.cinnamon"
                 )
         elif desktop_env == "GNOME":
-            xkb_id = f"{xkb_layout}+{xkb_variant}" if xkb_variant else xkb_layout
             self._gnome_input_sources = f"[('xkb', '{xkb_id}')]"
             settings_file = settings_file_path(desktop_env)
             self._stamp_gnome_input_sources(settings_file)
@@ -304,23 +410,34 @@ class SystemService:
             )
             self._write_user_config_file(kxkbrc_path, kxkbrc_content)
 
+    def get_catalog(self) -> Catalog:
+        """Themes and desktop layouts, scanned once and cached for the boot.
+
+        A catalog missing a failed listing is not kept; the next call scans.
+        """
+        with self._catalog_lock:
+            if self._catalog is not None:
+                return self._catalog
+            catalog = load_catalog(
+                CatalogSources(
+                    desktop_environment=self.get_desktop_environment(),
+                    theme_list_script=self.theme_list_script,
+                    desktop_list_script=self.desktop_list_script,
+                    theme_preview=self.theme_image_path,
+                    desktop_preview=self.desktop_image_path,
+                    gnome_layouts=self.gnome_layouts_path,
+                    gnome_icons=self.gnome_layouts_icons_path,
+                ),
+                lambda command: self._run_command(command, read_only=True),
+                None if self.test_mode else CATALOG_DIRECTORY,
+            )
+            if catalog.complete:
+                self._catalog = catalog
+            return catalog
+
     def get_available_desktops(self) -> List[str]:
         """Returns a list of available desktop layout names."""
-        if self.get_desktop_environment() == "GNOME":
-            layouts = [
-                layout
-                for layout in LAYOUT_NAMES
-                if os.path.exists(self._get_gnome_layout_file_path(layout))
-            ]
-            if not layouts:
-                logger.warning(f"No GNOME layouts found at {self.gnome_layouts_path}")
-            return layouts
-
-        if not os.path.exists(self.desktop_list_script):
-            logger.warning(f"Desktop script not found at {self.desktop_list_script}")
-            return []
-        success, output = self._run_command([self.desktop_list_script], read_only=True)
-        return output.splitlines() if success else []
+        return self.get_catalog().names(DESKTOP)
 
     def apply_desktop_layout(self, layout: str):
         """Applies the selected desktop layout."""
@@ -346,16 +463,16 @@ class SystemService:
             logger.error(f"Failed to read GNOME layout {layout_file}: {e}")
             return
 
-        settings_text = normalize_layout_text(layout_text)
         settings_file = settings_file_path("GNOME")
-        if not self._write_user_config_file(settings_file, settings_text):
+        documents = SettingsDocuments()
+        documents.replace(settings_file, normalize_layout_text(layout_text))
+        self._stamp_gnome_input_sources(settings_file, documents)
+        if not documents.commit(self._write_user_config_file):
             return
 
-        self._stamp_gnome_input_sources(settings_file)
-
         self._write_live_state_file(self.desktop_state_file, layout)
         self._write_live_state_file(self.gnome_layout_state_file, layout)
-        self._sync_gnome_settings_tmp()
+        self._sync_gnome_settings_tmp(documents.text(settings_file))
         logger.info(f"Prepared GNOME layout '{layout}' in {settings_file}")
 
     def get_available_themes(self) -> List[str]:
@@ -370,20 +487,49 @@ class SystemService:
         """Apply an allowlisted light or dark desktop theme."""
         return apply_simple_desktop_theme(self, theme)
 
-    def finalize_setup(self, config: SetupConfig):
+    def finalize_setup(
+        self, config: SetupConfig, *, restart_compositor: bool = True
+    ) -> ApplyGraph:
         """
         Performs final setup steps, including creating flag files.
 
         All config files are saved under /run/biglinux-live during the live session.
         Calamares will copy them to /etc/big-default-config/ on the installed system.
+
+        The steps run concurrently where they can; the compositor restart waits
+        for all of them. Returns the graph so callers can wait on it. The wizard
+        passes ``restart_compositor=False`` and restarts it when the user leaves.
         """
         logger.info("Finalizing setup...")
 
-        self._finalize_jamesdsp(config.enable_jamesdsp)
-        self._finalize_display_profile(config.enable_enhanced_contrast)
-        self._run_command(["killall", "kwin_wayland"])
+        graph = ApplyGraph(self._apply_executor)
+        self._finalize_jamesdsp(graph, config.enable_jamesdsp)
+        self._finalize_display_profile(graph, config.enable_enhanced_contrast)
+        self.commit_live_state()
+        if restart_compositor:
+            self.restart_compositor(graph)
+        return graph
+
+    def restart_compositor(self, graph: ApplyGraph) -> Future[StepResult]:
+        """Restart the compositor once every step already in ``graph`` is done."""
+        restart = graph.add(
+            "restart-compositor",
+            self._command_step(["killall", "kwin_wayland"]),
+            after=graph.futures,
+        )
+        restart.add_done_callback(lambda _future: graph.report())
+        return restart
+
+    def _command_step(self, command: List[str]) -> StepAction:
+        def run() -> int:
+            if self.test_mode:
+                logger.debug(f"[TEST MODE] Suppressed step: {' '.join(command)}")
+                return 0
+            return run_process(command)
+
+        return run
 
-    def _finalize_jamesdsp(self, is_enabled: bool) -> None:
+    def _finalize_jamesdsp(self, graph: ApplyGraph, is_enabled: bool) -> None:
         jamesdsp_conf = os.path.expanduser("~/.config/jamesdsp/application.conf")
         replacement = (
             "s|AutoStartEnabled=false|AutoStartEnabled=true|g"
@@ -395,20 +541,32 @@ class SystemService:
             self._write_live_state_file(self.jamesdsp_state_file, "enabled")
         else:
             self._remove_live_state_file(self.jamesdsp_state_file)
-        if os.path.exists(jamesdsp_conf):
-            self._run_command(["sed", "-i", replacement, jamesdsp_conf], as_root=False)
-            self._run_command(
-                ["systemctl", "--user", service_action, "jamesdsp-autostart.service"],
-                as_root=False,
-            )
+        if not os.path.exists(jamesdsp_conf):
+            return
+        # The service reads the file when it starts: restarting it while sed
+        # was still rewriting it used to pick up the old setting.
+        graph.add(
+            "jamesdsp-config",
+            self._command_step(["sed", "-i", replacement, jamesdsp_conf]),
+        )
+        graph.add(
+            "jamesdsp-service",
+            self._command_step(
+                ["systemctl", "--user", service_action, "jamesdsp-autostart.service"]
+            ),
+            after=["jamesdsp-config"],
+        )
 
-    def _finalize_display_profile(self, is_enabled: bool) -> None:
+    def _finalize_display_profile(self, graph: ApplyGraph, is_enabled: bool) -> None:
         action = "enable" if is_enabled else "disable"
         if is_enabled:
             self._write_live_state_file(self.display_profile_state_file, "enabled")
         else:
             self._remove_live_state_file(self.display_profile_state_file)
-        self._run_command(["/usr/bin/icc_profile_apply", action], as_root=False)
+        graph.add(
+            "display-profile",
+            self._command_step(["/usr/bin/icc_profile_apply", action]),
+        )
 
     def get_desktop_image_path(self, layout_name: str) -> str:
         if self.get_desktop_environment() == "GNOME":
@@ -421,50 +579,18 @@ class SystemService:
     def get_desktop_display_name(self, layout_name: str) -> str:
         return LAYOUT_DISPLAY_NAMES.get(layout_name, layout_name)
 
-    def apply_jamesdsp_settings(self, enabled: bool):
+    def apply_jamesdsp_settings(self, enabled: bool) -> ApplyGraph:
         """
         Applies JamesDSP configuration immediately.
         This is called when a theme is selected, based on the switch state.
+        The service is restarted or stopped only once the config is rewritten,
+        as in finalize_setup.
         """
-        home = os.path.expanduser("~")
-        jamesdsp_conf = os.path.join(home, ".config/jamesdsp/application.conf")
-
-        if enabled:
-            logger.info("Applying JamesDSP enabled settings...")
-            self._write_live_state_file(self.jamesdsp_state_file, "enabled")
-            if os.path.exists(jamesdsp_conf):
-                self._run_command(
-                    [
-                        "sed",
-                        "-i",
-                        "s|AutoStartEnabled=false|AutoStartEnabled=true|g",
-                        jamesdsp_conf,
-                    ],
-                    as_root=False,
-                )
-                # Restart the systemd service so JamesDSP actually starts
-                self._run_command(
-                    ["systemctl", "--user", "restart", "jamesdsp-autostart.service"],
-                    as_root=False,
-                )
-        else:
-            logger.info("Applying JamesDSP disabled settings...")
-            self._remove_live_state_file(self.jamesdsp_state_file)
-            if os.path.exists(jamesdsp_conf):
-                self._run_command(
-                    [
-                        "sed",
-                        "-i",
-                        "s|AutoStartEnabled=true|AutoStartEnabled=false|g",
-                        jamesdsp_conf,
-                    ],
-                    as_root=False,
-                )
-                # Stop the systemd service so JamesDSP actually stops
-                self._run_command(
-                    ["systemctl", "--user", "stop", "jamesdsp-autostart.service"],
-                    as_root=False,
-                )
+        state = "enabled" if enabled else "disabled"
+        logger.info(f"Applying JamesDSP {state} settings...")
+        graph = ApplyGraph(self._apply_executor)
+        self._finalize_jamesdsp(graph, enabled)
+        return graph
 
     def apply_icc_profile_settings(self, enabled: bool):
         """
@@ -492,7 +618,10 @@ class SystemService:
 
     def check_enhanced_contrast_availability(self) -> bool:
         """Checks for the AppleRGB ICC profile and if running on Wayland."""
-        icc_profile_exists = os.path.exists("/usr/share/color/icc/colord/ECI-RGBv1.icc")
+        if self.live_facts is not None:
+            icc_profile_exists = self.live_facts.contrast_profile
+        else:
+            icc_profile_exists = detect_contrast_profile()
         logger.debug(f"ICC profile exists: {icc_profile_exists}")
 
         # Check if running on Wayland (works for GNOME, KDE, etc)
@@ -528,40 +657,25 @@ class SystemService:
 
     def get_total_memory_gb(self) -> float:
         """Gets total system memory in Gigabytes from /proc/meminfo."""
-        try:
-            with open("/proc/meminfo", "r", encoding="utf-8") as f:
-                meminfo = f.read()
-            match = re.search(r"MemTotal:\s+(\d+)\s+kB", meminfo)
-            if match:
-                kb = int(match.group(1))
-                gb = kb / (1024 * 1024)
-                return gb
-        except (FileNotFoundError, ValueError, IndexError) as e:
-            logger.warning(f"Could not read or parse /proc/meminfo: {e}")
-        return 0.0  # Safe fallback
+        if self.live_facts is not None:
+            kib = self.live_facts.total_memory_kib
+        else:
+            kib = read_total_memory_kib()
+            if not kib:
+                logger.warning("Could not read or parse /proc/meminfo")
+        return kib / (1024 * 1024)
 
     def is_virtual_machine(self) -> bool:
         """Checks if the system is running inside a virtual machine using systemd-detect-virt."""
-        try:
-            # systemd-detect-virt returns 0 if in a VM, 1 otherwise.
-            result = subprocess.run(
-                ["systemd-detect-virt"], capture_output=True, check=False
-            )
-            return result.returncode == 0
-        except FileNotFoundError:
-            # Fallback if the command doesn't exist. Assume not a VM for safety.
-            return False
+        if self.live_facts is not None:
+            return self.live_facts.virtual_machine
+        return detect_virtual_machine()
 
     def get_desktop_environment(self) -> str:
         """Detects the desktop environment by checking specific startup files."""
-        if os.path.exists("/usr/bin/startgnome-community"):
-            return "GNOME"
-        elif os.path.exists("/usr/bin/startcinnamon-community"):
-            return "Cinnamon"
-        elif os.path.exists("/usr/bin/startxfce-community"):
-            return "XFCE"
-        else:
-            return "other"
+        if self.live_facts is not None:
+            return self.live_facts.desktop_environment
+        return detect_desktop_environment()
 
     def is_simplified_environment(self) -> bool:
         """Checks if we should use simplified UI (GNOME/XFCE/Cinnamon)."""
@@ -589,13 +703,18 @@ class SystemService:
             return match.group(1), match.group(2)
         return layout, ""
 
-    def _stamp_gnome_input_sources(self, settings_file: str) -> None:
-        if not self._gnome_input_sources or not os.path.isfile(settings_file):
+    def _stamp_gnome_input_sources(
+        self, settings_file: str, documents: SettingsDocuments | None = None
+    ) -> None:
+        if not self._gnome_input_sources:
+            return
+        if documents is None and not os.path.isfile(settings_file):
             return
         modify_settings_file(
             self,
             settings_file,
             {"org/gnome/desktop/input-sources": {"sources": self._gnome_input_sources}},
+            documents,
         )
 
     def _ensure_gnome_settings_file(self):
@@ -606,7 +725,11 @@ class SystemService:
         logger.info(f"Creating GNOME settings from default layout: {default_layout}")
         self.apply_gnome_desktop_layout(default_layout)
 
-    def _sync_gnome_settings_tmp(self):
+    def _sync_gnome_settings_tmp(self, text: str | None = None):
+        """Stage the GNOME settings; ``text`` saves reading what was just written."""
+        if text is not None:
+            self._write_live_state_file(self.gnome_settings_state_file, text)
+            return
         settings_file = settings_file_path("GNOME")
         if not os.path.exists(settings_file):
             return
@@ -622,36 +745,10 @@ class SystemService:
         """Read the profile metadata used by the live wizard and installer."""
         if SystemService._profile_cache is not None:
             return SystemService._profile_cache
-        try:
-            result = subprocess.run(
-                ["/usr/lib/biglinux-livecd/resolve-profile", "--path"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10,
-            )
-            profile_directory = result.stdout.strip()
-            profile_path = os.path.join(profile_directory, "profile.json")
-            with open(profile_path, encoding="utf-8") as profile_file:
-                profile = json.load(profile_file)
-            if not isinstance(profile, dict):
-                raise ValueError("profile metadata is not an object")
-            profile["directory"] = profile_directory
-        # A hand-edited or truncated profile.json raises JSONDecodeError, and a
-        # profile that is not an object raises ValueError below: neither was
-        # caught, so either one aborted the wizard on startup instead of
-        # falling back to the defaults this except clause exists to provide.
-        except (
-            OSError,
-            ValueError,
-            subprocess.CalledProcessError,
-            subprocess.TimeoutExpired,
-        ):
-            profile = {
-                "id": "biglinux",
-                "display_name": "BigLinux",
-                "directory": "/usr/share/biglinux/calamares-profiles/biglinux",
-            }
+        if self.live_facts is not None and self.live_facts.profile:
+            profile = dict(self.live_facts.profile)
+        else:
+            profile = resolve_live_profile()
         SystemService._profile_cache = profile
         return profile
 
@@ -0,0 +1,13 @@
+"""Boot timeline recorder shared with the shell stages of the live session."""
+
+import sys
+from pathlib import Path
+
+_installed_library = Path("/usr/lib/biglinux-livecd")
+_development_library = Path(__file__).resolve().parents[3] / "lib/biglinux-livecd"
+sys.path.insert(
+    0, str(_installed_library if _installed_library.is_dir() else _development_library)
+)
+from boot_timeline import mark, set_source, span  # noqa: E402
+
+__all__ = ["mark", "set_source", "span"]
@@ -1,8 +1,16 @@
 """
 Translation utility module to ensure consistent translations throughout the application
+
+Catalogs are parsed once per language and kept: the language page prefetches
+the catalog of the focused language on a worker thread while the user is
+still choosing, so confirming a language only swaps the active catalog.
+``language_generation`` changes on every switch, which lets the window
+retranslate a page only when it is shown.
 """
 
 import gettext
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from logging_config import get_logger
 
@@ -15,21 +23,24 @@ LOCALE_DIR = "/usr/share/locale"
 # This module-level variable will hold the current translation object.
 # It's initialized with a "null" translation, which just returns the original string.
 _translation_instance = gettext.NullTranslations()
+_generation = 0
 
+# Parsed catalogs by language code; None is the environment's language.
+_catalogs: dict[str | None, gettext.NullTranslations] = {}
+_prefetches: dict[str | None, Future[gettext.NullTranslations]] = {}
+_catalog_lock = threading.Lock()
+_prefetch_executor: ThreadPoolExecutor | None = None
 
-def set_language(lang_code=None):
-    """
-    Sets the active translation for the entire application.
 
-    Args:
-        lang_code (str, optional): The language code (e.g., 'pt', 'es').
-                                   If None, gettext uses environment variables.
-    """
-    global _translation_instance
+def _load_catalog(lang_code=None) -> gettext.NullTranslations:
+    with _catalog_lock:
+        cached = _catalogs.get(lang_code)
+    if cached is not None:
+        return cached
     try:
         # gettext.translation handles finding the best .mo file and fallbacks
         # (e.g., pt_BR -> pt -> default).
-        _translation_instance = gettext.translation(
+        translation = gettext.translation(
             APP_NAME,
             localedir=LOCALE_DIR,
             languages=[lang_code] if lang_code else None,
@@ -40,7 +51,43 @@ def set_language(lang_code=None):
         logger.warning(
             f"Translation for '{lang_code}' not found in '{LOCALE_DIR}'. Using default (English)."
         )
-        _translation_instance = gettext.NullTranslations()
+        translation = gettext.NullTranslations()
+    with _catalog_lock:
+        return _catalogs.setdefault(lang_code, translation)
+
+
+def prefetch_language(lang_code) -> Future[gettext.NullTranslations]:
+    """Parse the catalog for ``lang_code`` in the background; one load each."""
+    global _prefetch_executor
+    with _catalog_lock:
+        future = _prefetches.get(lang_code)
+        if future is None:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="livecd-catalog"
+                )
+            future = _prefetch_executor.submit(_load_catalog, lang_code)
+            _prefetches[lang_code] = future
+    return future
+
+
+def set_language(lang_code=None):
+    """
+    Sets the active translation for the entire application.
+
+    Args:
+        lang_code (str, optional): The language code (e.g., 'pt', 'es').
+                                   If None, gettext uses environment variables.
+    """
+    global _translation_instance, _generation
+    # A prefetched catalog is already parsed; otherwise this loads it now.
+    _translation_instance = _load_catalog(lang_code)
+    _generation += 1
+
+
+def language_generation() -> int:
+    """Changes whenever the active language does."""
+    return _generation
 
 
 def _(message):
@@ -51,6 +98,11 @@ def _(message):
     return _translation_instance.gettext(message)
 
 
+def ngettext(singular, plural, count):
+    """The form of a counted message that the active language uses for ``count``."""
+    return _translation_instance.ngettext(singular, plural, count)
+
+
 # Initialize with the system's default language on startup.
 # This ensures that if the app starts before a language is selected, it uses
 # the system's locale settings (e.g., from the LANG environment variable).
@@ -6,8 +6,10 @@ gi.require_version("GdkPixbuf", "2.0")
 import importlib
 import os
 import threading
-from collections.abc import Callable
-from concurrent.futures import Future, ThreadPoolExecutor
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_for_futures
 from typing import Any
 
 from accessibility import (
@@ -17,12 +19,18 @@ from accessibility import (
     set_accessibility_enabled,
     speak,
 )
+from apply_graph import ApplyGraph
 from config import SetupConfig
+from finish_tracker import FinishStep, FinishTracker
 from gi.repository import Adw, Gdk, GdkPixbuf, GLib, Gtk
+from icon_atlas import STEP_GROUP, get_icon_atlas
 from logging_config import get_logger
+from memory_governor import CHECK_INTERVAL_SECONDS, MemoryGovernor, MemoryPolicy
 from services import SystemService
-from translations import _, set_language
-from ui.language_view import LanguageView
+from translations import _, language_generation, set_language
+from ui.language_view import LanguageView, set_voice_cache_limit
+from ui.preview_loader import display_scale, get_preview_loader
+from ui.work_scheduler import PRIORITY_NEXT, get_work_scheduler
 
 logger = get_logger()
 
@@ -32,6 +40,9 @@ ASSETS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "asse
 DEFAULT_LOGO_PATH = os.path.join(ASSETS_DIR, "logo.png")
 DEFAULT_COMM_LOGO_PATH = os.path.join(ASSETS_DIR, "comm-logo.png")
 
+# How long the finish waits for queued system updates before giving up on them.
+SYSTEM_UPDATE_TIMEOUT = 15
+
 
 def get_logo_path(system_service: SystemService | None = None):
     """Return the selected profile logo or the BigLinux fallback."""
@@ -53,6 +64,11 @@ def get_comm_logo_path(system_service: SystemService | None = None):
 
 def load_svg_texture(path, size):
     """Load SVG as Gdk.Texture for better GTK4 scaling."""
+    if os.path.dirname(path) == ASSETS_DIR:
+        name = os.path.splitext(os.path.basename(path))[0]
+        texture = get_icon_atlas().texture(STEP_GROUP, name, size, display_scale())
+        if texture is not None:
+            return texture
     try:
         pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_size(path, size, size)
         if pixbuf is None:
@@ -78,7 +94,13 @@ class AppWindow(Adw.ApplicationWindow):
         self._system_updates = ThreadPoolExecutor(
             max_workers=1, thread_name_prefix="livecd-system-update"
         )
-        self._last_system_update: Future[Any] | None = None
+        self._finish_worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="livecd-finish"
+        )
+        self._finish = FinishTracker()
+        self._finish_view: Any | None = None
+        self._finish_started: float | None = None
+        self._settings_graph: ApplyGraph | None = None
         self._speechd_client: Any | None = None
         self._preload_modules = [
             "ui.keyboard_view",
@@ -88,6 +110,13 @@ class AppWindow(Adw.ApplicationWindow):
         self._theme_runtime_states: dict[bool, Any] = {}
         self._pending_view_name: str | None = None
         self._preload_started = False
+        self._scheduler = get_work_scheduler()
+        self._memory = MemoryGovernor(system_service.get_total_memory_gb())
+        self._memory.add_listener(self._apply_memory_policy)
+        # What the keyboard page was built for, to rebuild it once released.
+        self._keyboard_primary_layout = "us"
+        # Language generation each page was last translated for.
+        self._translated_generation: dict[str, int] = {}
         self.has_desktop_step = system_service.has_desktop_layout_step()
         self.uses_simple_theme = system_service.uses_simple_theme_selector()
         # Ensure ORCA is not running — user activates it manually via Super+Alt+S
@@ -132,6 +161,8 @@ class AppWindow(Adw.ApplicationWindow):
 
         self.set_content(self._build_ui())
         self._update_header_state()
+        self._memory.check()
+        GLib.timeout_add_seconds(CHECK_INTERVAL_SECONDS, self._check_memory)
 
         # Create and add a Gtk.EventControllerKey for global key events (CAPTURE phase
         # so it runs before child widgets like the search entry consume keys)
@@ -239,7 +270,6 @@ class AppWindow(Adw.ApplicationWindow):
             if not isinstance(page, Adw.ViewStackPage):
                 continue
 
-            view = page.get_child()
             view_name = page.get_name()
 
             # Update the title of the stack page
@@ -254,9 +284,26 @@ class AppWindow(Adw.ApplicationWindow):
             elif view_name == "simple_theme":
                 page.set_title(_("Theme"))
 
-            # Trigger re-translation within the view itself
-            if hasattr(view, "_retranslate_ui"):
-                view._retranslate_ui()
+        # Walking every page used to retranslate pages the user had not seen
+        # yet; only the visible one is done now, the rest when they are shown.
+        self._retranslate_view(self.stack.get_visible_child_name())
+
+    def _add_page(self, view: Gtk.Widget, view_name: str, title: str) -> None:
+        self.stack.add_titled(view, view_name, title)
+        self._translated_generation[view_name] = language_generation()
+
+    def _retranslate_view(self, view_name: str | None) -> None:
+        """Retranslate a page if the language changed since it was translated."""
+        if view_name is None:
+            return
+        generation = language_generation()
+        if self._translated_generation.get(view_name) == generation:
+            return
+        view = self.stack.get_child_by_name(view_name)
+        # Trigger re-translation within the view itself
+        if hasattr(view, "_retranslate_ui"):
+            view._retranslate_ui()
+        self._translated_generation[view_name] = generation
 
     def _ensure_view(self, view_name: str, *args) -> bool:
         """Creates and adds a view to the stack if it doesn't exist."""
@@ -267,8 +314,10 @@ class AppWindow(Adw.ApplicationWindow):
             if simplified_mode not in self._theme_runtime_states:
                 return False
         if not self.stack.get_child_by_name(view_name):
-            if view_name == "keyboard":
-                self._add_keyboard_view(*args)
+            if view_name == "language":
+                self._add_language_view()
+            elif view_name == "keyboard":
+                self._add_keyboard_view(*(args or (self._keyboard_primary_layout,)))
             elif view_name == "desktop":
                 self._add_desktop_view()
             elif view_name == "theme":
@@ -281,18 +330,18 @@ class AppWindow(Adw.ApplicationWindow):
         if self._preload_started:
             return
         self._preload_started = True
-        GLib.idle_add(self._preload_next_module)
-
-    def _preload_next_module(self) -> bool:
-        if not self._preload_modules:
-            return GLib.SOURCE_REMOVE
-        module_name = self._preload_modules.pop(0)
-        importlib.import_module(module_name)
-        if module_name == "ui.keyboard_view":
-            self._ensure_view("keyboard", "us")
-        elif module_name == "ui.theme_view":
-            self._start_theme_runtime_detection()
-        return bool(self._preload_modules)
+        self._scheduler.add("preload", self._preload_pages())
+
+    def _preload_pages(self) -> Iterator[None]:
+        """Import the later pages one unit at a time, then build the next one."""
+        for module_name in self._preload_modules:
+            importlib.import_module(module_name)
+            yield
+            if module_name == "ui.keyboard_view" and self._memory.policy.precache:
+                self._ensure_view("keyboard", "us")
+                yield
+            elif module_name == "ui.theme_view":
+                self._start_theme_runtime_detection()
 
     def _start_theme_runtime_detection(self) -> None:
         from ui.theme_view import ThemeRuntimeState
@@ -319,20 +368,71 @@ class AppWindow(Adw.ApplicationWindow):
         return GLib.SOURCE_REMOVE
 
     def _preload_following_views(self) -> bool:
-        if self.has_desktop_step:
-            self._ensure_view("desktop")
+        # Runs again when the theme runtime states arrive; a queued build
+        # picks them up when it reaches the theme page.
+        if not self._memory.policy.precache:
+            return GLib.SOURCE_REMOVE
+        if not self._scheduler.pending("following-pages"):
+            self._scheduler.add(
+                "following-pages", self._build_following_views(), priority=PRIORITY_NEXT
+            )
+        return GLib.SOURCE_REMOVE
+
+    def _build_following_views(self) -> Iterator[None]:
         theme_name = "simple_theme" if self.uses_simple_theme else "theme"
-        self._ensure_view(theme_name)
-        for view_name in ("desktop", theme_name):
+        view_names = ["desktop", theme_name] if self.has_desktop_step else [theme_name]
+        for view_name in view_names:
+            if not self._ensure_view(view_name):
+                continue
+            yield
             view = self.stack.get_child_by_name(view_name)
             if view is not None and hasattr(view, "load_items"):
                 view.load_items()
+                yield
+
+    def _check_memory(self) -> bool:
+        if self._finish_started is not None:
+            return GLib.SOURCE_REMOVE
+        self._memory.check()
+        return GLib.SOURCE_CONTINUE
+
+    def _apply_memory_policy(self, policy: MemoryPolicy) -> None:
+        if policy.max_textures is not None:
+            get_preview_loader().set_limit(policy.max_textures)
+        set_voice_cache_limit(policy.max_voice_clips)
+        language_view = self.stack.get_child_by_name("language")
+        if isinstance(language_view, LanguageView):
+            language_view.precache_enabled = policy.precache
+        if policy.release_hidden_pages:
+            self._release_hidden_pages()
+
+    # Pages rebuilt from self.config alone; the theme pages hold switches.
+    _RELEASABLE_PAGES = ("language", "keyboard", "desktop")
+
+    def _release_hidden_pages(self) -> bool:
+        """Destroy pages out of view; _ensure_view builds them again."""
+        visible = self.stack.get_visible_child_name()
+        for view_name in self._RELEASABLE_PAGES:
+            view = self.stack.get_child_by_name(view_name)
+            if view is None or view_name == visible:
+                continue
+            self.stack.remove(view)
+            self._translated_generation.pop(view_name, None)
+            logger.info(f"Released the hidden {view_name} page to save memory")
         return GLib.SOURCE_REMOVE
 
-    def _submit_system_update(self, operation: Callable[..., Any], *args: Any) -> None:
-        self._last_system_update = self._system_updates.submit(
-            self._run_system_update, operation, args
+    def _submit_system_update(
+        self,
+        name: str,
+        operation: Callable[..., Any],
+        *args: Any,
+        critical: bool = True,
+    ) -> None:
+        step = self._finish.add(name, critical=critical)
+        future = self._system_updates.submit(
+            self._finish.timed(step, lambda: self._run_system_update(operation, args))
         )
+        self._finish.watch(step, future)
 
     @staticmethod
     def _run_system_update(
@@ -342,18 +442,107 @@ class AppWindow(Adw.ApplicationWindow):
             operation(*args)
         except Exception:
             logger.exception("Background live-session update failed")
+            raise
+
+    def _wait_for_system_updates(self, updates: list[FinishStep]) -> None:
+        # Runs on the finish worker. It used to run in the theme signal
+        # handlers and blocked the main loop until timedated and localed (or
+        # the sudo fallback) came back. A hung child still must not keep the
+        # user in the wizard, so updates that outlast the timeout are given up.
+        futures = [step.future for step in updates if step.future is not None]
+        _done, not_done = wait_for_futures(futures, timeout=SYSTEM_UPDATE_TIMEOUT)
+        stalled = [step for step in updates if step.future in not_done]
+        if stalled:
+            logger.warning(
+                "System settings updates did not finish: %s",
+                ", ".join(step.name for step in stalled),
+            )
+            self._finish.stall(stalled)
+
+    _FINISH_STEP_LABELS = {
+        "language": lambda: _("Language and time zone"),
+        "keyboard": lambda: _("Keyboard"),
+        "desktop": lambda: _("Desktop Layout"),
+        "speech": lambda: _("Screen reader language"),
+        "theme": lambda: _("Theme"),
+        "live-state": lambda: _("Saving your choices"),
+        "jamesdsp-config": lambda: _("JamesDSP Audio"),
+        "jamesdsp-service": lambda: _("JamesDSP service"),
+        "display-profile": lambda: _("Image quality"),
+    }
 
-    def _wait_for_system_updates(self) -> None:
-        # Both callers are GTK signal handlers, so this blocks the main loop:
-        # the window stops drawing until sudo timedatectl and localectl come
-        # back. They are quick, but an unbounded wait on a hung child froze the
-        # wizard with no way out, and the settings are not worth that.
-        if self._last_system_update is None:
+    def _finish_step_title(self, name: str) -> str:
+        label_fn = self._FINISH_STEP_LABELS.get(name)
+        return label_fn() if label_fn else name
+
+    def _start_finish(self, apply_choice: Callable[[], None]) -> None:
+        """Apply the last choices off the main loop and show their progress.
+
+        The queued system updates, the theme and the live-state commit are
+        critical: the user can leave once they have settled. The settings
+        steps ``finalize_setup`` starts are listed too, but are not waited for.
+        """
+        if self._finish_started is not None:
             return
-        try:
-            self._last_system_update.result(timeout=15)
-        except Exception as error:
-            logger.warning("A system settings update did not finish: %s", error)
+        from ui.finish_view import FinishView
+
+        self._finish_started = self._finish.now()
+        updates = self._finish.unsettled()
+        view = FinishView(self._finish_step_title)
+        view.connect("exit-confirmed", self._on_exit_confirmed)
+        self._add_page(view, "finish", _("Finish"))
+        self._finish_view = view
+        self._finish.add_listener(self._refresh_finish_view)
+        self.stack.set_visible_child_name("finish")
+
+        graph = ApplyGraph(self._finish_worker)
+        graph.add("system-updates", lambda: self._wait_for_system_updates(updates))
+        theme = self._finish.add("theme")
+        self._finish.watch(
+            theme,
+            graph.add(
+                "theme",
+                self._finish.timed(theme, apply_choice),
+                after=["system-updates"],
+            ),
+        )
+        live_state = self._finish.add("live-state")
+        self._finish.watch(
+            live_state,
+            graph.add(
+                "live-state",
+                self._finish.timed(live_state, self._finalize_settings),
+                after=["theme"],
+            ),
+        )
+        self._refresh_finish_view()
+
+    def _finalize_settings(self) -> None:
+        # Runs on the finish worker; the restart waits for the user to leave.
+        graph = self.system_service.finalize_setup(
+            self.config, restart_compositor=False
+        )
+        self._settings_graph = graph
+        for name, future in graph.futures.items():
+            self._finish.track(name, future, critical=False)
+
+    def _refresh_finish_view(self) -> None:
+        view = self._finish_view
+        if view is None:
+            return
+        view.show_steps(self._finish.steps())
+        if self._finish_started is None or view.ready:
+            return
+        if self._finish.settled():
+            self._finish.log_wait(self._finish_started)
+            view.set_ready()
+
+    def _on_exit_confirmed(self, _view) -> None:
+        if self._settings_graph is not None:
+            self.system_service.restart_compositor(self._settings_graph)
+        logger.info("Setup finalized. Closing application...")
+        self._shutdown_background_services()
+        self.close()
 
     def _shutdown_background_services(self) -> None:
         if self._speechd_client is not None:
@@ -363,6 +552,10 @@ class AppWindow(Adw.ApplicationWindow):
                 pass
             self._speechd_client = None
         self._system_updates.shutdown(wait=False)
+        self._finish_worker.shutdown(wait=False)
+        self._scheduler.log_summary()
+        self._memory.sample()
+        self._memory.publish()
 
     _STEP_LABELS = {
         "language": lambda: _("Language"),
@@ -410,6 +603,10 @@ class AppWindow(Adw.ApplicationWindow):
         box.append(button)
 
     def _on_view_changed(self, stack, _param):
+        # Before the page is drawn, so it never shows the previous language.
+        self._retranslate_view(stack.get_visible_child_name())
+        if self._memory.policy.release_hidden_pages:
+            GLib.idle_add(self._release_hidden_pages)
         GLib.idle_add(self._update_header_state)
         # Announce the new step to screen readers (ORCA)
         view_name = stack.get_visible_child_name()
@@ -431,9 +628,11 @@ class AppWindow(Adw.ApplicationWindow):
         announce(self, msg, assertive=True)
 
     def _on_step_button_clicked(self, button, view_name):
-        # Only allow navigation to completed steps
-        if view_name in self.completed_steps:
-            self.stack.set_visible_child_name(view_name)
+        # Only allow navigation to completed steps, and none while finishing
+        if view_name in self.completed_steps and self._finish_started is None:
+            # The page may have been released in low-memory mode.
+            if self._ensure_view(view_name):
+                self.stack.set_visible_child_name(view_name)
 
     def _update_header_state(self):
         current_view_name = self.stack.get_visible_child_name()
@@ -479,8 +678,9 @@ class AppWindow(Adw.ApplicationWindow):
 
     def _add_language_view(self):
         view = LanguageView()
+        view.precache_enabled = self._memory.policy.precache
         view.connect("language-selected", self._on_language_selected)
-        self.stack.add_titled(view, "language", _("Language"))
+        self._add_page(view, "language", _("Language"))
 
     def _on_language_selected(self, view, selection):
         self.config.language = selection
@@ -489,10 +689,14 @@ class AppWindow(Adw.ApplicationWindow):
         # --- DYNAMIC TRANSLATION ---
         # 1. Set the new language for the entire application
         lang_code = params.get("lang")
+        switch_started = time.monotonic()
         set_language(lang_code)
 
-        # 2. Retranslate all existing UI elements
+        # 2. Retranslate the visible page; the others follow when shown
         self._retranslate_ui()
+        self.add_tick_callback(
+            lambda _widget, _clock: self._log_language_switch(lang_code, switch_started)
+        )
         # --- END DYNAMIC TRANSLATION ---
 
         locale_code = getattr(selection, "code", lang_code)
@@ -512,6 +716,7 @@ class AppWindow(Adw.ApplicationWindow):
             keyboard_layout = "us(intl)"
 
         # LAZY LOADING: Ensure keyboard view exists before updating or showing it
+        self._keyboard_primary_layout = keyboard_layout
         self._ensure_view("keyboard", keyboard_layout)
 
         from ui.keyboard_view import KeyboardView
@@ -524,6 +729,7 @@ class AppWindow(Adw.ApplicationWindow):
         if keyboard_layout not in ["us", "latam"]:
             self.stack.set_visible_child_name("keyboard")
             self._submit_system_update(
+                "language",
                 self._apply_language_settings,
                 params["language"],
                 params["timezone"],
@@ -532,6 +738,7 @@ class AppWindow(Adw.ApplicationWindow):
         else:
             # Also skip for us(intl) if the user doesn't need to see the choice
             self._submit_system_update(
+                "language",
                 self._apply_language_settings,
                 params["language"],
                 params["timezone"],
@@ -540,6 +747,15 @@ class AppWindow(Adw.ApplicationWindow):
             self._on_keyboard_selected(None, keyboard_layout)
         GLib.timeout_add(100, self._preload_following_views)
 
+    @staticmethod
+    def _log_language_switch(lang_code: str | None, started: float) -> bool:
+        logger.info(
+            "Language switch to %s reached the next frame in %.1f ms",
+            lang_code,
+            (time.monotonic() - started) * 1000,
+        )
+        return GLib.SOURCE_REMOVE
+
     def _update_language_step_icon(self, language_code: str) -> bool:
         step = next((s for s in self.steps if s["name"] == "language"), None)
         if not step or not (image := step.get("img")):
@@ -565,7 +781,7 @@ class AppWindow(Adw.ApplicationWindow):
 
         view = KeyboardView(primary_layout=primary_layout)
         view.connect("keyboard-selected", self._on_keyboard_selected)
-        self.stack.add_titled(view, "keyboard", _("Keyboard"))
+        self._add_page(view, "keyboard", _("Keyboard"))
 
     def _on_keyboard_selected(self, view, layout):
         self.config.keyboard_layout = layout
@@ -583,20 +799,24 @@ class AppWindow(Adw.ApplicationWindow):
             # LAZY LOADING: Ensure desktop view exists before showing it
             self._ensure_view("desktop")
             self.stack.set_visible_child_name("desktop")
-        self._submit_system_update(self.system_service.apply_keyboard_layout, layout)
+        self._submit_system_update(
+            "keyboard", self.system_service.apply_keyboard_layout, layout
+        )
 
     def _add_desktop_view(self):
         from ui.desktop_view import DesktopView
 
         view = DesktopView(system_service=self.system_service)
         view.connect("desktop-selected", self._on_desktop_selected)
-        self.stack.add_titled(view, "desktop", _("Desktop Layout"))
+        self._add_page(view, "desktop", _("Desktop Layout"))
 
     def _on_desktop_selected(self, view, layout):
         logger.debug(f"AppWindow received desktop-selected signal for: {layout}")
         if layout != "default":
             self.config.desktop_layout = layout
-            self._submit_system_update(self.system_service.apply_desktop_layout, layout)
+            self._submit_system_update(
+                "desktop", self.system_service.apply_desktop_layout, layout
+            )
 
         # Mark desktop step as completed
         self.completed_steps.add("desktop")
@@ -624,31 +844,32 @@ class AppWindow(Adw.ApplicationWindow):
             runtime_state=self._theme_runtime_states[False],
         )
         view.connect("theme-selected", self._on_theme_selected)
-        self.stack.add_titled(view, "theme", _("Theme"))
+        self._add_page(view, "theme", _("Theme"))
 
     def _on_theme_selected(self, view, theme):
         from ui.theme_view import ThemeView
 
-        self._wait_for_system_updates()
         if theme != "default":
             self.config.theme = theme
-            self.system_service.apply_theme(theme)
 
         # Mark theme step as completed
         self.completed_steps.add("theme")
 
         # Update config with extra options from the theme view
         theme_view = self.stack.get_child_by_name("theme")
+        has_options = isinstance(theme_view, ThemeView)
         if isinstance(theme_view, ThemeView):
             self.config.enable_jamesdsp = theme_view.is_jamesdsp_enabled()
             self.config.enable_enhanced_contrast = theme_view.is_contrast_enabled()
 
+        def apply_choice() -> None:
+            if theme != "default":
+                self.system_service.apply_theme(theme)
             # Apply JamesDSP settings immediately when theme is selected
-            self.system_service.apply_jamesdsp_settings(self.config.enable_jamesdsp)
+            if has_options:
+                self.system_service.apply_jamesdsp_settings(self.config.enable_jamesdsp)
 
-        self.system_service.finalize_setup(self.config)
-        self._shutdown_background_services()
-        self.close()
+        self._start_finish(apply_choice)
 
     def _add_simple_theme_view(self):
         """Creates and adds the simplified theme view for GNOME/XFCE/Cinnamon."""
@@ -660,7 +881,7 @@ class AppWindow(Adw.ApplicationWindow):
             simplified_mode=True,
         )
         view.connect("theme-selected", self._on_simple_theme_selected)
-        self.stack.add_titled(view, "simple_theme", _("Theme"))
+        self._add_page(view, "simple_theme", _("Theme"))
 
     def _on_simple_theme_selected(self, view, theme):
         """Handle theme selection from simplified theme view."""
@@ -669,7 +890,6 @@ class AppWindow(Adw.ApplicationWindow):
         logger.info(f"========== SIMPLE THEME SELECTED: {theme} ==========")
 
         try:
-            self._wait_for_system_updates()
             # Mark theme step as completed
             self.completed_steps.add("theme")
             logger.debug(
@@ -680,32 +900,31 @@ class AppWindow(Adw.ApplicationWindow):
             self.config.simple_theme = theme
             logger.debug(f"Saved theme to config: {theme}")
 
-            # Apply simple theme (light or dark)
-            logger.info(f"Applying simple theme: {theme}")
-            self.system_service.apply_simple_theme(theme)
-            logger.info("Simple theme applied successfully")
-
             # Get JamesDSP and contrast settings from the theme view
             theme_view = self.stack.get_child_by_name("simple_theme")
+            has_options = isinstance(theme_view, ThemeView)
             if isinstance(theme_view, ThemeView):
                 jamesdsp = theme_view.is_jamesdsp_enabled()
                 contrast = theme_view.is_contrast_enabled()
                 self.config.enable_jamesdsp = jamesdsp
                 self.config.enable_enhanced_contrast = contrast
                 logger.info(f"JamesDSP: {jamesdsp}, Enhanced Contrast: {contrast}")
-
-                # Apply JamesDSP settings immediately when theme is selected
-                self.system_service.apply_jamesdsp_settings(jamesdsp)
             else:
                 logger.warning("Could not get theme_view from stack")
 
-            # Finalize and close
-            logger.info("Finalizing setup...")
-            self.system_service.finalize_setup(self.config)
-            logger.info("Setup finalized. Closing application...")
-            self._shutdown_background_services()
-            self.close()
-            logger.info("Application closed successfully")
+            def apply_choice() -> None:
+                # Apply simple theme (light or dark)
+                logger.info(f"Applying simple theme: {theme}")
+                self.system_service.apply_simple_theme(theme)
+                logger.info("Simple theme applied successfully")
+                # Apply JamesDSP settings immediately when theme is selected
+                if has_options:
+                    self.system_service.apply_jamesdsp_settings(
+                        self.config.enable_jamesdsp
+                    )
+
+            # Finalize in the background; the finish page shows the progress
+            self._start_finish(apply_choice)
         except Exception as e:
             logger.error(f"ERROR in _on_simple_theme_selected: {e}", exc_info=True)
 
@@ -720,7 +939,9 @@ class AppWindow(Adw.ApplicationWindow):
             set_accessibility_enabled(True)
             if self.config.language is not None:
                 lang_code = self.config.language.url_params.get("lang")
-                self._submit_system_update(self._set_speechd_language, lang_code)
+                self._submit_system_update(
+                    "speech", self._set_speechd_language, lang_code, critical=False
+                )
             lang_view = self.stack.get_child_by_name("language")
             if isinstance(lang_view, LanguageView):
                 lang_view.enable_voice_preview()
@@ -7,20 +7,44 @@ import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from accessibility import is_accessibility_enabled, speak
-from gi.repository import Adw, Gdk, GLib, GObject, Gtk
+from gi.repository import Adw, Gdk, Gio, GLib, GObject, Gtk
 from logging_config import get_logger
 from services import SystemService
+from ui.preview_loader import PreviewSlot
+from ui.work_scheduler import PRIORITY_PRELOAD, PRIORITY_VISIBLE, get_work_scheduler
 
 logger = get_logger()
 
+# Items added to the model per scheduler unit; the grid makes the cards.
+ITEMS_PER_UNIT = 64
 
-class ItemFlowBoxChild(Gtk.FlowBoxChild):
-    """Flow-box child carrying the domain item represented by the row."""
 
-    item_data: GObject.Object
+class ItemCard(Gtk.Box):
+    """A card the grid recycles; it shows whichever item it is bound to."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.item: GObject.Object | None = None
+        self.preview: PreviewSlot | None = None
+
+
+def item_label(item: GObject.Object) -> str:
+    label = getattr(item, "display_name", None)
+    if label is None:
+        label = getattr(item, "name", "")
+    return str(label)
 
 
 class BaseItemView(Adw.Bin):
+    """Grid of theme or desktop cards.
+
+    Every card used to be built up front and packed into a ``Gtk.FlowBox``,
+    so build time and memory grew with the catalog. The items now live in a
+    ``Gio.ListStore`` shown by a ``Gtk.GridView``: only the cards in view
+    exist, and they are rebound as the grid scrolls. Subclasses build an
+    empty card in ``create_card`` and fill it in ``bind_card``.
+    """
+
     __gtype_name__ = "BaseItemView"
 
     def __init__(self, system_service: SystemService, **kwargs):
@@ -29,6 +53,8 @@ class BaseItemView(Adw.Bin):
         self.set_vexpand(True)
         self.items_loaded = False
         self.items_loading = False
+        self._items_task = f"{type(self).__name__}-items-{id(self)}"
+        self._store = Gio.ListStore(item_type=GObject.Object)
 
         self.set_child(self._build_ui())
         self.connect("map", self._on_map)
@@ -37,80 +63,82 @@ class BaseItemView(Adw.Bin):
         """Load items only when the view is first mapped (made visible)."""
         if not self.items_loaded and not self.items_loading:
             self.load_items()
+        # Items still queued from a preload are now what the user is waiting for.
+        get_work_scheduler().prioritize(self._items_task, PRIORITY_VISIBLE)
         self.grab_focus()
         # Suppress selection-changed speak during initial selection
         self._suppress_speak = True
         GLib.idle_add(self._select_first_and_announce)
 
     def _build_ui(self):
-        scrolled_window = Gtk.ScrolledWindow(
-            vexpand=True,
-            hexpand=True,
-            hscrollbar_policy=Gtk.PolicyType.NEVER,
-        )
-
-        # This box will contain all scrollable content
         self.main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=18)
         self.main_box.set_margin_top(24)
         self.main_box.set_margin_bottom(24)
         self.main_box.set_margin_start(24)
         self.main_box.set_margin_end(24)
-        scrolled_window.set_child(self.main_box)
 
         self.title_label = Gtk.Label(label=self.get_title(), halign=Gtk.Align.CENTER)
         self.title_label.add_css_class("title-2")
         self.main_box.append(self.title_label)
 
-        # This container centers the FlowBox vertically within the available space.
-        centering_box = Gtk.Box(
-            orientation=Gtk.Orientation.VERTICAL, vexpand=True, valign=Gtk.Align.FILL
+        self.selection_model = Gtk.SingleSelection(
+            model=self._store, autoselect=False, can_unselect=True
         )
-        self.main_box.append(centering_box)
-
-        clamp = Adw.Clamp(maximum_size=self.get_clamp_width())
-        clamp.set_halign(Gtk.Align.CENTER)
-        centering_box.append(clamp)
-
-        self.flow_box = Gtk.FlowBox(
-            selection_mode=Gtk.SelectionMode.SINGLE,
-            activate_on_single_click=True,
-            max_children_per_line=self.get_max_columns(),
-            min_children_per_line=self.get_min_columns(),
-            homogeneous=True,
-            column_spacing=12,
-            row_spacing=12,
+        self.selection_model.connect("selection-changed", self._on_selection_changed)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_factory_setup)
+        factory.connect("bind", self._on_factory_bind)
+        factory.connect("unbind", self._on_factory_unbind)
+
+        # Single-click activation also selects the card under the pointer.
+        self.grid_view = Gtk.GridView(
+            model=self.selection_model,
+            factory=factory,
+            max_columns=self.get_max_columns(),
+            min_columns=self.get_min_columns(),
+            single_click_activate=True,
             hexpand=True,
-            vexpand=True,
-            valign=Gtk.Align.CENTER,
         )
-        self.flow_box.set_can_focus(True)
-        self.flow_box.set_halign(Gtk.Align.CENTER)
-        self.flow_box.update_property(
+        self.grid_view.add_css_class("item-grid")
+        self.grid_view.update_property(
             [Gtk.AccessibleProperty.LABEL], [self.get_title()]
         )
+        self.grid_view.connect("activate", self._on_grid_view_activate)
 
-        self.flow_box.connect("child-activated", self._on_child_activated)
-        self.flow_box.connect("activate-cursor-child", self._on_activate_cursor_child)
-        self.flow_box.connect("selected-children-changed", self._on_selection_changed)
-
+        # Capture, so Enter confirms the hovered card rather than the focused one.
         key_controller = Gtk.EventControllerKey.new()
+        key_controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
         key_controller.connect("key-pressed", self._on_key_pressed)
-        self.flow_box.add_controller(key_controller)
+        self.grid_view.add_controller(key_controller)
 
-        flow_motion_controller = Gtk.EventControllerMotion.new()
-        flow_motion_controller.connect("leave", self._on_flow_leave)
-        self.flow_box.add_controller(flow_motion_controller)
+        grid_motion_controller = Gtk.EventControllerMotion.new()
+        grid_motion_controller.connect("leave", self._on_grid_leave)
+        self.grid_view.add_controller(grid_motion_controller)
 
-        clamp.set_child(self.flow_box)
+        # The grid must be the scrollable child itself, or it is given its
+        # full height and realizes every card anyway.
+        clamp = Adw.ClampScrollable(
+            maximum_size=self.get_clamp_width(), child=self.grid_view
+        )
+        self.scrolled_window = Gtk.ScrolledWindow(
+            vexpand=True,
+            hexpand=True,
+            hscrollbar_policy=Gtk.PolicyType.NEVER,
+            propagate_natural_height=True,
+            valign=Gtk.Align.CENTER,
+            child=clamp,
+        )
+        self.main_box.append(self.scrolled_window)
 
-        return scrolled_window
+        return self.main_box
 
     def _retranslate_ui(self):
         """Updates the view's title to the current language."""
         if hasattr(self, "title_label"):
             self.title_label.set_label(self.get_title())
-        if hasattr(self, "flow_box"):
-            self.flow_box.update_property(
+        if hasattr(self, "grid_view"):
+            self.grid_view.update_property(
                 [Gtk.AccessibleProperty.LABEL], [self.get_title()]
             )
 
@@ -140,87 +168,95 @@ class BaseItemView(Adw.Bin):
             self.emit_signal("default")
             return GLib.SOURCE_REMOVE
 
-        for name in items:
-            item_obj = self.create_item_gobject(name)
-            child_widget = self.create_item_widget(item_obj)
-
-            flow_child = ItemFlowBoxChild()
-            flow_child.set_child(child_widget)
-            flow_child.set_can_focus(True)
-            flow_child.item_data = item_obj
-
-            # Accessible label for screen readers
-            item_label = getattr(item_obj, "display_name", None)
-            if item_label is None:
-                item_label = getattr(item_obj, "name", "")
-            flow_child.update_property([Gtk.AccessibleProperty.LABEL], [item_label])
+        priority = PRIORITY_VISIBLE if self.get_mapped() else PRIORITY_PRELOAD
+        get_work_scheduler().add(
+            self._items_task, self._append_items(items), priority=priority
+        )
+        return GLib.SOURCE_REMOVE
 
-            # Hover-to-select functionality
-            item_motion_controller = Gtk.EventControllerMotion.new()
-            item_motion_controller.connect("enter", self._on_item_enter, flow_child)
-            flow_child.add_controller(item_motion_controller)
+    def _append_items(self, items: list):
+        """Add the items to the model in batches, one per scheduler unit."""
+        for start in range(0, len(items), ITEMS_PER_UNIT):
+            batch = [
+                self.create_item_gobject(name)
+                for name in items[start : start + ITEMS_PER_UNIT]
+            ]
+            self._store.splice(self._store.get_n_items(), 0, batch)
+            yield
 
-            self.flow_box.append(flow_child)
+        self._select_first_item()
 
-        GLib.idle_add(self._select_first_item)
-        return GLib.SOURCE_REMOVE
+    def _on_factory_setup(self, factory, list_item):
+        card = self.create_card()
+        try:
+            card.set_cursor(Gdk.Cursor.new_from_name("pointer", None))
+        except Exception:
+            pass
+        list_item.set_child(card)
+
+    def _on_factory_bind(self, factory, list_item):
+        item = list_item.get_item()
+        card = list_item.get_child()
+        if item is None or not isinstance(card, ItemCard):
+            return
+        card.item = item
+        # Accessible label for screen readers
+        card.update_property([Gtk.AccessibleProperty.LABEL], [item_label(item)])
+        self.bind_card(card, item)
+
+    def _on_factory_unbind(self, factory, list_item):
+        card = list_item.get_child()
+        if not isinstance(card, ItemCard):
+            return
+        if card.preview is not None:
+            card.preview.unbind()
+        card.item = None
 
     def grab_focus(self):
-        self.flow_box.grab_focus()
+        self.grid_view.grab_focus()
 
     def _select_first_item(self):
-        first_child = self.flow_box.get_first_child()
-        if isinstance(first_child, Gtk.FlowBoxChild):
-            self.flow_box.select_child(first_child)
+        if self.selection_model.get_n_items() > 0:
+            self.selection_model.set_selected(0)
             self.grab_focus()
         return GLib.SOURCE_REMOVE
 
+    def _selected_item(self) -> GObject.Object | None:
+        return self.selection_model.get_selected_item()
+
+    def _activate_item(self, item: GObject.Object | None) -> None:
+        if item is None:
+            logger.warning("BaseItemView: item activated but no item_data found")
+            return
+        item_name = str(getattr(item, "name", ""))
+        logger.info(f"BaseItemView: item activated - emitting signal for: {item_name}")
+        self.emit_signal(item_name)
+
     def _on_key_pressed(self, controller, keyval, keycode, state):
         if keyval == Gdk.KEY_Return or keyval == Gdk.KEY_KP_Enter:
-            selected = self.flow_box.get_selected_children()
-            if selected:
-                self._on_child_activated(self.flow_box, selected[0])
+            selected = self._selected_item()
+            if selected is not None:
+                self._activate_item(selected)
                 return True
         return False
 
-    def _on_child_activated(self, flow_box, child):
-        if isinstance(child, ItemFlowBoxChild):
-            item_name = str(getattr(child.item_data, "name", ""))
-            logger.info(
-                f"BaseItemView: child activated - emitting signal for: {item_name}"
-            )
-            self.emit_signal(item_name)
-        else:
-            logger.warning("BaseItemView: child activated but no item_data found")
-
-    def _on_flow_leave(self, controller, *args):
-        self.flow_box.unselect_all()
+    def _on_grid_view_activate(self, grid_view, position):
+        self._activate_item(self.selection_model.get_item(position))
 
-    def _on_item_enter(self, controller, x, _y, flow_child):
-        self.flow_box.select_child(flow_child)
+    def _on_grid_leave(self, controller, *args):
+        self.selection_model.unselect_all()
 
-    def _on_selection_changed(self, flow_box):
+    def _on_selection_changed(self, selection_model, _position, _n_items):
         """Speak the selected item name when selection changes (mouse or keyboard)."""
         if getattr(self, "_suppress_speak", False):
             return
-        selected = flow_box.get_selected_children()
-        if selected and is_accessibility_enabled():
-            child = selected[0]
-            if isinstance(child, ItemFlowBoxChild):
-                speak(
-                    getattr(
-                        child.item_data,
-                        "display_name",
-                        getattr(child.item_data, "name", ""),
-                    )
-                )
+        selected = self._selected_item()
+        if selected is not None and is_accessibility_enabled():
+            speak(item_label(selected))
 
     def _select_first_and_announce(self):
         """Select first item and announce page title (without race condition)."""
-        first_child = self.flow_box.get_first_child()
-        if isinstance(first_child, Gtk.FlowBoxChild):
-            self.flow_box.select_child(first_child)
-            self.grab_focus()
+        self._select_first_item()
         self._suppress_speak = False
         if is_accessibility_enabled():
             text = self.get_title() or ""
@@ -228,11 +264,6 @@ class BaseItemView(Adw.Bin):
                 speak(text)
         return GLib.SOURCE_REMOVE
 
-    def _on_activate_cursor_child(self, flow_box):
-        selected = flow_box.get_selected_children()
-        if selected:
-            self._on_child_activated(flow_box, selected[0])
-
     def get_title(self) -> str:
         raise NotImplementedError
 
@@ -242,7 +273,10 @@ class BaseItemView(Adw.Bin):
     def create_item_gobject(self, name: str) -> GObject.Object:
         raise NotImplementedError
 
-    def create_item_widget(self, item: GObject.Object):
+    def create_card(self) -> ItemCard:
+        raise NotImplementedError
+
+    def bind_card(self, card: ItemCard, item: GObject.Object) -> None:
         raise NotImplementedError
 
     def emit_signal(self, name: str):
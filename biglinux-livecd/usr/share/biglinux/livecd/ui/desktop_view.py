@@ -6,13 +6,11 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 import os
 
-from gi.repository import Gdk, GdkPixbuf, GLib, GObject, Gtk
-from logging_config import get_logger
+from gi.repository import GObject, Gtk
 from services import SystemService
 from translations import _
-from ui.base_view import BaseItemView
-
-logger = get_logger()
+from ui.base_view import BaseItemView, ItemCard
+from ui.preview_loader import PreviewSlot, create_preview_picture
 
 
 class DesktopListItem(GObject.Object):
@@ -25,6 +23,21 @@ class DesktopListItem(GObject.Object):
         self.name = name
         self.display_name = system_service.get_desktop_display_name(name)
         self.image_path = system_service.get_desktop_image_path(name)
+        # Checked once here, not on every rebind while the grid scrolls.
+        self.has_preview = os.path.exists(self.image_path)
+
+
+class DesktopCard(ItemCard):
+    """Layout preview, or a placeholder icon when the layout ships none."""
+
+    def __init__(self) -> None:
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.set_can_focus(True)
+        self.picture = create_preview_picture()
+        self.preview = PreviewSlot(self.picture)
+        self.missing = Gtk.Image.new_from_icon_name("image-missing-symbolic")
+        self.append(self.picture)
+        self.append(self.missing)
 
 
 class DesktopView(BaseItemView):
@@ -40,41 +53,21 @@ class DesktopView(BaseItemView):
     def create_item_gobject(self, name: str) -> GObject.Object:
         return DesktopListItem(name, self.system_service)
 
-    def create_item_widget(self, item: GObject.Object):
-        if not isinstance(item, DesktopListItem):
+    def create_card(self) -> ItemCard:
+        return DesktopCard()
+
+    def bind_card(self, card: ItemCard, item: GObject.Object) -> None:
+        if not isinstance(item, DesktopListItem) or not isinstance(card, DesktopCard):
             raise TypeError("DesktopView requires a DesktopListItem")
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        box.set_can_focus(True)
         # Accessible description for screen readers
-        box.update_property(
+        card.update_property(
             [Gtk.AccessibleProperty.LABEL],
             [_("Desktop Layout") + ": " + item.display_name],
         )
-        try:
-            cursor = Gdk.Cursor.new_from_name("pointer", None)
-            box.set_cursor(cursor)
-        except Exception:
-            pass
-
-        picture: Gtk.Widget
-        if os.path.exists(item.image_path):
-            try:
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(item.image_path)
-                picture = Gtk.Picture.new_for_pixbuf(pixbuf)
-                picture.set_hexpand(True)
-                picture.set_vexpand(True)
-                picture.set_can_shrink(True)
-                picture.set_halign(Gtk.Align.CENTER)
-                picture.set_valign(Gtk.Align.CENTER)
-                picture.set_content_fit(Gtk.ContentFit.CONTAIN)
-            except GLib.Error as e:
-                logger.error(f"Error loading image {item.image_path}: {e}")
-                picture = Gtk.Picture()
-        else:
-            picture = Gtk.Image.new_from_icon_name("image-missing-symbolic")
-
-        box.append(picture)
-        return box
+        card.picture.set_visible(item.has_preview)
+        card.missing.set_visible(not item.has_preview)
+        if item.has_preview and card.preview is not None:
+            card.preview.bind(item.image_path)
 
     def emit_signal(self, name: str):
         self.sig_desktop_selected.emit(name)  # type: ignore[arg-type]
@@ -0,0 +1,120 @@
+# ui/finish_view.py
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from collections.abc import Callable
+
+from accessibility import announce
+from finish_tracker import DONE, FAILED, QUEUED, RUNNING, STALLED, FinishStep
+from gi.repository import Adw, GObject, Gtk
+from translations import _
+
+_STATUS_LABELS: dict[str, Callable[[], str]] = {
+    QUEUED: lambda: _("Waiting"),
+    RUNNING: lambda: _("Applying"),
+    DONE: lambda: _("Done"),
+    FAILED: lambda: _("Failed"),
+    STALLED: lambda: _("Still running"),
+}
+
+
+class _StepRow(Gtk.Box):
+    def __init__(self) -> None:
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        self.set_margin_top(6)
+        self.set_margin_bottom(6)
+        self.set_focusable(True)
+        self.title_label = Gtk.Label(xalign=0, hexpand=True)
+        self.spinner = Gtk.Spinner()
+        self.status_label = Gtk.Label(xalign=1)
+        self.status_label.add_css_class("dim-label")
+        self.append(self.title_label)
+        self.append(self.spinner)
+        self.append(self.status_label)
+
+    def show_step(self, title: str, status: str) -> None:
+        status_text = _STATUS_LABELS[status]()
+        self.title_label.set_label(title)
+        self.status_label.set_label(status_text)
+        self.spinner.set_spinning(status == RUNNING)
+        self.spinner.set_visible(status in {QUEUED, RUNNING})
+        self.update_property(
+            [Gtk.AccessibleProperty.LABEL], [f"{title}: {status_text}"]
+        )
+
+
+class FinishView(Adw.Bin):
+    """Progress of the last settings changes, with the button that leaves."""
+
+    __gtype_name__ = "FinishView"
+    sig_exit_confirmed = GObject.Signal("exit-confirmed")
+
+    def __init__(self, step_title: Callable[[str], str], **kwargs):
+        super().__init__(**kwargs)
+        self._step_title = step_title
+        self._rows: dict[str, _StepRow] = {}
+        self._steps: list[FinishStep] = []
+        self._ready = False
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=18)
+        box.set_margin_top(24)
+        box.set_margin_bottom(24)
+        box.set_margin_start(24)
+        box.set_margin_end(24)
+        box.set_valign(Gtk.Align.CENTER)
+
+        self.title_label = Gtk.Label(halign=Gtk.Align.CENTER)
+        self.title_label.add_css_class("title-2")
+        box.append(self.title_label)
+
+        clamp = Adw.Clamp(maximum_size=480)
+        self.step_list = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        self.step_list.add_css_class("card")
+        self.step_list.set_margin_start(6)
+        self.step_list.set_margin_end(6)
+        clamp.set_child(self.step_list)
+        box.append(clamp)
+
+        self.exit_button = Gtk.Button(halign=Gtk.Align.CENTER, sensitive=False)
+        self.exit_button.add_css_class("pill")
+        self.exit_button.add_css_class("suggested-action")
+        self.exit_button.connect("clicked", lambda _button: self.emit("exit-confirmed"))
+        box.append(self.exit_button)
+
+        self.set_child(box)
+        self._retranslate_ui()
+
+    def show_steps(self, steps: list[FinishStep]) -> None:
+        self._steps = steps
+        for step in steps:
+            row = self._rows.get(step.name)
+            if row is None:
+                row = self._rows[step.name] = _StepRow()
+                row.set_margin_start(12)
+                row.set_margin_end(12)
+                self.step_list.append(row)
+            row.show_step(self._step_title(step.name), step.status)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def set_ready(self) -> None:
+        """Let the user leave; the remaining steps finish on their own."""
+        if self._ready:
+            return
+        self._ready = True
+        self.exit_button.set_sensitive(True)
+        self.exit_button.grab_focus()
+        self._retranslate_ui()
+        announce(self, _("Settings applied. Press Enter to start the desktop."))
+
+    def _retranslate_ui(self) -> None:
+        self.title_label.set_label(
+            _("Ready") if self._ready else _("Applying your settings")
+        )
+        self.exit_button.set_label(_("Start desktop"))
+        if self._steps:
+            self.show_steps(self._steps)
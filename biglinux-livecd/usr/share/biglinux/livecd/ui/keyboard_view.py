@@ -6,9 +6,10 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 import os
 
-from accessibility import is_accessibility_enabled, speak
-from gi.repository import Adw, Gdk, GLib, GObject, Gtk
-from translations import _
+from accessibility import announce, is_accessibility_enabled, speak
+from gi.repository import Adw, Gdk, Gio, GLib, GObject, Gtk
+from translations import _, ngettext
+from xkb_index import KeyboardIndex, KeyboardLayout, get_keyboard_index
 
 ASSETS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
 
@@ -17,6 +18,71 @@ class LayoutFlowBoxChild(Gtk.FlowBoxChild):
     layout_data: dict[str, str]
 
 
+class LayoutItem(GObject.Object):
+    """One xkb layout or variant from the index."""
+
+    __gtype_name__ = "KeyboardLayoutItem"
+
+    def __init__(self, layout: KeyboardLayout) -> None:
+        super().__init__()
+        self.layout = layout
+
+
+class LayoutResults(GObject.Object, Gio.ListModel):
+    """Search results over the xkb index.
+
+    The index keeps its rows as plain strings; an item object is only made
+    for a row the list asks for, and the list only asks for visible rows.
+    """
+
+    __gtype_name__ = "KeyboardLayoutResults"
+
+    def __init__(self, index: KeyboardIndex) -> None:
+        super().__init__()
+        self._index = index
+        self._positions = index.search("")
+        self._items: dict[int, LayoutItem] = {}
+
+    def do_get_item_type(self):
+        return LayoutItem.__gtype__
+
+    def do_get_n_items(self) -> int:
+        return len(self._positions)
+
+    def do_get_item(self, position: int) -> LayoutItem | None:
+        if position >= len(self._positions):
+            return None
+        index_position = self._positions[position]
+        # The same object each time: selection and rows compare items.
+        item = self._items.get(index_position)
+        if item is None:
+            item = LayoutItem(self._index.entry(index_position))
+            self._items[index_position] = item
+        return item
+
+    def set_query(self, query: str) -> int:
+        removed = len(self._positions)
+        self._positions = self._index.search(query)
+        self.items_changed(0, removed, len(self._positions))
+        return len(self._positions)
+
+
+class LayoutRow(Gtk.Box):
+    """Typed widget references owned by a recycled layout row."""
+
+    def __init__(self) -> None:
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        self.set_margin_top(6)
+        self.set_margin_bottom(6)
+        self.set_margin_start(12)
+        self.set_margin_end(12)
+        self.description_label = Gtk.Label(xalign=0, hexpand=True)
+        self.id_label = Gtk.Label(xalign=1)
+        self.id_label.add_css_class("dim-label")
+        self.append(self.description_label)
+        self.append(self.id_label)
+
+
 class KeyboardView(Adw.Bin):
     __gtype_name__ = "KeyboardView"
     sig_keyboard_selected = GObject.Signal("keyboard-selected", arg_types=[str])
@@ -58,6 +124,9 @@ class KeyboardView(Adw.Bin):
         self.flow_box = self._build_flow_box()
         clamp.set_child(self.flow_box)
 
+        self.layout_browser = self._build_layout_browser()
+        center_box.append(self.layout_browser)
+
         image_path = os.path.join(ASSETS_DIR, "keyboard.svg")
         if os.path.exists(image_path):
             from gi.repository import Gio
@@ -106,10 +175,91 @@ class KeyboardView(Adw.Bin):
         flow_box.add_controller(flow_motion_controller)
         return flow_box
 
+    def _build_layout_browser(self) -> Gtk.Widget:
+        """Search over every xkb layout and variant, filled on first map."""
+        self._layout_results: LayoutResults | None = None
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        box.set_margin_bottom(18)
+        box.set_visible(False)
+
+        self.layout_search = Gtk.SearchEntry()
+        self.layout_search.connect("search-changed", self._on_layout_search_changed)
+        box.append(self.layout_search)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_layout_row_setup)
+        factory.connect("bind", self._on_layout_row_bind)
+        self.layout_selection = Gtk.SingleSelection(autoselect=False)
+        self.layout_list = Gtk.ListView(
+            model=self.layout_selection,
+            factory=factory,
+            single_click_activate=True,
+        )
+        self.layout_list.add_css_class("card")
+        self.layout_list.connect("activate", self._on_layout_row_activated)
+
+        scrolled_window = Gtk.ScrolledWindow(
+            hscrollbar_policy=Gtk.PolicyType.NEVER,
+            min_content_height=220,
+            child=self.layout_list,
+        )
+        box.append(scrolled_window)
+        self._retranslate_browser()
+        return box
+
+    def _retranslate_browser(self) -> None:
+        self.layout_search.set_placeholder_text(_("Search all keyboard layouts..."))
+        self.layout_search.update_property(
+            [Gtk.AccessibleProperty.LABEL], [_("Search all keyboard layouts...")]
+        )
+        self.layout_list.update_property(
+            [Gtk.AccessibleProperty.LABEL], [_("All keyboard layouts")]
+        )
+
+    def _load_layout_index(self) -> bool:
+        if self._layout_results is None:
+            index = get_keyboard_index()
+            if len(index) == 0:
+                return GLib.SOURCE_REMOVE
+            self._layout_results = LayoutResults(index)
+            self.layout_selection.set_model(self._layout_results)
+            self.layout_browser.set_visible(True)
+        return GLib.SOURCE_REMOVE
+
+    def _on_layout_search_changed(self, entry) -> None:
+        if self._layout_results is None:
+            return
+        count = self._layout_results.set_query(entry.get_text())
+        announce(self, ngettext("%d result", "%d results", count) % count)
+
+    def _on_layout_row_setup(self, factory, list_item) -> None:
+        list_item.set_child(LayoutRow())
+
+    def _on_layout_row_bind(self, factory, list_item) -> None:
+        item = list_item.get_item()
+        row = list_item.get_child()
+        if not isinstance(item, LayoutItem) or not isinstance(row, LayoutRow):
+            return
+        row.description_label.set_label(item.layout.description)
+        row.id_label.set_label(item.layout.layout_id)
+        row.update_property(
+            [Gtk.AccessibleProperty.LABEL],
+            [_("Keyboard layout: %s") % item.layout.description],
+        )
+
+    def _on_layout_row_activated(self, list_view, position) -> None:
+        item = self.layout_selection.get_item(position)
+        if isinstance(item, LayoutItem):
+            # Applied as chosen, variant included; nothing is mapped or dropped.
+            layout_id = item.layout.layout_id
+            self.sig_keyboard_selected.emit(layout_id)  # type: ignore[arg-type]
+
     def _retranslate_ui(self):
         """Updates the view's title to the current language."""
         if hasattr(self, "title_label"):
             self.title_label.set_label(_("Choose Your Keyboard Layout"))
+        if hasattr(self, "layout_search"):
+            self._retranslate_browser()
 
     def load_layouts(self):
         # Clear existing children
@@ -235,6 +385,7 @@ class KeyboardView(Adw.Bin):
         # Suppress selection-changed speak during initial selection
         self._suppress_speak = True
         GLib.idle_add(self._select_first_and_announce)
+        GLib.idle_add(self._load_layout_index)
 
     def _select_first_and_announce(self):
         """Select first item and announce page title (without race condition)."""
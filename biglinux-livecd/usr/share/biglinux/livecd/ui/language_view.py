@@ -12,11 +12,14 @@ from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 from accessibility import announce, set_speak_voice
+from audio_sink import get_audio_sink
 from config import LanguageSelection
 from gi.repository import Adw, Gdk, Gio, GLib, GObject, Gtk
+from icon_atlas import FLAG_GROUP, FLAG_SIZE, get_icon_atlas
 from logging_config import get_logger
 from suggested_locale import language_sort_key, load_suggested_locale
-from translations import _
+from translations import _, prefetch_language
+from ui.preview_loader import display_scale
 
 logger = get_logger()
 
@@ -94,7 +97,48 @@ _KOKORO_WAV_CACHE: dict[str, str] = {}
 _KOKORO_CACHE_LOCK = threading.Lock()
 _KOKORO_CACHE_CONDITION = threading.Condition(_KOKORO_CACHE_LOCK)
 _KOKORO_GENERATING: set[str] = set()
-_KOKORO_CACHE_DIRECTORY = tempfile.TemporaryDirectory(prefix="biglinux-kokoro-")
+# Created on first use: the zygote imports this module, and a directory made
+# then would be shared by every wizard it forks and removed by the first exit.
+_KOKORO_CACHE_DIRECTORY: tempfile.TemporaryDirectory[str] | None = None
+# Clips kept in the tmpfs cache; None keeps all. Lowered in low-memory mode.
+_KOKORO_CACHE_LIMIT: int | None = None
+
+
+def _trim_voice_cache() -> list[str]:
+    """Drop the oldest clips over the limit; caller holds the cache lock."""
+    evicted = []
+    while _KOKORO_CACHE_LIMIT is not None and len(_KOKORO_WAV_CACHE) > (
+        _KOKORO_CACHE_LIMIT
+    ):
+        evicted.append(_KOKORO_WAV_CACHE.pop(next(iter(_KOKORO_WAV_CACHE))))
+    return evicted
+
+
+def _voice_cache_directory() -> str:
+    global _KOKORO_CACHE_DIRECTORY
+    with _KOKORO_CACHE_LOCK:
+        if _KOKORO_CACHE_DIRECTORY is None:
+            _KOKORO_CACHE_DIRECTORY = tempfile.TemporaryDirectory(
+                prefix="biglinux-kokoro-"
+            )
+        return _KOKORO_CACHE_DIRECTORY.name
+
+
+def _unlink_clips(paths: list[str]) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def set_voice_cache_limit(limit: int | None) -> None:
+    """Keep at most ``limit`` voice clips; the files live in RAM on tmpfs."""
+    global _KOKORO_CACHE_LIMIT
+    with _KOKORO_CACHE_LOCK:
+        _KOKORO_CACHE_LIMIT = limit
+        evicted = _trim_voice_cache()
+    _unlink_clips(evicted)
 
 
 def _kokoro_command(voice: str, language: str, text: str, output: str) -> list[str]:
@@ -154,6 +198,8 @@ class LanguageListItem(GObject.Object):
         self.name = name
         self.name_orig = nameOrig
         self.code = code
+        # The gettext language the wizard switches to when this row is chosen.
+        self.lang = parse_qs(urlparse(url).query).get("lang", [""])[0]
 
         # This logic works for any path, including /usr/share/circle-flags-svg/br.svg
         self.flag_icon_name = os.path.splitext(os.path.basename(flag))[0]
@@ -190,6 +236,10 @@ class LanguageView(Adw.Bin):
         self.set_vexpand(True)
         self._store = Gio.ListStore(item_type=LanguageListItem)
         self.filter_timeout_id = 0
+        # Off in low-memory mode: clips are then only made for rows spoken.
+        self.precache_enabled = True
+        # Flags come from the prebuilt atlas at this scale when it is present.
+        self._scale = display_scale()
 
         self.set_child(self._build_ui())
         GLib.idle_add(self._load_languages)
@@ -306,7 +356,11 @@ class LanguageView(Adw.Bin):
         """Enable TTS voice preview and start WAV precache."""
         self._connect_speechd()
         self._voice_preview_enabled = True
-        if hasattr(self, "_language_data") and self._language_data:
+        if (
+            self.precache_enabled
+            and hasattr(self, "_language_data")
+            and self._language_data
+        ):
             self._start_kokoro_precache(self._language_data)
 
     def _cancel_orca(self):
@@ -336,12 +390,17 @@ class LanguageView(Adw.Bin):
                 self._espeak_proc.kill()
                 self._espeak_proc.wait()
         self._espeak_proc = None
+        get_audio_sink().interrupt()
         self._tts_gen += 1
         # Always update the global speak voice for other screens
         selected = selection_model.get_selected()
         if selected != Gtk.INVALID_LIST_POSITION:
             item = selection_model.get_item(selected)
             if item:
+                # Parse the catalog while the user is still looking, so that
+                # choosing this language only swaps the active one.
+                if item.lang:
+                    prefetch_language(item.lang)
                 engine, voice, lang_code = _voice_config_for_locale(item.code)
                 if engine == "kokoro":
                     set_speak_voice(voice, lang_code)
@@ -401,17 +460,13 @@ class LanguageView(Adw.Bin):
         return GLib.SOURCE_REMOVE
 
     def _play_wav(self, wav_path):
-        """Play a cached WAV file instantly."""
+        """Play a cached WAV file through the shared speech stream."""
         self._speak_timeout_id = 0
         self._cancel_orca()
         try:
-            self._espeak_proc = subprocess.Popen(
-                ["paplay", wav_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        except FileNotFoundError:
-            pass
+            get_audio_sink().play_file(wav_path)
+        except (OSError, ValueError) as error:
+            logger.debug("Could not play voice preview: %s", error)
         return GLib.SOURCE_REMOVE
 
     def _kokoro_generate(self, voice, lang_code, text, cache_key):
@@ -425,7 +480,7 @@ class LanguageView(Adw.Bin):
         tmpwav = None
         try:
             fd, tmpwav = tempfile.mkstemp(
-                prefix="voice-", suffix=".wav", dir=_KOKORO_CACHE_DIRECTORY.name
+                prefix="voice-", suffix=".wav", dir=_voice_cache_directory()
             )
             os.close(fd)
             proc = subprocess.run(
@@ -442,6 +497,8 @@ class LanguageView(Adw.Bin):
                 with _KOKORO_CACHE_LOCK:
                     _KOKORO_WAV_CACHE[cache_key] = tmpwav
                     tmpwav = None
+                    evicted = _trim_voice_cache()
+                _unlink_clips(evicted)
             else:
                 logger.warning("Kokoro could not generate a voice preview")
         except (OSError, subprocess.SubprocessError):
@@ -490,6 +547,8 @@ class LanguageView(Adw.Bin):
     def _precache_worker(self, tasks):
         """Background: sequentially generate Kokoro WAVs, favorites first."""
         for _priority, voice, lang_code, text, cache_key in tasks:
+            if not self.precache_enabled:
+                return
             with _KOKORO_CACHE_LOCK:
                 if cache_key in _KOKORO_WAV_CACHE:
                     continue
@@ -558,7 +617,7 @@ class LanguageView(Adw.Bin):
         )
 
         flag_widget = Gtk.Image(
-            pixel_size=36,
+            pixel_size=FLAG_SIZE,
             accessible_role=Gtk.AccessibleRole.PRESENTATION,
         )
 
@@ -625,7 +684,13 @@ class LanguageView(Adw.Bin):
         # Caption: English name (PRESENTATION — ORCA doesn't read)
         root_box.orig_label.set_label(item.name)
 
-        root_box.flag.set_from_icon_name(item.flag_icon_name)
+        flag = get_icon_atlas().texture(
+            FLAG_GROUP, item.flag_icon_name, FLAG_SIZE, self._scale
+        )
+        if flag is not None:
+            root_box.flag.set_from_paintable(flag)
+        else:
+            root_box.flag.set_from_icon_name(item.flag_icon_name)
         root_box.item = item
 
     def _on_item_clicked(self, gesture, n_press, _x, _y):
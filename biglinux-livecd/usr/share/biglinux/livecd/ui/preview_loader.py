@@ -0,0 +1,233 @@
+# ui/preview_loader.py
+
+"""Background decoding of theme and desktop previews.
+
+The cards used to decode full-resolution screenshots with
+``GdkPixbuf.Pixbuf.new_from_file`` on the GTK main thread and let the
+picture scale them down, which froze the wizard on slow CPUs while a page
+was built. Previews are now decoded at the card size on a small worker pool
+and handed to the main loop as textures. The most recent ones stay cached,
+so going back and forth between pages does not decode them again.
+
+Cards are recycled by the item grids, so a preview belongs to whichever item
+a card shows at the moment. ``PreviewSlot`` requests it when the card is
+bound and withdraws the request when it is unbound: a card scrolled past
+does not decode, and a late texture never lands on a card that moved on.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+PREVIEW_WIDTH = 480
+PREVIEW_HEIGHT = 320
+MAX_CACHED_TEXTURES = 32
+
+PreviewKey = tuple[str, int, int]
+Decoder = Callable[[str, int, int], Any]
+Dispatcher = Callable[[Callable[[], object]], object]
+
+
+def decode_texture(path: str, width: int, height: int) -> Any:
+    """Decode ``path`` no larger than ``width`` x ``height``; worker thread."""
+    from gi.repository import Gdk, GdkPixbuf
+
+    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(path, width, height, True)
+    return Gdk.Texture.new_for_pixbuf(pixbuf)
+
+
+def dispatch_on_main_loop(callback: Callable[[], object]) -> object:
+    from gi.repository import GLib
+
+    def run() -> bool:
+        callback()
+        return GLib.SOURCE_REMOVE
+
+    return GLib.idle_add(run)
+
+
+def display_scale() -> int:
+    """Largest monitor scale, so previews stay sharp on HiDPI screens."""
+    from gi.repository import Gdk
+
+    display = Gdk.Display.get_default()
+    if display is None:
+        return 1
+    monitors = display.get_monitors()
+    scales = [
+        monitor.get_scale_factor()
+        for index in range(monitors.get_n_items())
+        if (monitor := monitors.get_item(index)) is not None
+    ]
+    return max(scales, default=1)
+
+
+class PreviewLoader:
+    """Bounded LRU of decoded previews filled by a worker pool."""
+
+    def __init__(
+        self,
+        max_textures: int = MAX_CACHED_TEXTURES,
+        *,
+        workers: int = 2,
+        decode: Decoder = decode_texture,
+        dispatch: Dispatcher = dispatch_on_main_loop,
+    ) -> None:
+        self.max_textures = max_textures
+        self.decodes = 0
+        self._decode = decode
+        self._dispatch = dispatch
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="livecd-preview"
+        )
+        self._textures: OrderedDict[PreviewKey, Any] = OrderedDict()
+        self._pending: dict[PreviewKey, list[Callable[[Any], None]]] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        callback: Callable[[Any], None],
+    ) -> None:
+        """Call ``callback`` on the main loop with the texture, or ``None``."""
+        key = (path, width, height)
+        with self._lock:
+            texture = self._textures.get(key)
+            if texture is not None:
+                self._textures.move_to_end(key)
+            elif key in self._pending:
+                self._pending[key].append(callback)
+                return
+            else:
+                self._pending[key] = [callback]
+        if texture is not None:
+            callback(texture)
+            return
+        self._executor.submit(self._load, key)
+
+    def cancel(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        callback: Callable[[Any], None],
+    ) -> None:
+        """Withdraw ``callback``; a preview nobody waits for is not decoded."""
+        with self._lock:
+            callbacks = self._pending.get((path, width, height))
+            if callbacks is not None and callback in callbacks:
+                callbacks.remove(callback)
+
+    def _load(self, key: PreviewKey) -> None:
+        path, width, height = key
+        with self._lock:
+            if not self._pending.get(key):
+                self._pending.pop(key, None)
+                return
+        try:
+            texture = self._decode(path, width, height)
+        except Exception as error:
+            logger.error(f"Error loading image {path}: {error}")
+            texture = None
+        with self._lock:
+            self.decodes += 1
+            if texture is not None:
+                self._textures[key] = texture
+                while len(self._textures) > self.max_textures:
+                    self._textures.popitem(last=False)
+        self._dispatch(lambda: self._deliver(key, texture))
+
+    def _deliver(self, key: PreviewKey, texture: Any) -> None:
+        with self._lock:
+            callbacks = self._pending.pop(key, [])
+        for callback in callbacks:
+            callback(texture)
+
+    def set_limit(self, max_textures: int) -> None:
+        """Keep at most ``max_textures``, dropping the least recently used."""
+        with self._lock:
+            self.max_textures = max_textures
+            while len(self._textures) > self.max_textures:
+                self._textures.popitem(last=False)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_loader: PreviewLoader | None = None
+
+
+def get_preview_loader() -> PreviewLoader:
+    """Loader shared by every view; only used from the GTK main thread."""
+    global _shared_loader
+    if _shared_loader is None:
+        _shared_loader = PreviewLoader()
+    return _shared_loader
+
+
+class PreviewSlot:
+    """The preview of one recycled card, tied to the item it is bound to."""
+
+    def __init__(
+        self,
+        picture: Any,
+        *,
+        loader: PreviewLoader | None = None,
+        scale: int | None = None,
+    ) -> None:
+        self.picture = picture
+        self._loader = loader
+        self._scale = scale
+        self._request: tuple[PreviewKey, Callable[[Any], None]] | None = None
+
+    def bind(self, path: str) -> None:
+        self.unbind()
+        if self._loader is None:
+            self._loader = get_preview_loader()
+        if self._scale is None:
+            self._scale = display_scale()
+        key = (path, PREVIEW_WIDTH * self._scale, PREVIEW_HEIGHT * self._scale)
+
+        def show(texture: Any) -> None:
+            if self._request is None or self._request[1] is not show:
+                return
+            self._request = None
+            self.picture.remove_css_class("preview-placeholder")
+            if texture is not None:
+                self.picture.set_paintable(texture)
+
+        self._request = (key, show)
+        self._loader.request(*key, show)
+
+    def unbind(self) -> None:
+        self.picture.set_paintable(None)
+        self.picture.add_css_class("preview-placeholder")
+        if self._request is not None and self._loader is not None:
+            key, show = self._request
+            self._request = None
+            self._loader.cancel(*key, show)
+
+
+def create_preview_picture() -> Any:
+    """Return an empty picture that shows a placeholder until a slot binds it."""
+    from gi.repository import Gtk
+
+    picture = Gtk.Picture()
+    picture.set_hexpand(True)
+    picture.set_vexpand(True)
+    picture.set_can_shrink(True)
+    picture.set_halign(Gtk.Align.FILL)
+    picture.set_valign(Gtk.Align.CENTER)
+    picture.set_content_fit(Gtk.ContentFit.CONTAIN)
+    picture.add_css_class("preview-placeholder")
+    return picture
@@ -13,7 +13,8 @@ from gi.repository import Gdk, GdkPixbuf, GLib, GObject, Gtk, Pango
 from logging_config import get_logger
 from services import SystemService
 from translations import _
-from ui.base_view import BaseItemView
+from ui.base_view import BaseItemView, ItemCard
+from ui.preview_loader import PreviewSlot, create_preview_picture
 
 logger = get_logger()
 
@@ -52,6 +53,43 @@ class ThemeListItem(GObject.Object):
         super().__init__()
         self.name = name
         self.image_path = system_service.get_theme_image_path(name)
+        # Checked once here, not on every rebind while the grid scrolls.
+        self.has_preview = os.path.exists(self.image_path)
+
+
+class ThemeCard(ItemCard):
+    """Large light/dark card in simplified mode, small preview card otherwise."""
+
+    def __init__(self, simplified_mode: bool) -> None:
+        spacing = 12 if simplified_mode else 6
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=spacing)
+        self.set_can_focus(True)
+        self.label = Gtk.Label(halign=Gtk.Align.CENTER)
+        self.icon: Gtk.Image | None = None
+        if simplified_mode:
+            self.add_css_class("theme-card")
+            self.set_size_request(300, 250)
+            self.icon = Gtk.Image(
+                pixel_size=120,
+                halign=Gtk.Align.CENTER,
+                valign=Gtk.Align.CENTER,
+                vexpand=True,
+            )
+            self.icon.set_size_request(120, 120)
+            self.append(self.icon)
+            self.label.add_css_class("title-4")
+        else:
+            outer_box = Gtk.Box(
+                orientation=Gtk.Orientation.VERTICAL, hexpand=True, vexpand=True
+            )
+            picture = create_preview_picture()
+            self.preview = PreviewSlot(picture)
+            outer_box.append(picture)
+            self.append(outer_box)
+            self.label.set_margin_top(6)
+            self.label.set_ellipsize(Pango.EllipsizeMode.END)
+            self.label.set_max_width_chars(25)
+        self.append(self.label)
 
 
 class ThemeView(BaseItemView):
@@ -92,25 +130,21 @@ class ThemeView(BaseItemView):
         # Get the base UI from the parent class (a ScrolledWindow with a content box)
         root_widget = super()._build_ui()
 
-        # The parent _build_ui created self.main_box and self.flow_box.
+        # The parent _build_ui created self.main_box and self.grid_view.
         # We can now modify them or add other widgets to the main_box.
         if self.simplified_mode:
             # Simplified mode: larger cards, centered
-            self.flow_box.set_max_children_per_line(2)
-            self.flow_box.set_min_children_per_line(2)
-            self.flow_box.set_column_spacing(24)
-            self.flow_box.set_row_spacing(24)
-            self.flow_box.set_vexpand(False)
-            self.flow_box.set_halign(Gtk.Align.CENTER)
-            self.flow_box.set_valign(Gtk.Align.CENTER)
+            self.grid_view.set_max_columns(2)
+            self.grid_view.set_min_columns(2)
+            self.grid_view.add_css_class("large-cards")
+            self.scrolled_window.set_vexpand(False)
+            self.scrolled_window.set_valign(Gtk.Align.CENTER)
         else:
             # Full mode: many small cards
-            self.flow_box.set_max_children_per_line(8)
-            self.flow_box.set_min_children_per_line(4)
-            self.flow_box.set_column_spacing(0)
-            self.flow_box.set_row_spacing(12)
-            self.flow_box.set_vexpand(True)
-            self.flow_box.set_valign(Gtk.Align.END)
+            self.grid_view.set_max_columns(8)
+            self.grid_view.set_min_columns(4)
+            self.scrolled_window.set_vexpand(True)
+            self.scrolled_window.set_valign(Gtk.Align.END)
 
         # --- Settings Section (Bottom) ---
         if self.jamesdsp_available or self.contrast_available:
@@ -334,10 +368,7 @@ class ThemeView(BaseItemView):
 
     def _select_first_and_announce(self):
         """Override to include JamesDSP state in announcement."""
-        first_child = self.flow_box.get_first_child()
-        if first_child:
-            self.flow_box.select_child(first_child)
-            self.grab_focus()
+        self._select_first_item()
         self._suppress_speak = False
         if is_accessibility_enabled():
             text = self.get_title() or ""
@@ -372,87 +403,41 @@ class ThemeView(BaseItemView):
     def emit_signal(self, name: str):
         self.sig_theme_selected.emit(name)  # type: ignore[arg-type]
 
-    def create_item_widget(self, item: GObject.Object):
-        if not isinstance(item, ThemeListItem):
+    def create_card(self) -> ItemCard:
+        return ThemeCard(self.simplified_mode)
+
+    def bind_card(self, card: ItemCard, item: GObject.Object) -> None:
+        if not isinstance(item, ThemeListItem) or not isinstance(card, ThemeCard):
             raise TypeError("ThemeView requires a ThemeListItem")
-        if self.simplified_mode:
-            return self._create_simple_theme_widget(item)
-        return self._create_full_theme_widget(item)
+        if card.icon is not None:
+            self._bind_simple_theme_card(card, card.icon, item)
+        else:
+            self._bind_full_theme_card(card, item)
 
     @staticmethod
-    def _create_simple_theme_widget(item: ThemeListItem) -> Gtk.Box:
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_can_focus(True)
-        box.add_css_class("theme-card")
-        box.set_size_request(300, 250)
+    def _bind_simple_theme_card(
+        card: ThemeCard, icon: Gtk.Image, item: ThemeListItem
+    ) -> None:
         icon_name = "weather-clear-night" if item.name == "dark" else "weather-clear"
         label_text = _("Dark Theme") if item.name == "dark" else _("Light Theme")
-        box.update_property([Gtk.AccessibleProperty.LABEL], [label_text])
+        card.update_property([Gtk.AccessibleProperty.LABEL], [label_text])
         icon_path = f"/usr/share/biglinux/livecd/assets/icons/{icon_name}.svg"
         try:
             pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_size(icon_path, 120, 120)
-            icon = (
-                Gtk.Image.new_from_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
-                if pixbuf
-                else Gtk.Image.new_from_icon_name(icon_name)
-            )
+            if pixbuf:
+                icon.set_from_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
+            else:
+                icon.set_from_icon_name(icon_name)
         except GLib.Error:
-            icon = Gtk.Image.new_from_icon_name(icon_name)
-        icon.set_pixel_size(120)
-        icon.set_size_request(120, 120)
-        icon.set_halign(Gtk.Align.CENTER)
-        icon.set_valign(Gtk.Align.CENTER)
-        icon.set_vexpand(True)
-        box.append(icon)
-        label = Gtk.Label(label=label_text, halign=Gtk.Align.CENTER)
-        label.add_css_class("title-4")
-        box.append(label)
-        return box
+            icon.set_from_icon_name(icon_name)
+        card.label.set_label(label_text)
 
     @staticmethod
-    def _create_full_theme_widget(item: ThemeListItem) -> Gtk.Box:
+    def _bind_full_theme_card(card: ThemeCard, item: ThemeListItem) -> None:
         # Full mode: standard small theme cards
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        box.set_can_focus(True)
-
-        outer_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        outer_box.set_hexpand(True)
-        outer_box.set_vexpand(True)
-
-        try:
-            cursor = Gdk.Cursor.new_from_name("pointer", None)
-            outer_box.set_cursor(cursor)
-        except Exception:
-            pass
-
-        if os.path.exists(item.image_path):
-            try:
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(item.image_path)
-                picture = Gtk.Picture.new_for_pixbuf(pixbuf)
-                picture.set_hexpand(True)
-                picture.set_vexpand(True)
-                picture.set_can_shrink(True)
-                picture.set_halign(Gtk.Align.CENTER)
-                picture.set_valign(Gtk.Align.CENTER)
-                picture.set_content_fit(Gtk.ContentFit.CONTAIN)
-            except GLib.Error as e:
-                logger.error(f"Error loading image {item.image_path}: {e}")
-                picture = Gtk.Picture()
-        else:
-            picture = Gtk.Picture()
-
-        outer_box.append(picture)
-        box.append(outer_box)
-
-        label = Gtk.Label()
-        label.set_label(item.name.replace("-", " ").title())
-        label.set_halign(Gtk.Align.CENTER)
-        label.set_margin_top(6)
-        label.set_ellipsize(Pango.EllipsizeMode.END)
-        label.set_max_width_chars(25)
-        box.append(label)
-
-        return box
+        card.label.set_label(item.name.replace("-", " ").title())
+        if item.has_preview and card.preview is not None:
+            card.preview.bind(item.image_path)
 
     def is_jamesdsp_enabled(self) -> bool:
         if self.jamesdsp_switch:
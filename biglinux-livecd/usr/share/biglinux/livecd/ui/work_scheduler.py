@@ -0,0 +1,177 @@
+# ui/work_scheduler.py
+
+"""Build wizard pages in small steps between frames.
+
+Preloading imported the next page module and built the page in one idle
+callback, and the item views appended every card in another. On slow CPUs
+either one could hold the main loop for hundreds of milliseconds, so arrow
+keys and hover stuttered while the wizard looked idle. Page construction is
+now a generator that yields between units of work. The scheduler runs units
+from a default-idle source, which GLib only dispatches after the frame clock
+has painted, and stops each slice once the budget is spent. The most urgent
+task goes first, and every unit's duration is kept so slow ones can be found.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+# Leaves most of a 60 Hz frame for layout, paint and input.
+FRAME_BUDGET = 0.006
+SLOW_UNIT = 0.050
+MAX_TIMINGS = 512
+# Lower runs first.
+PRIORITY_VISIBLE = 0
+PRIORITY_NEXT = 10
+PRIORITY_PRELOAD = 20
+
+Waker = Callable[[Callable[[], bool]], object]
+
+
+@dataclass(frozen=True)
+class UnitTiming:
+    task: str
+    unit: int
+    duration: float
+
+
+@dataclass
+class _Task:
+    priority: int
+    sequence: int
+    units: Iterator[object]
+    done: int = 0
+
+
+def wake_when_idle(callback: Callable[[], bool]) -> object:
+    from gi.repository import GLib
+
+    return GLib.idle_add(callback, priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+
+class WorkScheduler:
+    """Runs queued construction tasks a few units per frame; main thread only."""
+
+    def __init__(
+        self,
+        budget: float = FRAME_BUDGET,
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+        wake: Waker = wake_when_idle,
+    ) -> None:
+        self.budget = budget
+        self.timings: deque[UnitTiming] = deque(maxlen=MAX_TIMINGS)
+        self._clock = clock
+        self._wake = wake
+        self._tasks: dict[str, _Task] = {}
+        self._sequence = itertools.count()
+        self._awake = False
+
+    def add(
+        self, name: str, units: Iterable[object], *, priority: int = PRIORITY_PRELOAD
+    ) -> None:
+        """Queue ``units``; each step of the iterator is one unit of work."""
+        if name in self._tasks:
+            raise ValueError(f"task already queued: {name}")
+        self._tasks[name] = _Task(priority, next(self._sequence), iter(units))
+        if not self._awake:
+            self._awake = True
+            self._wake(self._on_wake)
+
+    def pending(self, name: str) -> bool:
+        return name in self._tasks
+
+    def prioritize(self, name: str, priority: int) -> bool:
+        """Move a queued task up to ``priority``; it never moves down."""
+        task = self._tasks.get(name)
+        if task is None:
+            return False
+        task.priority = min(task.priority, priority)
+        return True
+
+    def cancel(self, name: str) -> bool:
+        return self._tasks.pop(name, None) is not None
+
+    def finish(self, name: str) -> None:
+        """Run what is left of ``name`` now, because the user needs it now."""
+        while name in self._tasks:
+            self._run_unit(name)
+
+    def run_slice(self) -> bool:
+        """Run units until the budget is spent; return whether work remains."""
+        started = self._clock()
+        while self._tasks:
+            name = min(
+                self._tasks,
+                key=lambda key: (self._tasks[key].priority, self._tasks[key].sequence),
+            )
+            self._run_unit(name)
+            if self._clock() - started >= self.budget:
+                break
+        return bool(self._tasks)
+
+    def _run_unit(self, name: str) -> None:
+        task = self._tasks[name]
+        started = self._clock()
+        finished = False
+        try:
+            next(task.units)
+        except StopIteration:
+            finished = True
+        except Exception:
+            logger.exception("Building %s failed", name)
+            finished = True
+        duration = self._clock() - started
+        self.timings.append(UnitTiming(name, task.done, duration))
+        task.done += 1
+        if duration > SLOW_UNIT:
+            logger.debug("Unit %d of %s took %.1f ms", task.done, name, duration * 1000)
+        # A unit may have cancelled its own task.
+        if finished and self._tasks.get(name) is task:
+            del self._tasks[name]
+
+    def _on_wake(self) -> bool:
+        more = self.run_slice()
+        self._awake = more
+        return more
+
+    def summary(self) -> dict[str, tuple[int, float, float]]:
+        """Units, total and longest seconds per task, from the recent timings."""
+        totals: dict[str, tuple[int, float, float]] = {}
+        for timing in self.timings:
+            count, total, longest = totals.get(timing.task, (0, 0.0, 0.0))
+            totals[timing.task] = (
+                count + 1,
+                total + timing.duration,
+                max(longest, timing.duration),
+            )
+        return totals
+
+    def log_summary(self) -> None:
+        for name, (count, total, longest) in sorted(self.summary().items()):
+            logger.info(
+                "Built %s in %d units: %.1f ms total, longest %.1f ms",
+                name,
+                count,
+                total * 1000,
+                longest * 1000,
+            )
+
+
+_shared_scheduler: WorkScheduler | None = None
+
+
+def get_work_scheduler() -> WorkScheduler:
+    """Scheduler shared by the window and every view."""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = WorkScheduler()
+    return _shared_scheduler
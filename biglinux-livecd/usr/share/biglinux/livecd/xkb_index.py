@@ -0,0 +1,211 @@
+"""Precompiled index of the xkb keyboard layouts and their variants.
+
+The keyboard page only offered the layout of the chosen language and ``us``,
+so anyone else had to fix their keyboard after installing. Browsing every
+layout means reading the xkb registry, and parsing ``evdev.xml`` in the
+wizard costs hundreds of milliseconds and tens of MB on a slow live medium.
+The package build now turns the registry into a small JSON index: one row
+per layout and variant, with its description and a search key already
+folded to lower-case ASCII, so a search is a substring scan over strings
+that are in memory. A missing or stale index only means the page offers the
+suggested layouts alone.
+
+Build it with ``python xkb_index.py --rules-dir DIR --output-dir DIR``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from xml.etree import ElementTree
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+INDEX_VERSION = 1
+INDEX_NAME = "xkb-index.json"
+INDEX_DIRECTORY = Path(__file__).resolve().parent / "assets"
+RULES_DIRECTORY = Path("/usr/share/X11/xkb/rules")
+RULES_FILE = "evdev.xml"
+# The names startbiglive accepts when it replays the saved layout.
+XKB_NAME = re.compile(r"[A-Za-z0-9_.+-]+")
+
+
+@dataclass(frozen=True)
+class KeyboardLayout:
+    layout: str
+    variant: str
+    description: str
+
+    @property
+    def layout_id(self) -> str:
+        """The ``layout(variant)`` form apply_keyboard_layout takes."""
+        return f"{self.layout}({self.variant})" if self.variant else self.layout
+
+
+def fold_text(text: str) -> str:
+    """Lower-case ASCII, so "português" matches "portugues"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+
+
+def _config_text(item: ElementTree.Element | None, tag: str) -> str:
+    if item is None:
+        return ""
+    return (item.findtext(tag) or "").strip()
+
+
+def _config_codes(item: ElementTree.Element | None) -> list[str]:
+    if item is None:
+        return []
+    codes = item.findall("languageList/iso639Id") + item.findall(
+        "countryList/iso3166Id"
+    )
+    return [code.text.strip() for code in codes if code.text]
+
+
+def _row(layout: str, variant: str, description: str, codes: list[str]) -> list[str]:
+    entry = KeyboardLayout(layout, variant, description)
+    key = fold_text(" ".join([description, entry.layout_id, *codes]))
+    return [layout, variant, description, key]
+
+
+def registry_rows(rules_file: Path) -> list[list[str]]:
+    """Rows of [layout, variant, description, search key], by description."""
+    root = ElementTree.parse(rules_file).getroot()
+    rows: dict[str, list[str]] = {}
+    for layout in root.iterfind("layoutList/layout"):
+        item = layout.find("configItem")
+        name = _config_text(item, "name")
+        if not XKB_NAME.fullmatch(name):
+            continue
+        codes = _config_codes(item)
+        rows.setdefault(name, _row(name, "", _config_text(item, "description"), codes))
+        for variant in layout.iterfind("variantList/variant"):
+            variant_item = variant.find("configItem")
+            variant_name = _config_text(variant_item, "name")
+            if not XKB_NAME.fullmatch(variant_name):
+                continue
+            rows.setdefault(
+                f"{name}({variant_name})",
+                _row(
+                    name,
+                    variant_name,
+                    _config_text(variant_item, "description"),
+                    codes + _config_codes(variant_item),
+                ),
+            )
+    return sorted(rows.values(), key=lambda row: (fold_text(row[2]), row[0], row[1]))
+
+
+def build_index(rules_dir: Path, output_dir: Path) -> int:
+    rows = registry_rows(rules_dir / RULES_FILE)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / INDEX_NAME).write_text(
+        json.dumps(
+            {"version": INDEX_VERSION, "rows": rows},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+    return len(rows)
+
+
+def _valid_row(row: object) -> bool:
+    return (
+        isinstance(row, list)
+        and len(row) == 4
+        and all(isinstance(value, str) for value in row)
+    )
+
+
+class KeyboardIndex:
+    """Layouts and variants from the index; rows stay as plain strings."""
+
+    def __init__(self, rows: list[list[str]]) -> None:
+        self._layouts = tuple(row[0] for row in rows)
+        self._variants = tuple(row[1] for row in rows)
+        self._descriptions = tuple(row[2] for row in rows)
+        self._keys = tuple(row[3] for row in rows)
+        self._positions = {
+            KeyboardLayout(row[0], row[1], "").layout_id: position
+            for position, row in enumerate(rows)
+        }
+
+    @classmethod
+    def load(cls, directory: Path = INDEX_DIRECTORY) -> KeyboardIndex:
+        """The index in ``directory``; empty if it is missing or stale."""
+        try:
+            index = json.loads((directory / INDEX_NAME).read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as error:
+            logger.info(f"No keyboard layout index, offering suggestions: {error}")
+            return cls([])
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return cls([])
+        rows = index.get("rows")
+        if not isinstance(rows, list):
+            return cls([])
+        return cls([row for row in rows if _valid_row(row)])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def entry(self, position: int) -> KeyboardLayout:
+        return KeyboardLayout(
+            self._layouts[position],
+            self._variants[position],
+            self._descriptions[position],
+        )
+
+    def position(self, layout_id: str) -> int | None:
+        return self._positions.get(layout_id)
+
+    def search(self, query: str) -> list[int]:
+        """Positions whose description, id or language codes hold every word."""
+        words = fold_text(query).split()
+        if not words:
+            return list(range(len(self._keys)))
+        return [
+            position
+            for position, key in enumerate(self._keys)
+            if all(word in key for word in words)
+        ]
+
+
+_shared_index: KeyboardIndex | None = None
+
+
+def get_keyboard_index() -> KeyboardIndex:
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = KeyboardIndex.load()
+    return _shared_index
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Index the xkb layouts and variants for the live wizard."
+    )
+    parser.add_argument("--rules-dir", type=Path, default=RULES_DIRECTORY)
+    parser.add_argument("--output-dir", type=Path, default=INDEX_DIRECTORY)
+    arguments = parser.parse_args(argv)
+    if not (arguments.rules_dir / RULES_FILE).is_file():
+        print(f"{arguments.rules_dir / RULES_FILE} is missing", file=sys.stderr)
+        return 1
+    count = build_index(arguments.rules_dir, arguments.output_dir)
+    print(f"Indexed {count} layouts into {os.fspath(arguments.output_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
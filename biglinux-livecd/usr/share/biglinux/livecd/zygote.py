@@ -0,0 +1,322 @@
+"""Fork server that keeps the wizard's module graph imported.
+
+``startbiglive`` starts ``main.py --zygote`` before it waits for the GPU and
+the compositor. That process imports GTK4, libadwaita, GdkPixbuf and every
+view module, then waits on a socket in the user's runtime directory. When the
+compositor runs ``main.py`` it hands its argv, environment and standard
+streams to the zygote, which forks a child that starts the application
+straight away instead of importing everything again.
+
+The zygote never talks to a display: the display variables are dropped
+before the imports, and each child opens its own display once it has taken
+over the environment of the process that asked for it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import importlib
+import json
+import locale
+import os
+import selectors
+import signal
+import socket
+import stat
+import struct
+import sys
+import time
+import traceback
+from collections.abc import Callable
+
+from logging_config import get_logger
+
+logger = get_logger()
+
+SOCKET_NAME = "biglinux-live-wizard.sock"
+PRELOAD_MODULES = (
+    "application",
+    "services",
+    "ui.language_view",
+    "ui.keyboard_view",
+    "ui.desktop_view",
+    "ui.theme_view",
+)
+# Launch time and mode travel to the wizard, which reports how long it took
+# to map its window when it creates the wizard-ready marker.
+LAUNCH_TIME_VARIABLE = "BIGLINUX_WIZARD_LAUNCHED_AT"
+LAUNCH_MODE_VARIABLE = "BIGLINUX_WIZARD_LAUNCH_MODE"
+IDLE_TIMEOUT = 300.0
+_DISPLAY_VARIABLES = ("DISPLAY", "WAYLAND_DISPLAY", "WAYLAND_SOCKET")
+_STANDARD_STREAMS = 3
+_MAX_REQUEST_BYTES = 256 * 1024
+_FORWARDED_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+
+WizardRunner = Callable[[list[str]], int]
+
+
+def socket_path() -> str | None:
+    """Return the zygote socket path inside a private runtime directory."""
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR", "")
+    if runtime_directory != f"/run/user/{os.getuid()}":
+        return None
+    try:
+        directory_stat = os.lstat(runtime_directory)
+    except OSError:
+        return None
+    if (
+        not stat.S_ISDIR(directory_stat.st_mode)
+        or directory_stat.st_uid != os.getuid()
+        or directory_stat.st_mode & 0o077
+    ):
+        return None
+    return os.path.join(runtime_directory, SOCKET_NAME)
+
+
+def request_wizard(argv: list[str], path: str | None = None) -> int | None:
+    """Ask a running zygote for a wizard; ``None`` means start one here."""
+    path = path or socket_path()
+    # A compositor-provided socket descriptor cannot be handed to the zygote.
+    if path is None or "WAYLAND_SOCKET" in os.environ:
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    try:
+        connection.connect(path)
+        payload = json.dumps(
+            {"argv": argv, "environ": dict(os.environ), "cwd": os.getcwd()}
+        ).encode("utf-8")
+        socket.send_fds(connection, [payload], list(range(_STANDARD_STREAMS)))
+        reply = connection.recv(64).decode("ascii")
+    except (OSError, UnicodeDecodeError):
+        connection.close()
+        return None
+    if not reply.startswith("pid:"):
+        connection.close()
+        return None
+    child = int(reply.removeprefix("pid:"))
+
+    def forward(signal_number: int, _frame: object) -> None:
+        try:
+            os.kill(child, signal_number)
+        except ProcessLookupError:
+            pass
+
+    # The compositor only knows this process, so its session-exit signals
+    # have to reach the wizard the zygote forked.
+    for signal_number in _FORWARDED_SIGNALS:
+        signal.signal(signal_number, forward)
+    with connection:
+        try:
+            status = connection.recv(64).decode("ascii")
+        except (OSError, UnicodeDecodeError):
+            return 1
+    if not status.startswith("exit:"):
+        return 1
+    return int(status.removeprefix("exit:"))
+
+
+def preload() -> None:
+    for variable in _DISPLAY_VARIABLES:
+        os.environ.pop(variable, None)
+    started = time.monotonic()
+    for module_name in PRELOAD_MODULES:
+        importlib.import_module(module_name)
+    logger.info(
+        "Wizard zygote preloaded %d modules in %.0f ms",
+        len(PRELOAD_MODULES),
+        (time.monotonic() - started) * 1000,
+    )
+
+
+def serve(
+    run_wizard: WizardRunner,
+    path: str | None = None,
+    *,
+    idle_timeout: float = IDLE_TIMEOUT,
+) -> int:
+    """Fork a wizard per request until one finishes cleanly or we idle out."""
+    path = path or socket_path()
+    if path is None:
+        logger.warning("No private runtime directory for the wizard zygote")
+        return 1
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(old_umask)
+    listener.listen(4)
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    deadline = time.monotonic() + idle_timeout
+    try:
+        while True:
+            waiting_children = len(selector.get_map()) > 1
+            timeout = None if waiting_children else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                return 0
+            for key, _events in selector.select(timeout):
+                if key.fileobj is listener:
+                    connection, _address = listener.accept()
+                    _start_child(connection, selector, run_wizard)
+                    continue
+                if _reap_child(key, selector) == 0:
+                    return 0
+                deadline = time.monotonic() + idle_timeout
+    finally:
+        for key in list(selector.get_map().values()):
+            if key.fileobj is not listener:
+                _close_child_key(key, selector)
+        selector.close()
+        listener.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _peer_uid(connection: socket.socket) -> int:
+    credentials = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    return struct.unpack("3i", credentials)[1]
+
+
+def _receive_request(
+    connection: socket.socket,
+) -> tuple[dict[str, object], list[int]] | None:
+    message, descriptors, flags, _address = socket.recv_fds(
+        connection, _MAX_REQUEST_BYTES, _STANDARD_STREAMS
+    )
+    if flags & (socket.MSG_TRUNC | socket.MSG_CTRUNC) or (
+        len(descriptors) != _STANDARD_STREAMS
+    ):
+        for descriptor in descriptors:
+            os.close(descriptor)
+        return None
+    try:
+        request = json.loads(message.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        request = None
+    if (
+        not isinstance(request, dict)
+        or not isinstance(request.get("argv"), list)
+        or not all(isinstance(argument, str) for argument in request["argv"])
+        or not isinstance(request.get("environ"), dict)
+        or not all(
+            isinstance(name, str) and isinstance(value, str)
+            for name, value in request["environ"].items()
+        )
+        or not isinstance(request.get("cwd"), str)
+    ):
+        for descriptor in descriptors:
+            os.close(descriptor)
+        return None
+    return request, descriptors
+
+
+def _start_child(
+    connection: socket.socket,
+    selector: selectors.BaseSelector,
+    run_wizard: WizardRunner,
+) -> None:
+    try:
+        if _peer_uid(connection) != os.getuid():
+            raise OSError("wizard request from another user")
+        received = _receive_request(connection)
+        if received is None:
+            raise OSError("malformed wizard request")
+    except OSError as error:
+        logger.warning("Rejected wizard zygote request: %s", error)
+        connection.close()
+        return
+    request, descriptors = received
+    child = os.fork()
+    if child == 0:
+        _run_child(selector, connection, request, descriptors, run_wizard)
+    for descriptor in descriptors:
+        os.close(descriptor)
+    child_descriptor = os.pidfd_open(child)
+    selector.register(child_descriptor, selectors.EVENT_READ, (child, connection))
+    try:
+        connection.send(f"pid:{child}".encode("ascii"))
+    except OSError:
+        pass
+
+
+def _reap_child(key: selectors.SelectorKey, selector: selectors.BaseSelector) -> int:
+    child, connection = key.data
+    _close_child_key(key, selector, close_connection=False)
+    _pid, status = os.waitpid(child, 0)
+    exit_code = os.waitstatus_to_exitcode(status)
+    with connection:
+        try:
+            connection.send(f"exit:{exit_code}".encode("ascii"))
+        except OSError:
+            pass
+    return exit_code
+
+
+def _close_child_key(
+    key: selectors.SelectorKey,
+    selector: selectors.BaseSelector,
+    *,
+    close_connection: bool = True,
+) -> None:
+    selector.unregister(key.fileobj)
+    if isinstance(key.fileobj, int):
+        os.close(key.fileobj)
+    if close_connection and key.data is not None:
+        key.data[1].close()
+
+
+def _run_child(
+    selector: selectors.BaseSelector,
+    connection: socket.socket,
+    request: dict[str, object],
+    descriptors: list[int],
+    run_wizard: WizardRunner,
+) -> None:
+    exit_code = 1
+    try:
+        for key in list(selector.get_map().values()):
+            if isinstance(key.fileobj, int):
+                os.close(key.fileobj)
+            elif isinstance(key.fileobj, socket.socket):
+                key.fileobj.close()
+            if key.data is not None:
+                key.data[1].close()
+        connection.close()
+        for signal_number in _FORWARDED_SIGNALS:
+            signal.signal(signal_number, signal.SIG_DFL)
+        for target, descriptor in enumerate(descriptors):
+            os.dup2(descriptor, target)
+            os.close(descriptor)
+        environment = request["environ"]
+        assert isinstance(environment, dict)
+        os.environ.clear()
+        os.environ.update(environment)
+        os.environ[LAUNCH_MODE_VARIABLE] = "zygote"
+        os.chdir(str(request["cwd"]))
+        locale.setlocale(locale.LC_ALL, "")
+        argv = request["argv"]
+        assert isinstance(argv, list)
+        sys.argv = list(argv)
+        exit_code = run_wizard(list(argv))
+    except SystemExit as exit_request:
+        exit_code = exit_request.code if isinstance(exit_request.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        # The child is the wizard now: run its exit handlers, but never return
+        # into the zygote's accept loop.
+        try:
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
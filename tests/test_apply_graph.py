@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+from apply_graph import ApplyGraph, run_process  # noqa: E402
+from config import SetupConfig  # noqa: E402
+from services import SystemService  # noqa: E402
+
+
+class Timeline:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.spans: dict[str, tuple[float, float]] = {}
+
+    def step(self, name: str, seconds: float, status: int = 0):
+        def run() -> int:
+            started = time.monotonic()
+            time.sleep(seconds)
+            with self.lock:
+                self.spans[name] = (started, time.monotonic())
+            return status
+
+        return run
+
+
+def test_steps_follow_their_dependencies_and_overlap_otherwise() -> None:
+    timeline = Timeline()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        graph = ApplyGraph(executor)
+        graph.add("config", timeline.step("config", 0.1))
+        graph.add("service", timeline.step("service", 0.1), after=["config"])
+        graph.add("profile", timeline.step("profile", 0.2))
+        graph.add(
+            "restart", timeline.step("restart", 0.0), after=["service", "profile"]
+        )
+        started = time.monotonic()
+        results = graph.wait(timeout=5)
+        elapsed = time.monotonic() - started
+
+    spans = timeline.spans
+    assert spans["service"][0] >= spans["config"][1]
+    assert spans["restart"][0] >= max(spans["service"][1], spans["profile"][1])
+    assert spans["profile"][0] < spans["config"][1]
+    # The longest chain is 0.2 s; one after another would be 0.4 s.
+    assert elapsed < 0.35
+    assert [result.name for result in results] == [
+        "config",
+        "service",
+        "profile",
+        "restart",
+    ]
+    assert all(result.ok and result.duration > 0 for result in results[:3])
+
+
+def test_failures_are_reported_and_do_not_block_later_steps() -> None:
+    def broken() -> int:
+        raise OSError("no such device")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        graph = ApplyGraph(executor)
+        graph.add("broken", broken)
+        graph.add("exit-code", lambda: 3)
+        last = graph.add("last", lambda: 0, after=["broken", "exit-code"])
+        assert last.result(timeout=5).ok
+
+    results = {result.name: result for result in graph.wait()}
+    assert results["broken"].error == "no such device"
+    assert results["exit-code"].status == 3
+    assert not results["exit-code"].ok
+
+
+def test_unknown_or_repeated_steps_are_rejected() -> None:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        graph = ApplyGraph(executor)
+        graph.add("one", lambda: 0)
+        with pytest.raises(ValueError):
+            graph.add("one", lambda: 0)
+        with pytest.raises(ValueError):
+            graph.add("two", lambda: 0, after=["missing"])
+
+
+def test_commands_are_waited_for_and_keep_their_status(tmp_path: Path) -> None:
+    pid_file = tmp_path / "pid"
+
+    status = run_process(["sh", "-c", f'echo $$ >"{pid_file}"; exit 3'])
+
+    assert status == 3
+    assert not Path(f"/proc/{pid_file.read_text().strip()}").exists()
+    assert run_process(["/nonexistent/command"]) == 127
+    assert run_process(["sleep", "5"], timeout=0.05) == 124
+
+
+def test_background_commands_are_reaped(tmp_path: Path) -> None:
+    pid_file = tmp_path / "pid"
+    service = SystemService()
+
+    assert service._run_command(["sh", "-c", f'echo $$ >"{pid_file}"'])
+    service._apply_executor.shutdown(wait=True)
+
+    assert not Path(f"/proc/{pid_file.read_text().strip()}").exists()
+
+
+def test_finalize_restarts_the_compositor_after_every_other_step(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config_file = tmp_path / ".config/jamesdsp/application.conf"
+    config_file.parent.mkdir(parents=True)
+    config_file.write_text("AutoStartEnabled=false\n")
+    service = SystemService(test_mode=True)
+
+    graph = service.finalize_setup(
+        SetupConfig(enable_jamesdsp=True, enable_enhanced_contrast=False)
+    )
+    results = graph.wait(timeout=5)
+
+    assert set(graph.futures) == {
+        "jamesdsp-config",
+        "jamesdsp-service",
+        "display-profile",
+        "restart-compositor",
+    }
+    assert all(result.ok for result in results)
+
+
+def test_immediate_jamesdsp_apply_rewrites_the_config_first(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config_file = tmp_path / ".config/jamesdsp/application.conf"
+    config_file.parent.mkdir(parents=True)
+    config_file.write_text("AutoStartEnabled=true\n")
+    service = SystemService()
+    events: list[str] = []
+
+    def step(command: list[str]):
+        def run() -> int:
+            events.append(f"{command[0]} started")
+            # Unordered, the service step would start during this sleep.
+            time.sleep(0.05 if command[0] == "sed" else 0)
+            events.append(f"{command[0]} done")
+            return 0
+
+        return run
+
+    monkeypatch.setattr(service, "_command_step", step)
+    monkeypatch.setattr(service, "_remove_live_state_file", lambda *_args: True)
+
+    graph = service.apply_jamesdsp_settings(False)
+    graph.wait(timeout=5)
+
+    assert events == ["sed started", "sed done", "systemctl started", "systemctl done"]
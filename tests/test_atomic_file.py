@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPOSITORY / "biglinux-livecd/usr/lib/biglinux-livecd"))
+
+from atomic_file import user_file, write_atomically  # noqa: E402
+
+
+def test_a_write_replaces_the_file_and_leaves_nothing_behind(tmp_path: Path) -> None:
+    path = user_file(tmp_path, "catalog")
+    assert path == tmp_path / f"catalog.{os.geteuid()}.json"
+
+    write_atomically(path, b"first")
+    write_atomically(path, b"second", 0o600)
+
+    assert path.read_bytes() == b"second"
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_a_failed_rename_keeps_the_old_file(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "profile.env"
+    write_atomically(path, b"old")
+
+    def refuse(_source, _destination) -> None:
+        raise OSError("read-only")
+
+    monkeypatch.setattr(os, "replace", refuse)
+    with pytest.raises(OSError):
+        write_atomically(path, b"new")
+
+    assert path.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import io
+import struct
+import sys
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+import audio_sink  # noqa: E402
+
+RECORDER = (
+    "import shutil, sys\n"
+    "with open(sys.argv[1], 'ab') as output:\n"
+    "    shutil.copyfileobj(sys.stdin.buffer, output)\n"
+)
+
+
+def make_wav(frames: bytes, rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(frames)
+    return buffer.getvalue()
+
+
+def recording_sink(output: Path) -> audio_sink.AudioSink:
+    return audio_sink.AudioSink(
+        lambda _format: [sys.executable, "-c", RECORDER, str(output)]
+    )
+
+
+def test_parse_wav_reads_float_samples_written_by_kokoro() -> None:
+    frames = struct.pack("<4f", 0.0, 0.5, -0.5, 0.25)
+    fmt = struct.pack("<HHIIHH", 3, 1, 24000, 96000, 4, 32)
+    data = (
+        b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"data"
+        + struct.pack("<I", len(frames))
+        + frames
+    )
+    clip = audio_sink.parse_wav(b"RIFF" + struct.pack("<I", len(data)) + data)
+
+    assert clip.audio_format == audio_sink.AudioFormat("float32le", 24000, 1, 4)
+    assert clip.frames == frames
+    assert "--format=float32le" in audio_sink.pacat_command(clip.audio_format)
+
+
+def test_parse_wav_rejects_other_files() -> None:
+    with pytest.raises(ValueError):
+        audio_sink.parse_wav(b"ID3\x03not a wave file")
+
+
+def test_clips_share_one_stream_and_report_first_sample(tmp_path: Path) -> None:
+    output = tmp_path / "played.raw"
+    sink = recording_sink(output)
+    sink.enqueue(make_wav(b"\x01\x00" * 80))
+    sink.enqueue(make_wav(b"\x02\x00" * 80))
+    assert sink.wait_idle(timeout=5)
+    sink.close()
+
+    assert output.read_bytes() == b"\x01\x00" * 80 + b"\x02\x00" * 80
+    assert sink.streams_opened == 1
+    assert sink.last_time_to_first_sample is not None
+    assert 0 <= sink.last_time_to_first_sample < 5
+
+
+def test_play_interrupts_the_current_and_queued_clips(tmp_path: Path) -> None:
+    output = tmp_path / "played.raw"
+    sink = recording_sink(output)
+    long_clip = b"\x01\x00" * 16000
+    sink.enqueue(make_wav(long_clip))
+    sink.enqueue(make_wav(b"\x02\x00" * 800))
+    time.sleep(0.2)
+    sink.play(make_wav(b"\x03\x00" * 80))
+    assert sink.wait_idle(timeout=5)
+    sink.close()
+
+    played = output.read_bytes()
+    assert played.endswith(b"\x03\x00" * 80)
+    assert b"\x02\x00" not in played
+    assert len(played) < len(long_clip)
+    assert sink.streams_opened == 1
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIBRARY = REPOSITORY / "biglinux-livecd/usr/lib/biglinux-livecd"
+sys.path.insert(0, str(LIBRARY))
+
+import block_inventory  # noqa: E402
+
+ESP = "c12a7328-f81f-11d2-ba4b-00a0c93ec93b"
+LIVE_MOUNT = "/run/miso/bootmnt"
+
+
+class FakeSystem:
+    """A sysfs block tree, udev database and mount table under one directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.devices = root / "sys/devices"
+        self.sysfs_block = root / "sys/class/block"
+        self.udev_data = root / "run/udev/data"
+        self.mountinfo = root / "proc/self/mountinfo"
+        self.run = root / "run/biglinux-live"
+        for directory in (self.sysfs_block, self.udev_data, self.run):
+            directory.mkdir(parents=True)
+        self.mountinfo.parent.mkdir(parents=True)
+        self.mountinfo.write_text(
+            "22 1 0:21 / / rw - overlay overlay rw\n", encoding="utf-8"
+        )
+        self.sequence = 0
+
+    def add(
+        self,
+        name: str,
+        number: str,
+        *,
+        disk: str | None = None,
+        slaves: tuple[str, ...] = (),
+        dm_uuid: str = "",
+        **udev: str,
+    ) -> None:
+        if disk is not None:
+            directory = self.sysfs_block.joinpath(disk).resolve() / name
+        else:
+            directory = self.devices / "virtual" / name
+        directory.mkdir(parents=True)
+        (directory / "dev").write_text(f"{number}\n")
+        if disk is not None:
+            (directory / "partition").write_text("1\n")
+        if dm_uuid:
+            (directory / "dm").mkdir()
+            (directory / "dm/uuid").write_text(f"{dm_uuid}\n")
+        (directory / "slaves").mkdir()
+        for slave in slaves:
+            (directory / "slaves" / slave).symlink_to(
+                self.sysfs_block.joinpath(slave).resolve()
+            )
+        (self.sysfs_block / name).symlink_to(directory)
+        (self.udev_data / f"b{number}").write_text(
+            "".join(f"E:{key}={value}\n" for key, value in udev.items())
+        )
+
+    def remove(self, name: str) -> None:
+        (self.sysfs_block / name).unlink()
+
+    def mount_live(self, number: str, source: str) -> None:
+        with self.mountinfo.open("a", encoding="utf-8") as mountinfo:
+            mountinfo.write(f"40 22 {number} / {LIVE_MOUNT} ro - iso9660 {source} ro\n")
+
+    def uevent(self) -> None:
+        """What the udev rule runs for a block uevent."""
+        self.sequence += 1
+        subprocess.run(
+            [str(LIBRARY / "block-uevent"), str(self.sequence)],
+            check=True,
+            env={**os.environ, "block_generation_file": str(self.generation)},
+        )
+
+    @property
+    def generation(self) -> Path:
+        return self.run / "block-generation"
+
+    def load(self) -> block_inventory.BlockInventory:
+        return block_inventory.load_inventory(
+            self.run / "block-inventory.json",
+            self.run / "block-inventory.env",
+            self.generation,
+            sysfs_block=self.sysfs_block,
+            udev_data=self.udev_data,
+            mountinfo=self.mountinfo,
+        )
+
+    def cached(self) -> block_inventory.BlockInventory | None:
+        return block_inventory.read_inventory(
+            self.run / "block-inventory.json", self.generation
+        )
+
+
+@pytest.fixture
+def system(tmp_path: Path) -> FakeSystem:
+    fake = FakeSystem(tmp_path)
+    fake.devices.joinpath("pci").mkdir(parents=True)
+    for disk, number in (("sda", "8:0"), ("sdb", "8:16"), ("sdc", "8:32")):
+        directory = fake.devices / "pci" / disk
+        directory.mkdir()
+        (directory / "dev").write_text(f"{number}\n")
+        (fake.sysfs_block / disk).symlink_to(directory)
+    # An installed system with its root on LVM.
+    fake.add("sda1", "8:1", disk="sda", ID_FS_TYPE="vfat", ID_PART_ENTRY_TYPE=ESP)
+    fake.add("sda2", "8:2", disk="sda", ID_FS_TYPE="LVM2_member")
+    fake.add("dm-0", "254:0", slaves=("sda2",), dm_uuid="LVM-abc", ID_FS_TYPE="ext4")
+    # The live USB stick, with its own EFI partition.
+    fake.add("sdb1", "8:17", disk="sdb", ID_FS_TYPE="iso9660")
+    fake.add("sdb2", "8:18", disk="sdb", ID_FS_TYPE="vfat", ID_PART_ENTRY_TYPE="0xEF")
+    # A BIOS Windows install: NTFS on the active MBR partition.
+    fake.add(
+        "sdc1",
+        "8:33",
+        disk="sdc",
+        ID_FS_TYPE="ntfs",
+        ID_PART_ENTRY_TYPE="0x7",
+        ID_PART_ENTRY_FLAGS="0x80",
+    )
+    fake.add("sdc2", "8:34", disk="sdc", ID_FS_TYPE="btrfs", ID_PART_ENTRY_TYPE="0x83")
+    fake.mount_live("8:17", "/dev/sdb1")
+    return fake
+
+
+def test_inventory_answers_each_probe_from_sysfs(system: FakeSystem) -> None:
+    inventory = system.load()
+
+    assert inventory.live_device == "sdb1"
+    assert inventory.live_ancestry() == {"sdb1", "sdb"}
+    assert inventory.device("dm-0").type == "lvm"
+    assert inventory.ancestry("dm-0") == {"dm-0", "sda2", "sda"}
+    assert inventory.efi_partitions() == ["/dev/sda1"]
+    assert inventory.linux_filesystems() == [
+        ("/dev/dm-0", "ext4"),
+        ("/dev/sdc2", "btrfs"),
+    ]
+    assert inventory.windows_boot_volumes() == ["/dev/sda1", "/dev/sdc1"]
+
+    # Without the live medium nothing is excluded.
+    system.mountinfo.write_text("")
+    inventory = block_inventory.enumerate_inventory(
+        system.sysfs_block, system.udev_data, system.mountinfo
+    )
+    assert inventory.live_device is None
+    assert inventory.efi_partitions() == ["/dev/sda1", "/dev/sdb2"]
+
+
+def test_hotplug_invalidates_the_cache(system: FakeSystem) -> None:
+    system.uevent()
+    inventory = system.load()
+    assert system.cached() == inventory
+    assert (system.run / "block-inventory.json").stat().st_mode & 0o777 == 0o644
+
+    # A disk plugged in: its uevent makes the cache stale before it is read.
+    disk = system.devices / "pci/sdd"
+    disk.mkdir()
+    (disk / "dev").write_text("8:48\n")
+    (system.sysfs_block / "sdd").symlink_to(disk)
+    system.add("sdd1", "8:49", disk="sdd", ID_FS_TYPE="vfat", ID_PART_ENTRY_TYPE=ESP)
+    system.uevent()
+    assert system.cached() is None
+    assert system.load().efi_partitions() == ["/dev/sda1", "/dev/sdd1"]
+    assert system.cached() is not None
+
+    # And pulled out again.
+    system.remove("sdd1")
+    system.remove("sdd")
+    system.uevent()
+    assert system.cached() is None
+    assert system.load().efi_partitions() == ["/dev/sda1"]
+
+
+def test_storage_probe_counts_from_the_cache_without_lsblk(system: FakeSystem) -> None:
+    system.uevent()
+    system.load()
+    script = """
+source "$STORAGE_PROBE"
+findmnt_command=false
+lsblk_command=false
+count_non_live_efi_partitions /run/miso/bootmnt
+"""
+    environment = {
+        **os.environ,
+        "STORAGE_PROBE": str(LIBRARY / "storage-probe"),
+        "block_inventory_file": str(system.run / "block-inventory.env"),
+        "block_generation_file": str(system.generation),
+    }
+
+    def count() -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            ["bash", "-c", script],
+            check=False,
+            capture_output=True,
+            text=True,
+            env=environment,
+        )
+
+    result = count()
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "1"
+
+    # After a uevent the probe asks lsblk, which fails here, rather than
+    # trusting an inventory that may miss the new disk.
+    system.uevent()
+    assert count().returncode != 0
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIBRARY = REPOSITORY / "biglinux-livecd/usr/lib/biglinux-livecd"
+sys.path.insert(0, str(LIBRARY))
+
+import boot_timeline  # noqa: E402
+
+
+def record_from_bash(directory: Path, uptime: str, script: str) -> None:
+    uptime_file = directory.parent / "uptime"
+    uptime_file.write_text(f"{uptime} 1.00\n", encoding="ascii")
+    result = subprocess.run(
+        [
+            "bash",
+            "-c",
+            f"""
+source "$LIBRARY/boot-timeline"
+timeline_directory=$DIRECTORY
+timeline_uptime_path=$UPTIME
+timeline_source=startbiglive
+{script}
+""",
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+        env={
+            **os.environ,
+            "LIBRARY": str(LIBRARY),
+            "DIRECTORY": str(directory),
+            "UPTIME": str(uptime_file),
+        },
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_shell_and_python_events_form_one_report(tmp_path: Path) -> None:
+    directory = tmp_path / "timeline"
+    directory.mkdir()
+    record_from_bash(directory, "0.50", "timeline_mark session-start")
+    record_from_bash(
+        directory,
+        "1.00",
+        """
+timeline_begin wait-for-gpu
+printf '3.25 1.00\n' >"$UPTIME"
+timeline_end wait-for-gpu
+""",
+    )
+    with boot_timeline.span(
+        "wizard-imports", source="livecd-wizard", directory=directory
+    ):
+        pass
+    boot_timeline.mark("wizard-visible", source="livecd-wizard", directory=directory)
+
+    spans = boot_timeline.build_spans(boot_timeline.read_events(directory))
+
+    assert [(span.source, span.name) for span in spans] == [
+        ("startbiglive", "session-start"),
+        ("startbiglive", "wait-for-gpu"),
+        ("livecd-wizard", "wizard-imports"),
+        ("livecd-wizard", "wizard-visible"),
+    ]
+    assert spans[1].duration == 2.25
+    report = boot_timeline.format_report(spans)
+    assert "2.250s  startbiglive   wait-for-gpu" in report
+    assert "mark  livecd-wizard  wizard-visible" in report
+
+
+def test_unfinished_spans_are_reported_open() -> None:
+    events = boot_timeline.parse_events(
+        "1.0\tstartbiglive\t10\tbegin\tcompositor-grace-period\n"
+        "broken line\n"
+        "2.0\tstartbiglive\t11\tend\tcompositor-grace-period\n"
+    )
+    (span,) = boot_timeline.build_spans(events)
+    assert span.end is None
+    assert "open" in boot_timeline.format_report([span])
+
+
+def test_recorders_do_not_follow_planted_links(tmp_path: Path) -> None:
+    directory = tmp_path / "timeline"
+    directory.mkdir()
+    target = tmp_path / "target"
+    target.write_text("", encoding="ascii")
+    (directory / f"events.{os.geteuid()}").symlink_to(target)
+
+    boot_timeline.mark("wizard-launch", source="livecd-wizard", directory=directory)
+    record_from_bash(directory, "1.00", "timeline_mark session-start")
+
+    assert target.read_text(encoding="ascii") == ""
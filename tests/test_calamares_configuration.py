@@ -395,12 +395,13 @@ def test_profiles_ship_complete_mhwd_configuration() -> None:
 
 
 def test_launcher_preserves_mhwd_configuration_and_skips_free_driver_job() -> None:
-    launcher = (REPOSITORY / "biglinux-livecd/usr/bin/calamares-biglinux").read_text(
-        encoding="utf-8"
-    )
+    # The launcher renders the profile through this library.
+    launcher = (
+        REPOSITORY / "biglinux-livecd/usr/lib/biglinux-livecd/calamares-profile"
+    ).read_text(encoding="utf-8")
 
     assert "printf '%s\\n' '---' \"driver: $driver\"" not in launcher
-    assert 'sed -i "s/^driver:.*/driver: $driver/"' in launcher
+    assert 'sed "s/^driver:.*/driver: $driver/"' in launcher
     assert "[[ $driver == free ]]" in launcher
     assert "- mhwdcfg[[:space:]]*$" in launcher
 
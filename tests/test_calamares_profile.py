@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+import yaml
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+PACKAGE = REPOSITORY / "biglinux-livecd"
+LIBRARY = PACKAGE / "usr/lib/biglinux-livecd/calamares-profile"
+PROFILE = PACKAGE / "usr/share/biglinux/calamares-profiles/biglinux"
+
+
+def materialize(
+    tmp_path: Path,
+    driver: str = "free",
+    timezone: str = "America/Sao_Paulo",
+    **commands: str,
+) -> subprocess.CompletedProcess[str]:
+    keyrings = tmp_path / "keyrings"
+    keyrings.mkdir(exist_ok=True)
+    for name in ("archlinux.gpg", "biglinux.gpg", "pubring.gpg"):
+        (keyrings / name).touch()
+    environment = {
+        **os.environ,
+        "LIBRARY": str(LIBRARY),
+        "calamares_keyring_directory": str(keyrings),
+        **{f"calamares_{name}_command": path for name, path in commands.items()},
+    }
+    return subprocess.run(
+        [
+            "bash",
+            "-c",
+            'set -uo pipefail; source "$LIBRARY"; '
+            'materialize_calamares_profile "$@" && '
+            'printf "%s\\n" "$calamares_profile_materialized"',
+            "materialize",
+            str(tmp_path / "profile"),
+            str(tmp_path / "etc/calamares"),
+            str(tmp_path / "run/profile-layer"),
+            driver,
+            timezone,
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+        env=environment,
+    )
+
+
+def tree_bytes(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+@pytest.fixture
+def profile(tmp_path: Path) -> Path:
+    shutil.copytree(PROFILE, tmp_path / "profile")
+    (tmp_path / "etc").mkdir()
+    (tmp_path / "run").mkdir()
+    return tmp_path / "profile"
+
+
+def test_only_templated_files_are_written_for_a_launch(
+    tmp_path: Path, profile: Path
+) -> None:
+    # Without overlay support the launcher falls back to a full copy.
+    result = materialize(tmp_path, mount="/bin/false", mountpoint="/bin/false")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "copy"
+
+    upper = tmp_path / "run/profile-layer/upper"
+    rendered = sorted(
+        str(path.relative_to(upper)) for path in upper.rglob("*") if path.is_file()
+    )
+    assert rendered == [
+        "modules/locale.conf",
+        "modules/mhwdcfg.conf",
+        "modules/postcfg.conf",
+        "settings.conf",
+    ]
+    config = tmp_path / "etc/calamares"
+    assert (config / "profile.json").is_file()
+    mhwd = yaml.safe_load((config / "modules/mhwdcfg.conf").read_text())
+    assert mhwd["driver"] == "free"
+    locale = yaml.safe_load((config / "modules/locale.conf").read_text())
+    assert (locale["region"], locale["zone"]) == ("America", "Sao_Paulo")
+    postcfg = yaml.safe_load((config / "modules/postcfg.conf").read_text())
+    assert postcfg["keyrings"] == ["archlinux", "biglinux"]
+    assert "- mhwdcfg" not in (config / "settings.conf").read_text()
+
+    # The profile itself is never edited.
+    assert "- mhwdcfg" in (profile / "settings.conf").read_text()
+
+    # A symbolic link in the profile is still refused.
+    (profile / "modules/link.conf").symlink_to("/etc/shadow")
+    result = materialize(tmp_path, mount="/bin/false", mountpoint="/bin/false")
+    assert result.returncode != 0
+    assert "symbolic link" in result.stderr
+
+
+def overlay_available(tmp_path: Path) -> bool:
+    if os.geteuid() != 0:
+        return False
+    probe = tmp_path / "probe"
+    for name in ("lower", "upper", "work", "merged"):
+        (probe / name).mkdir(parents=True)
+    mounted = subprocess.run(
+        [
+            "mount",
+            "-t",
+            "overlay",
+            "overlay",
+            "-o",
+            f"lowerdir={probe}/lower,upperdir={probe}/upper,workdir={probe}/work",
+            str(probe / "merged"),
+        ],
+        check=False,
+        capture_output=True,
+    )
+    if mounted.returncode != 0:
+        return False
+    subprocess.run(["umount", str(probe / "merged")], check=False)
+    return True
+
+
+def test_overlay_launch_is_reused_until_its_inputs_change(
+    tmp_path: Path, profile: Path
+) -> None:
+    if not overlay_available(tmp_path):
+        pytest.skip("mounting an overlay needs root and overlayfs")
+    config = tmp_path / "etc/calamares"
+    try:
+        first = materialize(tmp_path)
+        assert first.returncode == 0, first.stderr
+        assert first.stdout.strip() == "overlay"
+
+        # The wizard writes its own files into the mounted profile.
+        shipped = (profile / "modules/partition.conf").read_text()
+        (config / "modules/partition.conf").write_text("efiSystemPartition: /boot\n")
+        assert (profile / "modules/partition.conf").read_text() == shipped
+
+        second = materialize(tmp_path)
+        assert second.stdout.strip() == "reused", second.stderr
+        assert "/boot" in (config / "modules/partition.conf").read_text()
+
+        third = materialize(tmp_path, driver="nonfree", timezone="Europe/Minsk")
+        assert third.stdout.strip() == "overlay", third.stderr
+        mhwd = yaml.safe_load((config / "modules/mhwdcfg.conf").read_text())
+        assert mhwd["driver"] == "nonfree"
+        locale = yaml.safe_load((config / "modules/locale.conf").read_text())
+        assert (locale["region"], locale["zone"]) == ("Europe", "Minsk")
+        assert "- mhwdcfg" in (config / "settings.conf").read_text()
+
+        layer = tree_bytes(tmp_path / "run/profile-layer/upper")
+        assert layer * 10 < tree_bytes(profile)
+    finally:
+        subprocess.run(["umount", str(config)], check=False, capture_output=True)
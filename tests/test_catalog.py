@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+from catalog import (  # noqa: E402
+    DESKTOP,
+    THEME,
+    CatalogSources,
+    load_catalog,
+    source_key,
+)
+
+
+class RecordingLister:
+    def __init__(self, outputs: dict[str, str]) -> None:
+        self.outputs = outputs
+        self.commands: list[list[str]] = []
+
+    def __call__(self, command: list[str]) -> tuple[bool, str]:
+        self.commands.append(command)
+        return True, self.outputs[Path(command[0]).name]
+
+
+def make_sources(root: Path, environment: str = "XFCE") -> CatalogSources:
+    scripts = root / "scripts"
+    themes = root / "themes"
+    desktops = root / "desktops"
+    layouts = root / "layouts"
+    icons = root / "icons"
+    for directory in (scripts, themes, desktops, layouts, icons):
+        directory.mkdir(parents=True, exist_ok=True)
+    for script in ("list-themes.sh", "list-desktops.sh"):
+        (scripts / script).write_text("#!/bin/sh\n", "utf-8")
+    (themes / "breeze.png").write_bytes(b"png")
+    return CatalogSources(
+        desktop_environment=environment,
+        theme_list_script=str(scripts / "list-themes.sh"),
+        desktop_list_script=str(scripts / "list-desktops.sh"),
+        theme_preview=str(themes / "{}.png"),
+        desktop_preview=str(desktops / "{}.svg"),
+        gnome_layouts=str(layouts),
+        gnome_icons=str(icons),
+    )
+
+
+def make_lister() -> RecordingLister:
+    return RecordingLister(
+        {"list-themes.sh": "breeze\nnight\n", "list-desktops.sh": "classic\n"}
+    )
+
+
+def test_a_scan_indexes_themes_and_desktops(tmp_path: Path) -> None:
+    sources = make_sources(tmp_path)
+    lister = make_lister()
+
+    catalog = load_catalog(sources, lister, directory=None)
+
+    assert catalog.names(THEME) == ["breeze", "night"]
+    assert catalog.names(DESKTOP) == ["classic"]
+    breeze = catalog.get(THEME, "breeze")
+    assert breeze is not None
+    assert breeze.preview == str(tmp_path / "themes/breeze.png")
+    assert breeze.files == (breeze.preview,)
+    assert breeze.desktop_environment == "XFCE"
+    assert catalog.get(THEME, "missing") is None
+    assert len(lister.commands) == 2
+
+
+def test_the_cache_answers_until_a_source_directory_changes(tmp_path: Path) -> None:
+    sources = make_sources(tmp_path / "sources")
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    lister = make_lister()
+
+    first = load_catalog(sources, lister, directory=cache)
+    second = load_catalog(sources, lister, directory=cache)
+
+    assert len(lister.commands) == 2
+    assert second.entries == first.entries
+    assert (os.stat(next(cache.iterdir())).st_mode & 0o777) == 0o644
+
+    # A theme package installed during the session adds a preview.
+    themes = tmp_path / "sources/themes"
+    (themes / "night.png").write_bytes(b"png")
+    os.utime(themes, ns=(0, os.stat(themes).st_mtime_ns + 1_000_000))
+    lister.outputs["list-themes.sh"] = "breeze\nnight\nsunset\n"
+
+    third = load_catalog(sources, lister, directory=cache)
+
+    assert len(lister.commands) == 4
+    assert third.names(THEME) == ["breeze", "night", "sunset"]
+
+
+def test_unsafe_or_stale_cache_files_are_ignored(tmp_path: Path) -> None:
+    sources = make_sources(tmp_path / "sources")
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    lister = make_lister()
+    load_catalog(sources, lister, directory=cache)
+    cache_file = next(cache.iterdir())
+
+    cache_file.chmod(0o666)
+    load_catalog(sources, lister, directory=cache)
+    assert len(lister.commands) == 4
+
+    cache_file.write_text('{"version": 1, "key": [], "entries": []}', "utf-8")
+    cache_file.chmod(0o644)
+    load_catalog(sources, lister, directory=cache)
+    assert len(lister.commands) == 6
+
+    cache_file.write_text("not json", "utf-8")
+    assert load_catalog(sources, lister, directory=cache).names(DESKTOP) == ["classic"]
+    assert len(lister.commands) == 8
+
+
+def test_a_missing_cache_directory_still_returns_the_scan(tmp_path: Path) -> None:
+    sources = make_sources(tmp_path)
+    lister = make_lister()
+
+    catalog = load_catalog(sources, lister, directory=tmp_path / "missing")
+
+    assert catalog.names(THEME) == ["breeze", "night"]
+
+
+def test_gnome_layouts_come_from_their_files_without_a_listing(
+    tmp_path: Path,
+) -> None:
+    sources = make_sources(tmp_path, environment="GNOME")
+    layouts = Path(sources.gnome_layouts)
+    (layouts / "classic.txt").write_text("[org/gnome]\n", "utf-8")
+    (layouts / "unknown.txt").write_text("[org/gnome]\n", "utf-8")
+    (Path(sources.gnome_icons) / "classic.svg").write_text("<svg/>", "utf-8")
+    lister = make_lister()
+
+    catalog = load_catalog(sources, lister, directory=None)
+
+    assert catalog.names(DESKTOP) == ["classic"]
+    classic = catalog.get(DESKTOP, "classic")
+    assert classic is not None
+    assert classic.files == (str(layouts / "classic.txt"), classic.preview)
+    assert lister.commands == [[sources.theme_list_script]]
+    assert source_key(sources)[0] == "GNOME"
+
+
+def test_a_failed_listing_is_not_cached(tmp_path: Path) -> None:
+    sources = make_sources(tmp_path / "sources")
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    lister = make_lister()
+
+    def desktops_fail(command: list[str]) -> tuple[bool, str]:
+        success, output = lister(command)
+        return command != [sources.desktop_list_script] and success, output
+
+    catalog = load_catalog(sources, desktops_fail, directory=cache)
+    assert catalog.names(THEME) == ["breeze", "night"]
+    assert catalog.names(DESKTOP) == []
+    assert not catalog.complete
+    assert list(cache.iterdir()) == []
+
+    # Once the listing works again its names are scanned and cached.
+    catalog = load_catalog(sources, lister, directory=cache)
+    assert catalog.names(DESKTOP) == ["classic"]
+    assert load_catalog(sources, lister, directory=cache).complete
+    assert len(lister.commands) == 4
@@ -3,6 +3,7 @@ from __future__ import annotations
 import ast
 import os
 import sys
+from collections import Counter
 from pathlib import Path
 
 import pytest
@@ -11,16 +12,21 @@ REPOSITORY = Path(__file__).resolve().parents[1]
 LIBRARY = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
 sys.path.insert(0, str(LIBRARY))
 
+import desktop_theme  # noqa: E402
+from catalog import Catalog, CatalogSources, scan_catalog  # noqa: E402
 from desktop_theme import (  # noqa: E402
     GNOME_LIGHT_STYLE_UUID,
     GNOME_USER_THEME_UUID,
+    SettingsDocuments,
     _desktop_changes,
     _selected_gnome_layout,
     apply_packaged_theme,
     apply_simple_theme,
+    modify_settings_file,
     update_settings_text,
 )
 from gnome_layout import normalize_layout_text  # noqa: E402
+from settings_bus import BusCall, CallResult  # noqa: E402
 from user_config import update_ini_file, update_ini_text, write_text  # noqa: E402
 
 
@@ -33,6 +39,8 @@ class FakeThemeHost:
         self.commands: list[list[str]] = []
         self.states: list[tuple[str, str]] = []
         self.gtk_settings: list[tuple[bool, str]] = []
+        self.xfconf: list[tuple[object, ...]] = []
+        self._catalog: Catalog | None = None
 
     def _run_command(
         self,
@@ -59,9 +67,23 @@ class FakeThemeHost:
     def _apply_gtk_settings_ini(self, dark: bool, icon_theme: str) -> None:
         self.gtk_settings.append((dark, icon_theme))
 
+    def _apply_xfconf_settings(self, calls: list[BusCall]) -> list[CallResult]:
+        self.xfconf.extend(call.arguments for call in calls)
+        return []
+
     def get_desktop_environment(self) -> str:
         return "XFCE"
 
+    def get_catalog(self) -> Catalog:
+        if self._catalog is None:
+            sources = CatalogSources(
+                "XFCE", self.theme_list_script, "/missing", "{}", "{}", "", ""
+            )
+            self._catalog = scan_catalog(
+                sources, lambda command: self._run_command(command, read_only=True)
+            )
+        return self._catalog
+
     def _ensure_gnome_settings_file(self) -> None:
         raise AssertionError("GNOME setup must not run for XFCE")
 
@@ -117,7 +139,12 @@ def test_simple_theme_rejects_unknown_value_and_applies_xfce(
     assert apply_simple_theme(host, "dark")
     assert "color-scheme='prefer-dark'" in settings.read_text(encoding="utf-8")
     assert host.gtk_settings == [(True, "bigicons-papient-dark")]
-    assert any(command[0] == "xfconf-query" for command in host.commands)
+    assert host.xfconf == [
+        ("xsettings", "/Net/ThemeName", ("s", "adw-gtk3-dark")),
+        ("xsettings", "/Net/IconThemeName", ("s", "bigicons-papient-dark")),
+        ("xfwm4", "/general/theme", ("s", "adw-gtk3-dark")),
+    ]
+    assert not any(command[0] == "xfconf-query" for command in host.commands)
 
 
 def test_user_config_writes_atomically_inside_home(
@@ -242,3 +269,88 @@ def test_selected_gnome_layout_uses_live_state(tmp_path: Path) -> None:
 
     state.write_text("../../invalid\n", encoding="utf-8")
     assert _selected_gnome_layout(host) == ""
+
+
+def test_settings_documents_read_once_and_write_only_changes(tmp_path: Path) -> None:
+    settings = tmp_path / "settings"
+    settings.write_text("[one]\nkey=old\n", encoding="utf-8")
+    unchanged = tmp_path / "unchanged"
+    unchanged.write_text("[one]\nkey=same\n", encoding="utf-8")
+    documents = SettingsDocuments()
+    written: list[tuple[str, str]] = []
+
+    documents.update(str(settings), {"one": {"key": "new"}})
+    documents.update(str(settings), {"two": {"added": "yes"}})
+    assert documents.section(str(settings), "one") == {"key": "new"}
+    documents.update(str(unchanged), {"one": {"key": "same"}})
+
+    assert documents.dirty == [str(settings)]
+    assert documents.commit(lambda path, text: written.append((path, text)) or True)
+    assert written == [(str(settings), "[one]\nkey=new\n\n[two]\nadded=yes\n")]
+    assert documents.reads == Counter({str(settings): 1, str(unchanged): 1})
+    assert documents.writes == Counter({str(settings): 1})
+    assert documents.commit(lambda _path, _text: False)
+
+
+class FakeGnomeHost(FakeThemeHost):
+    def __init__(self, theme_list_script: Path) -> None:
+        super().__init__(theme_list_script)
+        self.synced: list[str] = []
+        self.writes: Counter[str] = Counter()
+
+    def _write_user_config_file(self, filepath: str, content: str) -> bool:
+        self.writes[filepath] += 1
+        return super()._write_user_config_file(filepath, content)
+
+    def get_desktop_environment(self) -> str:
+        return "GNOME"
+
+    def _ensure_gnome_settings_file(self) -> None:
+        pass
+
+    def _sync_gnome_settings_tmp(self, text: str | None = None) -> None:
+        assert text is not None
+        self.synced.append(text)
+
+    def _stamp_gnome_input_sources(
+        self, settings_file: str, documents: SettingsDocuments | None = None
+    ) -> None:
+        modify_settings_file(
+            self,
+            settings_file,
+            {"org/gnome/desktop/input-sources": {"sources": "[('xkb', 'br')]"}},
+            documents,
+        )
+
+
+def test_simple_gnome_theme_reads_and_writes_each_file_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    settings = tmp_path / ".config/dconf/settings.gnome"
+    settings.parent.mkdir(parents=True)
+    settings.write_text(
+        "[org/gnome/shell]\n"
+        f"enabled-extensions={[GNOME_USER_THEME_UUID]!r}\n"
+        "disabled-extensions=[]\n",
+        encoding="utf-8",
+    )
+    reads: Counter[str] = Counter()
+    read_regular_text = desktop_theme._read_regular_text
+
+    def count_reads(path: str) -> str:
+        reads[path] += 1
+        return read_regular_text(path)
+
+    monkeypatch.setattr(desktop_theme, "_read_regular_text", count_reads)
+    host = FakeGnomeHost(tmp_path / "list-themes")
+
+    assert apply_simple_theme(host, "light")
+
+    text = settings.read_text(encoding="utf-8")
+    assert "sources=[('xkb', 'br')]" in text
+    assert "color-scheme='default'" in text
+    assert host.synced == [text]
+    assert reads and max(reads.values()) == 1
+    assert host.writes[str(settings)] == 1
+    assert max(host.writes.values()) == 1
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+from apply_graph import StepResult  # noqa: E402
+from config import SetupConfig  # noqa: E402
+from finish_tracker import (  # noqa: E402
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    STALLED,
+    FinishTracker,
+)
+from services import SystemService  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeMainLoop:
+    def __init__(self) -> None:
+        self.callbacks: list[Callable[[], None]] = []
+
+    def notify(self, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+    def run(self) -> int:
+        count = len(self.callbacks)
+        while self.callbacks:
+            self.callbacks.pop(0)()
+        return count
+
+
+def make_tracker() -> tuple[FinishTracker, FakeClock, FakeMainLoop]:
+    clock = FakeClock()
+    loop = FakeMainLoop()
+    return FinishTracker(clock=clock, notify=loop.notify), clock, loop
+
+
+def test_steps_move_from_queued_to_done_and_failed() -> None:
+    tracker, clock, _loop = make_tracker()
+    language = tracker.add("language")
+    keyboard = tracker.add("keyboard")
+    language_future: Future[None] = Future()
+    keyboard_future: Future[None] = Future()
+    tracker.watch(language, language_future)
+    tracker.watch(keyboard, keyboard_future)
+
+    assert [step.status for step in tracker.steps()] == [QUEUED, QUEUED]
+    clock.now = 1.0
+    tracker.timed(language, lambda: None)()
+    assert language.status == RUNNING
+    clock.now = 2.0
+    language_future.set_result(None)
+    keyboard_future.set_exception(RuntimeError("localectl failed"))
+
+    assert (language.status, language.started, language.finished) == (DONE, 1.0, 2.0)
+    assert keyboard.status == FAILED
+    assert keyboard.error == "localectl failed"
+    assert tracker.settled()
+
+
+def test_only_critical_steps_hold_the_exit() -> None:
+    tracker, _clock, _loop = make_tracker()
+    theme_future: Future[None] = Future()
+    speech_future: Future[None] = Future()
+    tracker.track("theme", theme_future)
+    tracker.track("speech", speech_future, critical=False)
+
+    assert not tracker.settled()
+    theme_future.set_result(None)
+
+    assert tracker.settled()
+    assert [step.name for step in tracker.unsettled(critical_only=False)] == ["speech"]
+
+
+def test_stalled_updates_release_the_exit_but_still_settle() -> None:
+    tracker, _clock, _loop = make_tracker()
+    future: Future[None] = Future()
+    step = tracker.track("desktop", future)
+
+    tracker.stall([step])
+
+    assert step.status == STALLED
+    assert tracker.settled()
+    future.set_result(None)
+    assert step.status == DONE
+
+
+def test_graph_steps_take_their_start_from_the_step_result() -> None:
+    tracker, clock, _loop = make_tracker()
+    future: Future[StepResult] = Future()
+    step = tracker.track("display-profile", future, critical=False)
+
+    clock.now = 5.0
+    future.set_result(StepResult("display-profile", 1, 1.5))
+
+    assert step.started == 3.5
+    assert step.status == FAILED
+    assert step.error == "exit status 1"
+
+
+def test_the_latest_submission_of_a_name_is_shown() -> None:
+    tracker, _clock, _loop = make_tracker()
+    first = tracker.add("language")
+    second = tracker.add("language")
+    keyboard = tracker.add("keyboard")
+
+    assert tracker.steps() == [second, keyboard]
+    assert first in tracker.unsettled()
+
+
+def test_listeners_run_on_the_main_loop_not_the_worker() -> None:
+    tracker, _clock, loop = make_tracker()
+    seen: list[str] = []
+    tracker.add_listener(lambda: seen.append(threading.current_thread().name))
+
+    with ThreadPoolExecutor(max_workers=1) as worker:
+        step = tracker.add("keyboard")
+        tracker.watch(step, worker.submit(tracker.timed(step, lambda: None)))
+
+    assert seen == []
+    assert loop.run() == 3
+    assert set(seen) == {threading.current_thread().name}
+
+
+def test_breakdown_names_the_update_that_dominated_the_wait() -> None:
+    tracker, clock, _loop = make_tracker()
+    futures: dict[str, Future[None]] = {}
+    steps = {}
+    for name in ("language", "keyboard", "desktop"):
+        futures[name] = Future()
+        steps[name] = tracker.track(name, futures[name])
+
+    # One worker, so each update starts when the previous one finishes.
+    timeline = [("language", 0.0, 0.2), ("keyboard", 0.2, 0.3), ("desktop", 0.3, 4.3)]
+    for name, started, finished in timeline:
+        clock.now = started
+        tracker.begin(steps[name])
+        clock.now = finished
+        futures[name].set_result(None)
+
+    # The user chose the theme while the language was still being applied.
+    breakdown = tracker.wait_breakdown(since=0.1, until=4.3)
+
+    assert [(step.name, round(share, 3)) for step, share in breakdown] == [
+        ("desktop", 4.0),
+        ("language", 0.1),
+        ("keyboard", 0.1),
+    ]
+
+
+def test_finalize_can_leave_the_compositor_restart_to_the_caller(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    service = SystemService(test_mode=True)
+
+    graph = service.finalize_setup(SetupConfig(), restart_compositor=False)
+    assert "restart-compositor" not in graph.futures
+
+    restart = service.restart_compositor(graph)
+    assert restart.result(timeout=5).ok
+    assert set(graph.futures) == {"display-profile", "restart-compositor"}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+import icon_atlas  # noqa: E402
+from icon_atlas import IconAtlas, Tile, pack_tiles, tile_key  # noqa: E402
+
+
+def overlaps(first: Tile, second: Tile) -> bool:
+    return not (
+        first.x + first.width <= second.x
+        or second.x + second.width <= first.x
+        or first.y + first.height <= second.y
+        or second.y + second.height <= first.y
+    )
+
+
+def test_packed_tiles_fit_the_atlas_without_overlapping() -> None:
+    sizes = {f"flag/{index}/36@1": (36, 36) for index in range(40)}
+    sizes.update({f"flag/{index}/36@2": (72, 72) for index in range(40)})
+    sizes["step/headerbar-theme/48@2"] = (96, 96)
+
+    tiles, height = pack_tiles(sizes, width=256)
+
+    assert set(tiles) == set(sizes)
+    placed = list(tiles.values())
+    for tile in placed:
+        assert tile.x + tile.width <= 256
+        assert tile.y + tile.height <= height
+    for index, tile in enumerate(placed):
+        assert not any(overlaps(tile, other) for other in placed[index + 1 :])
+
+
+def test_sources_cover_every_flag_and_header_step(tmp_path: Path) -> None:
+    flags = tmp_path / "flags"
+    flags.mkdir()
+    (flags / "br.svg").write_text("<svg/>")
+    (flags / "readme.txt").write_text("")
+
+    sources = icon_atlas.atlas_sources(flags, LIVECD / "assets")
+
+    names = {(group, name) for group, name, _path in sources}
+    assert ("flag", "br") in names
+    assert ("step", "headerbar-locale") in names
+    assert ("step", "headerbar-theme") in names
+    assert not any(name == "readme" for _group, name in names)
+
+
+def write_index(directory: Path, tiles: dict[str, list[int]], version=1) -> None:
+    (directory / icon_atlas.ATLAS_INDEX).write_text(
+        json.dumps({"version": version, "tiles": tiles})
+    )
+
+
+def test_lookup_prefers_the_closest_scale_at_or_above(tmp_path: Path) -> None:
+    write_index(
+        tmp_path,
+        {
+            tile_key("flag", "br", 36, 1): [0, 0, 36, 36],
+            tile_key("flag", "br", 36, 2): [36, 0, 72, 72],
+        },
+    )
+    atlas = IconAtlas(tmp_path)
+
+    assert atlas.tile("flag", "br", 36, 1) == "flag/br/36@1"
+    assert atlas.tile("flag", "br", 36, 2) == "flag/br/36@2"
+    assert atlas.tile("flag", "br", 36, 3) == "flag/br/36@2"
+    assert atlas.tile("flag", "xx", 36, 1) is None
+    assert atlas.texture("flag", "xx", 36) is None
+
+
+def test_missing_or_foreign_index_falls_back_to_svgs(tmp_path: Path) -> None:
+    assert IconAtlas(tmp_path).tiles == {}
+
+    write_index(tmp_path, {"flag/br/36@1": [0, 0, 36, 36]}, version=99)
+    assert IconAtlas(tmp_path).tiles == {}
+
+    write_index(tmp_path, {"flag/br/36@1": [0, -1, 36, 36], "flag/us/36@1": "x"})
+    assert IconAtlas(tmp_path).tiles == {}
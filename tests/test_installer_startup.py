@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+CALAMARES = REPOSITORY / "biglinux-livecd/usr/share/biglinux/calamares"
+sys.path.insert(0, str(CALAMARES))
+
+from src.services import ServiceStartup, install_service  # noqa: E402
+
+# How long each stub service takes, standing in for forks and ISO detection.
+SERVICE_DELAY = 0.4
+
+
+def test_services_start_in_the_background_and_are_timed() -> None:
+    dispatched: list[Callable[[], None]] = []
+    release = threading.Event()
+    startup = ServiceStartup(dispatched.append)
+    ready: list[str] = []
+
+    started = time.perf_counter()
+    startup.start("system", lambda: release.wait(5))
+    startup.start("broken", lambda: 1 / 0)
+    assert time.perf_counter() - started < 0.1
+
+    startup.when_ready("system", lambda: ready.append("system"))
+    assert not startup.wait("system", timeout=0.05)
+    release.set()
+    assert startup.wait("system", "broken", "unknown", timeout=5)
+    # The callback goes through the main loop, not the worker thread.
+    for _attempt in range(50):
+        if dispatched:
+            break
+        time.sleep(0.01)
+    assert ready == []
+    dispatched.pop()()
+    assert ready == ["system"]
+    assert set(startup.timings) == {"service system", "service broken"}
+    startup.shutdown()
+
+
+def test_installation_waits_for_the_system_detection(monkeypatch) -> None:
+    class SlowSystem:
+        def __init__(self) -> None:
+            self.ready = threading.Event()
+
+        def wait_until_ready(self, timeout: float | None = None) -> bool:
+            return self.ready.wait(timeout)
+
+        def get_sfs_folder(self) -> str:
+            return "manjaro" if self.ready.is_set() else ""
+
+        def is_live_mode(self) -> bool:
+            return True
+
+    system = SlowSystem()
+    service = install_service.InstallService(system)  # type: ignore[arg-type]
+    monkeypatch.setattr(install_service, "ensure_directory", lambda _path: True)
+    service.initialize()
+    threading.Timer(0.1, system.ready.set).start()
+
+    requirements = service.check_installation_requirements()
+
+    assert requirements["sfs_detected"]
+
+
+@pytest.fixture(scope="module")
+def gtk():
+    gi = pytest.importorskip("gi")
+    gi.require_version("Gtk", "4.0")
+    gi.require_version("Adw", "1")
+    from gi.repository import Adw, Gtk
+
+    if not Gtk.init_check():
+        pytest.skip("no display for GTK")
+    Adw.init()
+    return Gtk
+
+
+def test_window_startup_benchmark_with_stub_services(
+    gtk, monkeypatch, record_property
+) -> None:
+    """The window appears without waiting for services or unseen pages.
+
+    The first-page time and each timed startup step go to the test report.
+    """
+    from gi.repository import GLib
+    from src import window as window_module
+
+    class StubSystem:
+        def __init__(self) -> None:
+            self.ready = threading.Event()
+
+        def initialize(self) -> None:
+            time.sleep(SERVICE_DELAY)
+            self.ready.set()
+
+        def wait_until_ready(self, timeout: float | None = None) -> bool:
+            return self.ready.wait(timeout)
+
+        def get_system_summary(self) -> str:
+            return "The system is in UEFI, Linux 6.12."
+
+        def get_boot_mode(self) -> str:
+            return "UEFI"
+
+        def get_kernel_version(self) -> str:
+            return "6.12"
+
+        def get_session_type(self) -> str:
+            return ""
+
+        def can_manage_efi_entries(self) -> bool:
+            return False
+
+        def cleanup(self) -> None:
+            pass
+
+    class StubPackages:
+        def initialize(self) -> None:
+            time.sleep(SERVICE_DELAY)
+
+        def get_minimal_packages(self) -> list:
+            return []
+
+        def removal_size(self, _names: list[str]) -> int:
+            return 0
+
+        def cleanup(self) -> None:
+            pass
+
+    class StubInstall:
+        def __init__(self, system_service: StubSystem) -> None:
+            self.system_service = system_service
+
+        def initialize(self) -> None:
+            time.sleep(SERVICE_DELAY)
+
+        def cleanup(self) -> None:
+            pass
+
+    monkeypatch.setattr(window_module, "SystemService", StubSystem)
+    monkeypatch.setattr(window_module, "PackageService", StubPackages)
+    monkeypatch.setattr(window_module, "InstallService", StubInstall)
+
+    started = time.perf_counter()
+    window = window_module.CalamaresWindow()
+    window.present()
+    context = GLib.MainContext.default()
+    while context.pending():
+        context.iteration(False)
+    first_page = time.perf_counter() - started
+
+    assert list(window.pages) == ["main"]
+    assert first_page < SERVICE_DELAY
+
+    window.navigate_to("maintenance")
+    assert set(window.pages) == {"main", "maintenance"}
+    assert "page main" in window.startup.timings
+    assert "page maintenance" in window.startup.timings
+    record_property("first_page_ms", round(first_page * 1000, 1))
+    for name, elapsed in window.startup.timings.items():
+        record_property(f"{name}_ms", round(elapsed * 1000, 1))
+    window.cleanup()
+    window.destroy()
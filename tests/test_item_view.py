@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+WINDOW_WIDTH = 1024
+WINDOW_HEIGHT = 768
+
+
+@pytest.fixture(scope="module")
+def gtk():
+    gi = pytest.importorskip("gi")
+    gi.require_version("Gtk", "4.0")
+    gi.require_version("Adw", "1")
+    from gi.repository import Gtk
+
+    if not Gtk.init_check():
+        pytest.skip("no display for GTK")
+    return Gtk
+
+
+def make_view_class(gtk):
+    from gi.repository import GObject
+    from ui.base_view import BaseItemView, ItemCard
+
+    class SyntheticItem(GObject.Object):
+        def __init__(self, name: str) -> None:
+            super().__init__()
+            self.name = name
+
+    class SyntheticView(BaseItemView):
+        __gtype_name__ = "SyntheticItemView"
+
+        def __init__(self, names: list[str]) -> None:
+            self.names = names
+            self.cards = 0
+            self.binds = 0
+            super().__init__(system_service=None)
+
+        def get_title(self) -> str:
+            return "Synthetic"
+
+        def get_items(self) -> list:
+            return self.names
+
+        def create_item_gobject(self, name: str) -> GObject.Object:
+            return SyntheticItem(name)
+
+        def create_card(self) -> ItemCard:
+            self.cards += 1
+            card = ItemCard(orientation=gtk.Orientation.VERTICAL, spacing=6)
+            card.set_size_request(180, 140)
+            card.append(gtk.Label())
+            return card
+
+        def bind_card(self, card: ItemCard, item: GObject.Object) -> None:
+            self.binds += 1
+            label = card.get_first_child()
+            assert isinstance(label, gtk.Label)
+            label.set_label(item.name)
+
+        def emit_signal(self, name: str) -> None:
+            pass
+
+    return SyntheticView
+
+
+def build(gtk, view_class, count: int) -> tuple[object, float]:
+    from gi.repository import GLib
+
+    context = GLib.MainContext.default()
+    view = view_class([f"item-{index}" for index in range(count)])
+    window = gtk.Window(default_width=WINDOW_WIDTH, default_height=WINDOW_HEIGHT)
+    window.set_child(view)
+    started = time.perf_counter()
+    window.present()
+    deadline = started + 30
+    while (
+        view._store.get_n_items() < count or view.cards == 0
+    ) and time.perf_counter() < deadline:
+        context.iteration(True)
+    while context.pending():
+        context.iteration(False)
+    elapsed = time.perf_counter() - started
+    window.destroy()
+    return view, elapsed
+
+
+def test_item_view_benchmark_builds_only_the_visible_cards(
+    gtk, record_property
+) -> None:
+    """Build the view with 10, 100 and 1000 items; cards stay bounded.
+
+    The build times go to the test report; only the card counts are asserted.
+    """
+    view_class = make_view_class(gtk)
+    results = {count: build(gtk, view_class, count) for count in (10, 100, 1000)}
+
+    for count, (view, elapsed) in results.items():
+        record_property(f"build_{count}_items_ms", round(elapsed * 1000, 1))
+        record_property(f"cards_{count}_items", view.cards)
+        record_property(f"binds_{count}_items", view.binds)
+    views = {count: view for count, (view, _elapsed) in results.items()}
+    assert views[10].cards == 10
+    # A 1024x768 window shows a few rows of three; the rest are never built.
+    assert views[1000].cards < 100
+    assert views[1000].cards <= views[100].cards + 12
@@ -16,6 +16,7 @@ PROBE_PATH = (
 )
 LIVECD_SOURCE = ROOT / "biglinux-livecd/usr/share/biglinux/livecd"
 sys.path.insert(0, str(LIVECD_SOURCE))
+sys.path.insert(0, str(PROBE_PATH.parent))
 
 spec = importlib.util.spec_from_file_location("language_suggestion_probe", PROBE_PATH)
 assert spec and spec.loader
@@ -68,50 +69,36 @@ def test_geoip_parser_reads_only_a_valid_country_code() -> None:
 def test_storage_inventory_excludes_the_complete_live_device_tree(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    payload = {
-        "blockdevices": [
-            {
-                "path": "/dev/sda",
-                "type": "disk",
-                "children": [{"path": "/dev/sda1", "type": "part", "fstype": "btrfs"}],
-            },
-            {
-                "path": "/dev/sdb",
-                "type": "disk",
-                "children": [
-                    {"path": "/dev/sdb1", "type": "part", "fstype": "iso9660"},
-                    {
-                        "path": "/dev/sdb2",
-                        "type": "part",
-                        "fstype": "vfat",
-                        "parttype": "c12a7328-f81f-11d2-ba4b-00a0c93ec93b",
-                    },
-                ],
-            },
-            {
-                "path": "/dev/nvme0n1",
-                "type": "disk",
-                "children": [
-                    {"path": "/dev/nvme0n1p2", "type": "part", "fstype": "ext4"},
-                    {
-                        "path": "/dev/nvme0n1p1",
-                        "type": "part",
-                        "fstype": "vfat",
-                        "parttype": "0xEF",
-                    },
-                ],
-            },
-        ]
-    }
-
-    def command(argv: list[str], _deadline: float) -> str | None:
-        if argv[0].endswith("findmnt"):
-            return "/dev/sdb1\n"
-        return json.dumps(payload)
-
-    monkeypatch.setattr(probe, "run_text_command", command)
-    inventory = probe.storage_inventory(time.monotonic() + 1)
-    assert inventory == probe.StorageInventory(
+    from block_inventory import BlockDevice, BlockInventory
+
+    def partition(name: str, disk: str, **udev: str) -> BlockDevice:
+        return BlockDevice(name, f"/dev/{name}", name, "part", (disk,), **udev)
+
+    inventory = BlockInventory(
+        generation="7",
+        live_mount="/run/miso/bootmnt",
+        live_device="sdb1",
+        devices=(
+            BlockDevice("sda", "/dev/sda", "8:0", "disk"),
+            partition("sda1", "sda", filesystem="btrfs"),
+            BlockDevice("sdb", "/dev/sdb", "8:16", "disk"),
+            partition("sdb1", "sdb", filesystem="iso9660"),
+            partition(
+                "sdb2",
+                "sdb",
+                filesystem="vfat",
+                partition_type="c12a7328-f81f-11d2-ba4b-00a0c93ec93b",
+            ),
+            BlockDevice("nvme0n1", "/dev/nvme0n1", "259:0", "disk"),
+            partition("nvme0n1p2", "nvme0n1", filesystem="ext4"),
+            partition("nvme0n1p1", "nvme0n1", filesystem="vfat", partition_type="0xef"),
+        ),
+    )
+    monkeypatch.setattr(probe, "load_inventory", lambda: inventory)
+    monkeypatch.setattr(
+        probe, "run_text_command", lambda *_args: pytest.fail("forked a command")
+    )
+    assert probe.storage_inventory(time.monotonic() + 1) == probe.StorageInventory(
         linux_filesystems=(("/dev/nvme0n1p2", "ext4"), ("/dev/sda1", "btrfs")),
         efi_partitions=("/dev/nvme0n1p1",),
     )
@@ -120,7 +107,13 @@ def test_storage_inventory_excludes_the_complete_live_device_tree(
 def test_storage_inventory_fails_closed_without_live_device(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr(probe, "run_text_command", lambda _argv, _deadline: None)
+    from block_inventory import BlockInventory
+
+    monkeypatch.setattr(
+        probe,
+        "load_inventory",
+        lambda: BlockInventory("7", "/run/miso/bootmnt", None, ()),
+    )
     assert probe.storage_inventory(time.monotonic() + 1) is None
 
 
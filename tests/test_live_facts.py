@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+PACKAGE = REPOSITORY / "biglinux-livecd"
+sys.path.insert(0, str(PACKAGE / "usr/lib/biglinux-livecd"))
+sys.path.insert(0, str(PACKAGE / "usr/share/biglinux/livecd"))
+sys.path.insert(0, str(PACKAGE / "usr/share/biglinux/calamares"))
+
+import live_facts  # noqa: E402
+from services import SystemService  # noqa: E402
+from src.services import system_service  # noqa: E402
+
+
+@pytest.fixture
+def snapshot(tmp_path: Path) -> Path:
+    path = tmp_path / "facts.json"
+    live_facts.write_snapshot(live_facts.collect_facts(), path)
+    return path
+
+
+def test_snapshot_round_trips_the_collected_facts(snapshot: Path) -> None:
+    facts = live_facts.load_snapshot(snapshot)
+
+    assert facts == live_facts.collect_facts()
+    assert snapshot.stat().st_mode & 0o777 == 0o644
+    assert json.loads(snapshot.read_text())["version"] == live_facts.SNAPSHOT_VERSION
+
+
+def test_snapshot_matches_live_detection(snapshot: Path) -> None:
+    facts = live_facts.load_snapshot(snapshot)
+    assert facts is not None
+
+    assert facts.desktop_environment == live_facts.detect_desktop_environment()
+    assert facts.virtual_machine == live_facts.detect_virtual_machine()
+    assert facts.total_memory_kib == live_facts.read_total_memory_kib()
+    assert facts.contrast_profile == live_facts.detect_contrast_profile()
+    assert facts.profile == live_facts.resolve_live_profile()
+    assert facts.iso_image_directory == live_facts.detect_iso_image_directory()
+    assert (facts.kernel_release, facts.machine) == (
+        os.uname().release,
+        os.uname().machine,
+    )
+
+
+def live_wizard_answers(service: SystemService) -> tuple[object, ...]:
+    SystemService._profile_cache = None
+    return (
+        service.get_desktop_environment(),
+        service.is_virtual_machine(),
+        service.get_total_memory_gb(),
+        service.check_enhanced_contrast_availability(),
+        service.get_live_profile_data(),
+    )
+
+
+def test_live_wizard_answers_the_same_with_and_without_snapshot(
+    snapshot: Path,
+) -> None:
+    service = SystemService(test_mode=True)
+    service.live_facts = None
+    detected = live_wizard_answers(service)
+
+    service.live_facts = live_facts.load_snapshot(snapshot)
+    assert service.live_facts is not None
+    assert live_wizard_answers(service) == detected
+    SystemService._profile_cache = None
+
+
+def test_installer_answers_the_same_with_and_without_snapshot(
+    snapshot: Path, monkeypatch
+) -> None:
+    facts = live_facts.load_snapshot(snapshot)
+    keys = ("kernel_version", "architecture", "sfs_folder")
+
+    monkeypatch.setattr(system_service, "load_snapshot", lambda: None)
+    detected = system_service.SystemService()
+    detected.initialize()
+
+    monkeypatch.setattr(system_service, "load_snapshot", lambda: facts)
+    loaded = system_service.SystemService()
+    loaded.initialize()
+
+    assert [loaded._system_info[key] for key in keys] == [
+        detected._system_info[key] for key in keys
+    ]
+
+
+def test_installer_takes_the_image_folder_from_the_snapshot(monkeypatch) -> None:
+    facts = live_facts.LiveFacts(
+        desktop_environment="other",
+        virtual_machine=False,
+        total_memory_kib=4 * 1024 * 1024,
+        contrast_profile=False,
+        kernel_release="6.12.4-1-MANJARO",
+        machine="x86_64",
+        iso_image_directory="/run/miso/bootmnt/alpha/x86_64",
+    )
+    monkeypatch.setattr(system_service, "load_snapshot", lambda: facts)
+    monkeypatch.setattr(
+        system_service,
+        "detect_iso_mount",
+        lambda: pytest.fail("the snapshot already names the image"),
+    )
+    service = system_service.SystemService()
+    service.initialize()
+
+    assert service.get_sfs_folder() == "alpha"
+    assert service.get_kernel_version() == "6.12.4"
+
+
+def test_unusable_snapshots_fall_back_to_detection(snapshot: Path) -> None:
+    payload = json.loads(snapshot.read_text())
+
+    snapshot.write_text(json.dumps(dict(payload, version=0)))
+    assert live_facts.load_snapshot(snapshot) is None
+
+    snapshot.write_text(json.dumps(dict(payload, total_memory_kib=True)))
+    assert live_facts.load_snapshot(snapshot) is None
+
+    snapshot.write_text(json.dumps(payload))
+    snapshot.chmod(0o666)
+    assert live_facts.load_snapshot(snapshot) is None
+
+    assert live_facts.load_snapshot(snapshot.with_name("missing.json")) is None
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+PACKAGE = REPOSITORY / "biglinux-livecd"
+LIVE_STATE = PACKAGE / "usr/lib/biglinux-livecd/live-state"
+LIVE_STATE_TOOL = PACKAGE / "usr/lib/biglinux-livecd/live_state.py"
+sys.path.insert(0, str(PACKAGE / "usr/lib/biglinux-livecd"))
+sys.path.insert(0, str(PACKAGE / "usr/share/biglinux/livecd"))
+
+import live_state  # noqa: E402
+from config import SetupConfig  # noqa: E402
+from services import SystemService  # noqa: E402
+
+
+def run_bash(script: str, directory: Path) -> subprocess.CompletedProcess[str]:
+    environment = os.environ.copy()
+    environment.update(
+        {
+            "LIVE_STATE": str(LIVE_STATE),
+            "LIVE_STATE_TOOL": str(LIVE_STATE_TOOL),
+            "PYTHON": sys.executable,
+            "STATE_DIRECTORY": str(directory),
+        }
+    )
+    return subprocess.run(
+        [
+            "bash",
+            "-c",
+            'source "$LIVE_STATE"\n'
+            "live_state_directory=$STATE_DIRECTORY\n"
+            "live_state_python=$PYTHON\n"
+            "live_state_tool=$LIVE_STATE_TOOL\n" + script,
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+        env=environment,
+    )
+
+
+def service_in(directory: Path) -> SystemService:
+    service = SystemService()
+    service.live_state_dir = str(directory)
+    for attribute, value in vars(service).copy().items():
+        if attribute.endswith("_state_file"):
+            setattr(service, attribute, str(directory / os.path.basename(value)))
+    return service
+
+
+def test_commit_writes_one_document_and_exports_legacy_files(tmp_path: Path) -> None:
+    report = live_state.commit_state(
+        {"language": "pt_BR", "keyboard": "br", "desktop-theme": "dark"}, tmp_path
+    )
+
+    document = json.loads((tmp_path / live_state.DOCUMENT_NAME).read_text())
+    assert document == {
+        "version": live_state.STATE_VERSION,
+        "state": {"desktop-theme": "dark", "keyboard": "br", "language": "pt_BR"},
+    }
+    assert (tmp_path / "big_language").read_text(encoding="utf-8") == "pt_BR"
+    assert (tmp_path / "big_keyboard").read_text(encoding="utf-8") == "br"
+    assert (report.changed, report.exported, report.removed) == (3, 3, 0)
+    for path in tmp_path.iterdir():
+        assert path.stat().st_mode & 0o777 == 0o600
+    assert list(tmp_path.glob(".big_*")) == []
+
+
+def test_commit_only_exports_values_that_changed(tmp_path: Path) -> None:
+    live_state.commit_state({"language": "pt_BR", "keyboard": "br"}, tmp_path)
+    (tmp_path / "big_language").unlink()
+
+    report = live_state.commit_state(
+        {"language": "pt_BR", "keyboard": "us", "enable-jamesdsp": None}, tmp_path
+    )
+
+    assert (report.exported, report.removed) == (1, 0)
+    assert not (tmp_path / "big_language").exists()
+    assert live_state.read_state(tmp_path) == {"language": "pt_BR", "keyboard": "us"}
+
+
+def test_removed_names_leave_the_document_and_the_export(tmp_path: Path) -> None:
+    live_state.commit_state({"enable-jamesdsp": "enabled"}, tmp_path)
+
+    report = live_state.commit_state({"enable-jamesdsp": None}, tmp_path)
+
+    assert report.removed == 1
+    assert live_state.read_state(tmp_path) == {}
+    assert not (tmp_path / "big_enable_jamesdsp").exists()
+
+
+def test_legacy_files_are_read_until_the_first_commit(tmp_path: Path) -> None:
+    (tmp_path / "big_desktop_theme").write_text("breeze", encoding="utf-8")
+    (tmp_path / "big_desktop_theme").chmod(0o600)
+    assert live_state.read_document(tmp_path) is None
+    assert live_state.read_state(tmp_path) == {"desktop-theme": "breeze"}
+
+    live_state.commit_state({"language": "en_US"}, tmp_path)
+
+    assert live_state.read_document(tmp_path) == {
+        "desktop-theme": "breeze",
+        "language": "en_US",
+    }
+
+
+def test_invalid_changes_leave_the_directory_untouched(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        live_state.commit_state({"language": "pt_BR", "unknown": "x"}, tmp_path)
+    with pytest.raises(ValueError):
+        live_state.commit_state({"language": "x" * 5000}, tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unsafe_documents_are_ignored(tmp_path: Path) -> None:
+    live_state.commit_state({"language": "pt_BR"}, tmp_path)
+    document = tmp_path / live_state.DOCUMENT_NAME
+
+    document.chmod(0o622)
+    assert live_state.read_document(tmp_path) is None
+    document.chmod(0o600)
+    document.write_text('{"version": 99, "state": {}}', encoding="utf-8")
+    assert live_state.read_document(tmp_path) is None
+    document.unlink()
+    document.symlink_to(tmp_path / "big_language")
+    assert live_state.read_document(tmp_path) is None
+
+
+def test_shell_helpers_round_trip_through_the_document(tmp_path: Path) -> None:
+    result = run_bash(
+        """
+write_live_state language pt_BR desktop 'startkde-biglinux classic $(date)'
+load_live_state
+read_live_state desktop; printf '\\n'
+read_live_state keyboard; printf 'keyboard=%s\\n' "$?"
+""",
+        tmp_path,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "startkde-biglinux classic $(date)\nkeyboard=1\n"
+    assert live_state.read_document(tmp_path) == {
+        "desktop": "startkde-biglinux classic $(date)",
+        "language": "pt_BR",
+    }
+
+
+def test_wizard_run_commits_once_when_the_user_confirms(
+    monkeypatch, tmp_path: Path
+) -> None:
+    service = service_in(tmp_path)
+    monkeypatch.setattr(service, "_command_step", lambda _command: lambda: 0)
+    replaced: list[str] = []
+    original_replace = os.replace
+
+    def record_replace(source, destination) -> None:
+        replaced.append(os.path.basename(destination))
+        original_replace(source, destination)
+
+    monkeypatch.setattr(os, "replace", record_replace)
+    # What a Plasma run stages: the user went back and changed two choices.
+    writes = [
+        ("big_language", "en_US"),
+        ("big_language", "pt_BR"),
+        ("big_keyboard", "us"),
+        ("big_keyboard", "br"),
+        ("big_desktop_changed", "startkde-biglinux classic"),
+        ("big_desktop_theme", "breeze"),
+        ("big_enable_jamesdsp", "enabled"),
+    ]
+    for name, value in writes:
+        assert service._write_live_state_file(str(tmp_path / name), value)
+    assert replaced == []
+    assert service._read_live_state_file(str(tmp_path / "big_keyboard")) == "br"
+
+    service.finalize_setup(SetupConfig()).wait(timeout=5)
+
+    # Staging each write as its own file took one rename per write.
+    assert len(replaced) < len(writes)
+    assert replaced[0] == live_state.DOCUMENT_NAME
+    assert sorted(replaced[1:]) == [
+        "big_desktop_changed",
+        "big_desktop_theme",
+        "big_keyboard",
+        "big_language",
+    ]
+    assert live_state.read_state(tmp_path)["language"] == "pt_BR"
+    assert not (tmp_path / "big_enable_jamesdsp").exists()
+    assert service._staged_live_state == {}
+
+
+def test_interrupted_wizard_leaves_no_partial_state(tmp_path: Path) -> None:
+    service = service_in(tmp_path)
+
+    service._write_live_state_file(str(tmp_path / "big_language"), "pt_BR")
+
+    assert list(tmp_path.iterdir()) == []
+    assert not service._write_live_state_file("/etc/big_language", "pt_BR")
+    assert not service._write_live_state_file(str(tmp_path / "big_other"), "x")
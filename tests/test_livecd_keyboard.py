@@ -13,6 +13,7 @@ STARTBIGLIVE = PACKAGE / "usr/bin/startbiglive"
 sys.path.insert(0, str(LIVECD_SRC))
 
 from services import SystemService  # noqa: E402
+from settings_bus import SettingsBus  # noqa: E402
 
 
 def test_live_state_atomic_publish_does_not_request_durability(
@@ -28,8 +29,10 @@ def test_live_state_atomic_publish_does_not_request_durability(
     monkeypatch.setattr(os, "fsync", reject_fsync)
 
     assert service._write_live_state_file(str(state_file), "br")
+    assert not state_file.exists()
+    assert service.commit_live_state()
     assert state_file.read_text(encoding="utf-8") == "br"
-    assert list(tmp_path.glob(".big_keyboard.*")) == []
+    assert list(tmp_path.glob(".big_*")) == []
 
 
 def run_bash(
@@ -59,6 +62,8 @@ def test_wizard_writes_complete_plasma_keyboard_config(
         return True
 
     monkeypatch.setattr(service, "get_desktop_environment", lambda: "other")
+    # No system bus: localed must not be reached from the test suite.
+    service.settings_bus = SettingsBus("unix:path=/nonexistent")
     monkeypatch.setattr(service, "_write_live_state_file", record_live_state)
     monkeypatch.setattr(
         service,
@@ -111,7 +116,7 @@ def test_startbiglive_applies_saved_keyboard_layout(tmp_path: Path) -> None:
         f"""
 _log() {{ :; }}
 display_manager=sddm
-live_state_path() {{ printf '%s\\n' "$STATE_FILE"; }}
+read_live_state() {{ cat -- "$STATE_FILE"; }}
 setxkbmap() {{ printf 'setxkbmap:%s\\n' "$*" >>"$COMMAND_LOG"; }}
 sudo() {{ printf 'sudo:%s\\n' "$*" >>"$COMMAND_LOG"; }}
 {helpers}
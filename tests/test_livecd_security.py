@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import stat
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -12,7 +13,9 @@ KERNEL_OPTIONS = PACKAGE / "usr/lib/biglinux-livecd/kernel-options"
 INSTALL_SETUP = PACKAGE / "usr/bin/biglinux-install-setup.sh"
 STARTBIGLIVE = PACKAGE / "usr/bin/startbiglive"
 LIVE_STATE = PACKAGE / "usr/lib/biglinux-livecd/live-state"
+LIVE_STATE_TOOL = PACKAGE / "usr/lib/biglinux-livecd/live_state.py"
 STORAGE_PROBE = PACKAGE / "usr/lib/biglinux-livecd/storage-probe"
+BOOT_TIMELINE = PACKAGE / "usr/lib/biglinux-livecd/boot-timeline"
 
 
 def run_bash(
@@ -292,6 +295,7 @@ _detect_multi_gpu() {{
     has_nvidia_proprietary=0
 }}
 sleep() {{ :; }}
+_compositor_grace_period() {{ :; }}
 dbus-run-session() {{
     printf '%s\\0' "$@" >"$CAPTURE"
     command sleep 0.2
@@ -383,6 +387,8 @@ sudo() {
     "$@"
 }
 live_state_directory=$STATE_DIRECTORY
+live_state_python=$PYTHON
+live_state_tool=$LIVE_STATE_TOOL
 live_state_default_config_directory=$DEFAULT_CONFIG
 live_state_legacy_theme_path=$LEGACY_THEME
 live_state_legacy_desktop_path=$LEGACY_DESKTOP
@@ -392,6 +398,8 @@ install_live_state_defaults
 """,
         environment={
             "LIVE_STATE": str(LIVE_STATE),
+            "LIVE_STATE_TOOL": str(LIVE_STATE_TOOL),
+            "PYTHON": sys.executable,
             "STATE_DIRECTORY": str(state_directory),
             "DEFAULT_CONFIG": str(default_config),
             "LEGACY_THEME": str(legacy_theme),
@@ -435,7 +443,7 @@ def test_wizard_defers_noninitial_pages_and_accessibility_backends() -> None:
     assert "from ui.theme_view import ThemeView" not in imports
     assert "GLib.timeout_add(500, ensure_orca_disabled)" in app_window
     assert '"ui.keyboard_view"' in app_window
-    assert "GLib.idle_add(self._preload_next_module)" in app_window
+    assert 'self._scheduler.add("preload", self._preload_pages())' in app_window
     assert "if not lang_code or not is_accessibility_enabled():" in app_window
 
     language_view = (
@@ -497,11 +505,15 @@ def test_live_state_write_is_atomic_and_rejects_unknown_names(tmp_path: Path) ->
         """
 source "$LIVE_STATE"
 live_state_directory=$STATE_DIRECTORY
+live_state_python=$PYTHON
+live_state_tool=$LIVE_STATE_TOOL
 write_live_state language pt_BR
 write_live_state unsupported value >/dev/null 2>&1; printf 'unsupported=%s\n' "$?"
 """,
         environment={
             "LIVE_STATE": str(LIVE_STATE),
+            "LIVE_STATE_TOOL": str(LIVE_STATE_TOOL),
+            "PYTHON": sys.executable,
             "STATE_DIRECTORY": str(state_directory),
         },
     )
@@ -510,7 +522,7 @@ write_live_state unsupported value >/dev/null 2>&1; printf 'unsupported=%s\n' "$
     state_file = state_directory / "big_language"
     assert state_file.read_text(encoding="utf-8") == "pt_BR"
     assert stat.S_IMODE(state_file.stat().st_mode) == 0o600
-    assert list(state_directory.glob(".language.*")) == []
+    assert list(state_directory.glob(".big_*")) == []
 
 
 def test_efi_probe_excludes_the_live_device_tree() -> None:
@@ -564,6 +576,9 @@ def test_livecd_tweaks_requires_marker_and_exact_flags(tmp_path: Path) -> None:
     source = source.replace(
         "source /usr/lib/biglinux-livecd/kernel-options",
         'source "$KERNEL_OPTIONS"',
+    ).replace(
+        "source /usr/lib/biglinux-livecd/boot-timeline",
+        'source "$BOOT_TIMELINE"',
     )
     test_script = tmp_path / "livecd-tweaks"
     test_script.write_text(source, encoding="utf-8")
@@ -580,6 +595,7 @@ def test_livecd_tweaks_requires_marker_and_exact_flags(tmp_path: Path) -> None:
     ssh_config.write_text("Include /etc/ssh/sshd_config.d/*.conf\n", encoding="utf-8")
     environment = {
         "KERNEL_OPTIONS": str(KERNEL_OPTIONS),
+        "BOOT_TIMELINE": str(BOOT_TIMELINE),
         "TEST_SCRIPT": str(test_script),
         "TEST_LOG": str(log),
         "CMDLINE": str(cmdline),
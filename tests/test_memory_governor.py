@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import stat
+import sys
+import threading
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+import memory_governor  # noqa: E402
+from memory_governor import LEAN, NORMAL, MemoryGovernor, MemoryPolicy  # noqa: E402
+from ui.preview_loader import PreviewLoader  # noqa: E402
+
+MIB = 1024
+
+
+@pytest.fixture
+def marks(monkeypatch) -> list[str]:
+    names: list[str] = []
+    monkeypatch.setattr(memory_governor, "mark", names.append)
+    return names
+
+
+class FakeProc:
+    """/proc/self/status and /proc/meminfo with the values a test sets."""
+
+    def __init__(self, directory: Path) -> None:
+        self.status_path = directory / "status"
+        self.meminfo_path = directory / "meminfo"
+        self.set(rss=60 * MIB, high_water=60 * MIB, available=2048 * MIB)
+
+    def set(self, *, rss: int, high_water: int, available: int) -> None:
+        self.status_path.write_text(
+            f"Name:\tpython3\nVmPeak:\t  900000 kB\nVmHWM:\t{high_water:8d} kB\n"
+            f"VmRSS:\t{rss:8d} kB\nThreads:\t4\n"
+        )
+        self.meminfo_path.write_text(
+            "MemTotal:       16318000 kB\nMemFree:         1200000 kB\n"
+            f"MemAvailable:   {available:8d} kB\n"
+        )
+
+    def governor(self, total_memory_gb: float, reports: Path | None = None):
+        return MemoryGovernor(
+            total_memory_gb,
+            status_path=self.status_path,
+            meminfo_path=self.meminfo_path,
+            report_directory=reports,
+        )
+
+
+def test_a_roomy_machine_under_budget_stays_normal(tmp_path: Path, marks) -> None:
+    proc = FakeProc(tmp_path)
+    governor = proc.governor(16)
+
+    assert governor.check().mode == NORMAL
+    assert governor.budget_kib == memory_governor.MAX_BUDGET_KIB
+    assert governor.rss_kib == 60 * MIB
+    assert marks == []
+
+
+def test_a_small_machine_starts_lean(tmp_path: Path, marks) -> None:
+    proc = FakeProc(tmp_path)
+    governor = proc.governor(3.8)
+
+    policy = governor.check()
+
+    assert policy.mode == LEAN
+    assert "3.8 GB" in policy.reason
+    assert not policy.precache
+    assert policy.release_hidden_pages
+    assert marks == ["wizard-memory-lean"]
+
+
+def test_rss_over_the_budget_switches_to_lean_once(tmp_path: Path, marks) -> None:
+    proc = FakeProc(tmp_path)
+    governor = proc.governor(8)
+    decisions: list[MemoryPolicy] = []
+    governor.add_listener(decisions.append)
+    assert governor.check().mode == NORMAL
+
+    proc.set(rss=400 * MIB, high_water=410 * MIB, available=2048 * MIB)
+    assert governor.check().mode == LEAN
+    # Back under budget: lean mode is kept for the rest of the session.
+    proc.set(rss=100 * MIB, high_water=410 * MIB, available=2048 * MIB)
+    assert governor.check().mode == LEAN
+
+    assert len(decisions) == 1
+    assert "over the" in decisions[0].reason
+    assert decisions[0].max_textures is not None
+    assert marks == ["wizard-memory-lean"]
+
+
+def test_low_available_memory_switches_to_lean(tmp_path: Path, marks) -> None:
+    proc = FakeProc(tmp_path)
+    proc.set(rss=80 * MIB, high_water=80 * MIB, available=200 * MIB)
+
+    policy = proc.governor(8).check()
+
+    assert policy.mode == LEAN
+    assert "available" in policy.reason
+
+
+def test_the_report_holds_the_kernel_peak(tmp_path: Path, marks) -> None:
+    proc = FakeProc(tmp_path)
+    reports = tmp_path / "memory"
+    reports.mkdir()
+    governor = proc.governor(8, reports)
+    # The spike between two samples is only visible through VmHWM.
+    proc.set(rss=90 * MIB, high_water=250 * MIB, available=2048 * MIB)
+    governor.check()
+    proc.set(rss=70 * MIB, high_water=250 * MIB, available=2048 * MIB)
+    governor.sample()
+
+    governor.publish()
+
+    (report_file,) = reports.iterdir()
+    report = json.loads(report_file.read_text())
+    assert report["peak_rss_kib"] == 250 * MIB
+    assert report["rss_kib"] == 70 * MIB
+    assert report["policy"]["mode"] == NORMAL
+    assert stat.S_IMODE(report_file.stat().st_mode) == 0o644
+
+
+def test_a_missing_proc_file_reads_as_zero(tmp_path: Path, marks) -> None:
+    governor = MemoryGovernor(
+        8,
+        status_path=tmp_path / "missing",
+        meminfo_path=tmp_path / "missing",
+        report_directory=None,
+    )
+
+    assert governor.check().mode == NORMAL
+    assert governor.rss_kib == 0
+    assert governor.available_kib is None
+
+
+def test_lean_texture_limit_releases_decoded_previews() -> None:
+    """Measure what shrinking the texture cache gives back, with tracemalloc."""
+    delivered = threading.Semaphore(0)
+
+    def decode(path: str, width: int, height: int) -> bytearray:
+        return bytearray(width * height * 4)
+
+    def dispatch(callback: Callable[[], object]) -> None:
+        callback()
+        delivered.release()
+
+    tracemalloc.start()
+    loader = PreviewLoader(48, workers=1, decode=decode, dispatch=dispatch)
+    for index in range(48):
+        loader.request(f"/themes/{index}.png", 512, 512, lambda _texture: None)
+    for _index in range(48):
+        assert delivered.acquire(timeout=5)
+    full, _peak = tracemalloc.get_traced_memory()
+
+    loader.set_limit(memory_governor.lean_policy("test").max_textures or 0)
+    lean, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    loader.shutdown()
+
+    # 48 previews of 1 MiB each, down to the 8 lean mode keeps.
+    assert full - lean > 38 * 1024 * 1024
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE = Path(__file__).resolve().parents[1] / "biglinux-livecd"
+sys.path.insert(0, str(PACKAGE / "usr/share/biglinux/calamares"))
+
+from src.infrastructure.pacman_db import LocalDatabase, parse_desc  # noqa: E402
+from src.services import package_service  # noqa: E402
+
+SYNTHETIC_PACKAGES = 3000
+
+
+def write_desc(
+    local: Path,
+    name: str,
+    *,
+    version: str = "1.0-1",
+    size: int = 1024,
+    reason: int | None = None,
+    depends: tuple[str, ...] = (),
+    groups: tuple[str, ...] = (),
+    provides: tuple[str, ...] = (),
+) -> None:
+    sections = [
+        ("NAME", [name]),
+        ("VERSION", [version]),
+        ("BASE", [name]),
+        ("DESC", [f"The {name} package"]),
+        ("URL", ["https://example.org"]),
+        ("ARCH", ["x86_64"]),
+        ("BUILDDATE", ["1700000000"]),
+        ("INSTALLDATE", ["1700000001"]),
+        ("PACKAGER", ["Unknown Packager"]),
+        ("SIZE", [str(size)]),
+        ("REASON", [] if reason is None else [str(reason)]),
+        ("LICENSE", ["GPL"]),
+        ("VALIDATION", ["pgp"]),
+        ("GROUPS", list(groups)),
+        ("DEPENDS", list(depends)),
+        ("PROVIDES", list(provides)),
+    ]
+    entry = local / f"{name}-{version}"
+    entry.mkdir(parents=True)
+    (entry / "desc").write_text(
+        "".join(
+            f"%{section}%\n" + "".join(f"{value}\n" for value in values) + "\n"
+            for section, values in sections
+            if values
+        ),
+        encoding="utf-8",
+    )
+    (entry / "files").write_text("%FILES%\nusr/\n", encoding="utf-8")
+
+
+def write_synthetic_database(local: Path, count: int) -> None:
+    local.mkdir(parents=True)
+    (local / "ALPM_DB_VERSION").write_text("9\n")
+    for index in range(count):
+        depends = tuple(f"lib{index - step}>=1" for step in (1, 7) if index >= step)
+        write_desc(
+            local,
+            f"lib{index}",
+            size=4096 + index,
+            reason=1 if index % 3 else None,
+            depends=depends,
+            groups=("synthetic",) if index % 100 == 0 else (),
+            provides=(f"lib{index}.so=1-64",),
+        )
+
+
+def test_desc_sections_are_parsed() -> None:
+    package = parse_desc(
+        "%NAME%\nsteam\n\n%VERSION%\n1.0.0.81-2\n\n%SIZE%\n12582912\n\n"
+        "%REASON%\n1\n\n%GROUPS%\ngames\n\n"
+        "%DEPENDS%\nbash\nlib32-glibc>=2.27\nsh: for scripts\n\n"
+        "%OPTDEPENDS%\nsteam-native-runtime: native runtime\n\n"
+    )
+
+    assert package is not None
+    assert (package.name, package.version) == ("steam", "1.0.0.81-2")
+    assert package.installed_size == 12582912
+    assert package.reason == 1
+    assert package.groups == ("games",)
+    assert package.depends == ("bash", "lib32-glibc>=2.27", "sh: for scripts")
+    assert parse_desc("%NAME%\nbroken\n\n") is None
+    assert parse_desc("%NAME%\nx\n\n%VERSION%\n1-1\n\n%SIZE%\nbig\n\n") is None
+
+
+def test_removal_size_counts_the_dependencies_pacman_rs_takes(tmp_path: Path) -> None:
+    local = tmp_path / "local"
+    write_desc(local, "steam", size=10_000, depends=("steam-runtime", "sh"))
+    # Only steam needs it, and it came in as a dependency: removed with steam.
+    write_desc(local, "steam-runtime", size=5_000, reason=1, depends=("libfoo.so",))
+    write_desc(local, "foo", size=700, reason=1, provides=("libfoo.so=1-64",))
+    # Still needed by another installed program.
+    write_desc(local, "bash", size=2_000, reason=1, provides=("sh",))
+    write_desc(local, "kate", size=3_000, depends=("bash",), groups=("kde",))
+    # Explicitly installed: never taken away as a dependency.
+    write_desc(local, "gparted", size=4_000, depends=("foo",))
+
+    database = LocalDatabase.load(local)
+
+    assert len(database) == 6
+    assert database.resolve("sh") == ["bash"]
+    assert database.resolve("libfoo.so>=1") == ["foo"]
+    assert database.required_by("foo") == {"steam-runtime", "gparted"}
+    assert database.group("kde") == ["kate"]
+    assert database.removal_set(["steam"]) == {"steam", "steam-runtime"}
+    assert database.removal_size(["steam"]) == 15_000
+    assert database.removal_size(["steam", "gparted"]) == 19_700
+    assert database.removal_size(["not-installed"]) == 0
+
+
+def test_package_service_reads_the_database_in_the_background(
+    tmp_path: Path, monkeypatch
+) -> None:
+    local = tmp_path / "local"
+    write_desc(local, "steam", size=10_000, depends=("steam-runtime",))
+    write_desc(local, "steam-runtime", size=5_000, reason=1)
+    write_desc(local, "kate", size=3_000)
+    data = tmp_path / "minimal-packages.json"
+    data.write_text('{"packages": ["steam", "kate", "absent"]}', encoding="utf-8")
+    monkeypatch.setattr(package_service, "MINIMAL_PACKAGES_FILE", data)
+    monkeypatch.setattr(package_service, "ICON_MAPPING_FILE", tmp_path / "none")
+    monkeypatch.setattr(
+        package_service,
+        "TEMP_FILES",
+        {name: tmp_path / name for name in package_service.TEMP_FILES},
+    )
+    load = LocalDatabase.load
+    monkeypatch.setattr(
+        package_service.LocalDatabase, "load", lambda directory=local: load(local)
+    )
+    monkeypatch.setattr(
+        package_service,
+        "pacman_query_installed",
+        lambda: pytest.fail("pacman was forked"),
+    )
+
+    service = package_service.PackageService()
+    service.initialize()
+    packages = service.get_minimal_packages()
+
+    assert [(package.name, package.installed_size) for package in packages] == [
+        ("steam", 15_000),
+        ("kate", 3_000),
+    ]
+    assert service.removal_size(["steam", "kate"]) == 18_000
+    installed = (tmp_path / "installed_packages").read_text(encoding="utf-8")
+    assert installed.split() == ["kate", "steam", "steam-runtime"]
+
+
+def test_a_large_database_reads_what_pacman_lists(tmp_path: Path) -> None:
+    local = tmp_path / "db/local"
+    write_synthetic_database(local, SYNTHETIC_PACKAGES)
+
+    database = LocalDatabase.load(local)
+    freed = database.removal_size([f"lib{SYNTHETIC_PACKAGES - 1}"])
+
+    assert len(database) == SYNTHETIC_PACKAGES
+    assert len(database.group("synthetic")) == SYNTHETIC_PACKAGES // 100
+    assert freed > 4096 + SYNTHETIC_PACKAGES - 1
+    pacman = shutil.which("pacman")
+    if pacman is not None:
+        result = subprocess.run(
+            [pacman, "-Qq", "--dbpath", str(tmp_path / "db")],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode == 0:
+            assert set(result.stdout.split()) == database.names()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+from phrase_cache import PhraseCache  # noqa: E402
+
+
+def key(text: str) -> tuple[str, str, str]:
+    return (text, "af_heart:en-us", "1.5")
+
+
+def test_repeated_phrases_hit_and_count() -> None:
+    cache = PhraseCache(memory_budget=100)
+    assert cache.get(key("Next")) is None
+    cache.put(key("Next"), b"n" * 10)
+
+    assert cache.get(key("Next")) == b"n" * 10
+    assert cache.get(key("Next")) == b"n" * 10
+    assert (cache.statistics.hits, cache.statistics.misses) == (2, 1)
+
+
+def test_least_recently_used_phrase_is_evicted_within_budget() -> None:
+    cache = PhraseCache(memory_budget=30)
+    cache.put(key("Next"), b"n" * 10)
+    cache.put(key("Back"), b"b" * 10)
+    cache.put(key("Theme"), b"t" * 10)
+    cache.get(key("Next"))
+    cache.put(key("Finish"), b"f" * 10)
+
+    assert cache.memory_bytes == 30
+    assert cache.get(key("Back")) is None
+    assert cache.get(key("Next")) == b"n" * 10
+    assert cache.statistics.evictions == 1
+
+
+def test_oversized_phrase_is_not_kept_in_memory() -> None:
+    cache = PhraseCache(memory_budget=8)
+    cache.put(key("A long sentence"), b"x" * 9)
+
+    assert cache.memory_bytes == 0
+    assert cache.get(key("A long sentence")) is None
+
+
+def test_evicted_phrases_spill_to_a_bounded_directory(tmp_path: Path) -> None:
+    cache = PhraseCache(
+        memory_budget=10, spill_directory=str(tmp_path), spill_budget=20
+    )
+    for text in ("one", "two", "three", "four"):
+        cache.put(key(text), text.encode() * 2)
+
+    assert cache.spilled_bytes <= 20
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 20
+    assert cache.get(key("one")) is None
+    assert cache.get(key("three")) == b"threethree"
+    assert cache.statistics.spill_hits == 1
+    assert cache.memory_bytes <= 10
+
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
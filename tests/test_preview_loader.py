@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+from ui.preview_loader import PreviewLoader, PreviewSlot  # noqa: E402
+
+
+class FakeMainLoop:
+    """Collects callbacks the workers hand to the GTK main loop."""
+
+    def __init__(self) -> None:
+        self.callbacks: list[Callable[[], object]] = []
+        self.condition = threading.Condition()
+
+    def dispatch(self, callback: Callable[[], object]) -> None:
+        with self.condition:
+            self.callbacks.append(callback)
+            self.condition.notify_all()
+
+    def run(self, expected: int) -> None:
+        with self.condition:
+            assert self.condition.wait_for(
+                lambda: len(self.callbacks) >= expected, timeout=5
+            )
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def make_loader(
+    max_textures: int = 4,
+    release: threading.Event | None = None,
+    workers: int = 2,
+) -> tuple[PreviewLoader, FakeMainLoop, list[str]]:
+    main_loop = FakeMainLoop()
+    decoded: list[str] = []
+
+    def decode(path: str, width: int, height: int) -> str:
+        if release is not None:
+            release.wait(5)
+        decoded.append(path)
+        if path.endswith("broken.png"):
+            raise OSError("not an image")
+        return f"{path}@{width}x{height}"
+
+    loader = PreviewLoader(
+        max_textures, workers=workers, decode=decode, dispatch=main_loop.dispatch
+    )
+    return loader, main_loop, decoded
+
+
+def test_preview_is_decoded_at_the_requested_size() -> None:
+    loader, main_loop, _decoded = make_loader()
+    received: list[object] = []
+    loader.request("/themes/a.png", 480, 320, received.append)
+
+    assert received == []
+    main_loop.run(1)
+    assert received == ["/themes/a.png@480x320"]
+    loader.shutdown()
+
+
+def test_cached_preview_is_delivered_without_decoding_again() -> None:
+    loader, main_loop, decoded = make_loader()
+    loader.request("/themes/a.png", 480, 320, lambda _texture: None)
+    main_loop.run(1)
+
+    received: list[object] = []
+    loader.request("/themes/a.png", 480, 320, received.append)
+
+    assert received == ["/themes/a.png@480x320"]
+    assert decoded == ["/themes/a.png"]
+    assert loader.decodes == 1
+    loader.shutdown()
+
+
+def test_concurrent_requests_share_one_decode() -> None:
+    release = threading.Event()
+    loader, main_loop, decoded = make_loader(release=release)
+    received: list[object] = []
+    for _ in range(3):
+        loader.request("/themes/a.png", 480, 320, received.append)
+    release.set()
+    main_loop.run(1)
+
+    assert received == ["/themes/a.png@480x320"] * 3
+    assert decoded == ["/themes/a.png"]
+    loader.shutdown()
+
+
+def test_texture_cache_keeps_only_the_most_recent_previews() -> None:
+    loader, main_loop, decoded = make_loader(max_textures=2)
+    for name in ("a", "b", "c"):
+        loader.request(f"/themes/{name}.png", 480, 320, lambda _texture: None)
+        main_loop.run(1)
+
+    loader.request("/themes/c.png", 480, 320, lambda _texture: None)
+    loader.request("/themes/a.png", 480, 320, lambda _texture: None)
+    main_loop.run(1)
+
+    assert decoded == ["/themes/a.png", "/themes/b.png", "/themes/c.png"] + [
+        "/themes/a.png"
+    ]
+    loader.shutdown()
+
+
+def test_unreadable_preview_delivers_none_and_is_not_cached() -> None:
+    loader, main_loop, decoded = make_loader()
+    received: list[object] = []
+    loader.request("/themes/broken.png", 480, 320, received.append)
+    main_loop.run(1)
+    loader.request("/themes/broken.png", 480, 320, received.append)
+    main_loop.run(1)
+
+    assert received == [None, None]
+    assert decoded == ["/themes/broken.png"] * 2
+    loader.shutdown()
+
+
+class FakePicture:
+    def __init__(self) -> None:
+        self.paintable: object = None
+        self.css_classes: set[str] = set()
+
+    def set_paintable(self, paintable: object) -> None:
+        self.paintable = paintable
+
+    def add_css_class(self, name: str) -> None:
+        self.css_classes.add(name)
+
+    def remove_css_class(self, name: str) -> None:
+        self.css_classes.discard(name)
+
+
+def test_withdrawn_requests_are_not_decoded() -> None:
+    release = threading.Event()
+    loader, main_loop, decoded = make_loader(release=release, workers=1)
+    received: list[object] = []
+    # The first decode holds the only worker, so b is still queued.
+    loader.request("/themes/a.png", 480, 320, received.append)
+    loader.request("/themes/b.png", 480, 320, received.append)
+    loader.cancel("/themes/b.png", 480, 320, received.append)
+    release.set()
+    main_loop.run(1)
+    loader.shutdown()
+    loader._executor.shutdown(wait=True)
+
+    assert received == ["/themes/a.png@480x320"]
+    assert decoded == ["/themes/a.png"]
+
+
+def test_a_rebound_card_shows_only_its_current_preview() -> None:
+    release = threading.Event()
+    loader, main_loop, _decoded = make_loader(release=release)
+    picture = FakePicture()
+    slot = PreviewSlot(picture, loader=loader, scale=1)
+
+    slot.bind("/themes/a.png")
+    # Scrolled: the card now shows another theme before the first decoded.
+    slot.bind("/themes/b.png")
+    release.set()
+    main_loop.run(1)
+    loader._executor.shutdown(wait=True)
+    main_loop.run(0)
+
+    assert picture.paintable == "/themes/b.png@480x320"
+    assert "preview-placeholder" not in picture.css_classes
+
+    slot.unbind()
+    assert picture.paintable is None
+    assert "preview-placeholder" in picture.css_classes
+
+
+def test_a_cached_preview_is_shown_when_the_card_is_bound() -> None:
+    loader, main_loop, decoded = make_loader()
+    loader.request("/themes/a.png", 960, 640, lambda _texture: None)
+    main_loop.run(1)
+    picture = FakePicture()
+
+    PreviewSlot(picture, loader=loader, scale=2).bind("/themes/a.png")
+
+    assert picture.paintable == "/themes/a.png@960x640"
+    assert decoded == ["/themes/a.png"]
+    loader.shutdown()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+PACKAGE = REPOSITORY / "biglinux-livecd"
+LIBRARY = PACKAGE / "usr/lib/biglinux-livecd"
+sys.path.insert(0, str(LIBRARY))
+sys.path.insert(0, str(PACKAGE / "usr/share/biglinux/calamares"))
+
+import profile_manifest  # noqa: E402
+from src import profile as installer_profile  # noqa: E402
+
+
+def install_profile(root: Path, profile_id: str, **metadata: object) -> Path:
+    directory = root / profile_id
+    (directory / "modules").mkdir(parents=True)
+    (directory / "branding").mkdir()
+    (directory / "settings.conf").write_text("---\n", encoding="utf-8")
+    (directory / "profile.json").write_text(
+        json.dumps({"id": profile_id, "display_name": profile_id.title(), **metadata}),
+        encoding="utf-8",
+    )
+    return directory
+
+
+def settle() -> None:
+    """Let a file-time tick pass, as it has by boot for the installed profiles."""
+    time.sleep(0.05)
+
+
+@pytest.fixture
+def layout(tmp_path: Path) -> dict[str, Path]:
+    paths = {
+        "marker": tmp_path / "etc/profile",
+        "custom": tmp_path / "etc/calamares-profiles",
+        "builtin": tmp_path / "usr/calamares-profiles",
+        "json": tmp_path / "run/profile.json",
+        "env": tmp_path / "run/profile.env",
+    }
+    paths["json"].parent.mkdir()
+    install_profile(paths["builtin"], "biglinux", warn_old_release=True)
+    settle()
+    return paths
+
+
+def load(layout: dict[str, Path]) -> dict:
+    return profile_manifest.load_manifest(
+        layout["json"],
+        layout["env"],
+        layout["marker"],
+        (layout["custom"], layout["builtin"]),
+    )
+
+
+def test_manifest_is_cached_until_an_input_changes(layout: dict[str, Path]) -> None:
+    manifest = load(layout)
+    assert manifest["id"] == "biglinux"
+    assert manifest["directory"] == str(layout["builtin"] / "biglinux")
+    assert profile_manifest.live_profile(manifest)["display_name"] == "Biglinux"
+    assert profile_manifest.read_manifest(layout["json"]) == manifest
+    assert layout["env"].read_text(encoding="utf-8").splitlines()[:4] == [
+        "version=1",
+        "profile_id=biglinux",
+        f"profile_directory={layout['builtin']}/biglinux",
+        "profile_warn_old_release=true",
+    ]
+    assert layout["json"].stat().st_mode & 0o777 == 0o644
+
+    # An edited profile is read again.
+    settle()
+    metadata = layout["builtin"] / "biglinux/profile.json"
+    metadata.write_text(json.dumps({"id": "biglinux", "display_name": "New"}))
+    assert profile_manifest.read_manifest(layout["json"]) is None
+    assert profile_manifest.live_profile(load(layout))["display_name"] == "New"
+
+    # So is a custom profile that did not exist when the cache was built.
+    install_profile(layout["custom"], "biglinux", warn_old_release=False)
+    assert profile_manifest.read_manifest(layout["json"]) is None
+    manifest = load(layout)
+    assert manifest["directory"] == str(layout["custom"] / "biglinux")
+    assert "profile_warn_old_release=false" in layout["env"].read_text()
+
+
+def test_unusable_profiles_are_not_cached(layout: dict[str, Path]) -> None:
+    install_profile(layout["custom"], "biglinux", warn_old_release="yes")
+    with pytest.raises(ValueError):
+        load(layout)
+    assert not layout["json"].exists()
+
+    if os.geteuid() != 0:
+        pytest.skip("the profile marker has to be owned by root")
+    layout["marker"].parent.mkdir(exist_ok=True)
+    layout["marker"].write_text("xivastudio\n", encoding="utf-8")
+    layout["marker"].chmod(0o644)
+    with pytest.raises(ValueError, match="not installed"):
+        load(layout)
+    install_profile(layout["builtin"], "xivastudio")
+    assert load(layout)["id"] == "xivastudio"
+    layout["marker"].chmod(0o666)
+    with pytest.raises(ValueError, match="unsafe"):
+        load(layout)
+
+
+def run_shell(
+    layout: dict[str, Path], tmp_path: Path, script: str
+) -> subprocess.CompletedProcess[str]:
+    # The launcher's rebuild, pointed at the test's profile roots.
+    builder = tmp_path / "builder"
+    builder.write_text(
+        "#!/bin/sh\n"
+        f'exec "{sys.executable}" "$@" --marker "{layout["marker"]}" '
+        f'--root "{layout["custom"]}" --root "{layout["builtin"]}"\n',
+        encoding="utf-8",
+    )
+    builder.chmod(0o755)
+    environment = {
+        **os.environ,
+        "LIBRARY": str(LIBRARY / "profile-manifest"),
+        "profile_manifest_file": str(layout["env"]),
+        "profile_manifest_python": str(builder),
+        "profile_manifest_builder": str(LIBRARY / "profile_manifest.py"),
+    }
+    return subprocess.run(
+        ["bash", "-c", f'set -uo pipefail; source "$LIBRARY"; {script}'],
+        check=False,
+        capture_output=True,
+        text=True,
+        env=environment,
+    )
+
+
+def test_the_launcher_reads_the_cache_without_python(
+    layout: dict[str, Path], tmp_path: Path
+) -> None:
+    report = (
+        'printf "%s %s %s\\n" "$profile_manifest_id" '
+        '"$profile_manifest_directory" "$profile_manifest_warn_old_release"'
+    )
+    # No cache yet: reading fails and loading builds it.
+    result = run_shell(layout, tmp_path, "read_profile_manifest")
+    assert result.returncode == 1
+    result = run_shell(layout, tmp_path, f"load_profile_manifest && {report}")
+    assert result.returncode == 0, result.stderr
+    expected = f"biglinux {layout['builtin']}/biglinux true"
+    assert result.stdout.strip() == expected
+    assert profile_manifest.read_manifest(layout["json"]) is not None
+
+    # A fresh cache is read by the shell alone.
+    result = run_shell(
+        layout,
+        tmp_path,
+        f"profile_manifest_python=/bin/false; load_profile_manifest && {report}",
+    )
+    assert result.stdout.strip() == expected, result.stderr
+
+    # A newer custom profile makes the shell rebuild it.
+    install_profile(layout["custom"], "biglinux", warn_old_release=False)
+    result = run_shell(layout, tmp_path, "read_profile_manifest")
+    assert result.returncode == 1
+    result = run_shell(layout, tmp_path, f"load_profile_manifest && {report}")
+    assert result.stdout.strip() == f"biglinux {layout['custom']}/biglinux false"
+
+
+def test_installer_takes_the_metadata_from_the_manifest(
+    layout: dict[str, Path], monkeypatch
+) -> None:
+    manifest = load(layout)
+    monkeypatch.setattr(installer_profile, "read_manifest", lambda: manifest)
+    monkeypatch.setenv("CALAMARES_PROFILE_DIRECTORY", "/nonexistent/calamares")
+    monkeypatch.setenv("CALAMARES_PROFILE_ID", "biglinux")
+
+    assert installer_profile.load_profile() == {
+        "id": "biglinux",
+        "display_name": "Biglinux",
+    }
+
+    # A manifest for another profile is not used.
+    monkeypatch.setenv("CALAMARES_PROFILE_ID", "xivastudio")
+    assert installer_profile.load_profile() == {
+        "id": "calamares",
+        "display_name": "calamares",
+    }
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIBRARY = REPOSITORY / "biglinux-livecd/usr/lib/biglinux-livecd"
+sys.path.insert(0, str(LIBRARY))
+
+import readahead  # noqa: E402
+
+
+def fanotify_event(mask: int, fd: int, pid: int, padding: int = 0) -> bytes:
+    length = readahead._EVENT.size + padding
+    return (
+        readahead._EVENT.pack(
+            length,
+            readahead.FANOTIFY_METADATA_VERSION,
+            0,
+            readahead._EVENT.size,
+            mask,
+            fd,
+            pid,
+        )
+        + b"\0" * padding
+    )
+
+
+def test_fanotify_events_are_split_by_their_length() -> None:
+    buffer = fanotify_event(readahead.FAN_OPEN, 7, 100, padding=8) + fanotify_event(
+        readahead.FAN_OPEN_EXEC, 8, 101
+    )
+
+    events = readahead.parse_fanotify_events(buffer)
+
+    assert events == [
+        readahead.FanotifyEvent(readahead.FAN_OPEN, 7, 100),
+        readahead.FanotifyEvent(readahead.FAN_OPEN_EXEC, 8, 101),
+    ]
+
+
+def test_replay_follows_the_squashfs_layout() -> None:
+    opened = [
+        "/usr/share/icons/a.svg",
+        "/usr/bin/python",
+        "/usr/lib/python3/b.py",
+        "/usr/lib/libgtk.so",
+        "/usr/lib/python3/a.py",
+        "/usr/bin/python",
+    ]
+
+    assert readahead.layout_order(opened) == [
+        "/usr/bin/python",
+        "/usr/lib/libgtk.so",
+        "/usr/lib/python3/a.py",
+        "/usr/lib/python3/b.py",
+        "/usr/share/icons/a.svg",
+    ]
+
+
+def test_profile_keeps_only_system_files(tmp_path: Path) -> None:
+    profile = tmp_path / "readahead.list"
+    readahead.write_profile(
+        profile,
+        ["/usr/bin/python", "/etc/fonts/fonts.conf", "/usr/lib/libc.so.6"],
+    )
+    with profile.open("a", encoding="utf-8") as stream:
+        stream.write("/home/biglinux/.bashrc\nrelative/path\n/usr/lib/../../etc/x\n")
+
+    assert readahead.read_profile(profile) == [
+        "/usr/bin/python",
+        "/etc/fonts/fonts.conf",
+        "/usr/lib/libc.so.6",
+    ]
+
+    profile.chmod(0o664)
+    assert readahead.read_profile(profile) == []
+    profile.chmod(0o644)
+    profile.write_text("# biglinux-readahead 0\n/usr/bin/python\n")
+    assert readahead.read_profile(profile) == []
+
+
+def test_replay_advises_regular_files_within_the_budget(tmp_path: Path) -> None:
+    (tmp_path / "a").write_bytes(b"a" * 4096)
+    (tmp_path / "b").write_bytes(b"b" * 8192)
+    (tmp_path / "c").write_bytes(b"c" * 1024)
+    (tmp_path / "link").symlink_to(tmp_path / "a")
+    (tmp_path / "directory").mkdir()
+    advised: list[tuple[int, int]] = []
+
+    def advise(descriptor: int, offset: int, length: int, advice: int) -> None:
+        assert advice == os.POSIX_FADV_WILLNEED
+        advised.append((offset, length))
+
+    result = readahead.replay(
+        [
+            str(tmp_path / name)
+            for name in ("c", "missing", "b", "link", "directory", "a")
+        ],
+        max_bytes=6000,
+        advise=advise,
+    )
+
+    # a and c fit; b would go over the budget.
+    assert advised == [(0, 4096), (0, 1024)]
+    assert (result.files, result.bytes, result.skipped) == (2, 5120, 4)
+
+
+def test_recording_lists_the_files_another_process_opens() -> None:
+    def open_files() -> None:
+        time.sleep(0.3)
+        subprocess.run(["cat", "/etc/hostname"], check=False, capture_output=True)
+
+    opener = threading.Thread(target=open_files)
+    try:
+        opener.start()
+        paths = readahead.record(["/"], 1.5)
+    except OSError as error:
+        pytest.skip(f"fanotify is not available here: {error}")
+    finally:
+        opener.join()
+
+    assert any(path.endswith("/cat") for path in paths)
+    assert all(readahead.is_recorded_path(path) for path in paths)
+    assert len(paths) == len(set(paths))
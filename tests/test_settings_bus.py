@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import threading
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+import desktop_theme  # noqa: E402
+import settings_bus  # noqa: E402
+from services import SystemService  # noqa: E402
+from settings_bus import BusCall, CallResult  # noqa: E402
+
+
+class RecordingBus:
+    def __init__(self, failing: set[str] = frozenset()) -> None:
+        self.batches: list[list[str]] = []
+        self.failing = failing
+
+    def run(self, calls: Sequence[BusCall]) -> list[CallResult]:
+        self.batches.append([call.method for call in calls])
+        return [
+            CallResult(
+                call,
+                0.002,
+                "Interactive authentication required."
+                if call.method in self.failing or call.arguments[:1] == ("missing",)
+                else None,
+            )
+            for call in calls
+        ]
+
+
+def make_service(
+    monkeypatch, bus: RecordingBus, session_bus: RecordingBus | None = None
+) -> tuple[SystemService, list]:
+    service = SystemService()
+    service.settings_bus = bus
+    service.session_settings_bus = session_bus or RecordingBus()
+    commands: list[list[str]] = []
+    monkeypatch.setattr(service, "_write_live_state_file", lambda *_args: True)
+    monkeypatch.setattr(
+        service,
+        "_run_command",
+        lambda command, as_root=False, **_kwargs: (
+            commands.append(["sudo", *command] if as_root else command.copy())
+            or (True, "")
+        ),
+    )
+    return service, commands
+
+
+def test_language_settings_go_out_as_one_batch(monkeypatch) -> None:
+    bus = RecordingBus()
+    service, commands = make_service(monkeypatch, bus)
+
+    service.apply_language_settings("pt_BR", "America/Sao_Paulo")
+
+    assert bus.batches == [["SetTimezone", "SetNTP", "SetLocale"]]
+    assert commands == []
+
+
+def test_refused_calls_fall_back_to_the_command_they_replace(monkeypatch) -> None:
+    bus = RecordingBus(failing={"SetLocale"})
+    service, commands = make_service(monkeypatch, bus)
+
+    service.apply_language_settings("pt_BR", "America/Sao_Paulo")
+
+    assert commands == [["sudo", "localectl", "set-locale", "LANG=pt_BR.UTF-8"]]
+
+
+def test_xfce_theme_properties_go_to_xfconfd_as_one_batch(monkeypatch) -> None:
+    session_bus = RecordingBus()
+    service, commands = make_service(monkeypatch, RecordingBus(), session_bus)
+
+    desktop_theme._apply_xfce(service, dark=True)
+
+    assert session_bus.batches == [["SetProperty"] * 3]
+    assert commands == []
+
+
+def test_failed_xfconf_properties_fall_back_without_root(monkeypatch) -> None:
+    service, commands = make_service(monkeypatch, RecordingBus())
+    calls = [
+        settings_bus.set_xfconf_property("xsettings", "/Net/ThemeName", "adw-gtk3"),
+        settings_bus.set_xfconf_property("missing", "/general/theme", "adw-gtk3"),
+    ]
+
+    failed = service._apply_xfconf_settings(calls)
+
+    assert [result.call for result in failed] == [calls[1]]
+    assert commands == [
+        ["xfconf-query", "-c", "missing", "-p", "/general/theme", "-s", "adw-gtk3"]
+    ]
+
+
+def test_test_mode_makes_no_calls() -> None:
+    service = SystemService(test_mode=True)
+    service.settings_bus = bus = RecordingBus()
+
+    service.apply_language_settings("pt_BR", "America/Sao_Paulo")
+
+    assert bus.batches == []
+
+
+def test_an_unreachable_bus_reports_every_call() -> None:
+    bus = settings_bus.SettingsBus("unix:path=/nonexistent")
+    calls = [settings_bus.set_timezone("UTC"), settings_bus.set_ntp(True)]
+
+    results = bus.run(calls)
+
+    assert [result.call for result in results] == calls
+    assert all(result.error for result in results)
+
+
+FAKE_INTERFACES = """
+<node>
+  <interface name="org.freedesktop.timedate1">
+    <method name="SetTimezone">
+      <arg type="s" direction="in"/><arg type="b" direction="in"/>
+    </method>
+    <method name="SetNTP">
+      <arg type="b" direction="in"/><arg type="b" direction="in"/>
+    </method>
+  </interface>
+  <interface name="org.freedesktop.locale1">
+    <method name="SetLocale">
+      <arg type="as" direction="in"/><arg type="b" direction="in"/>
+    </method>
+    <method name="SetX11Keyboard">
+      <arg type="s" direction="in"/><arg type="s" direction="in"/>
+      <arg type="s" direction="in"/><arg type="s" direction="in"/>
+      <arg type="b" direction="in"/><arg type="b" direction="in"/>
+    </method>
+  </interface>
+  <interface name="org.xfce.Xfconf">
+    <method name="SetProperty">
+      <arg type="s" direction="in"/><arg type="s" direction="in"/>
+      <arg type="v" direction="in"/>
+    </method>
+  </interface>
+</node>
+"""
+
+
+@pytest.fixture
+def private_bus() -> Iterator[tuple[str, list[tuple[str, object]]]]:
+    """A session bus of our own with fake timedated and localed on it."""
+    pytest.importorskip("gi")
+    daemon = shutil.which("dbus-daemon")
+    if daemon is None:
+        pytest.skip("dbus-daemon is not installed")
+    from gi.repository import Gio, GLib
+
+    process = subprocess.Popen(
+        [daemon, "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    address = process.stdout.readline().strip()
+    calls: list[tuple[str, object]] = []
+    ready = threading.Event()
+    context = GLib.MainContext.new()
+    loop = GLib.MainLoop.new(context, False)
+
+    def handle(_connection, _sender, _path, _interface, method, parameters, call):
+        calls.append((method, parameters.unpack()))
+        if method == "SetProperty" and parameters.unpack()[0] == "missing":
+            call.return_dbus_error(
+                "org.xfce.Xfconf.Error.ChannelNotFound", "Channel does not exist"
+            )
+        elif method == "SetLocale" and parameters.unpack()[0] == ["LANG=xx_XX.UTF-8"]:
+            call.return_dbus_error(
+                "org.freedesktop.DBus.Error.InteractiveAuthorizationRequired",
+                "Interactive authentication required.",
+            )
+        else:
+            call.return_value(None)
+
+    def serve() -> None:
+        context.push_thread_default()
+        connection = Gio.DBusConnection.new_for_address_sync(
+            address,
+            Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+            | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+            None,
+            None,
+        )
+        node = Gio.DBusNodeInfo.new_for_xml(FAKE_INTERFACES)
+        for name, path, interface in (
+            settings_bus.TIMEDATE,
+            settings_bus.LOCALE,
+            settings_bus.XFCONF,
+        ):
+            connection.register_object(
+                path, node.lookup_interface(interface), handle, None, None
+            )
+            connection.call_sync(
+                "org.freedesktop.DBus",
+                "/org/freedesktop/DBus",
+                "org.freedesktop.DBus",
+                "RequestName",
+                GLib.Variant("(su)", (name, 0)),
+                None,
+                Gio.DBusCallFlags.NONE,
+                -1,
+                None,
+            )
+        ready.set()
+        loop.run()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    try:
+        yield address, calls
+    finally:
+        loop.quit()
+        thread.join(5)
+        process.terminate()
+        process.wait(5)
+
+
+def test_calls_reach_the_services_with_their_latency(private_bus) -> None:
+    address, calls = private_bus
+    bus = settings_bus.SettingsBus(address)
+
+    results = bus.run(
+        [
+            settings_bus.set_timezone("America/Sao_Paulo"),
+            settings_bus.set_ntp(True),
+            settings_bus.set_locale("pt_BR.UTF-8"),
+            settings_bus.set_x11_keyboard("br", "pc105", "", "terminate:ctrl_alt_bksp"),
+            settings_bus.set_locale("xx_XX.UTF-8"),
+        ]
+    )
+
+    assert sorted(calls, key=repr) == sorted(
+        [
+            ("SetTimezone", ("America/Sao_Paulo", False)),
+            ("SetNTP", (True, False)),
+            ("SetLocale", (["LANG=pt_BR.UTF-8"], False)),
+            (
+                "SetX11Keyboard",
+                ("br", "pc105", "", "terminate:ctrl_alt_bksp", True, False),
+            ),
+            ("SetLocale", (["LANG=xx_XX.UTF-8"], False)),
+        ],
+        key=repr,
+    )
+    assert [result.error is None for result in results] == [True] * 4 + [False]
+    assert all(result.latency >= 0 for result in results)
+
+
+def test_xfconf_properties_reach_a_fake_xfconfd(private_bus) -> None:
+    address, calls = private_bus
+    bus = settings_bus.SettingsBus(address, session=True)
+
+    results = bus.run(
+        [
+            settings_bus.set_xfconf_property("xsettings", "/Net/ThemeName", "adw"),
+            settings_bus.set_xfconf_property("xfwm4", "/general/theme", "adw"),
+            settings_bus.set_xfconf_property("missing", "/general/theme", "adw"),
+            # A value that does not fit its type is never sent.
+            BusCall(
+                settings_bus.XFCONF,
+                "SetProperty",
+                "(ssv)",
+                ("xfwm4", "/general/button_offset", ("i", "two")),
+                ("xfconf-query", "-c", "xfwm4", "-p", "/general/button_offset"),
+            ),
+        ]
+    )
+
+    assert sorted(calls, key=repr) == sorted(
+        [
+            ("SetProperty", ("xsettings", "/Net/ThemeName", "adw")),
+            ("SetProperty", ("xfwm4", "/general/theme", "adw")),
+            ("SetProperty", ("missing", "/general/theme", "adw")),
+        ],
+        key=repr,
+    )
+    assert [result.error for result in results][:2] == [None, None]
+    assert "Channel does not exist" in (results[2].error or "")
+    assert (results[3].error or "").startswith("bad arguments")
+
+
+def test_the_polkit_rule_covers_every_system_bus_call() -> None:
+    rule = (
+        REPOSITORY
+        / "biglinux-livecd/usr/share/polkit-1/rules.d/49-biglinux-livecd.rules"
+    ).read_text(encoding="utf-8")
+    actions = {
+        "SetTimezone": "org.freedesktop.timedate1.set-timezone",
+        "SetNTP": "org.freedesktop.timedate1.set-ntp",
+        "SetLocale": "org.freedesktop.locale1.set-locale",
+        "SetX11Keyboard": "org.freedesktop.locale1.set-keyboard",
+    }
+    calls = (
+        settings_bus.set_timezone("America/Sao_Paulo"),
+        settings_bus.set_ntp(True),
+        settings_bus.set_locale("pt_BR.UTF-8"),
+        settings_bus.set_x11_keyboard("br", "pc105", "", ""),
+    )
+    for call in calls:
+        assert f'action.id == "{actions[call.method]}"' in rule
+    assert '"/run/miso/bootmnt"' in rule
@@ -105,3 +105,25 @@ def test_integrity_check_is_not_started_by_a_path_unit(tmp_path: Path) -> None:
     assert "IOSchedulingClass=idle" in unit
     assert "IOSchedulingPriority=7" in unit
     assert "ConditionPathExists=/livefs-pkgs.txt" in unit
+
+
+def test_readahead_unit_is_valid_for_staged_payload(tmp_path: Path) -> None:
+    verify_staged_unit(
+        tmp_path,
+        "biglinux-readahead.service",
+        "/usr/bin/biglinux-readahead",
+        "usr/bin/biglinux-readahead",
+    )
+    unit = (PACKAGE / "usr/lib/systemd/system/biglinux-readahead.service").read_text(
+        encoding="utf-8"
+    )
+    # Warming the cache must never hold back the display manager.
+    assert "Before=" not in unit
+    assert "Type=exec" in unit
+    assert "IOSchedulingPriority=7" in unit
+    assert "ConditionPathExists=/usr/share/biglinux/livecd/readahead.list" in unit
+    wanted_unit = (
+        PACKAGE
+        / "usr/lib/systemd/system/multi-user.target.wants/biglinux-readahead.service"
+    )
+    assert wanted_unit.readlink() == Path("../biglinux-readahead.service")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import gettext
+import json
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+PACKAGE = REPOSITORY / "biglinux-livecd"
+LIVECD = PACKAGE / "usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+import translations  # noqa: E402
+
+DOMAIN = "biglinux-livecd"
+LOCALES = json.loads((LIVECD / "assets/localization.json").read_text("utf-8"))
+
+
+def locale_language(entry: dict[str, str]) -> str:
+    return parse_qs(urlparse(entry["url"]).query)["lang"][0]
+
+
+def message_ids() -> list[str]:
+    source = (PACKAGE / "locale/pt.po").read_text("utf-8")
+    return [
+        message
+        for message in re.findall(r'^msgid "(.*)"$', source, re.MULTILINE)
+        if message
+    ]
+
+
+def write_catalog(path: Path, messages: dict[str, str]) -> None:
+    """Write a GNU .mo file; msgfmt is not needed for synthetic catalogs."""
+    entries = {"": "Content-Type: text/plain; charset=UTF-8\n", **messages}
+    keys = sorted(entries)
+    originals = [key.encode("utf-8") for key in keys]
+    translated = [entries[key].encode("utf-8") for key in keys]
+    count = len(keys)
+    offset = 28 + 16 * count
+    tables = []
+    data = b""
+    for strings in (originals, translated):
+        table = []
+        for string in strings:
+            table.append((len(string), offset + len(data)))
+            data += string + b"\0"
+        tables.append(table)
+    header = struct.pack("<7I", 0x950412DE, 0, count, 28, 28 + 8 * count, 0, 0)
+    body = b"".join(
+        struct.pack("<2I", length, start) for table in tables for length, start in table
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + body + data)
+
+
+@pytest.fixture
+def locale_dir(monkeypatch, tmp_path: Path) -> Path:
+    for language in {locale_language(entry) for entry in LOCALES}:
+        write_catalog(
+            tmp_path / language / "LC_MESSAGES" / f"{DOMAIN}.mo",
+            {message: f"{language}: {message}" for message in message_ids()},
+        )
+    monkeypatch.setattr(translations, "LOCALE_DIR", str(tmp_path))
+    monkeypatch.setattr(translations, "_catalogs", {})
+    monkeypatch.setattr(translations, "_prefetches", {})
+    monkeypatch.setattr(translations, "_translation_instance", None)
+    return tmp_path
+
+
+def count_catalog_loads(monkeypatch) -> list[str | None]:
+    loads: list[str | None] = []
+    original = gettext.translation
+
+    def translation(*args, **kwargs):
+        languages = kwargs.get("languages")
+        loads.append(languages[0] if languages else None)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(gettext, "translation", translation)
+    return loads
+
+
+def test_a_prefetched_language_switches_without_loading(
+    monkeypatch, locale_dir: Path
+) -> None:
+    loads = count_catalog_loads(monkeypatch)
+    generation = translations.language_generation()
+
+    first = translations.prefetch_language("pt")
+    assert translations.prefetch_language("pt") is first
+    first.result(timeout=5)
+    translations.set_language("pt")
+
+    assert loads == ["pt"]
+    assert translations._("Keyboard") == "pt: Keyboard"
+    assert translations.language_generation() == generation + 1
+
+
+def test_an_unknown_language_falls_back_to_english(locale_dir: Path) -> None:
+    translations.set_language("xx")
+
+    assert translations._("Keyboard") == "Keyboard"
+
+
+def test_language_switch_benchmark_over_every_locale(
+    monkeypatch, record_property, locale_dir: Path
+) -> None:
+    """Time selection-to-translated-page for all locales, cold and prefetched.
+
+    The page is every message the wizard translates; what is left before the
+    next frame is GTK's own layout, which does not depend on the catalog. The
+    mean switch times go to the test report rather than into an assertion.
+    """
+    assert len(LOCALES) == 72
+    messages = message_ids()
+
+    def switch(language: str) -> float:
+        started = time.perf_counter()
+        translations.set_language(language)
+        for message in messages:
+            translations._(message)
+        return time.perf_counter() - started
+
+    cold = []
+    for entry in LOCALES:
+        monkeypatch.setattr(translations, "_catalogs", {})
+        # gettext keeps parsed files too; a first switch does not have them.
+        monkeypatch.setattr(gettext, "_translations", {})
+        cold.append(switch(locale_language(entry)))
+
+    monkeypatch.setattr(translations, "_catalogs", {})
+    monkeypatch.setattr(gettext, "_translations", {})
+    loads = count_catalog_loads(monkeypatch)
+    prefetched = []
+    for entry in LOCALES:
+        # Focusing the row prefetches while the user reads it.
+        translations.prefetch_language(locale_language(entry)).result(timeout=5)
+        prefetched.append(switch(locale_language(entry)))
+        assert translations._("Keyboard").startswith(locale_language(entry))
+
+    assert sorted(set(loads)) == sorted({locale_language(e) for e in LOCALES})
+    assert len(loads) == len(set(loads))
+    record_property("cold_switch_ms", round(sum(cold) / len(cold) * 1000, 2))
+    record_property(
+        "prefetched_switch_ms", round(sum(prefetched) / len(prefetched) * 1000, 2)
+    )
+    assert sum(prefetched) < sum(cold)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+STARTBIGLIVE = REPOSITORY / "biglinux-livecd/usr/bin/startbiglive"
+sys.path.insert(0, str(LIVECD))
+
+import zygote  # noqa: E402
+
+SERVER = """
+import os, sys
+sys.path.insert(0, sys.argv[1])
+import zygote
+
+def run_wizard(argv):
+    with open(os.environ["WIZARD_REPORT"], "a") as report:
+        report.write(f"wizard {argv[1:]} {os.environ['WIZARD_MARK']} {os.getcwd()}\\n")
+    return int(os.environ["WIZARD_STATUS"])
+
+sys.exit(zygote.serve(run_wizard, sys.argv[2], idle_timeout=10))
+"""
+
+
+def start_server(path: Path) -> subprocess.Popen[bytes]:
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER, str(LIVECD), str(path)],
+        stdin=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while not path.exists():
+        assert server.poll() is None
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return server
+
+
+def test_request_without_zygote_falls_back_to_a_cold_start(tmp_path: Path) -> None:
+    assert zygote.request_wizard(["main.py"], str(tmp_path / "missing.sock")) is None
+
+
+def test_zygote_forks_wizards_with_the_callers_session(
+    tmp_path: Path, monkeypatch
+) -> None:
+    path = tmp_path / "wizard.sock"
+    report = tmp_path / "wizard.log"
+    monkeypatch.setenv("WIZARD_REPORT", str(report))
+    server = start_server(path)
+    try:
+        assert path.stat().st_mode & 0o777 == 0o600
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("WIZARD_MARK", "first")
+        monkeypatch.setenv("WIZARD_STATUS", "3")
+        assert zygote.request_wizard(["main.py", "--debug"], str(path)) == 3
+
+        # A failed wizard leaves the zygote serving for the next attempt.
+        monkeypatch.setenv("WIZARD_MARK", "second")
+        monkeypatch.setenv("WIZARD_STATUS", "0")
+        assert zygote.request_wizard(["main.py"], str(path)) == 0
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+        server.wait()
+
+    output = report.read_text()
+    assert f"wizard ['--debug'] first {tmp_path}" in output
+    assert f"wizard [] second {tmp_path}" in output
+    assert not path.exists()
+
+
+def test_only_the_compositor_paths_start_the_zygote() -> None:
+    source = STARTBIGLIVE.read_text(encoding="utf-8")
+    launch = source.index('if [[ "$session_type" == "x11" ]]; then\n')
+    wayland = source.index("\nelse\n\t# Wayland session", launch)
+    stop = source.index("\n_stop_wizard_zygote\nwait\n")
+    starts = [
+        match.start() for match in re.finditer(r"\n\t\t_start_wizard_zygote\n", source)
+    ]
+    kwin = source.index("\t\tif ! _start_kwin_wizard; then")
+    mutter = source.index("\t\tif ! _start_mutter_wizard; then")
+    # One before each compositor waits for the GPU, none on X11.
+    assert len(starts) == 2
+    assert wayland < starts[0] < kwin < starts[1] < mutter < stop
+    assert "main.py --zygote </dev/null &" in source
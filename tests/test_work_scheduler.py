@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+from ui.work_scheduler import (  # noqa: E402
+    PRIORITY_NEXT,
+    PRIORITY_VISIBLE,
+    WorkScheduler,
+)
+
+
+class FakeClock:
+    """Every unit of work advances time by what it says it costs."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeIdle:
+    def __init__(self) -> None:
+        self.callbacks: list[Callable[[], bool]] = []
+
+    def wake(self, callback: Callable[[], bool]) -> None:
+        self.callbacks.append(callback)
+
+    def run_frames(self) -> int:
+        """Dispatch the idle source until it removes itself; count frames."""
+        frames = 0
+        while self.callbacks:
+            callback = self.callbacks.pop(0)
+            frames += 1
+            if callback():
+                self.callbacks.append(callback)
+        return frames
+
+
+def make_scheduler(budget: float = 0.006) -> tuple[WorkScheduler, FakeClock, FakeIdle]:
+    clock = FakeClock()
+    idle = FakeIdle()
+    return WorkScheduler(budget, clock=clock, wake=idle.wake), clock, idle
+
+
+def units(
+    name: str, count: int, clock: FakeClock, log: list[str], cost: float = 0.002
+) -> Iterator[None]:
+    for index in range(count):
+        clock.now += cost
+        log.append(f"{name}{index}")
+        yield
+
+
+def test_units_run_in_budgeted_slices_and_are_timed() -> None:
+    scheduler, clock, idle = make_scheduler()
+    log: list[str] = []
+
+    scheduler.add("cards", units("card", 9, clock, log))
+
+    # Three 2 ms units fit in each 6 ms slice; the fourth slice only finds
+    # that the generator has ended.
+    assert idle.run_frames() == 4
+    assert log == [f"card{index}" for index in range(9)]
+    # The last unit is the one that ends the generator.
+    assert len(scheduler.timings) == 10
+    assert [timing.unit for timing in scheduler.timings] == list(range(10))
+    count, total, longest = scheduler.summary()["cards"]
+    assert count == 10
+    assert round(total, 6) == 0.018
+    assert round(longest, 6) == 0.002
+    assert not scheduler.pending("cards")
+
+
+def test_a_slow_unit_still_yields_the_frame() -> None:
+    scheduler, clock, idle = make_scheduler()
+    log: list[str] = []
+
+    scheduler.add("slow", units("slow", 2, clock, log, cost=0.1))
+    scheduler.add("fast", units("fast", 1, clock, log))
+
+    assert scheduler.run_slice()
+    assert log == ["slow0"]
+
+
+def test_the_page_about_to_be_entered_runs_first() -> None:
+    scheduler, clock, _idle = make_scheduler(budget=1.0)
+    log: list[str] = []
+    scheduler.add("preload", units("preload", 2, clock, log))
+    scheduler.add("next", units("next", 2, clock, log), priority=PRIORITY_NEXT)
+    scheduler.add("later", units("later", 1, clock, log))
+
+    assert scheduler.prioritize("later", PRIORITY_VISIBLE)
+    assert not scheduler.prioritize("missing", PRIORITY_VISIBLE)
+    assert not scheduler.run_slice()
+
+    assert log == ["later0", "next0", "next1", "preload0", "preload1"]
+
+
+def test_finish_cancel_and_failing_units() -> None:
+    scheduler, clock, idle = make_scheduler()
+    log: list[str] = []
+
+    def broken() -> Iterator[None]:
+        log.append("broken")
+        yield
+        raise RuntimeError("widget failed")
+
+    scheduler.add("page", units("page", 5, clock, log))
+    scheduler.add("broken", broken())
+    scheduler.add("dropped", units("dropped", 5, clock, log))
+    scheduler.finish("page")
+    assert log == [f"page{index}" for index in range(5)]
+    assert scheduler.cancel("dropped")
+
+    idle.run_frames()
+
+    assert log[-1] == "broken"
+    assert not scheduler.pending("broken")
+    assert "dropped" not in scheduler.summary()
+
+
+def test_wakes_once_while_work_is_queued() -> None:
+    scheduler, clock, idle = make_scheduler()
+    log: list[str] = []
+
+    scheduler.add("one", units("one", 1, clock, log))
+    scheduler.add("two", units("two", 1, clock, log))
+    assert len(idle.callbacks) == 1
+    idle.run_frames()
+
+    scheduler.add("three", units("three", 1, clock, log))
+    assert len(idle.callbacks) == 1
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+LIVECD = REPOSITORY / "biglinux-livecd/usr/share/biglinux/livecd"
+sys.path.insert(0, str(LIVECD))
+
+import xkb_index  # noqa: E402
+from services import SystemService  # noqa: E402
+from settings_bus import SettingsBus  # noqa: E402
+from xkb_index import KeyboardIndex, build_index  # noqa: E402
+
+REGISTRY_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<xkbConfigRegistry version="1.1"><layoutList>
+<layout><configItem><name>br</name><description>Portuguese (Brazil)</description>
+<languageList><iso639Id>por</iso639Id></languageList></configItem>
+<variantList>
+<variant><configItem><name>nodeadkeys</name>
+<description>Portuguese (Brazil, no dead keys)</description></configItem></variant>
+<variant><configItem><name>thinkpad</name>
+<description>Portuguese (Brazil, IBM/Lenovo ThinkPad)</description>
+</configItem></variant>
+</variantList></layout>
+<layout><configItem><name>de</name><description>German</description>
+<countryList><iso3166Id>DE</iso3166Id></countryList></configItem>
+<variantList>
+<variant><configItem><name>nodeadkeys</name>
+<description>German (no dead keys)</description></configItem></variant>
+<variant><configItem><name>bad name</name>
+<description>Not a name startbiglive accepts</description></configItem></variant>
+</variantList></layout>
+<layout><configItem><name>us</name><description>English (US)</description>
+</configItem><variantList>
+<variant><configItem><name>intl</name>
+<description>English (US, intl., with dead keys)</description></configItem></variant>
+</variantList></layout>
+"""
+
+
+def write_registry(rules_dir: Path, synthetic_layouts: int = 0) -> Path:
+    """A registry shaped like evdev.xml, padded to a realistic size."""
+    synthetic = "".join(
+        f"<layout><configItem><name>x{index}</name>"
+        f"<description>Synthetic Layout {index}</description></configItem>"
+        "<variantList>"
+        + "".join(
+            f"<variant><configItem><name>v{variant}</name>"
+            f"<description>Synthetic Layout {index}, variant {variant}"
+            "</description></configItem></variant>"
+            for variant in range(4)
+        )
+        + "</variantList></layout>"
+        for index in range(synthetic_layouts)
+    )
+    rules_dir.mkdir(parents=True, exist_ok=True)
+    registry = rules_dir / xkb_index.RULES_FILE
+    registry.write_text(
+        REGISTRY_HEAD + synthetic + "</layoutList></xkbConfigRegistry>", "utf-8"
+    )
+    return registry
+
+
+def test_the_index_lists_every_layout_and_variant(tmp_path: Path) -> None:
+    write_registry(tmp_path / "rules")
+
+    assert build_index(tmp_path / "rules", tmp_path / "assets") == 7
+    index = KeyboardIndex.load(tmp_path / "assets")
+
+    # Sorted by description, as the browser lists them.
+    ids = [index.entry(position).layout_id for position in range(len(index))]
+    assert ids == [
+        "us",
+        "us(intl)",
+        "de",
+        "de(nodeadkeys)",
+        "br",
+        "br(thinkpad)",
+        "br(nodeadkeys)",
+    ]
+    assert "de(bad name)" not in ids
+    position = index.position("br(nodeadkeys)")
+    assert position is not None
+    assert index.entry(position).description == "Portuguese (Brazil, no dead keys)"
+
+
+def test_search_matches_descriptions_ids_and_language_codes(tmp_path: Path) -> None:
+    write_registry(tmp_path / "rules")
+    build_index(tmp_path / "rules", tmp_path / "assets")
+    index = KeyboardIndex.load(tmp_path / "assets")
+
+    def search(query: str) -> list[str]:
+        return [index.entry(position).layout_id for position in index.search(query)]
+
+    assert search("PORTUGUÊS brazil dead") == ["br(nodeadkeys)"]
+    assert search("thinkpad") == ["br(thinkpad)"]
+    assert set(search("por")) == {"br", "br(nodeadkeys)", "br(thinkpad)"}
+    assert search("de(nodeadkeys)") == ["de(nodeadkeys)"]
+    assert len(search("  ")) == len(index)
+
+
+def test_a_missing_or_stale_index_is_empty(tmp_path: Path) -> None:
+    assert len(KeyboardIndex.load(tmp_path)) == 0
+
+    (tmp_path / xkb_index.INDEX_NAME).write_text(
+        json.dumps({"version": 0, "rows": [["us", "", "English (US)", "us"]]})
+    )
+    assert len(KeyboardIndex.load(tmp_path)) == 0
+
+    (tmp_path / xkb_index.INDEX_NAME).write_text(
+        json.dumps(
+            {"version": xkb_index.INDEX_VERSION, "rows": [["us"], ["de", "", "x", 1]]}
+        )
+    )
+    assert len(KeyboardIndex.load(tmp_path)) == 0
+
+
+def test_index_memory_and_search_on_a_full_size_registry(tmp_path: Path) -> None:
+    """Load and search an index as large as evdev.xml's, several times over."""
+    write_registry(tmp_path / "rules", synthetic_layouts=400)
+    count = build_index(tmp_path / "rules", tmp_path / "assets")
+    assert count > 2000
+
+    tracemalloc.start()
+    index = KeyboardIndex.load(tmp_path / "assets")
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(index) == count
+    # Parsing the registry in the wizard cost tens of MB.
+    assert peak < 4 * 1024 * 1024
+    for query in ("s", "synthetic 39", "variant 3", "layout 12 variant"):
+        assert index.search(query)
+
+
+def test_a_chosen_variant_is_applied_unchanged(monkeypatch, tmp_path: Path) -> None:
+    write_registry(tmp_path / "rules")
+    build_index(tmp_path / "rules", tmp_path / "assets")
+    index = KeyboardIndex.load(tmp_path / "assets")
+    chosen = index.entry(index.search("german no dead keys")[0]).layout_id
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    service = SystemService()
+    commands: list[list[str]] = []
+    state: dict[str, str] = {}
+    monkeypatch.setattr(service, "get_desktop_environment", lambda: "other")
+    service.settings_bus = SettingsBus("unix:path=/nonexistent")
+    monkeypatch.setattr(
+        service,
+        "_write_live_state_file",
+        lambda filepath, content: state.update({filepath: content}) or True,
+    )
+    monkeypatch.setattr(
+        service,
+        "_run_command",
+        lambda command, **kwargs: commands.append(command.copy()) or (True, ""),
+    )
+
+    service.apply_keyboard_layout(chosen)
+
+    assert state["/tmp/big_keyboard"] == "de(nodeadkeys)"
+    assert commands[0] == ["setxkbmap", "de", "-variant", "nodeadkeys"]
+    assert commands[1][2:5] == ["de", "pc105", "nodeadkeys"]
+    kxkbrc = (tmp_path / ".config/kxkbrc").read_text(encoding="utf-8")
+    assert "LayoutList=de\n" in kxkbrc
+    assert "VariantList=nodeadkeys\n" in kxkbrc